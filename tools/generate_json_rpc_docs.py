@@ -50,13 +50,30 @@
 Generates the JSON RPC documentation from the source code and writes it into
 ../docs/JSON-RPC.md.
 
+The same annotations are used to generate the typed asyncio Python client in
+jamulus_rpc_api.py (see jamulus_rpc.py for the connection handling) and a
+machine-readable OpenRPC document with JSON Schemas of all params and
+results in ../docs/JSON-RPC.openrpc.json.
+
+The parsed annotations are cached per source file, keyed by the content
+hash of the file (and of this script), and output files are only rewritten
+if their content changes, so unchanged files keep their modification time.
+
 Usage:
 ./tools/generate_json_rpc_docs.py
+./tools/generate_json_rpc_docs.py --check   # exit with 1 if an output file is outdated
 
 """
 
+import argparse
+import builtins
+import hashlib
+import json
+import keyword
 import os
 import re
+import sys
+import textwrap
 
 source_files = [
     "src/rpcserver.cpp",
@@ -66,6 +83,23 @@ source_files = [
 
 repo_root = os.path.join(os.path.dirname(__file__), '..')
 
+cache_path = os.path.join(os.path.dirname(__file__), 'generate_json_rpc_docs-cache.json')
+
+# Parse tag in form of "{type} name - description"
+tag_re = re.compile(r"^{(\w+)}\s+(\S+)\s+-\s+(.*)$", re.DOTALL)
+
+
+def parse_tag(tag):
+    """
+    @param tag: DocumentationText of a param or result
+    @return: (type, name, description) tuple or None if the tag is malformed
+    """
+    match = tag_re.match(str(tag))
+    if not match:
+        return None
+    description = re.sub(r"^\s+", " ", match.group(3)).strip()
+    return match.group(1), match.group(2), description
+
 
 class DocumentationItem:
     """
@@ -119,6 +153,30 @@ class DocumentationItem:
         """
         return self.type + ": " + self.name
 
+    def to_dict(self):
+        """
+        @return: dict suitable for JSON, see from_dict()
+        """
+        return {
+            "name": self.name,
+            "type": self.type,
+            "brief": self.brief.parts,
+            "params": [tag.parts for tag in self.params],
+            "results": [tag.parts for tag in self.results],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        @param data: dict as returned by to_dict()
+        @return: DocumentationItem
+        """
+        item = cls(data["name"], data["type"])
+        item.brief.parts = list(data["brief"])
+        item.params = [DocumentationText(parts) for parts in data["params"]]
+        item.results = [DocumentationText(parts) for parts in data["results"]]
+        return item
+
     def to_markdown(self):
         """
         @return: Markdown-formatted str with name, brief, params and results
@@ -145,9 +203,11 @@ class DocumentationText:
     Represents text inside the documentation.
     """
 
-    def __init__(self):
-        """Constructor"""
-        self.parts = []
+    def __init__(self, parts=None):
+        """
+        @param parts: list of str, initial text parts
+        """
+        self.parts = list(parts or [])
 
     def add_text(self, text):
         """
@@ -178,54 +238,152 @@ class DocumentationTable:
         @return: str containing the Markdown table
         """
         output = ["| Name | Type | Description |", "| --- | --- | --- |"]
-        tag_re = re.compile(r"^{(\w+)}\s+(\S+)\s+-\s+(.*)$", re.DOTALL)
         for tag in self.tags:
-            text = str(tag)
-            # Parse tag in form of "{type} name - description"
-            match = tag_re.match(text)
-            if match:
-                type_ = match.group(1)
-                name = match.group(2)
-                description = re.sub(r"^\s+", " ", match.group(3)).strip()
+            parsed = parse_tag(tag)
+            if parsed:
+                type_, name, description = parsed
                 output.append(f"| {name} | {type_} | {description} |")
         return "\n".join(output)
 
 
-items = []
-current_item = None
-
-# Parse the source code
-for source_file in source_files:
-    with open(os.path.join(repo_root, source_file), "r") as f:
-        for line in f.readlines():
-            line = line.strip()
-            if line.startswith("/// @rpc_notification "):
-                current_item = DocumentationItem(
-                    line[len("/// @rpc_notification "):], "notification"
-                )
-                items.append(current_item)
-            elif line.startswith("/// @rpc_method "):
-                current_item = DocumentationItem(
-                    line[len("/// @rpc_method "):], "method"
-                )
-                items.append(current_item)
-            elif line.startswith("/// @brief "):
-                current_item.handle_tag("brief")
-                current_item.handle_text(line[len("/// @brief "):])
-            elif line.startswith("/// @param "):
-                current_item.handle_tag("param")
-                current_item.handle_text(line[len("/// @param "):])
-            elif line.startswith("/// @result "):
-                current_item.handle_tag("result")
-                current_item.handle_text(line[len("/// @result "):])
-            elif line.startswith("///"):
-                current_item.handle_text(line[len("///"):].lstrip())
-            elif line == "":
-                pass
-            else:
-                current_item = None
+def parse_source(text):
+    """
+    Parses all @rpc_method and @rpc_notification blocks of one source file.
+
+    @param text: str, content of the source file
+    @return: list of DocumentationItem in source order
+    """
+    items = []
+    current_item = None
+
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("/// @rpc_notification "):
+            current_item = DocumentationItem(
+                line[len("/// @rpc_notification "):], "notification"
+            )
+            items.append(current_item)
+        elif line.startswith("/// @rpc_method "):
+            current_item = DocumentationItem(
+                line[len("/// @rpc_method "):], "method"
+            )
+            items.append(current_item)
+        elif line.startswith("/// @brief "):
+            current_item.handle_tag("brief")
+            current_item.handle_text(line[len("/// @brief "):])
+        elif line.startswith("/// @param "):
+            current_item.handle_tag("param")
+            current_item.handle_text(line[len("/// @param "):])
+        elif line.startswith("/// @result "):
+            current_item.handle_tag("result")
+            current_item.handle_text(line[len("/// @result "):])
+        elif line.startswith("///"):
+            current_item.handle_text(line[len("///"):].lstrip())
+        elif line == "":
+            pass
+        else:
+            current_item = None
+
+    return items
+
+
+def generator_hash():
+    """
+    @return: str, hash of this script, so that the cache is invalidated if
+             the parser changes
+    """
+    with open(__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_cache(path=cache_path):
+    """
+    @param path: str, cache file
+    @return: dict of source file to {"hash": str, "items": list of dict}
+    """
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("generator") != generator_hash():
+        return {}
+    files = cache.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_cache(files, path=cache_path):
+    """
+    Atomically replaces the cache file.
+
+    @param files: dict as returned by load_cache()
+    @param path: str, cache file
+    """
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({"generator": generator_hash(), "files": files}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # the cache is an optimization only
+        pass
+
+
+def parse_source_files(use_cache=True, path=cache_path, save=True):
+    """
+    Parses all @rpc_method and @rpc_notification blocks in the source files.
+    Files whose content hash matches the cache are not parsed again.
+
+    @param use_cache: bool
+    @param path: str, cache file
+    @param save: bool, update the cache file if it is used and outdated
+    @return: list of DocumentationItem, sorted by name
+    """
+    cache = load_cache(path) if use_cache else {}
+    files = {}
+    items = []
+
+    for source_file in source_files:
+        with open(os.path.join(repo_root, source_file), "rb") as f:
+            content = f.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+        cached = cache.get(source_file)
+        if isinstance(cached, dict) and cached.get("hash") == content_hash:
+            file_items = [DocumentationItem.from_dict(data) for data in cached["items"]]
+        else:
+            file_items = parse_source(content.decode("utf-8"))
+        files[source_file] = {
+            "hash": content_hash,
+            "items": [item.to_dict() for item in file_items],
+        }
+        items += file_items
+
+    if use_cache and save and files != cache:
+        save_cache(files, path)
+    items.sort(key=lambda item: item.name)
+    return items
+
+
+def update_file(path, content, check=False):
+    """
+    Writes content to path unless the file already has exactly this content.
+
+    @param path: str
+    @param content: str
+    @param check: bool, only compare and never write
+    @return: bool, True if the file was (or, with check, would be) changed
+    """
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    if not check:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+    return True
 
-items.sort(key=lambda item: item.name)
 
 PREAMBLE = """
 # Jamulus JSON-RPC Server Documentation
@@ -275,6 +433,21 @@ client.request('jamulus/apiAuth', { secret: "...the secret from the file in --js
 .catch(console.error)
 ```
 
+Python 3 scripts can use the asyncio client in `tools/jamulus_rpc_api.py`, which is generated from the same source code annotations as this document.
+It keeps a single authenticated connection open and allows concurrent requests on it:
+
+```
+import asyncio
+from jamulus_rpc_api import JamulusRpcClient, read_secret_file
+
+async def main():
+    secret = read_secret_file("/file/with/a/secret.txt")
+    async with JamulusRpcClient("127.0.0.1", 22100, secret) as rpc:
+        print(await rpc.jamulus.get_version())
+
+asyncio.run(main())
+```
+
 ## Example
 
 After opening a TCP connection to the JSON-RPC server, the connection must be authenticated:
@@ -308,14 +481,405 @@ Jamulus will also send **notifications** to the consumer:
 
 """
 
-docs_path = os.path.join(repo_root, 'docs', 'JSON-RPC.md')
-with open(docs_path, "w") as f:
-    f.write(PREAMBLE)
 
-    f.write("## Method reference\n")
+def render_markdown(items):
+    """
+    @param items: list of DocumentationItem
+    @return: str, content of docs/JSON-RPC.md
+    """
+    output = [PREAMBLE]
+
+    output.append("## Method reference\n")
     for item in filter(lambda item: item.type == "method", items):
-        f.write(item.to_markdown() + "\n\n")
+        output.append(item.to_markdown() + "\n\n")
 
-    f.write("## Notification reference\n")
+    output.append("## Notification reference\n")
     for item in filter(lambda item: item.type == "notification", items):
-        f.write(item.to_markdown() + "\n\n")
+        output.append(item.to_markdown() + "\n\n")
+
+    return "".join(output)
+
+
+class SchemaNode:
+    """
+    Represents the structure described by the param or result tags of an
+    item. Paths like `result.clients[*].id` become nested nodes.
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self.type = None
+        self.description = ""
+        self.optional = False
+        self.properties = {}
+        self.items = None
+
+    @classmethod
+    def from_tags(cls, tags):
+        """
+        @param tags: iterable of DocumentationText
+        @return: SchemaNode for the `params` or `result` root, or None if there are no tags
+        """
+        root = None
+        for tag in tags:
+            parsed = parse_tag(tag)
+            if not parsed:
+                continue
+            type_, name, description = parsed
+            optional = name.startswith("[") and name.endswith("]")
+            if optional:
+                name = name[1:-1]
+            if root is None:
+                root = cls()
+            node = root
+            # skip the leading "params" or "result" token
+            for token in re.findall(r"\w+|\[\*\]", name)[1:]:
+                if token == "[*]":
+                    if node.items is None:
+                        node.items = cls()
+                    node = node.items
+                else:
+                    node = node.properties.setdefault(token, cls())
+            node.type = type_
+            node.description = description
+            node.optional = optional
+        return root
+
+    def to_json_schema(self):
+        """
+        @return: dict, JSON Schema of this node and its children
+        """
+        schema = {}
+        type_ = self.type or ("array" if self.items else "object" if self.properties else None)
+        if type_:
+            # e.g. "The musician's skill level (beginner, ..., or null)"
+            if re.search(r"\bnull\b", self.description):
+                schema["type"] = [type_, "null"]
+            else:
+                schema["type"] = type_
+        if self.description:
+            schema["description"] = self.description
+        if self.properties:
+            schema["properties"] = {
+                name: node.to_json_schema() for name, node in self.properties.items()
+            }
+            required = [name for name, node in self.properties.items() if not node.optional]
+            if required:
+                schema["required"] = required
+        if self.items is not None:
+            schema["items"] = self.items.to_json_schema()
+        return schema
+
+
+python_types = {
+    "string": "str",
+    "number": "Number",
+    "boolean": "bool",
+    "array": "List[Any]",
+    "object": "Dict[str, Any]",
+}
+
+PYTHON_CLIENT_PREAMBLE = '''\
+##############################################################################
+# This file is automatically generated from the source code.
+# Do not edit this file manually.
+# See `tools/generate_json_rpc_docs.py` for details.
+##############################################################################
+
+"""
+Typed asyncio client for the Jamulus JSON-RPC API.
+
+See jamulus_rpc.py for the connection handling and docs/JSON-RPC.md for the
+reference documentation.
+"""
+
+# pylint: disable=too-many-public-methods
+
+from typing import Any, Dict, List, Optional, TypedDict, Union
+
+from jamulus_rpc import (JsonRpcError, RpcConnection,  # pylint: disable=unused-import
+                         Subscription, read_secret_file)
+
+Number = Union[int, float]
+'''
+
+
+def camel_case(name):
+    """
+    @param name: str, e.g. jamulusserver/getClients
+    @return: str, e.g. JamulusserverGetClients
+    """
+    return "".join(part[:1].upper() + part[1:] for part in re.split(r"[^0-9A-Za-z]+", name))
+
+
+def snake_case(name):
+    """
+    @param name: str, e.g. getClients
+    @return: str, e.g. get_clients, with a trailing _ for Python keywords and builtins
+    """
+    name = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+    if keyword.iskeyword(name) or hasattr(builtins, name):
+        return name + "_"
+    return name
+
+
+def wrap_docstring(text, indent):
+    """
+    @return: list of lines containing the wrapped text
+    """
+    return textwrap.wrap(text, width=99 - len(indent), initial_indent=indent,
+                         subsequent_indent=indent) or [indent.rstrip()]
+
+
+class PythonClientWriter:
+    """
+    Renders jamulus_rpc_api.py from the parsed items.
+    """
+
+    def __init__(self, items):
+        """
+        @param items: list of DocumentationItem
+        """
+        self.items = items
+        self.typed_dicts = []
+
+    def python_type(self, node, name):
+        """
+        Returns the type annotation for a node, registering TypedDicts for
+        objects with known properties on the way.
+
+        @param node: SchemaNode
+        @param name: str, name to use if a TypedDict is needed
+        @return: str
+        """
+        if node.properties:
+            fields = []
+            for key, child in node.properties.items():
+                fields.append((key, self.python_type(child, name + camel_case(key))))
+            self.typed_dicts.append((name, fields))
+            return name
+        if node.items is not None:
+            return f"List[{self.python_type(node.items, name + 'Item')}]"
+        return python_types.get(node.type, "Any")
+
+    def render_params(self, params, base_name):
+        """
+        @param params: SchemaNode or None
+        @param base_name: str, prefix for TypedDict names
+        @return: tuple of (argument list, @param docs, lines building `params`,
+                 expression passed to call())
+        """
+        args = []
+        doc_args = []
+        build = []
+        if params is not None and params.properties:
+            required = [k for k, v in params.properties.items() if not v.optional]
+            optional = [k for k, v in params.properties.items() if v.optional]
+            build.append("        params = {")
+            for key in required:
+                node = params.properties[key]
+                arg = snake_case(key)
+                args.append(f"{arg}: {self.python_type(node, base_name + camel_case(key))}")
+                doc_args.append(f"@param {arg}: {node.description}")
+                build.append(f"            {key!r}: {arg},")
+            build.append("        }")
+            for key in optional:
+                node = params.properties[key]
+                arg = snake_case(key)
+                type_ = self.python_type(node, base_name + camel_case(key))
+                args.append(f"{arg}: Optional[{type_}] = None")
+                doc_args.append(f"@param {arg}: {node.description}")
+                build += [f"        if {arg} is not None:",
+                          f"            params[{key!r}] = {arg}"]
+            return args, doc_args, build, "params"
+        if params is not None and not params.description.startswith("No parameters"):
+            args.append("params: Dict[str, Any]")
+            doc_args.append(f"@param params: {params.description}")
+            return args, doc_args, build, "params"
+        return args, doc_args, build, "{}"
+
+    def render_method(self, item):
+        """
+        @param item: DocumentationItem of type method
+        @return: list of lines
+        """
+        base_name = camel_case(item.name)
+        params = SchemaNode.from_tags(item.params)
+        result = SchemaNode.from_tags(item.results)
+        return_type = self.python_type(result, base_name + "Result") if result else "Any"
+
+        args, doc_args, build, params_expr = self.render_params(params, base_name)
+        method_name = snake_case(item.name.split('/', 1)[1])
+        signature = ", ".join(["self"] + args)
+        lines = [f"    async def {method_name}({signature}) -> {return_type}:"]
+        if len(lines[0]) > 99:
+            lines = [f"    async def {method_name}("]
+            lines += [f"            {arg}," for arg in ["self"] + args]
+            lines[-1] = lines[-1][:-1] + f") -> {return_type}:"
+        lines.append('        """')
+        lines += wrap_docstring(f"{item.name}: {item.brief}", "        ")
+        if doc_args:
+            lines.append("")
+            for doc_arg in doc_args:
+                lines += wrap_docstring(doc_arg, "        ")
+        if result is not None and result.description:
+            lines.append("")
+            lines += wrap_docstring(f"@return: {result.description}", "        ")
+        lines.append('        """')
+        lines += build
+        lines.append(f"        return await self._connection.call({item.name!r}, {params_expr})")
+        return lines
+
+    def render_notification(self, item):
+        """
+        @param item: DocumentationItem of type notification
+        @return: list of lines
+        """
+        params = SchemaNode.from_tags(item.params)
+        params_type = "Dict[str, Any]"
+        if params is not None and params.properties:
+            params_type = self.python_type(params, camel_case(item.name) + "Params")
+        lines = [f"    def subscribe_{snake_case(item.name.split('/', 1)[1])}"
+                 f"(self, maxsize: int = 1000) -> Subscription:",
+                 '        """']
+        lines += wrap_docstring(f"{item.name}: {item.brief}", "        ")
+        lines.append("")
+        lines += wrap_docstring("@return: Subscription yielding (method, params) tuples, "
+                                f"params being {params_type}", "        ")
+        lines += ['        """',
+                  "        return self._connection.subscribe(",
+                  f"            {item.name!r}, maxsize=maxsize)"]
+        return lines
+
+    def render(self):
+        """
+        @return: str containing the Python module
+        """
+        namespaces = {}
+        for item in self.items:
+            # authentication is done by RpcConnection.connect()
+            if item.name == "jamulus/apiAuth":
+                continue
+            namespaces.setdefault(item.name.split("/", 1)[0], []).append(item)
+
+        classes = []
+        for namespace, items in sorted(namespaces.items()):
+            lines = ["", "", f"class {camel_case(namespace)}Methods:",
+                     '    """', f"    Methods and notifications of the {namespace}/ namespace.",
+                     '    """', "",
+                     "    def __init__(self, connection):",
+                     "        self._connection = connection"]
+            for item in items:
+                lines.append("")
+                if item.type == "method":
+                    lines += self.render_method(item)
+                else:
+                    lines += self.render_notification(item)
+            classes.append("\n".join(lines))
+
+        client = ["", "", "class JamulusRpcClient(RpcConnection):", '    """',
+                  "    RpcConnection with typed wrappers for all documented methods and",
+                  "    notifications, grouped by namespace.", '    """', "",
+                  "    def __init__(self, *args, **kwargs):",
+                  "        super().__init__(*args, **kwargs)"]
+        for namespace in sorted(namespaces):
+            client.append(f"        self.{namespace} = {camel_case(namespace)}Methods(self)")
+
+        typed_dicts = []
+        for name, fields in self.typed_dicts:
+            typed_dicts += ["", f"{name} = TypedDict(", f"    {name!r},", "    {"]
+            for key, type_ in fields:
+                typed_dicts.append(f"        {key!r}: {type_},")
+            typed_dicts += ["    },", "    total=False,", ")"]
+
+        return PYTHON_CLIENT_PREAMBLE + "\n".join(typed_dicts) + "".join(classes) + \
+            "\n".join(client) + "\n"
+
+
+OPENRPC_INFO = {
+    "title": "Jamulus JSON-RPC API",
+    "description": "Generated from the source code by tools/generate_json_rpc_docs.py. "
+                   "Notifications are listed in x-notifications using the method format.",
+    "version": "1.0.0",
+}
+
+
+def openrpc_method(item):
+    """
+    @param item: DocumentationItem
+    @return: dict, OpenRPC method object
+    """
+    method = {
+        "name": item.name,
+        "description": str(item.brief),
+        "paramStructure": "by-name",
+        "params": [],
+    }
+    params = SchemaNode.from_tags(item.params)
+    if params is not None:
+        for name, node in params.properties.items():
+            method["params"].append({
+                "name": name,
+                "description": node.description,
+                "required": not node.optional,
+                "schema": node.to_json_schema(),
+            })
+    result = SchemaNode.from_tags(item.results)
+    if result is not None:
+        method["result"] = {
+            "name": "result",
+            "description": result.description,
+            "schema": result.to_json_schema(),
+        }
+    return method
+
+
+def render_openrpc(items):
+    """
+    @param items: list of DocumentationItem
+    @return: str, OpenRPC document with JSON Schemas of all params and results
+    """
+    document = {
+        "openrpc": "1.2.6",
+        "info": OPENRPC_INFO,
+        "methods": [openrpc_method(item) for item in items if item.type == "method"],
+        "x-notifications": [
+            openrpc_method(item) for item in items if item.type == "notification"
+        ],
+    }
+    return json.dumps(document, indent=2, ensure_ascii=False) + "\n"
+
+
+def output_files(items):
+    """
+    @param items: list of DocumentationItem
+    @return: dict of path relative to the repository root to rendered content
+    """
+    return {
+        "docs/JSON-RPC.md": render_markdown(items),
+        "docs/JSON-RPC.openrpc.json": render_openrpc(items),
+        "tools/jamulus_rpc_api.py": PythonClientWriter(items).render(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates the JSON-RPC documentation.")
+    parser.add_argument("--check", action="store_true",
+                        help="do not write anything, exit with 1 if an output file is outdated")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="parse all source files, ignoring and not updating the cache")
+    args = parser.parse_args()
+
+    # --check must not write anything, so the cache is only read
+    items = parse_source_files(use_cache=not args.no_cache, save=not args.check)
+    changed = [path for path, content in output_files(items).items()
+               if update_file(os.path.join(repo_root, path), content, args.check)]
+    for path in changed:
+        print(f"{path} is outdated" if args.check else f"{path} updated")
+    if args.check and changed:
+        print("Please run ./tools/generate_json_rpc_docs.py to regenerate them")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -50,6 +50,10 @@
 Generates a list of GitHub usernames who contributed to a specific release.
 
 May need a GitHub Personal access token to avoid hitting rate limits.
+With a token, commit authors and profile emails are looked up via batched
+GraphQL queries; without one, the REST API is used. In both cases lookups
+run concurrently (see --jobs) and are throttled based on the X-RateLimit
+headers returned by GitHub.
 
 Usage:
 
@@ -66,14 +70,27 @@ Usage:
 - ./tools/get_release_contributors.py --from r3_8_1 --to r3_8_2 \
     --github-token YOUR_TOKEN --repo .
 
+## Offline testing
+# --api-url points the tool at any server implementing the used subset
+# of the GitHub API:
+- ./tools/get_release_contributors.py --from r3_8_1 --to r3_8_2 \
+    --api-url http://127.0.0.1:8000 --repo .
+# check the batching and throttling code against canned responses:
+- ./tools/get_release_contributors_selfcheck.py
+
 """
 import argparse
+import concurrent.futures
+import json
 import logging
 import os
 import re
 import subprocess
+import threading
+import time
 
 import requests
+import requests.adapters
 import yaml
 
 logger = logging.getLogger('')
@@ -90,6 +107,437 @@ ignore_list = ['@github-actions[bot]', '@imgbot[bot]', '@actions-bot',
                '@actions-user', '@ImgBotApp', '@dependabot[bot]', '@weblate']
 
 CHARSET = 'utf-8'
+# Failed lookups are retried after this many seconds:
+DEFAULT_NEGATIVE_TTL = 7 * 24 * 3600
+# The cache journal is compacted once it has this many lines:
+JOURNAL_COMPACT_RECORDS = 1000
+# Bytes read from git at once when streaming its output:
+GIT_READ_SIZE = 64 * 1024
+
+GITHUB_OWNER = 'jamulussoftware'
+DEFAULT_API_URL = 'https://api.github.com'
+DEFAULT_JOBS = 8
+# Longest time (in seconds) we are willing to sleep for a rate limit to reset:
+DEFAULT_MAX_WAIT = 120
+MAX_ATTEMPTS = 3
+# Number of aliased commit/user lookups per GraphQL query:
+GRAPHQL_BATCH_SIZE = 50
+# Once fewer requests than this remain, the remaining ones are spread
+# evenly over the time left until the rate limit resets:
+RATE_LIMIT_LOW_WATER = 10
+
+SHA_RE = re.compile(r'\A[0-9a-f]{7,40}\Z')
+LOGIN_RE = re.compile(r'\A[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?(?:\[bot\])?\Z')
+
+
+class RateLimiter:
+    """
+    Tracks the X-RateLimit state of each GitHub API resource (core, search,
+    graphql) and delays requests so that concurrent workers neither run into
+    the limit nor stall on it: requests pass freely while plenty remain, get
+    spaced out over the rest of the window once the remaining budget gets
+    low, and wait for the reset when it is used up.
+    """
+
+    def __init__(self, low_water=RATE_LIMIT_LOW_WATER):
+        self.low_water = low_water
+        self.lock = threading.Lock()
+        # resource -> [remaining, reset timestamp or None if unknown, next free slot, limit]
+        self.buckets = {}
+
+    def reserve(self, resource):
+        """
+        Reserves one request of the given resource.
+
+        @param resource: the rate limit resource name
+        @return: tuple of the number of seconds the caller has to wait, and
+                 whether the request may be sent after that (otherwise the
+                 caller has to wait and then try to reserve again)
+        """
+        with self.lock:
+            bucket = self.buckets.get(resource)
+            now = time.time()
+            if bucket is None:
+                return 0, True
+            remaining, reset, next_slot, limit = bucket
+            if reset is not None and reset <= now:
+                if not limit:
+                    del self.buckets[resource]
+                    return 0, True
+                # a new window has started, its reset time is only known
+                # once the first response of it arrives:
+                remaining, reset = limit, None
+                bucket[:2] = remaining, reset
+            if remaining <= 0:
+                return (reset - now + 1 if reset is not None else 1), False
+            bucket[0] = remaining - 1
+            if remaining >= self.low_water or reset is None:
+                return 0, True
+            slot = max(next_slot, now)
+            bucket[2] = slot + (reset - now) / remaining
+            return slot - now, True
+
+    def wait(self, resource, max_wait):
+        """
+        Blocks until a request of the given resource may be sent.
+
+        @param resource: the rate limit resource name
+        @param max_wait: the longest acceptable delay in seconds
+        @raise UnexpectedGithubStatus: if the delay would exceed max_wait
+        """
+        reserved = False
+        while not reserved:
+            delay, reserved = self.reserve(resource)
+            if delay > max_wait:
+                raise UnexpectedGithubStatus(
+                    f'{resource} rate limit exhausted for another {delay:.0f}s '
+                    '(a --github-token raises the limit)')
+            if delay > 0:
+                logger.debug('throttling %s request for %.1fs', resource, delay)
+                time.sleep(delay)
+
+    def update(self, resource, resp):
+        """
+        Updates the state of a resource from the headers of a response.
+
+        @param resource: the rate limit resource which was assumed for the request
+        @param resp: the requests.Response
+        @return: True if the request was rejected due to rate limiting and
+                 should be retried
+        """
+        headers = resp.headers
+        resource = headers.get('X-RateLimit-Resource', resource)
+        now = time.time()
+        try:
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset = float(headers['X-RateLimit-Reset'])
+            limit = int(headers.get('X-RateLimit-Limit', 0))
+        except (KeyError, ValueError):
+            remaining, reset, limit = None, None, 0
+        limited = resp.status_code in (403, 429) and (
+            remaining == 0 or 'Retry-After' in headers)
+        if limited and 'Retry-After' in headers:
+            try:
+                remaining, reset = 0, now + float(headers['Retry-After'])
+            except ValueError:
+                pass
+        if remaining is None or (reset <= now and not limited):
+            # no information or a late response from an expired window
+            return limited
+        with self.lock:
+            bucket = self.buckets.get(resource)
+            if bucket is None or bucket[1] is None or reset > bucket[1]:
+                # new window (responses may arrive out of order, so never go back):
+                if bucket is not None and bucket[1] is None:
+                    # requests reserved since the window started are already counted
+                    remaining = min(remaining, bucket[0])
+                self.buckets[resource] = [remaining, reset, now, limit]
+            else:
+                bucket[0] = min(bucket[0], remaining)
+        return limited
+
+
+class GithubClient:
+    """
+    Sends requests to the GitHub REST and GraphQL APIs from a bounded pool of
+    worker threads, sharing one pooled requests.Session and one RateLimiter.
+    """
+
+    def __init__(self, api_url=DEFAULT_API_URL, token=None, jobs=DEFAULT_JOBS,
+                 max_wait=DEFAULT_MAX_WAIT):
+        self.api_url = api_url.rstrip('/')
+        self.token = token
+        self.jobs = max(1, jobs)
+        self.max_wait = max_wait
+        self.limiter = RateLimiter()
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.jobs)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, method, path, **kwargs):
+        """
+        Sends an API request, waiting for and retrying on rate limits.
+
+        @param method: the HTTP method
+        @param path: the API path relative to the API URL, e.g. 'search/users'
+        @return: the requests.Response
+        """
+        if path == 'graphql':
+            resource = 'graphql'
+        elif path.startswith('search/'):
+            resource = 'search'
+        else:
+            resource = 'core'
+        headers = {
+            'Accept': 'application/vnd.github.v3+json',
+        }
+        if self.token:
+            headers['Authorization'] = f"token {self.token}"
+        for _ in range(MAX_ATTEMPTS):
+            self.limiter.wait(resource, self.max_wait)
+            resp = self.session.request(method, f'{self.api_url}/{path}', headers=headers,
+                                        timeout=10, **kwargs)
+            if not self.limiter.update(resource, resp):
+                return resp
+            logger.warning('%s hit the %s rate limit, retrying', path, resource)
+        raise UnexpectedGithubStatus(f"{path}: still rate limited after {MAX_ATTEMPTS} attempts")
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def graphql(self, query):
+        """
+        Runs a GraphQL query. Partial results (e.g. aliased lookups of which
+        some were not found) are returned as they are.
+
+        @param query: the GraphQL query text
+        @return: the data dict of the result
+        """
+        resp = self.request('POST', 'graphql', json={'query': query})
+        if resp.status_code != 200:
+            raise UnexpectedGithubStatus(f"graphql status was {resp.status_code}")
+        result = resp.json()
+        if result.get('data') is None:
+            messages = '; '.join(e.get('message', '?') for e in result.get('errors', []))
+            raise UnexpectedGithubStatus(f"graphql query failed: {messages}")
+        return result['data']
+
+    def map(self, fn, items):
+        """
+        Calls fn for each item using the worker pool.
+
+        @return: the list of results, in the order of items
+        """
+        items = list(items)
+        if len(items) <= 1 or self.jobs == 1:
+            return [fn(item) for item in items]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            return list(executor.map(fn, items))
+
+    def _batches(self, items):
+        items = list(items)
+        return [items[i:i + GRAPHQL_BATCH_SIZE] for i in range(0, len(items), GRAPHQL_BATCH_SIZE)]
+
+    def search_users_by_email(self, email):
+        """
+        Returns the logins of all users whose public email matches the search
+        for the given address (the search also returns partial matches).
+        """
+        resp = self.get('search/users', params={'q': f'{email} in:email'})
+        if resp.status_code < 200 or resp.status_code >= 300:
+            logger.warning('search/users for %s failed with code %s', email, resp.status_code)
+            return []
+        return [item['login'] for item in resp.json().get('items', [])]
+
+    def user_emails(self, logins):
+        """
+        Returns a dict mapping each of the given logins to its public email
+        (empty if there is none).
+        """
+        logins = sorted(set(logins))
+        if not self.token:
+            emails = self.map(lambda login: self.get(f'users/{login}').json().get('email'),
+                              logins)
+            return {login: email or '' for login, email in zip(logins, emails)}
+
+        def query(batch):
+            fields = ' '.join(f'u{i}: user(login: "{login}") {{ email }}'
+                              for i, login in enumerate(batch))
+            data = self.graphql(f'query {{ {fields} }}')
+            return {login: (data.get(f'u{i}') or {}).get('email') or ''
+                    for i, login in enumerate(batch)}
+
+        result = {}
+        for batch_result in self.map(query, self._batches(
+                login for login in logins if LOGIN_RE.match(login))):
+            result.update(batch_result)
+        return result
+
+    def commit_author(self, repo, sha):
+        """
+        Retrieves the GitHub login of the author of the given commit via the
+        REST API, or an empty string if the commit has no GitHub author.
+        """
+        resp = self.get(f'repos/{GITHUB_OWNER}/{repo}/commits/{sha}')
+        if 200 <= resp.status_code < 300:
+            try:
+                return resp.json()['author']['login']
+            except (TypeError, KeyError):
+                logger.warning('%s has not GitHub author, saving as empty', sha)
+                return ''
+        if resp.status_code == 422:
+            logger.warning('unable to find author of %s, saving as empty', sha)
+            return ''
+        raise UnexpectedGithubStatus(f"status was {resp.status_code}")
+
+    def commit_authors(self, repo, shas):
+        """
+        Returns a dict mapping each of the given commit hashes to the GitHub
+        login of its author (empty if there is none).
+        """
+        shas = sorted(set(shas))
+        if not self.token:
+            return dict(zip(shas, self.map(lambda sha: self.commit_author(repo, sha), shas)))
+
+        def query(batch):
+            fields = ' '.join(f'c{i}: object(oid: "{sha}") '
+                              '{ ... on Commit { author { user { login } } } }'
+                              for i, sha in enumerate(batch))
+            data = self.graphql(
+                f'query {{ repository(owner: "{GITHUB_OWNER}", name: "{repo}") {{ {fields} }} }}')
+            commits = data.get('repository') or {}
+            result = {}
+            for i, sha in enumerate(batch):
+                user = ((commits.get(f'c{i}') or {}).get('author') or {}).get('user')
+                if not user:
+                    logger.warning('%s has not GitHub author, saving as empty', sha)
+                result[sha] = (user or {}).get('login', '')
+            return result
+
+        result = {}
+        for batch_result in self.map(query, self._batches(s for s in shas if SHA_RE.match(s))):
+            result.update(batch_result)
+        return result
+
+
+class AuthorCache:
+    """
+    Persistent name+email-to-login cache.
+
+    The cache consists of a YAML snapshot mapping each key to its login and
+    an append-only journal of the lookups done since the snapshot was
+    written, one JSON object per line. A lookup therefore only appends a
+    line instead of rewriting the whole cache. Once the journal grows too
+    long, it is compacted into the snapshot. Both files are replaced
+    atomically, and an incomplete last journal line (e.g. after an
+    interruption) is ignored, so the cache is never corrupted.
+
+    Failed lookups are journaled as well, with an empty login, and are not
+    retried until they expire after negative_ttl seconds.
+    """
+
+    def __init__(self, path, negative_ttl=DEFAULT_NEGATIVE_TTL):
+        self.path = path
+        self.journal_path = os.path.splitext(path)[0] + '.journal'
+        self.negative_ttl = negative_ttl
+        self.logins = {}
+        # key -> (time of the failed lookup, hash of the commit which was checked or None)
+        self.failures = {}
+        self.journal_records = 0
+        self.pending = []
+
+    def load(self):
+        """
+        Loads the snapshot and replays the journal.
+        """
+        try:
+            with open(self.path, 'r') as f:
+                self.logins = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            self.logins = {}
+        self.failures = {}
+        self.journal_records = 0
+        try:
+            with open(self.journal_path, 'r', encoding=CHARSET) as f:
+                for line in f:
+                    self.journal_records += 1
+                    try:
+                        record = json.loads(line)
+                        self._apply(record['key'], record['login'], record.get('time', 0),
+                                    record.get('commit'))
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning('ignoring invalid line %d of %s', self.journal_records,
+                                       self.journal_path)
+        except FileNotFoundError:
+            pass
+
+    def _apply(self, key, login, timestamp, commit):
+        if login:
+            self.logins[key] = login
+            self.failures.pop(key, None)
+        elif key not in self.logins:
+            self.failures[key] = (timestamp, commit)
+
+    def failure(self, key):
+        """
+        @return: tuple of the time of the last failed lookup of the key and
+                 the commit hash which was checked (or None), or None if the
+                 key has not failed within the negative TTL
+        """
+        failure = self.failures.get(key)
+        if failure is None or failure[0] + self.negative_ttl <= time.time():
+            return None
+        return failure
+
+    def add(self, key, login, commit=None):
+        """
+        Records the result of a lookup. It is written by the next flush().
+
+        @param key: the name+email key
+        @param login: the GitHub login, or an empty string if the lookup failed
+        @param commit: for failed lookups, the commit hash whose author was checked
+        """
+        record = {'key': key, 'login': login, 'time': round(time.time())}
+        if not login and commit:
+            record['commit'] = commit
+        self._apply(key, login, record['time'], commit)
+        # a failure which has already expired (negative_ttl 0) is not worth
+        # an fsync
+        if login or self.negative_ttl > 0:
+            self.pending.append(record)
+
+    def flush(self):
+        """
+        Appends the recorded lookups to the journal and compacts it if it
+        has grown too long.
+        """
+        if not self.pending:
+            return
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in self.pending)
+        with open(self.journal_path, 'a+b') as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # terminate a line left incomplete by an interruption
+                    lines = '\n' + lines
+            f.write(lines.encode(CHARSET))
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_records += len(self.pending)
+        self.pending = []
+        if self.journal_records >= JOURNAL_COMPACT_RECORDS:
+            self.compact()
+
+    def compact(self):
+        """
+        Writes all logins to the snapshot and keeps only the unexpired
+        failed lookups in the journal.
+        """
+        records = []
+        for key in sorted(self.failures):
+            failure = self.failure(key)
+            if failure is not None:
+                records.append({'key': key, 'login': '', 'time': failure[0]})
+                if failure[1]:
+                    records[-1]['commit'] = failure[1]
+        # the snapshot comes first: if we are interrupted before the journal
+        # is replaced, replaying it again does no harm
+        self._replace(self.path, lambda f: yaml.dump(self.logins, f))
+        self._replace(self.journal_path, lambda f: f.writelines(
+            json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+        self.journal_records = len(records)
+        logger.debug('compacted author cache to %d logins and %d failed lookups',
+                     len(self.logins), len(records))
+
+    @staticmethod
+    def _replace(path, write):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding=CHARSET) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
 
 
 class Authors:
@@ -101,20 +549,29 @@ class Authors:
     """
 
     def __init__(self, path):
-        self.keys_to_user = {}
-        self.path = path
+        self.cache = AuthorCache(path)
         self.repo = None
-        self.token = None
-        try:
-            self.load()
-        except FileNotFoundError:
-            pass
+        self.github = GithubClient()
+        # lookups which already failed during this run:
+        self.searched_emails = set()
+        self.checked_commits = set()
+        self.load()
+
+    @property
+    def keys_to_user(self):
+        return self.cache.logins
 
     def set_repo(self, repo):
         self.repo = repo
 
     def set_github_token(self, token):
-        self.token = token
+        self.github.token = token
+
+    def set_github_client(self, github):
+        self.github = github
+
+    def set_negative_ttl(self, ttl):
+        self.cache.negative_ttl = ttl
 
     def _get_login(self, key, commit_hash):
         """
@@ -124,15 +581,7 @@ class Authors:
 
         Once looked up, the results are cached in a local file.
         """
-        if key not in self.keys_to_user:
-            user = self.get_user_by_email(key)
-            if not user and commit_hash:
-                user = self.get_user_by_commit(commit_hash)
-
-            if user:
-                self.keys_to_user[key] = user
-                self.save()
-
+        self.resolve([(key, commit_hash)])
         return self.keys_to_user.get(key, None)
 
     def get_login_or_realname(self, key, commit_hash):
@@ -149,67 +598,102 @@ class Authors:
         logger.warning("unable to extract GitHub login or real name from %r", key)
         return None
 
+    def has_login(self, key):
+        return bool(self.keys_to_user.get(key))
+
+    def resolve(self, pairs):
+        """
+        Looks up the GitHub logins of all uncached name+email keys at once.
+        Keys are matched by public email first; the remaining ones by the
+        author of their related commit, if any.
+        Keys whose lookup failed recently are skipped, unless a commit is
+        given for a key which was only looked up by email.
+        All results, including failures, are journaled once at the end.
+
+        @param pairs: iterable of (key, commit hash or None) tuples
+        """
+        pending = {}
+        for key, sha in pairs:
+            if key in self.keys_to_user or pending.get(key) is not None:
+                continue
+            failure = self.cache.failure(key)
+            if failure is None or (sha and not failure[1]):
+                pending[key] = sha
+        if not pending:
+            return
+        found = self._resolve_by_email(key for key in pending if self.cache.failure(key) is None)
+        by_commit = {key: sha for key, sha in pending.items()
+                     if not found.get(key) and sha and sha not in self.checked_commits}
+        if by_commit:
+            logins = self.github.commit_authors(self.repo, by_commit.values())
+            self.checked_commits.update(by_commit.values())
+            for key, sha in by_commit.items():
+                found[key] = logins.get(sha, '')
+        for key in pending:
+            self.cache.add(key, found.get(key, ''), by_commit.get(key))
+        self.save()
+
+    def _resolve_by_email(self, keys):
+        found = {}
+        key_emails = {}
+        for key in keys:
+            email = self.get_email(key)
+            if not email:
+                continue
+            login = self.get_static_login(email)
+            if login:
+                found[key] = login
+            elif email not in self.searched_emails:
+                key_emails[key] = email
+        emails = sorted(set(key_emails.values()))
+        if not emails:
+            return found
+        candidates = dict(zip(emails, self.github.map(self.github.search_users_by_email, emails)))
+        self.searched_emails.update(emails)
+        profile_emails = self.github.user_emails(
+            login for logins in candidates.values() for login in logins)
+        for key, email in key_emails.items():
+            for login in candidates[email]:
+                if profile_emails.get(login) == email:
+                    found[key] = login
+                    break
+            else:
+                logger.warning('unable to find a github profile with public email %s', email)
+        return found
+
+    @staticmethod
+    def get_email(key):
+        m = re.match(r'\A[^<]+<([^<> ]+@[^<> ]+)>\Z', key)
+        return m.group(1) if m else None
+
+    @staticmethod
+    def get_static_login(email):
+        """
+        Handles Github-generated email addresses via static matching.
+        """
+        m = re.match(r'\A(\d+\+)?([^+@]+)@users\.noreply\.github\.com\Z', email)
+        return m.group(2) if m else None
+
     def get_user_by_commit(self, sha):
         """
         Retrieves the associated GitHub username for the given commit hash.
         """
-        resp = self._github_api_get(f'repos/jamulussoftware/{self.repo}/commits/{sha}')
-        if 200 <= resp.status_code < 300:
-            try:
-                return resp.json()['author']['login']
-            except (TypeError, KeyError):
-                logger.warning('%s has not GitHub author, saving as empty', sha)
-                return ''
-        if resp.status_code == 422:
-            logger.warning('unable to find author of %s, saving as empty', sha)
-            return ''
-        raise UnexpectedGithubStatus(f"status was {resp.status_code}")
-
-    def _github_api_get(self, path, *args, **kwargs):
-        headers = {
-            'Accept': 'application/vnd.github.v3+json',
-        }
-        if self.token:
-            headers['Authorization'] = f"token {self.token}"
-        return requests.get(f'https://api.github.com/{path}', *args, headers=headers, **kwargs,
-                            timeout=10)
+        return self.github.commit_author(self.repo, sha)
 
     def get_user_by_email(self, key):
-        m = re.match(r'\A[^<]+<([^<> ]+@[^<> ]+)>\Z', key)
-        if not m:
-            return None
-        email = m.group(1)
-        # Handle Github-generated email addresses via static matching:
-        m = re.match(r'\A(\d+\+)?([^+@]+)@users\.noreply\.github\.com\Z', email)
-        if m:
-            return m.group(2)
-        resp = self._github_api_get('search/users', params={'q': f'{email} in:email'})
-        if resp.status_code < 200 or resp.status_code >= 300:
-            logger.warning('search/users for %s failed with code %s', email, resp.status_code)
-            return None
-        items = resp.json().get('items', [])
-        for item in items:
-            login = item['login']
-            u = self._github_api_get(f'users/{login}').json()
-            if u.get('email', '') == email:
-                return login
-
-        logger.warning('unable to find a github profile with public email %s', email)
-        return None
+        return self._resolve_by_email([key]).get(key)
 
     def save(self):
         """
-        Saves the cache to disk.
+        Saves the new lookup results to disk.
         """
-        with open(self.path, 'w') as f:
-            yaml.dump(self.keys_to_user, f)
+        self.cache.flush()
 
     def load(self):
         """
         Loads the cache from disk.
         """
-        with open(self.path, 'r') as f:
-            self.keys_to_user = yaml.safe_load(f) or {}
+        self.cache.load()
 
 
 # Store the lookup cache right next to this script:
@@ -252,6 +736,59 @@ def print_contributors(title, git_log_selector, from_, to):
     print(f'{title}: {contributors_str}')
 
 
+def git_log_records(git_log_args):
+    """
+    Runs `git log -z` with the given arguments and yields its NUL-separated
+    records one by one while git is still writing them, so that the whole
+    output never has to be held in memory. If the caller stops iterating
+    early, git is terminated.
+
+    @param git_log_args: list of additional git log arguments
+    """
+    with subprocess.Popen(['git', 'log', '-z'] + git_log_args, stdout=subprocess.PIPE) as proc:
+        try:
+            pending = b''
+            for chunk in iter(lambda: proc.stdout.read1(GIT_READ_SIZE), b''):
+                records = (pending + chunk).split(b'\0')
+                pending = records.pop()
+                for record in records:
+                    if record:
+                        yield record.decode(CHARSET)
+            if pending:
+                yield pending.decode(CHARSET)
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+
+
+def find_latest_commits_by_email(emails):
+    """
+    Finds the latest commit authored with each of the given email addresses.
+    All addresses are looked up in a single pass over the history, which
+    stops as soon as every address has been found.
+
+    @param emails: iterable of email addresses
+    @return: dict mapping each found address to a commit hash
+    """
+    wanted = set(emails)
+    found = {}
+    if not wanted:
+        return found
+    records = git_log_records(['--format=format:%H %ae'])
+    try:
+        for record in records:
+            sha, _, email = record.partition(' ')
+            if email in wanted and email not in found:
+                found[email] = sha
+                if len(found) == len(wanted):
+                    break
+    finally:
+        records.close()
+    return found
+
+
 def find_contributors(git_log_selector, from_ref, to_ref):
     """
     Uses `git log` with the provided git_log_selector to list all commits
@@ -260,60 +797,60 @@ def find_contributors(git_log_selector, from_ref, to_ref):
     A `git_log_selector` could just be a path such as '.'.
     `from_` and `to` can be any committish such as a commit hash or a tag.
     """
-    contributors = set()
-    co_author_keys = set()
-    commits = subprocess.check_output(
-        ['git', 'log', '-z', '--show-pulls', '--format=format:%H %an <%ae>%n%b',
-         f'{from_ref}..{to_ref}', '--'] + git_log_selector)
-    commits = commits.decode(CHARSET)
-    for commit in commits.split('\0'):
-        if not commit:
-            continue
+    author_keys = []
+    co_authors = {}
+    for commit in git_log_records(['--show-pulls', '--format=format:%H %an <%ae>%n%b',
+                                   f'{from_ref}..{to_ref}', '--'] + git_log_selector):
         sha, author_key = commit.split('\n', 1)[0].split(' ', 1)
-        contributor = authors.get_login_or_realname(author_key, sha)
-        contributors.add(contributor)
-        co_authors = re.findall(r'Co-authored-by:\s*(\S.*(<[^ >]+>))\s*(?:$|\n)', commit, re.I)
-        for co_author_full, co_author_email in co_authors:
-            logger.debug('checking co author %s', co_author_full)
-            contributor = authors.get_login_or_realname(co_author_full, None)
-            if not contributor or not contributor.startswith('@'):
-                # try to find a previous commit by this mail address
-                # and pass this commit id to get_login_or_realname() to retrieve the
-                # associated handle from the GitHub API.
-                esc_email = re.escape(co_author_email)
-                commit = subprocess.check_output(['git', 'log', '--format=%H', '--max-count=1',
-                                                  f'--author={esc_email}']).strip().decode(CHARSET)
-                if commit:
-                    contributor = authors.get_login_or_realname(co_author_full, commit)
-            if contributor:
-                contributors.add(contributor)
-
-    # Resolve co-authors last because we have to rely on having seen the
-    # email-to-login mapping via some other commit.
-    for co_author in co_author_keys:
-        contributor = authors.get_login_or_realname(co_author, None)
-        if contributor:
-            contributors.add(contributor)
-        else:
-            # TODO: check this is the right logic...
-            contributors.add(co_author)
+        author_keys.append((author_key, sha))
+        for co_author_full, co_author_email in re.findall(
+                r'Co-authored-by:\s*(\S.*<([^ >]+)>)\s*(?:$|\n)', commit, re.I):
+            co_authors[co_author_full] = co_author_email
+
+    # Look up all unknown authors and co-authors at once, so that the
+    # GitHub requests can be batched and run concurrently:
+    authors.resolve(author_keys + [(key, None) for key in co_authors])
+    # For the co-authors which are still unknown, try to find a previous
+    # commit by their mail address and resolve the associated handle of its
+    # author from the GitHub API:
+    unresolved = {key: email for key, email in co_authors.items() if not authors.has_login(key)}
+    if unresolved:
+        logger.debug('checking co authors %s', ', '.join(unresolved))
+    commits = find_latest_commits_by_email(unresolved.values())
+    authors.resolve([(key, commits[email]) for key, email in unresolved.items()
+                     if email in commits])
+
+    contributors = {authors.get_login_or_realname(key, None)
+                    for key in [key for key, _ in author_keys] + list(co_authors)}
+    contributors.discard(None)
     return sorted(contributors, key=str.casefold)
 
 
 if __name__ == '__main__':
     p = argparse.ArgumentParser(
         description='Generates a list of Github user names who contributed to a specific release.')
-    p.add_argument('--from', dest='from_', required=True,
+    p.add_argument('--from', dest='from_',
                    help='the first git hash or tag to include in the analysis, '
                         'e.g. the tag of the previous release')
-    p.add_argument('--to', required=True,
+    p.add_argument('--to',
                    help='the last git hash or tag to include in the analysis, '
                         'e.g. the (rc) tag of the target release')
-    p.add_argument('--repo', required=True,
+    p.add_argument('--repo',
                    help='the path to the git repository to be analyzed, e.g. ./jamuluswebsite')
     p.add_argument('--github-token',
                    help='a Github Personal Access Token; optional, but might be needed '
                         'if we exceed the anonymous API requests per hour limit')
+    p.add_argument('--api-url', default=DEFAULT_API_URL,
+                   help='the base URL of the GitHub API, e.g. of a test server '
+                        f'(default: {DEFAULT_API_URL})')
+    p.add_argument('--jobs', '-j', type=int, default=DEFAULT_JOBS,
+                   help=f'number of concurrent GitHub API requests (default: {DEFAULT_JOBS})')
+    p.add_argument('--max-wait', type=float, default=DEFAULT_MAX_WAIT,
+                   help='longest time in seconds to wait for a rate limit reset before '
+                        f'giving up (default: {DEFAULT_MAX_WAIT})')
+    p.add_argument('--negative-ttl', type=float, default=DEFAULT_NEGATIVE_TTL,
+                   help='time in seconds after which failed login lookups are retried, '
+                        f'0 to retry them on every run (default: {DEFAULT_NEGATIVE_TTL})')
     p.add_argument('--verbose', '-v', action='store_true',
                    help='enable verbose output')
     p.add_argument('--quiet', '-q', action='store_true',
@@ -321,6 +858,8 @@ if __name__ == '__main__':
     args = p.parse_args()
     if args.verbose and args.quiet:
         p.error('--verbose and --quiet are mutually exclusive')
+    if not (args.from_ and args.to and args.repo):
+        p.error('--from, --to and --repo are required')
     if args.verbose:
         level = logging.DEBUG
     elif args.quiet:
@@ -329,5 +868,7 @@ if __name__ == '__main__':
         level = logging.WARNING
     logging.basicConfig(format='%(levelname)s %(message)s', level=level)
     os.chdir(args.repo)
-    authors.set_github_token(args.github_token)
+    authors.set_github_client(GithubClient(args.api_url, args.github_token, args.jobs,
+                                           args.max_wait))
+    authors.set_negative_ttl(args.negative_ttl)
     main(args.from_, args.to)
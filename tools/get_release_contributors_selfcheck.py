@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Offline self-check of get_release_contributors.py.
+
+StubSession stands in for the requests.Session of GithubClient and answers
+from canned data in-process, so that the lookup, batching and throttling
+code and the author cache can be checked without network access. The tool
+itself does not import this module.
+
+Usage:
+./tools/get_release_contributors_selfcheck.py
+
+"""
+
+import collections
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+from get_release_contributors import (GRAPHQL_BATCH_SIZE, AuthorCache, Authors, GithubClient,
+                                      RateLimiter)
+
+logger = logging.getLogger('')
+
+# the aliased lookups in the GraphQL queries of GithubClient
+COMMIT_RE = re.compile(r'c(\d+): object\(oid: "(\w+)"\)')
+USER_RE = re.compile(r'u(\d+): user\(login: "([^"]+)"\)')
+
+StubResponse = collections.namedtuple('StubResponse', ['status_code', 'json', 'headers'])
+
+
+def stub_response(status_code, data, **headers):
+    """
+    @return: StubResponse with the parts of a requests.Response used here
+    """
+    return StubResponse(status_code, lambda: data,
+                        {name.replace('_', '-'): str(value) for name, value in headers.items()})
+
+
+class StubSession:
+    """
+    Answers the requests of GithubClient from canned data instead of the
+    network: commit authors and profile emails via GraphQL, and the user
+    search, which is rate limited once before it answers. The number of
+    requests per API path is counted.
+    """
+
+    def __init__(self, commit_logins, profile_emails, search_results):
+        """
+        @param commit_logins: dict of commit hash to login (None for no GitHub user)
+        @param profile_emails: dict of login to public email
+        @param search_results: dict of email to list of logins
+        """
+        self.commit_logins = commit_logins
+        self.profile_emails = profile_emails
+        self.search_results = search_results
+        self.lock = threading.Lock()
+        self.requests = collections.Counter()
+
+    def request(self, method, url, **kwargs):
+        path = url.split('/', 3)[3]
+        with self.lock:
+            self.requests[path] += 1
+            first_search = self.requests['search/users'] == 1
+        if path == 'search/users' and first_search:
+            return stub_response(403, {}, X_RateLimit_Resource='search',
+                                 X_RateLimit_Remaining=0, X_RateLimit_Reset=time.time() + 0.5)
+        if path == 'search/users':
+            logins = self.search_results.get(kwargs['params']['q'].split(' ')[0], [])
+            return stub_response(200, {'items': [{'login': login} for login in logins]})
+        if method == 'POST' and path == 'graphql':
+            return self._graphql(kwargs['json']['query'])
+        return stub_response(404, {})
+
+    def _graphql(self, query):
+        commits = {}
+        for alias, sha in COMMIT_RE.findall(query):
+            login = self.commit_logins.get(sha)
+            commits[f'c{alias}'] = {'author': {'user': {'login': login} if login else None}}
+        users = {f'u{alias}': ({'email': self.profile_emails[login]}
+                               if login in self.profile_emails else None)
+                 for alias, login in USER_RE.findall(query)}
+        return stub_response(200, {'data': {'repository': commits} if commits else users},
+                             X_RateLimit_Resource='graphql', X_RateLimit_Remaining=4000,
+                             X_RateLimit_Reset=time.time() + 3600)
+
+
+def check_rate_limiter():
+    """
+    @return: bool, True if requests are spaced out increasingly once the
+             remaining budget is low, and held back once it is used up
+    """
+    limiter = RateLimiter(low_water=10)
+    limiter.update('core', stub_response(200, {}, X_RateLimit_Remaining=5, X_RateLimit_Limit=60,
+                                         X_RateLimit_Reset=time.time() + 10))
+    delays = [limiter.reserve('core') for _ in range(6)]
+    return (all(a[0] < b[0] and b[1] for a, b in zip(delays, delays[1:5])) and
+            not delays[5][1] and delays[5][0] > 9)
+
+
+def check_batched_lookups():
+    """
+    @return: bool, True if commit authors and profile emails are looked up
+             in GraphQL batches, and the rate limited user search is retried
+    """
+    shas = [f'{i:040x}' for i in range(2 * GRAPHQL_BATCH_SIZE + 7)]
+    commit_logins = {sha: (f'user{i}' if i % 10 else None) for i, sha in enumerate(shas)}
+    session = StubSession(commit_logins, {'alice': 'alice@example.org', 'bob': ''},
+                          {'alice@example.org': ['alice-old', 'alice']})
+    github = GithubClient('https://stub', token='stub', jobs=4, max_wait=5)
+    github.session = session
+    found = github.commit_authors('jamulus', shas)
+    start = time.time()
+    candidates = github.search_users_by_email('alice@example.org')
+    throttled = time.time() - start >= 0.4
+    emails = github.user_emails(candidates + ['bob'])
+    return (found == {sha: login or '' for sha, login in commit_logins.items()} and throttled
+            and emails == {'alice': 'alice@example.org', 'alice-old': '', 'bob': ''}
+            and session.requests == {'graphql': 4, 'search/users': 2})
+
+
+def check_resolve(directory):
+    """
+    @param directory: str, where the author cache is written
+    @return: bool, True if Authors.resolve() finds logins by email and by
+             commit and caches the results and the failed lookups
+    """
+    session = StubSession({'a' * 40: 'carol', 'b' * 40: None}, {'alice': 'alice@example.org'},
+                          {'alice@example.org': ['alice']})
+    pairs = [('Alice <alice@example.org>', None),
+             ('Bob <12345+bob@users.noreply.github.com>', None),
+             ('Carol <carol@example.org>', 'a' * 40), ('Dave <dave@example.org>', 'b' * 40)]
+    expected = {'Alice <alice@example.org>': 'alice', 'Carol <carol@example.org>': 'carol',
+                'Bob <12345+bob@users.noreply.github.com>': 'bob'}
+    results = []
+    # the second run reloads the cache and must not send any requests
+    for _ in range(2):
+        resolver = Authors(os.path.join(directory, 'cache.yaml'))
+        resolver.set_repo('jamulus')
+        resolver.set_github_client(GithubClient('https://stub', token='stub', max_wait=5))
+        resolver.github.session = session
+        resolver.resolve(pairs)
+        results.append((resolver.keys_to_user == expected, dict(session.requests)))
+    return (results[0][0] and results[0] == results[1] and
+            resolver.cache.failure('Dave <dave@example.org>') is not None)
+
+
+def check_negative_ttl(directory):
+    """
+    @param directory: str, where the author cache is written
+    @return: bool, True if failed lookups are journaled, but not with a
+             negative TTL of 0, which would expire them right away
+    """
+    results = []
+    for ttl in (3600, 0):
+        path = os.path.join(directory, f'ttl{ttl}.yaml')
+        cache = AuthorCache(path, negative_ttl=ttl)
+        cache.add('Erin <erin@example.org>', '', 'c' * 40)
+        cache.add('Frank <frank@example.org>', 'frank')
+        cache.flush()
+        with open(cache.journal_path) as f:
+            results.append(len(f.readlines()))
+    return results == [2, 1]
+
+
+def selfcheck():
+    """
+    Feeds canned GraphQL, search and rate limit responses through the
+    lookup, batching and throttling code without network access.
+
+    @return: bool, True if all checks passed
+    """
+    passed = True
+    with tempfile.TemporaryDirectory() as directory:
+        for name, check in (('rate limiter', check_rate_limiter),
+                            ('batched lookups', check_batched_lookups),
+                            ('resolve and cache', lambda: check_resolve(directory)),
+                            ('negative TTL', lambda: check_negative_ttl(directory))):
+            ok = check()
+            logger.info('%s: %s', name, 'OK' if ok else 'FAILED')
+            passed &= ok
+    return passed
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(levelname)s %(message)s', level=logging.INFO)
+    sys.exit(0 if selfcheck() else 1)
@@ -0,0 +1,713 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Benchmark matrix for the server hot path with an append-only results
+database to track regressions across commits.
+
+On every tick, CServer::OnTimer decodes the audio of all connected clients
+in DecodeReceiveData and mixes and encodes it for each of them in
+MixEncodeTransmitData, split into blocks for CThreadPool (src/threadpool.h)
+with --multithreading. The server only copies the audio of clients which
+send raw audio and sends their mix back raw, so the Opus work, most of the
+CPU load with real clients, depends on the audio --quality of the synthetic
+clients: raw or one of the Opus qualities of jamulus_load_test.py.
+
+This tool does not build anything: for each given server binary, it runs
+every combination of --numchannels, --multithreading, --fastupdate,
+--clients (skipping client counts above the number of channels) and
+--quality --repeat times. The binaries take turns for each combination, so
+that drift of the machine affects all of them alike.
+
+Each run starts a headless server and connects synthetic clients with
+jamulus_load_test.py, split over several processes. It records:
+
+- deadline misses: gaps in the audio stream which the clients receive that
+  are longer than two periods of the server timer (see --gap-threshold of
+  jamulus_load_test.py), absolute and relative to the received packets
+- CPU per client: CPU time of the server process (read from /proc, so
+  Linux only) while all clients are connected, in percent of one core,
+  divided by the number of clients. The measurement only starts once
+  jamulusserver/getClients reports all of them.
+- output jitter: the running jitter estimate and the 99th percentile of the
+  inter-arrival time of the audio packets, and the packet loss
+
+The load generators run on the same machine as the server and compete for
+the CPU. On machines with enough cores, start the tool with taskset so that
+they do not share cores with the server threads.
+
+The results are appended to an SQLite database, keyed by the commit of the
+binary. It is taken from the --version output of intermediate builds (see
+Jamulus.pro) or given as COMMIT=BINARY. UPDATE and DELETE statements are
+rejected by triggers. Results in databases from before the --quality
+dimension count as raw.
+
+`compare` checks every combination and metric (higher is worse for all of
+them) with a one-sided permutation test on the repetitions of two commits
+measured on the same host. As many combinations and metrics are tested at
+once, the p-values are adjusted with the Benjamini-Hochberg procedure,
+which keeps the expected fraction of false regressions among the flagged
+ones at --alpha. It flags a regression if the adjusted p <= --alpha and
+the mean got worse by at least --min-change percent. With 3 repetitions
+per commit, the smallest possible p-value is 0.05 even before the
+adjustment, so use --repeat 5 or more.
+
+Usage:
+./tools/jamulus_bench_matrix.py run ../jamulus-3.12.3/Jamulus ./Jamulus \
+    --numchannels 50,150 --clients 10,50,100 --quality raw,normal --repeat 5
+./tools/jamulus_bench_matrix.py run v3.12.3=/opt/jamulus/Jamulus --db bench.sqlite
+./tools/jamulus_bench_matrix.py compare --base v3.12.3 --head 4f1c2ab
+./tools/jamulus_bench_matrix.py list
+
+"""
+
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+import jamulus_protocol as jp
+from jamulus_common import exit_on_error
+from jamulus_load_test import AUDIO_QUALITIES
+from jamulus_rpc import RpcConnection
+from jamulus_rpc_bench import LocalServer, binary_version, parse_int_list
+
+logger = logging.getLogger('')
+
+DEFAULT_DB = 'jamulus_bench_matrix.sqlite'
+LOAD_TEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jamulus_load_test.py')
+
+# synthetic clients per load generator process
+CLIENTS_PER_LOAD_PROCESS = 25
+RAMP_RATE = 50.0
+# seconds after all clients were added until the CPU time is measured
+SETTLE_TIME = 1.0
+# seconds to wait for the clients to connect beyond the ramp up
+CONNECT_TIMEOUT = 10.0
+CONNECT_POLL_INTERVAL = 0.2
+# above this, the permutation test samples random splits
+MAX_PERMUTATIONS = 10000
+
+METRICS = ['cpu_per_client', 'miss_ratio', 'jitter_ms', 'interarrival_p99_ms', 'loss_ratio']
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_id TEXT NOT NULL,
+    version TEXT,
+    binary TEXT NOT NULL,
+    host TEXT NOT NULL,
+    started TEXT NOT NULL,      -- UTC, ISO 8601
+    parameters TEXT NOT NULL    -- JSON
+);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs (commit_id, host);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    numchannels INTEGER NOT NULL,
+    multithreading INTEGER NOT NULL,
+    fastupdate INTEGER NOT NULL,
+    clients INTEGER NOT NULL,
+    quality TEXT NOT NULL,      -- audio quality of the clients, see AUDIO_QUALITIES
+    repetition INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    cpu_percent REAL,           -- of one core, NULL without /proc
+    cpu_per_client REAL,
+    audio_received INTEGER NOT NULL,
+    deadline_misses INTEGER NOT NULL,
+    miss_ratio REAL NOT NULL,
+    jitter_ms REAL NOT NULL,
+    interarrival_p99_ms REAL,
+    loss_ratio REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id);
+CREATE TRIGGER IF NOT EXISTS runs_no_update BEFORE UPDATE ON runs
+    BEGIN SELECT RAISE(ABORT, 'the results database is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS runs_no_delete BEFORE DELETE ON runs
+    BEGIN SELECT RAISE(ABORT, 'the results database is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS results_no_update BEFORE UPDATE ON results
+    BEGIN SELECT RAISE(ABORT, 'the results database is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS results_no_delete BEFORE DELETE ON results
+    BEGIN SELECT RAISE(ABORT, 'the results database is append-only'); END;
+'''
+
+Cell = collections.namedtuple('Cell', ['numchannels', 'multithreading', 'fastupdate', 'clients',
+                                       'quality'])
+
+Binary = collections.namedtuple('Binary', ['path', 'commit', 'version'])
+
+
+def parse_binary(text):
+    """
+    @param text: str, BINARY or COMMIT=BINARY
+    @return: Binary
+    """
+    commit, sep, path = text.partition('=')
+    if not sep or os.path.exists(text):
+        return Binary(text, *binary_version(text))
+    return Binary(path, commit, None)
+
+
+def parse_switch(text):
+    """
+    @param text: str, comma separated list of off and on
+    @return: list of bool
+    """
+    values = text.split(',')
+    if any(value not in ('off', 'on') for value in values):
+        raise argparse.ArgumentTypeError(f'invalid list {text!r}, expected off, on or off,on')
+    return [value == 'on' for value in values]
+
+
+def parse_quality_list(text):
+    """
+    @param text: str, comma separated list of AUDIO_QUALITIES
+    @return: list of str
+    """
+    values = text.split(',')
+    if any(value not in AUDIO_QUALITIES for value in values):
+        raise argparse.ArgumentTypeError(
+            f'invalid list {text!r}, expected values of {", ".join(AUDIO_QUALITIES)}')
+    return values
+
+
+def matrix(args):
+    """
+    @return: list of Cell for all combinations of the command line options
+    """
+    return [Cell(*values) for values in itertools.product(
+        args.numchannels, args.multithreading, args.fastupdate, args.clients, args.quality)
+        if values[3] <= values[0]]
+
+
+def server_args(cell):
+    """
+    @return: list of str, command line options of the server for `cell`
+    """
+    return (['--numchannels', str(cell.numchannels)] +
+            ['--multithreading'] * cell.multithreading + ['--fastupdate'] * cell.fastupdate)
+
+
+def process_cpu_seconds(pid):
+    """
+    @return: float, user plus system CPU time of a process, None without /proc
+    """
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            # the fields after the process name, starting with the state (field 3)
+            fields = f.read().rpartition(')')[2].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+async def run_load(address, clients, quality, duration, gap_threshold):
+    """
+    Runs jamulus_load_test.py in a separate process.
+
+    @return: dict with the aggregated results of the clients
+    """
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, LOAD_TEST, '--server', f'{address[0]}:{address[1]}',
+        '--clients', str(clients), '--quality', quality, '--ramp-rate', str(RAMP_RATE),
+        '--duration', str(duration), '--gap-threshold', str(gap_threshold),
+        '--report-interval', str(duration + 60), '--json', '-',
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    try:
+        stdout, _ = await process.communicate()
+    except asyncio.CancelledError:
+        process.kill()
+        raise
+    if process.returncode:
+        raise RuntimeError(f'jamulus_load_test.py exited with {process.returncode}')
+    return json.loads(stdout)['total']
+
+
+def split_clients(clients):
+    """
+    @return: list of int, the number of clients of each load generator process
+    """
+    processes = math.ceil(clients / CLIENTS_PER_LOAD_PROCESS)
+    return [clients // processes + (i < clients % processes) for i in range(processes)]
+
+
+async def wait_for_clients(server, secret, clients, timeout):
+    """
+    Polls jamulusserver/getClients until `clients` clients are connected.
+
+    @param server: LocalServer
+    @param secret: str, as returned by LocalServer.start()
+    @raise RuntimeError: if they did not connect within `timeout` seconds
+    """
+    deadline = time.monotonic() + timeout
+    async with RpcConnection(*server.rpc, secret=secret) as rpc:
+        while True:
+            connections = (await rpc.call('jamulusserver/getClients'))['connections']
+            if connections >= clients:
+                return
+            if time.monotonic() > deadline:
+                raise RuntimeError(f'only {connections} of {clients} clients connected')
+            await asyncio.sleep(CONNECT_POLL_INTERVAL)
+
+
+async def measure(server, secret, cell, duration):
+    """
+    Connects the clients of `cell` to a running server and measures it.
+
+    @param server: LocalServer
+    @param secret: str, as returned by LocalServer.start()
+    @param duration: float, seconds to run with all clients connected
+    @return: dict of metric name to value
+    """
+    counts = split_clients(cell.clients)
+    tick = jp.SYSTEM_FRAME_SIZE_SAMPLES if cell.fastupdate else jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES
+    gap_threshold = 2 * 1000 * tick / jp.SYSTEM_SAMPLE_RATE_HZ
+    loads = asyncio.gather(*(run_load(server.audio, count, cell.quality, duration,
+                                      gap_threshold)
+                             for count in counts))
+    # the load processes stop `duration` seconds after their ramp up
+    ramp_end = time.monotonic() + max(counts) / RAMP_RATE
+    try:
+        await wait_for_clients(server, secret, cell.clients,
+                               max(counts) / RAMP_RATE + CONNECT_TIMEOUT)
+    except (RuntimeError, OSError, asyncio.TimeoutError):
+        loads.cancel()
+        await asyncio.gather(loads, return_exceptions=True)
+        raise
+    await asyncio.sleep(SETTLE_TIME)
+    cpu_start, start = process_cpu_seconds(server.process.pid), time.monotonic()
+    await asyncio.sleep(max(ramp_end + duration - SETTLE_TIME - start, SETTLE_TIME))
+    cpu_end, end = process_cpu_seconds(server.process.pid), time.monotonic()
+    totals = await loads
+    cpu_percent = None
+    if cpu_start is not None and cpu_end is not None:
+        cpu_percent = 100 * (cpu_end - cpu_start) / (end - start)
+    return merge_totals(totals, cell.clients, cpu_percent, end - start)
+
+
+def merge_totals(totals, clients, cpu_percent, seconds):
+    """
+    @param totals: list of dicts, results of the load generator processes
+    @param cpu_percent: float, CPU usage of the server, None if unknown
+    @return: dict of metric name to value
+    """
+    received = sum(total['audio_received'] for total in totals)
+    lost = sum(total['audio_lost'] for total in totals)
+    misses = sum(total['audio_gaps'] for total in totals)
+    # percentiles cannot be merged, so the worst load process counts
+    p99 = [total['interarrival_ms'].get('p99') for total in totals]
+    return {
+        'seconds': seconds,
+        'cpu_percent': cpu_percent,
+        'cpu_per_client': cpu_percent / clients if cpu_percent is not None else None,
+        'audio_received': received,
+        'deadline_misses': misses,
+        'miss_ratio': misses / received if received else 0.0,
+        'jitter_ms': max(total['jitter_ms'] for total in totals),
+        'interarrival_p99_ms': max((value for value in p99 if value is not None), default=None),
+        'loss_ratio': lost / (received + lost) if received + lost else 0.0,
+    }
+
+
+def run_cell(binary, cell, duration):
+    """
+    Starts a server for `cell`, measures it and stops it again.
+
+    @param binary: Binary
+    @return: dict of metric name to value
+    """
+    server = LocalServer(binary.path, server_args(cell))
+    try:
+        secret = server.start()
+        return asyncio.run(measure(server, secret, cell, duration))
+    finally:
+        server.stop()
+
+
+class ResultsDatabase:
+    """
+    The append-only SQLite database of benchmark results.
+    """
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.executescript(SCHEMA)
+        columns = [row['name'] for row in self.db.execute('PRAGMA table_info(results)')]
+        if 'quality' not in columns:
+            # databases from before the quality dimension, whose clients sent raw audio
+            with self.db:
+                self.db.execute("ALTER TABLE results ADD COLUMN quality TEXT NOT NULL "
+                                "DEFAULT 'raw'")
+
+    def close(self):
+        self.db.close()
+
+    def add_run(self, binary, parameters):
+        """
+        @param binary: Binary
+        @param parameters: dict, the matrix options of the run
+        @return: int, the ID of the new run
+        """
+        with self.db:
+            return self.db.execute(
+                'INSERT INTO runs (commit_id, version, binary, host, started, parameters) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (binary.commit, binary.version, os.path.abspath(binary.path), platform.node(),
+                 time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                 json.dumps(parameters))).lastrowid
+
+    def add_result(self, run_id, cell, repetition, metrics):
+        """
+        @param metrics: dict as returned by measure()
+        """
+        with self.db:
+            self.db.execute(
+                'INSERT INTO results (run_id, numchannels, multithreading, fastupdate, clients, '
+                'quality, repetition, seconds, cpu_percent, cpu_per_client, audio_received, '
+                'deadline_misses, miss_ratio, jitter_ms, interarrival_p99_ms, loss_ratio) '
+                'VALUES (:run_id, :numchannels, :multithreading, :fastupdate, :clients, '
+                ':quality, :repetition, :seconds, :cpu_percent, :cpu_per_client, '
+                ':audio_received, :deadline_misses, :miss_ratio, :jitter_ms, '
+                ':interarrival_p99_ms, :loss_ratio)',
+                dict(metrics, run_id=run_id, repetition=repetition, **cell._asdict()))
+
+    def samples(self, commit, host):
+        """
+        @return: dict of Cell to dict of metric name to list of values,
+                 over all runs of `commit` on `host`
+        """
+        samples = collections.defaultdict(lambda: collections.defaultdict(list))
+        rows = self.db.execute(
+            f'SELECT numchannels, multithreading, fastupdate, clients, quality, '
+            f'{", ".join(METRICS)} '
+            'FROM results JOIN runs ON runs.id = results.run_id '
+            'WHERE commit_id = ? AND host = ?', (commit, host))
+        for row in rows:
+            cell = Cell(row['numchannels'], bool(row['multithreading']),
+                        bool(row['fastupdate']), row['clients'], row['quality'])
+            for metric in METRICS:
+                if row[metric] is not None:
+                    samples[cell][metric].append(row[metric])
+        return samples
+
+    def commits(self, host):
+        """
+        @return: list of commits measured on `host`, most recent last
+        """
+        return [row['commit_id'] for row in self.db.execute(
+            'SELECT commit_id, MAX(id) AS latest FROM runs WHERE host = ? '
+            'GROUP BY commit_id ORDER BY latest', (host,))]
+
+    def summary(self):
+        """
+        @return: list of rows with the number of runs and results per commit and host
+        """
+        return self.db.execute(
+            'SELECT commit_id, host, MAX(version) AS version, COUNT(DISTINCT runs.id) AS runs, '
+            'COUNT(results.run_id) AS results, MIN(started) AS first, MAX(started) AS last '
+            'FROM runs LEFT JOIN results ON runs.id = results.run_id '
+            'GROUP BY commit_id, host ORDER BY MAX(runs.id)').fetchall()
+
+
+def permutation_p_value(base, head, rng):
+    """
+    One-sided permutation test for a larger mean of `head`.
+
+    @param base: list of float
+    @param head: list of float
+    @param rng: random.Random, used when there are too many splits to try them all
+    @return: float, fraction of the splits of all values into two groups
+             whose difference of means is at least the observed one
+    """
+    values = base + head
+    observed = statistics.fmean(head) - statistics.fmean(base)
+    total = sum(values)
+    # the difference of means only depends on the sum of the head group
+    indices = range(len(values))
+    exact = math.comb(len(values), len(head)) <= MAX_PERMUTATIONS
+    if exact:
+        splits = itertools.combinations(indices, len(head))
+    else:
+        splits = (rng.sample(indices, len(head)) for _ in range(MAX_PERMUTATIONS))
+    count = tried = 0
+    for split in splits:
+        head_sum = sum(values[i] for i in split)
+        difference = head_sum / len(head) - (total - head_sum) / len(base)
+        # tolerate rounding errors of the sums
+        count += difference >= observed - 1e-9 * max(1.0, abs(observed))
+        tried += 1
+    if exact:
+        return count / tried
+    # the observed split counts as one of the samples, so that a sampled
+    # p-value is never 0 (see Phipson and Smyth 2010)
+    return (count + 1) / (tried + 1)
+
+
+def adjust_p_values(p_values):
+    """
+    Benjamini-Hochberg adjustment for testing many hypotheses at once.
+
+    @param p_values: list of float
+    @return: list of float, the adjusted p-values in the same order
+    """
+    order = sorted(range(len(p_values)), key=p_values.__getitem__)
+    adjusted = [0.0] * len(p_values)
+    smallest = 1.0
+    for rank in range(len(order), 0, -1):
+        i = order[rank - 1]
+        smallest = min(smallest, p_values[i] * len(p_values) / rank)
+        adjusted[i] = smallest
+    return adjusted
+
+
+def compare_samples(before, after, rng):
+    """
+    @param before: list of float, values of the reference commit
+    @param after: list of float, values of the commit to check
+    @return: dict with the means, the relative change and the p-value
+    """
+    mean_before, mean_after = statistics.fmean(before), statistics.fmean(after)
+    change = (100 * (mean_after - mean_before) / mean_before if mean_before
+              else (math.inf if mean_after else 0.0))
+    return {
+        'base': mean_before, 'head': mean_after, 'change_percent': change,
+        'p_value': permutation_p_value(before, after, rng), 'samples': (len(before), len(after)),
+    }
+
+
+def compare(db, base, head, options):
+    """
+    @param db: ResultsDatabase
+    @param base: str, reference commit
+    @param head: str, commit to check
+    @param options: argparse.Namespace with host, alpha and min_change
+    @return: list of dicts, one per combination and metric measured for both
+             commits, with the adjusted p-value and whether it is a regression
+    """
+    rng = random.Random(0)
+    base_samples = db.samples(base, options.host)
+    head_samples = db.samples(head, options.host)
+    rows = []
+    for cell in sorted(base_samples.keys() & head_samples.keys()):
+        for metric in METRICS:
+            before, after = base_samples[cell].get(metric), head_samples[cell].get(metric)
+            if not before or not after:
+                continue
+            rows.append(dict(cell._asdict(), metric=metric,
+                             **compare_samples(before, after, rng)))
+    for row, p_adjusted in zip(rows, adjust_p_values([row['p_value'] for row in rows])):
+        row['p_adjusted'] = p_adjusted
+        row['regression'] = (p_adjusted <= options.alpha
+                             and row['change_percent'] >= options.min_change)
+    return rows
+
+
+# Command line ---------------------------------------------------------------
+def run(args):
+    """
+    Measures all combinations for all binaries and stores the results.
+    """
+    cells = matrix(args)
+    if not cells:
+        sys.exit('no combination of --numchannels and --clients to run')
+    db = ResultsDatabase(args.db)
+    parameters = {name: getattr(args, name) for name in (
+        'numchannels', 'multithreading', 'fastupdate', 'clients', 'quality', 'duration',
+        'repeat')}
+    run_ids = [db.add_run(binary, parameters) for binary in args.binaries]
+    logger.info('%d combinations x %d repetitions x %d binaries, about %.0f minutes',
+                len(cells), args.repeat, len(args.binaries),
+                len(cells) * args.repeat * len(args.binaries) * (args.duration + 3) / 60)
+    try:
+        for repetition, cell in itertools.product(range(args.repeat), cells):
+            for binary, run_id in zip(args.binaries, run_ids):
+                metrics = run_cell(binary, cell, args.duration)
+                db.add_result(run_id, cell, repetition, metrics)
+                logger.info('%s %s #%d: CPU %s%% per client, %d deadline misses (%.4f%%), '
+                            'jitter %.3f ms, loss %.4f%%', binary.commit, format_cell(cell),
+                            repetition + 1, _format(metrics['cpu_per_client']),
+                            metrics['deadline_misses'], 100 * metrics['miss_ratio'],
+                            metrics['jitter_ms'], 100 * metrics['loss_ratio'])
+    finally:
+        db.close()
+
+
+def format_cell(cell):
+    """
+    @return: str, e.g. ch=150 mt=on fu=off clients=50 q=normal
+    """
+    return (f'ch={cell.numchannels} mt={"on" if cell.multithreading else "off"} '
+            f'fu={"on" if cell.fastupdate else "off"} clients={cell.clients} q={cell.quality}')
+
+
+def _format(value):
+    return '-' if value is None else f'{value:.4g}'
+
+
+def print_comparison(rows, show_all):
+    """
+    Prints the compared metrics, by default only the regressions.
+    """
+    for row in rows:
+        if not show_all and not row['regression']:
+            continue
+        cell = Cell(*(row[name] for name in Cell._fields))
+        print(f'{"REGRESSION" if row["regression"] else "":<10} {format_cell(cell):<49} '
+              f'{row["metric"]:<20} {_format(row["base"]):>10} -> {_format(row["head"]):>10} '
+              f'{row["change_percent"]:+8.1f}%  p={row["p_value"]:.3f} '
+              f'adjusted={row["p_adjusted"]:.3f}')
+
+
+def run_compare(args):
+    """
+    Compares two commits and exits with 1 if there is a regression.
+    """
+    db = ResultsDatabase(args.db)
+    try:
+        commits = db.commits(args.host)
+        head = args.head or (commits[-1] if commits else None)
+        base = args.base or next((commit for commit in reversed(commits) if commit != head), None)
+        if base is None or head is None:
+            sys.exit(f'need results of two commits on {args.host} in {args.db}')
+        rows = compare(db, base, head, args)
+    finally:
+        db.close()
+    if not rows:
+        sys.exit(f'{base} and {head} have no combination in common on {args.host}')
+    regressions = [row for row in rows if row['regression']]
+    if args.json:
+        json.dump({'base': base, 'head': head, 'host': args.host, 'results': rows},
+                  sys.stdout, indent=2)
+        print()
+    else:
+        print(f'base {base}, head {head} on {args.host}: {len(regressions)} regressions in '
+              f'{len(rows)} comparisons')
+        print_comparison(rows, args.all)
+    sys.exit(1 if regressions else 0)
+
+
+def run_list(args):
+    """
+    Prints the commits in the database.
+    """
+    db = ResultsDatabase(args.db)
+    try:
+        rows = db.summary()
+    finally:
+        db.close()
+    for row in rows:
+        print(f'{row["commit_id"]:<20} {row["version"] or "":<32} {row["host"]:<16} '
+              f'{row["runs"]:>3} runs {row["results"]:>5} results  '
+              f'{row["first"]} .. {row["last"]}')
+
+
+def main():
+    p = argparse.ArgumentParser(description='Benchmarks Jamulus server binaries over a matrix '
+                                            'of options and tracks regressions.')
+    p.add_argument('--db', default=DEFAULT_DB, help='SQLite results database')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    sub = p.add_subparsers(dest='command', required=True)
+
+    r = sub.add_parser('run', help='benchmark server binaries')
+    r.add_argument('binaries', nargs='+', metavar='[COMMIT=]BINARY', type=parse_binary,
+                   help='Jamulus executable, optionally with the commit it was built from')
+    r.add_argument('--numchannels', type=parse_int_list, default=[50, 150],
+                   help='comma separated values for --numchannels')
+    r.add_argument('--multithreading', type=parse_switch, default=[False, True],
+                   help='off, on or off,on')
+    r.add_argument('--fastupdate', type=parse_switch, default=[False, True],
+                   help='off, on or off,on')
+    r.add_argument('--clients', type=parse_int_list, default=[10, 50, 100],
+                   help='comma separated numbers of connected clients')
+    r.add_argument('--quality', type=parse_quality_list, default=['normal'],
+                   help='comma separated audio qualities of the clients: raw, which the '
+                        'server does not decode, or Opus low, normal or high '
+                        '(default: normal, like the client)')
+    r.add_argument('--duration', type=float, default=10.0,
+                   help='seconds to measure with all clients connected')
+    r.add_argument('--repeat', type=int, default=3, help='repetitions of every combination')
+
+    c = sub.add_parser('compare', help='flag regressions between two commits')
+    c.add_argument('--base', help='reference commit (default: the one measured before --head)')
+    c.add_argument('--head', help='commit to check (default: the last one measured)')
+    c.add_argument('--host', default=platform.node(),
+                   help='only compare results of this host (default: this one)')
+    c.add_argument('--alpha', type=float, default=0.05,
+                   help='false discovery rate of the flagged regressions')
+    c.add_argument('--min-change', type=float, default=5.0,
+                   help='minimum relative change in percent to flag')
+    c.add_argument('--all', action='store_true', help='also print unflagged comparisons')
+    c.add_argument('--json', action='store_true', help='print machine-readable output')
+
+    sub.add_parser('list', help='list the measured commits')
+
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+
+    if args.command == 'compare':
+        run_compare(args)
+    elif args.command == 'list':
+        run_list(args)
+    else:
+        if args.repeat < 1 or args.duration <= 2 * SETTLE_TIME:
+            p.error(f'--repeat must be positive and --duration longer than {2 * SETTLE_TIME} s')
+        exit_on_error(run, args, errors=(OSError, RuntimeError, sqlite3.Error))
+
+
+if __name__ == '__main__':
+    main()
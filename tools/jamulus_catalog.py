@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Searchable catalog of jam recorder sessions.
+
+The jam recorder (src/recorder) creates one Jam-YYYYMMDD-HHMMSSzzz directory
+per session (named after its UTC start time) with one WAV file per client
+connection, named <name>-<address>-<start frame>-<channels>[_<n>].wav (see
+CJamClient::CJamClient and CJamSession::TracksFromSessionDir).
+
+This tool indexes session directories below any number of archive roots
+into an SQLite database. Only the file names, the WAV headers (or the FLAC
+STREAMINFO block and the Ogg Opus header and last page of files compressed
+by jamulus_transcode.py) and the .lof project are read, never the audio
+data. If a track exists both as WAV and compressed file, only the
+compressed file is counted. Updates are incremental: sessions
+whose directory mtime is unchanged are skipped without listing them, except
+for sessions without a .lof project, which may still be recording.
+
+The database has the tables `sessions` and `tracks` and the view
+`participants` (one row per client name and session), so it can also be
+queried with the sqlite3 shell. The query subcommand covers the common
+searches.
+
+Usage:
+./tools/jamulus_catalog.py index /srv/recordings /mnt/archive --db catalog.sqlite
+./tools/jamulus_catalog.py query --db catalog.sqlite --client alice --min-duration 3600 \
+    --since 2026-09-01 --until 2026-10-01
+./tools/jamulus_catalog.py query --db catalog.sqlite --client 'bob%' --json -
+
+"""
+
+import argparse
+import calendar
+import contextlib
+import logging
+import os
+import re
+import sqlite3
+import sys
+import time
+
+import jamulus_recording as jr
+from jamulus_common import write_json
+
+logger = logging.getLogger('')
+
+DEFAULT_DB = 'jamulus_catalog.sqlite'
+# see CJamSession::CJamSession
+SESSION_DIR_RE = re.compile(r'^Jam-(\d{8}-\d{6})(\d{3})$')
+TRACK_FILE_RE = re.compile(
+    jr.TRACK_FILE_RE.pattern.replace(r'\.wav$', r'\.(?:wav|flac|opus)$'))
+# most preferred first, see output_path() in jamulus_transcode.py
+TRACK_EXTENSIONS = ('.opus', '.flac', '.wav')
+FLAC_STREAMINFO_BYTES = 42
+# see RFC 7845: the identification header follows the first Ogg page header,
+# which is 28 bytes long as it holds a single segment; granule positions
+# always count 48 kHz samples
+OPUS_HEAD_OFFSET = 28
+OPUS_HEAD_BYTES = 19
+OPUS_GRANULE_RATE = 48000
+OGG_MAX_PAGE_BYTES = 65307
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    started REAL,           -- UTC, seconds since the epoch
+    mtime REAL NOT NULL,    -- of the directory when it was indexed
+    complete INTEGER NOT NULL,
+    frame_size INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started);
+CREATE TABLE IF NOT EXISTS tracks (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    file TEXT NOT NULL,
+    client TEXT NOT NULL,
+    address TEXT NOT NULL,
+    start_frame INTEGER NOT NULL,
+    channels INTEGER NOT NULL,
+    sample_rate INTEGER NOT NULL,
+    offset REAL NOT NULL,   -- seconds from the start of the session
+    duration REAL NOT NULL,
+    bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tracks_session ON tracks (session_id);
+CREATE INDEX IF NOT EXISTS tracks_client ON tracks (client COLLATE NOCASE);
+CREATE VIEW IF NOT EXISTS participants AS
+    SELECT session_id, client, COUNT(*) AS connections, MIN(offset) AS first_offset,
+           SUM(duration) AS duration
+    FROM tracks GROUP BY session_id, client;
+'''
+
+
+def session_start(name):
+    """
+    @param name: str, session directory name
+    @return: float, UTC start time in seconds since the epoch, or None
+    """
+    match = SESSION_DIR_RE.match(name)
+    if match is None:
+        return None
+    try:
+        started = time.strptime(match[1], '%Y%m%d-%H%M%S')
+    except ValueError:
+        return None
+    return calendar.timegm(started) + int(match[2]) / 1000
+
+
+def read_flac_info(path):
+    """
+    Reads the STREAMINFO block of a FLAC file.
+
+    @return: jamulus_recording.WavInfo without data offset
+    @raise RecordingError: if this is not a FLAC file
+    """
+    with open(path, 'rb') as f:
+        header = f.read(FLAC_STREAMINFO_BYTES)
+    if len(header) < FLAC_STREAMINFO_BYTES or header[:4] != b'fLaC' or header[4] & 0x7F != 0:
+        raise jr.RecordingError(f'{path}: not a FLAC file')
+    # sample rate (20 bits), channels - 1 (3), bits per sample - 1 (5), total samples (36)
+    info = int.from_bytes(header[18:26], 'big')
+    return jr.WavInfo((info >> 41 & 0x7) + 1, info >> 44, (info >> 36 & 0x1F) + 1, None,
+                      info & 0xFFFFFFFFF)
+
+
+def read_opus_info(path):
+    """
+    Reads the identification header and the granule position of the last
+    page of an Ogg Opus file.
+
+    @return: jamulus_recording.WavInfo without bits per sample and data offset
+    @raise RecordingError: if this is not an Ogg Opus file
+    """
+    with open(path, 'rb') as f:
+        header = f.read(OPUS_HEAD_OFFSET + OPUS_HEAD_BYTES)
+        f.seek(max(0, os.fstat(f.fileno()).st_size - OGG_MAX_PAGE_BYTES))
+        tail = f.read()
+    head = header[OPUS_HEAD_OFFSET:]
+    last_page = tail.rfind(b'OggS')
+    if (header[:4] != b'OggS' or len(head) < OPUS_HEAD_BYTES or head[:8] != b'OpusHead'
+            or last_page < 0 or len(tail) < last_page + 14):
+        raise jr.RecordingError(f'{path}: not an Ogg Opus file')
+    channels = head[9]
+    pre_skip = int.from_bytes(head[10:12], 'little')
+    sample_rate = int.from_bytes(head[12:16], 'little') or OPUS_GRANULE_RATE
+    granule = int.from_bytes(tail[last_page + 6:last_page + 14], 'little', signed=True)
+    num_frames = max(0, granule - pre_skip) * sample_rate // OPUS_GRANULE_RATE
+    return jr.WavInfo(channels, sample_rate, None, None, num_frames)
+
+
+def track_files(names):
+    """
+    Picks one file per track, as jamulus_transcode.py keeps the WAV file
+    unless --delete-wav is given.
+
+    @param names: list of str, file names of a session directory
+    @return: list of (file name, TRACK_FILE_RE match), sorted by name
+    """
+    files = {}
+    for name in names:
+        match = TRACK_FILE_RE.match(name)
+        if match is None:
+            continue
+        stem, extension = os.path.splitext(name)
+        other = files.get(stem)
+        if other is None or (TRACK_EXTENSIONS.index(extension)
+                             < TRACK_EXTENSIONS.index(os.path.splitext(other[0])[1])):
+            files[stem] = (name, match)
+    return [files[stem] for stem in sorted(files)]
+
+
+def find_session_dirs(root):
+    """
+    Yields the session directories below root, without descending into them.
+    """
+    try:
+        entries = list(os.scandir(root))
+    except OSError as e:
+        logger.warning('cannot list %s: %s', root, e)
+        return
+    for entry in entries:
+        if not entry.is_dir(follow_symlinks=False):
+            continue
+        if SESSION_DIR_RE.match(entry.name):
+            yield entry.path
+        else:
+            yield from find_session_dirs(entry.path)
+
+
+def scan_session(path):
+    """
+    Reads the file names and headers of one session directory.
+
+    @return: tuple of (complete, frame size, list of track dicts)
+    """
+    names = os.listdir(path)
+    tracks = []
+    readers = {'.flac': read_flac_info, '.opus': read_opus_info}
+    for name, match in track_files(names):
+        file_path = os.path.join(path, name)
+        reader = readers.get(os.path.splitext(name)[1], jr.read_wav_info)
+        try:
+            info = reader(file_path)
+            size = os.path.getsize(file_path)
+        except (OSError, jr.RecordingError) as e:
+            logger.warning('skipping %s: %s', file_path, e)
+            continue
+        tracks.append({'file': name, 'client': match['name'], 'address': match['address'],
+                       'start_frame': int(match['start_frame']), 'channels': info.channels,
+                       'sample_rate': info.sample_rate,
+                       'duration': info.num_frames / info.sample_rate if info.sample_rate else 0,
+                       'bytes': size})
+    complete = any(name.endswith('.lof') for name in names)
+    frame_size = jr.detect_frame_size(path, [
+        jr.Track(track['file'], track['client'], track['address'], track['start_frame'],
+                 track['channels'], 0) for track in tracks])
+    for track in tracks:
+        track['offset'] = track['start_frame'] * frame_size / jr.SAMPLE_RATE
+    return complete, frame_size, tracks
+
+
+class Catalog:
+    """
+    The SQLite catalog of sessions and tracks.
+    """
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def _store_session(self, path, mtime, scanned):
+        complete, frame_size, tracks = scanned
+        duration = max((track['offset'] + track['duration'] for track in tracks), default=0)
+        with self.db:
+            self.db.execute('DELETE FROM sessions WHERE path = ?', (path,))
+            session_id = self.db.execute(
+                'INSERT INTO sessions (path, name, started, mtime, complete, frame_size, '
+                'duration, bytes) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (path, os.path.basename(path), session_start(os.path.basename(path)), mtime,
+                 complete, frame_size, duration,
+                 sum(track['bytes'] for track in tracks))).lastrowid
+            self.db.executemany(
+                'INSERT INTO tracks (session_id, file, client, address, start_frame, channels, '
+                'sample_rate, offset, duration, bytes) VALUES (:session_id, :file, :client, '
+                ':address, :start_frame, :channels, :sample_rate, :offset, :duration, :bytes)',
+                [dict(track, session_id=session_id) for track in tracks])
+
+    def update(self, roots):
+        """
+        Indexes new and changed sessions below the roots and removes the
+        sessions which no longer exist.
+
+        @param roots: list of str, archive directories
+        @return: dict with the numbers of scanned, unchanged and removed sessions
+        """
+        known = {row['path']: (row['mtime'], row['complete'])
+                 for row in self.db.execute('SELECT path, mtime, complete FROM sessions')}
+        counts = {'scanned': 0, 'unchanged': 0, 'removed': 0}
+        seen = set()
+        for root in roots:
+            root = os.path.abspath(root)
+            for path in find_session_dirs(root):
+                seen.add(path)
+                try:
+                    mtime = os.stat(path).st_mtime
+                    if known.get(path) == (mtime, True):
+                        counts['unchanged'] += 1
+                        continue
+                    self._store_session(path, mtime, scan_session(path))
+                except OSError as e:
+                    logger.warning('skipping %s: %s', path, e)
+                    continue
+                counts['scanned'] += 1
+            prefix = os.path.join(root, '')
+            gone = [path for path in known if path.startswith(prefix) and path not in seen]
+            with self.db:
+                self.db.executemany('DELETE FROM sessions WHERE path = ?',
+                                    [(path,) for path in gone])
+            counts['removed'] += len(gone)
+        return counts
+
+    def query(self, client=None, min_duration=0, since=None, until=None):
+        """
+        Finds sessions.
+
+        @param client: str, LIKE pattern (case insensitive) of a participant name, or None
+        @param min_duration: float, minimum session length in seconds
+        @param since: float, earliest start time in seconds since the epoch, or None
+        @param until: float, latest start time in seconds since the epoch, or None
+        @return: list of dicts, one per session, newest first
+        """
+        conditions = ['s.duration >= ?']
+        values = [min_duration]
+        if since is not None:
+            conditions.append('s.started >= ?')
+            values.append(since)
+        if until is not None:
+            conditions.append('s.started < ?')
+            values.append(until)
+        if client is not None:
+            conditions.append('EXISTS (SELECT 1 FROM tracks t WHERE t.session_id = s.id '
+                              'AND t.client LIKE ?)')
+            values.append(client)
+        rows = self.db.execute(
+            'SELECT s.id, s.path, s.started, s.duration, s.bytes, s.complete, '
+            "(SELECT GROUP_CONCAT(client, ', ') FROM "
+            ' (SELECT DISTINCT client FROM tracks WHERE session_id = s.id ORDER BY client)) '
+            'AS clients '
+            f"FROM sessions s WHERE {' AND '.join(conditions)} ORDER BY s.started DESC",
+            values)
+        return [dict(row) for row in rows]
+
+
+def parse_date(value):
+    """
+    @param value: str, YYYY-MM-DD (UTC)
+    @return: float, seconds since the epoch
+    """
+    return calendar.timegm(time.strptime(value, '%Y-%m-%d'))
+
+
+def print_sessions(sessions):
+    """
+    Prints query results as a table.
+    """
+    print(f"{'started (UTC)':<19} {'length':>8} {'MB':>8}  {'session':<26} clients")
+    for session in sessions:
+        started = (time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(session['started']))
+                   if session['started'] is not None else '?')
+        length = int(session['duration'])
+        print(f"{started:<19} {length // 3600:>2}:{length // 60 % 60:02}:{length % 60:02} "
+              f"{session['bytes'] / 1e6:>8.1f}  {os.path.basename(session['path']):<26} "
+              f"{session['clients'] or ''}")
+
+
+def main():
+    p = argparse.ArgumentParser(description='Indexes and searches jam recorder sessions.')
+    p.add_argument('--db', default=DEFAULT_DB,
+                   help='SQLite database of the catalog (default: %(default)s)')
+    p.add_argument('--verbose', '-v', action='store_true', help='enable verbose output')
+    subparsers = p.add_subparsers(dest='command', required=True)
+    index = subparsers.add_parser('index', help='add new and changed sessions to the catalog')
+    index.add_argument('roots', nargs='+', help='recording or archive directories')
+    query = subparsers.add_parser('query', help='search sessions')
+    query.add_argument('--client', help='participant name, %% and _ are wildcards')
+    query.add_argument('--min-duration', type=float, default=0,
+                       help='minimum session length in seconds')
+    query.add_argument('--since', type=parse_date, help='first day (YYYY-MM-DD, UTC)')
+    query.add_argument('--until', type=parse_date, help='day after the last one (YYYY-MM-DD)')
+    query.add_argument('--json', metavar='FILE', help='write the results as JSON ("-" for stdout)')
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+
+    with contextlib.closing(Catalog(args.db)) as catalog:
+        if args.command == 'index':
+            started = time.monotonic()
+            counts = catalog.update(args.roots)
+            logger.info('%d sessions scanned, %d unchanged, %d removed in %.1f s',
+                        counts['scanned'], counts['unchanged'], counts['removed'],
+                        time.monotonic() - started)
+            return
+        sessions = catalog.query(args.client, args.min_duration, args.since, args.until)
+    if args.json:
+        write_json(sessions, args.json)
+    else:
+        print_sessions(sessions)
+        print(f'{len(sessions)} sessions', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Helpers shared by the jamulus_*.py tools: optional dependencies, address
+parsing, JSON output, error handling in main() and a latency histogram.
+
+"""
+
+import bisect
+import importlib
+import json
+import logging
+import math
+import os
+import sys
+
+logger = logging.getLogger('')
+
+DEFAULT_PORT_NUMBER = 22124  # see src/global.h
+
+
+def optional_import(name):
+    """
+    Imports an optional dependency, so that the tools which only use it for
+    some commands still start without it.
+
+    @param name: str, module name such as numpy
+    @return: the module or None if it is not installed
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+np = optional_import('numpy')
+
+
+def require_numpy(purpose):
+    """
+    @param purpose: str, what NumPy is needed for, e.g. 'batch processing'
+    @raise RuntimeError: if NumPy is not installed
+    """
+    if np is None:
+        raise RuntimeError(f'NumPy is required for {purpose}, try: pip install numpy')
+
+
+def parse_address(text):
+    """
+    @param text: str, HOST or HOST:PORT
+    @return: (host, port)
+    """
+    host, _, port = text.rpartition(':')
+    if not host:
+        return text, DEFAULT_PORT_NUMBER
+    return host.strip('[]'), int(port)
+
+
+def write_json(results, path):
+    """
+    @param results: dict to write
+    @param path: str, file name, "-" for stdout or None to skip writing
+    """
+    if path == '-':
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif path:
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+def exit_on_error(function, *args, errors=(OSError, RuntimeError)):
+    """
+    Calls function(*args) as the main work of a tool. The given errors are
+    logged without a traceback and end the program with exit status 1,
+    Ctrl+C and a closed output pipe end it quietly.
+
+    @param errors: tuple of exception types
+    """
+    try:
+        function(*args)
+    except BrokenPipeError:
+        # the output was piped into a program like head which exited early,
+        # see https://docs.python.org/3/library/signal.html#note-on-sigpipe
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except errors as e:
+        logger.error('%s', e)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        logger.info('interrupted')
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with logarithmically spaced buckets.
+
+    Values are in milliseconds. The buckets cover 10 us to about 20 s with
+    about 10 % resolution, which is enough for percentiles of network
+    timings without storing every sample.
+    """
+
+    EDGES = [0.01 * 1.1 ** i for i in range(int(math.log(2e6) / math.log(1.1)) + 1)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value):
+        """
+        @param value: float, in ms
+        """
+        self.counts[bisect.bisect_right(self.EDGES, value)] += 1
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other):
+        """
+        Adds all samples of another histogram to this one.
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def percentile(self, fraction):
+        """
+        @param fraction: float, 0..1
+        @return: float, upper bucket edge containing the requested percentile
+                 (clamped to the observed maximum) or None if empty
+        """
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                edge = self.EDGES[i] if i < len(self.EDGES) else self.maximum
+                return min(max(edge, self.minimum), self.maximum)
+        return self.maximum
+
+    def to_dict(self):
+        """
+        @return: dict with summary statistics, suitable for JSON
+        """
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3),
+            'min': round(self.minimum, 3),
+            'p50': round(self.percentile(0.5), 3),
+            'p90': round(self.percentile(0.9), 3),
+            'p99': round(self.percentile(0.99), 3),
+            'max': round(self.maximum, 3),
+        }
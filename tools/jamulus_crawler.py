@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Concurrent crawler for Jamulus directories and the servers they list.
+
+The connect dialog of a client requests the server list of one directory
+with PROTMESSID_CLM_REQ_SERVER_LIST, which the directory answers with a
+reduced and a full list, and then pings every listed server with
+PROTMESSID_CLM_PING_MS_WITHNUMCLIENTS. This tool does the same for many
+directories at once from a single UDP socket:
+
+- All directories are queried concurrently. Like CConnectDlg, the request is
+  repeated every SERV_LIST_REQ_UPDATE_TIME_MS until the full list arrives;
+  the reduced list is used if the full one never does (e.g. because its IP
+  fragments are dropped).
+- The listed servers are pinged with a bounded number of outstanding pings,
+  a global packet rate and a minimum interval between packets to the same
+  host, as often several servers share one host. Unanswered pings are
+  retried.
+- With --depth, the listed servers are asked for their server list as well,
+  so directories which are registered with other directories are crawled
+  recursively.
+- Ping time, number of clients and version of each server are kept in a
+  cache with a time to live. Repeated crawls (--watch, or --cache across
+  runs) only probe servers with stale entries.
+
+The stub command runs local directories with synthetic servers, each on its
+own UDP port, to test the crawler against. They can drop and delay replies.
+
+Usage:
+./tools/jamulus_crawler.py crawl --json servers.json
+./tools/jamulus_crawler.py crawl --directory 127.0.0.1:22224 --depth 1 --cache crawl.json
+./tools/jamulus_crawler.py crawl --watch 60 --ttl 300 --json live-map.json
+./tools/jamulus_crawler.py stub --directories 10 --servers 2000 --loss 0.05
+
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import os
+import random
+import socket
+import time
+
+import jamulus_protocol as jp
+from jamulus_common import parse_address, write_json
+from jamulus_directory_load import raise_file_limit
+
+logger = logging.getLogger('')
+
+# see src/global.h
+DEFAULT_DIRECTORIES = [
+    'anygenre1.jamulus.app:22124',
+    'anygenre2.jamulus.app:22224',
+    'asia.jamulus.app:22624',
+    'rock.jamulus.app:22424',
+    'jazz.jamulus.app:22324',
+    'classical.jamulus.app:22524',
+    'choral.jamulus.app:22724',
+]
+PING_UPDATE_TIME_SERVER_LIST_MS = 2500
+
+# see src/connectdlg.h
+SERV_LIST_REQ_UPDATE_TIME_MS = 2000
+
+OS_LINUX = 2  # see COSUtil::EOpSystemType
+
+CrawlOptions = collections.namedtuple('CrawlOptions', [
+    'depth', 'concurrency', 'rate', 'host_interval', 'timeout', 'retries', 'list_timeout',
+    'versions'])
+
+StubOptions = collections.namedtuple('StubOptions', ['loss', 'delay'])
+
+
+def format_address(address):
+    """
+    @param address: (host, port)
+    @return: str, HOST:PORT
+    """
+    return f'{address[0]}:{address[1]}'
+
+
+class RateLimiter:
+    """
+    Spaces events with the same key by a minimum interval.
+    """
+
+    def __init__(self, interval):
+        """
+        @param interval: float, seconds between two events with the same key
+        """
+        self.interval = interval
+        self.next = {}
+
+    async def wait(self, key=None):
+        """
+        Waits for the next free slot of the key and reserves it.
+        """
+        if self.interval <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self.next.get(key, now))
+        self.next[key] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def _valid_cache(entries):
+    """
+    @param entries: the decoded contents of a cache file
+    @return: bool, True if it is a dict of HOST:PORT -> probe result as
+             written by PingCache.save()
+    """
+    if not isinstance(entries, dict):
+        return False
+    for key, entry in entries.items():
+        if not isinstance(key, str) or not isinstance(entry, dict):
+            return False
+        if not {'ping_ms', 'num_clients', 'version', 'checked'} <= entry.keys():
+            return False
+        checked = entry['checked']
+        if isinstance(checked, bool) or not isinstance(checked, (int, float)):
+            return False
+    return True
+
+
+class PingCache:
+    """
+    Results of server probes with a time to live, optionally persisted as
+    JSON.
+    """
+
+    def __init__(self, ttl, path=None):
+        """
+        @param ttl: float, seconds until an entry is stale
+        @param path: str, JSON file to load and save or None
+        """
+        self.ttl = ttl
+        self.path = path
+        self.entries = {}
+        if path:
+            try:
+                with open(path) as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                return
+            if _valid_cache(entries):
+                self.entries = entries
+            else:
+                logger.warning('%s: not a crawler cache, starting with an empty cache', path)
+
+    def get(self, key):
+        """
+        @param key: str, server address as HOST:PORT
+        @return: dict, a fresh entry or None
+        """
+        entry = self.entries.get(key)
+        if entry is None or time.time() - entry['checked'] >= self.ttl:
+            return None
+        return entry
+
+    def put(self, key, entry):
+        """
+        Stores a probe result with the current time.
+        """
+        self.entries[key] = dict(entry, checked=time.time())
+
+    def save(self):
+        """
+        Drops stale entries and atomically replaces the cache file.
+        """
+        now = time.time()
+        self.entries = {key: entry for key, entry in self.entries.items()
+                        if now - entry['checked'] < self.ttl}
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+
+class CrawlerProtocol(asyncio.DatagramProtocol):
+    """
+    The socket of the crawler. Replies are handed to the waiting requests.
+    """
+
+    def __init__(self):
+        self.transport = None
+        self.waiters = {}  # ('list', address) or ('ping', address, time_ms) -> future
+        self.reduced = {}  # address -> reduced server list
+        self.versions = {}  # address -> (version, os)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def send(self, address, msg_id, **fields):
+        """
+        @param address: (host, port)
+        """
+        self.transport.sendto(jp.encode_message(msg_id, **fields), address)
+
+    def _list_waiter(self, address):
+        # like CConnectDlg::SetServerList, only the IP address has to match
+        # since the directory may reply from another port
+        key = ('list', address)
+        if key not in self.waiters:
+            key = next((key for key in self.waiters
+                        if key[0] == 'list' and key[1][0] == address[0]), key)
+        return key
+
+    def datagram_received(self, data, addr):
+        frame = jp.decode_frame(data)
+        if frame is None:
+            return
+        # connection less messages are never split, see
+        # CProtocol::CreateAndImmSendConLessMessage in src/protocol.cpp
+        msg_id = frame.id
+        try:
+            fields = jp.decode_body(msg_id, frame.data)
+        except jp.ProtocolError as e:
+            logger.debug('%s: %s', format_address(addr), e)
+            return
+
+        if msg_id in (jp.PROTMESSID_CLM_SERVER_LIST, jp.PROTMESSID_CLM_RED_SERVER_LIST):
+            key = self._list_waiter(addr)
+            if key not in self.waiters:
+                return
+            if msg_id == jp.PROTMESSID_CLM_RED_SERVER_LIST:
+                self.reduced[key[1]] = fields['servers']
+            elif not self.waiters[key].done():
+                self.waiters[key].set_result(fields['servers'])
+        elif msg_id == jp.PROTMESSID_CLM_PING_MS_WITHNUMCLIENTS:
+            waiter = self.waiters.get(('ping', addr, fields['time_ms']))
+            if waiter is not None and not waiter.done():
+                waiter.set_result(fields['num_clients'])
+        elif msg_id == jp.PROTMESSID_CLM_VERSION_AND_OS:
+            self.versions[addr] = (fields['version'], fields['os'])
+
+    def error_received(self, exc):
+        logger.debug('crawler socket: %s', exc)
+
+
+def _server_records(directory, servers):
+    """
+    @param directory: (host, port) the list was requested from
+    @param servers: list of dicts, decoded server list
+    @return: list of (address, dict), the first entry is the directory
+             itself and has no address (see CServerListManager::RetrieveAll)
+    """
+    records = []
+    for index, server in enumerate(servers):
+        host = directory[0] if index == 0 else server['address']
+        records.append(((host, server['port']), {
+            key: value for key, value in server.items() if key not in ('address', 'port')}))
+    return records
+
+
+class Crawler:  # pylint: disable=too-many-instance-attributes
+    """
+    Queries directories and pings the listed servers concurrently.
+    """
+
+    def __init__(self, options, cache):
+        """
+        @param options: CrawlOptions
+        @param cache: PingCache
+        """
+        self.options = options
+        self.cache = cache
+        self.protocol = None
+        self.rate = RateLimiter(1 / options.rate if options.rate > 0 else 0)
+        self.hosts = RateLimiter(options.host_interval)
+        self.slots = asyncio.Semaphore(options.concurrency)
+        self.stats = collections.Counter()
+
+    async def open(self, bind='0.0.0.0'):
+        """
+        Opens the UDP socket. Directories are IPv4 only, like in the client.
+        """
+        loop = asyncio.get_running_loop()
+        _, self.protocol = await loop.create_datagram_endpoint(
+            CrawlerProtocol, local_addr=(bind, 0), family=socket.AF_INET)
+
+    def close(self):
+        """
+        Closes the UDP socket.
+        """
+        if self.protocol is not None and self.protocol.transport is not None:
+            self.protocol.transport.close()
+
+    async def _send(self, address, msg_id, **fields):
+        await self.rate.wait()
+        await self.hosts.wait(address[0])
+        self.protocol.send(address, msg_id, **fields)
+        self.stats['sent'] += 1
+
+    async def request_list(self, address, timeout):
+        """
+        @param address: (host, port) of a directory
+        @param timeout: float, seconds to wait for a list
+        @return: (kind, servers) with kind 'full' or 'reduced', or None if the
+                 address did not answer
+        """
+        loop = asyncio.get_running_loop()
+        key = ('list', address)
+        waiter = self.protocol.waiters[key] = loop.create_future()
+        deadline = loop.time() + timeout
+        try:
+            async with self.slots:
+                while loop.time() < deadline:
+                    await self._send(address, jp.PROTMESSID_CLM_REQ_SERVER_LIST)
+                    wait = min(SERV_LIST_REQ_UPDATE_TIME_MS / 1000, deadline - loop.time())
+                    try:
+                        return 'full', await asyncio.wait_for(asyncio.shield(waiter), wait)
+                    except asyncio.TimeoutError:
+                        pass
+            reduced = self.protocol.reduced.pop(address, None)
+            return None if reduced is None else ('reduced', reduced)
+        finally:
+            del self.protocol.waiters[key]
+            self.protocol.reduced.pop(address, None)
+
+    async def ping(self, address):
+        """
+        Pings a server unless the cache has a fresh result.
+
+        @param address: (host, port)
+        @return: dict with ping_ms, num_clients, version and cached
+        """
+        key = format_address(address)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.stats['cached'] += 1
+            return dict(entry, cached=True)
+
+        loop = asyncio.get_running_loop()
+        entry = {'ping_ms': None, 'num_clients': None, 'version': None}
+        async with self.slots:
+            for _ in range(self.options.retries + 1):
+                if self.options.versions and address not in self.protocol.versions:
+                    await self._send(address, jp.PROTMESSID_CLM_REQ_VERSION_AND_OS)
+                time_ms = int(loop.time() * 1000) & 0xFFFFFFFF
+                waiter_key = ('ping', address, time_ms)
+                waiter = self.protocol.waiters[waiter_key] = loop.create_future()
+                try:
+                    await self._send(address, jp.PROTMESSID_CLM_PING_MS_WITHNUMCLIENTS,
+                                     time_ms=time_ms, num_clients=0)
+                    sent = loop.time()
+                    entry['num_clients'] = await asyncio.wait_for(waiter, self.options.timeout)
+                    entry['ping_ms'] = round((loop.time() - sent) * 1000, 2)
+                    break
+                except asyncio.TimeoutError:
+                    self.stats['timeouts'] += 1
+                finally:
+                    del self.protocol.waiters[waiter_key]
+        entry['version'] = self.protocol.versions.get(address, (None,))[0]
+        self.stats['pinged'] += 1
+        self.cache.put(key, entry)
+        return dict(entry, cached=False)
+
+    async def _crawl_lists(self, directories):
+        """
+        @return: (directory results, dict of address -> server record)
+        """
+        results, servers, queried = [], {}, set()
+        level = list(directories)
+        for depth in range(self.options.depth + 1):
+            # at depth > 0 most addresses are plain servers which do not answer
+            timeout = self.options.list_timeout if depth == 0 else self.options.timeout
+            level = [address for address in dict.fromkeys(level) if address not in queried]
+            queried.update(level)
+            lists = await asyncio.gather(*(self.request_list(address, timeout)
+                                           for address in level))
+            for address, answer in zip(level, lists):
+                if answer is None:
+                    if depth == 0:
+                        logger.warning('%s: no server list received', format_address(address))
+                    continue
+                records = _server_records(address, answer[1])
+                results.append({'address': format_address(address), 'depth': depth,
+                                'name': records[0][1]['name'] if records else '',
+                                'list': answer[0], 'servers': len(records)})
+                for server, record in records:
+                    entry = servers.setdefault(server, dict(record, directories=[]))
+                    entry['directories'].append(format_address(address))
+            level = list(servers)
+        return results, servers
+
+    async def crawl(self, directories):
+        """
+        @param directories: list of (host, port), resolved IPv4 addresses
+        @return: dict with directories and servers, suitable for JSON
+        """
+        self.stats.clear()
+        started = time.monotonic()
+        results, servers = await self._crawl_lists(directories)
+        pings = await asyncio.gather(*(self.ping(address) for address in servers))
+        for (address, record), ping in zip(servers.items(), pings):
+            record.update(ping, address=format_address(address),
+                          reachable=ping['ping_ms'] is not None)
+        self.cache.save()
+        rows = sorted(servers.values(), key=lambda row: (not row['reachable'], row['ping_ms']
+                                                         or 0, row['address']))
+        return {'time': time.time(), 'duration': round(time.monotonic() - started, 3),
+                'stats': dict(self.stats), 'directories': results, 'servers': rows}
+
+
+async def resolve(addresses):
+    """
+    @param addresses: list of (host, port)
+    @return: list of (IPv4 address, port) which could be resolved
+    """
+    loop = asyncio.get_running_loop()
+
+    async def lookup(host, port):
+        try:
+            info = await loop.getaddrinfo(host, port, family=socket.AF_INET,
+                                          type=socket.SOCK_DGRAM)
+        except OSError as e:
+            logger.warning('%s: %s', host, e)
+            return None
+        return info[0][4][0], port
+
+    found = await asyncio.gather(*(lookup(host, port) for host, port in addresses))
+    return [address for address in found if address is not None]
+
+
+def print_summary(result):
+    """
+    Prints one line per directory and the totals.
+    """
+    print(f'{"directory":<28} {"name":<24} {"depth":>5} {"list":>8} {"servers":>8}')
+    for row in result['directories']:
+        print(f'{row["address"]:<28} {row["name"][:24]:<24} {row["depth"]:>5} {row["list"]:>8} '
+              f'{row["servers"]:>8}')
+    reachable = sum(row['reachable'] for row in result['servers'])
+    clients = sum(row['num_clients'] or 0 for row in result['servers'])
+    print(f'{len(result["servers"])} servers, {reachable} reachable, {clients} clients, '
+          f'{result["stats"].get("pinged", 0)} pinged, {result["stats"].get("cached", 0)} '
+          f'cached, {result["duration"]:.1f} s', flush=True)
+
+
+async def run_crawl(args):
+    """
+    Crawls once or every --watch seconds.
+    """
+    directories = await resolve(args.directory or
+                                [parse_address(text) for text in DEFAULT_DIRECTORIES])
+    if not directories:
+        raise SystemExit('no directory could be resolved')
+    crawler = Crawler(CrawlOptions(args.depth, args.concurrency, args.rate, args.host_interval,
+                                   args.timeout, args.retries, args.list_timeout,
+                                   args.versions),
+                      PingCache(args.ttl, args.cache))
+    await crawler.open(args.bind)
+    try:
+        while True:
+            result = await crawler.crawl(directories)
+            print_summary(result)
+            write_json(result, args.json)
+            if not args.watch:
+                break
+            await asyncio.sleep(max(0.0, args.watch - result['duration']))
+    finally:
+        crawler.close()
+
+
+# Stub directory ---------------------------------------------------------------
+class StubServer(asyncio.DatagramProtocol):
+    """
+    A synthetic server which answers pings and version requests, and the
+    server list requests if it is a directory.
+    """
+
+    def __init__(self, record, options, rng):
+        """
+        @param record: dict, server list entry with num_clients and listing,
+                       the entries of a directory or None
+        @param options: StubOptions
+        @param rng: random.Random
+        """
+        self.record = record
+        self.options = options
+        self.rng = rng
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def _reply(self, addr, frames):
+        if self.rng.random() < self.options.loss:
+            return
+        delay = self.rng.uniform(0, self.options.delay)
+        for frame in frames:
+            asyncio.get_running_loop().call_later(delay, self.transport.sendto, frame, addr)
+
+    def _list_frames(self, msg_id, servers):
+        return [jp.encode_message(msg_id, servers=servers)]
+
+    def datagram_received(self, data, addr):
+        decoded = jp.decode_message(data)
+        if decoded is None:
+            return
+        frame, fields = decoded
+        if frame.id == jp.PROTMESSID_CLM_PING_MS_WITHNUMCLIENTS:
+            self._reply(addr, [jp.encode_message(
+                frame.id, time_ms=fields['time_ms'], num_clients=self.record['num_clients'])])
+        elif frame.id == jp.PROTMESSID_CLM_REQ_VERSION_AND_OS:
+            self._reply(addr, [jp.encode_message(jp.PROTMESSID_CLM_VERSION_AND_OS,
+                                                 os=OS_LINUX, version='3.11.0')])
+        elif frame.id == jp.PROTMESSID_CLM_REQ_SERVER_LIST and self.record['listing']:
+            listing = self.record['listing']
+            self._reply(addr, self._list_frames(jp.PROTMESSID_CLM_RED_SERVER_LIST, [
+                {'address': server['address'], 'port': server['port'], 'name': server['name']}
+                for server in listing]))
+            self._reply(addr, self._list_frames(jp.PROTMESSID_CLM_SERVER_LIST, listing))
+
+
+def stub_records(directories, servers, port, rng):
+    """
+    @return: list of records of StubServer, the directories first, each
+             server is listed by one directory
+    """
+    records = []
+    for index in range(directories + servers):
+        max_clients = rng.choice([10, 10, 20, 30, 50])
+        records.append({'address': '127.0.0.1', 'port': port + index,
+                        'country': rng.randrange(1, 250), 'max_clients': max_clients,
+                        'permanent': False, 'name': f'stub-{index:05d}',
+                        'internal_address': '', 'city': rng.choice(['Berlin', 'Chicago',
+                                                                    'Tokyo', '']),
+                        'num_clients': rng.randrange(max_clients + 1), 'listing': None})
+    fields = [name for name, _ in jp.MESSAGE_FIELDS[jp.PROTMESSID_CLM_SERVER_LIST][0][1]]
+    for index, directory in enumerate(records[:directories]):
+        listed = [directory] + records[directories + index::directories]
+        directory['listing'] = [{name: server[name] for name in fields} for server in listed]
+        # the directory itself is sent without address
+        directory['listing'][0]['address'] = '0.0.0.0'
+    return records
+
+
+async def run_stub(args):
+    """
+    Runs the stub directories and servers until interrupted.
+    """
+    raise_file_limit(args.directories + args.servers + 64)
+    rng = random.Random(args.seed)
+    options = StubOptions(args.loss, args.delay)
+    loop = asyncio.get_running_loop()
+    transports = []
+    for record in stub_records(args.directories, args.servers, args.port, rng):
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda record=record: StubServer(record, options, rng),
+            local_addr=(args.bind, record['port']))
+        transports.append(transport)
+    logger.info('%d stub directories on ports %d-%d, %d servers on ports %d-%d',
+                args.directories, args.port, args.port + args.directories - 1, args.servers,
+                args.port + args.directories, args.port + args.directories + args.servers - 1)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for transport in transports:
+            transport.close()
+
+
+def main():
+    p = argparse.ArgumentParser(description='Crawls Jamulus directories and pings the listed '
+                                            'servers.')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    sub = p.add_subparsers(dest='command', required=True)
+
+    crawl = sub.add_parser('crawl', help='query directories and ping their servers')
+    crawl.add_argument('--directory', action='append', type=parse_address,
+                       help='directory as HOST[:PORT], may be repeated (default: the public '
+                            'directories)')
+    crawl.add_argument('--depth', type=int, default=0,
+                       help='also query listed servers for server lists up to this depth')
+    crawl.add_argument('--concurrency', type=int, default=256,
+                       help='maximum number of outstanding requests')
+    crawl.add_argument('--rate', type=float, default=1000.0,
+                       help='maximum packets per second, 0 for no limit')
+    crawl.add_argument('--host-interval', type=float, default=0.005,
+                       help='minimum seconds between packets to the same host')
+    crawl.add_argument('--timeout', type=float, default=1.0, help='seconds to wait for a ping')
+    crawl.add_argument('--retries', type=int, default=2, help='retries of unanswered pings')
+    crawl.add_argument('--list-timeout', type=float, default=3 * SERV_LIST_REQ_UPDATE_TIME_MS /
+                       1000, help='seconds to wait for the server list of a directory')
+    crawl.add_argument('--versions', action='store_true', help='also request server versions')
+    crawl.add_argument('--ttl', type=float, default=300.0,
+                       help='seconds until a cached ping result is probed again')
+    crawl.add_argument('--cache', metavar='FILE', help='keep ping results across runs')
+    crawl.add_argument('--watch', type=float, metavar='SECONDS',
+                       help=f'crawl repeatedly (the client pings every '
+                            f'{PING_UPDATE_TIME_SERVER_LIST_MS / 1000:g} s)')
+    crawl.add_argument('--bind', default='0.0.0.0', help='local address')
+    crawl.add_argument('--json', metavar='FILE', help='write results as JSON ("-" for stdout)')
+
+    stub = sub.add_parser('stub', help='run local stub directories and servers')
+    stub.add_argument('--directories', type=int, default=4, help='number of directories')
+    stub.add_argument('--servers', type=int, default=400,
+                      help='number of servers, spread over the directories')
+    stub.add_argument('--port', type=int, default=22224, help='port of the first directory')
+    stub.add_argument('--bind', default='127.0.0.1', help='local address')
+    stub.add_argument('--loss', type=float, default=0.0, help='probability to drop a reply')
+    stub.add_argument('--delay', type=float, default=0.0, help='maximum reply delay in s')
+    stub.add_argument('--seed', type=int, default=0)
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+    try:
+        asyncio.run(run_crawl(args) if args.command == 'crawl' else run_stub(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
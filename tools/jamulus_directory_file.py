@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Reads, compacts and compares the server list files which a directory
+persists with --directoryfile.
+
+CServerListManager::Save writes one line per registered server, see
+CServerListEntry::toCSV:
+
+    host:port;local_host:port;base64(name);base64(city);country;max_clients;permanent
+
+This module streams such files line by line and keeps the entries in a
+column layout: numbers in typed arrays and strings as ids into a
+StringPool which can be shared by many snapshots. Base64 fields are decoded
+in bulk once per distinct value, so a long history of hourly snapshots,
+which mostly repeat the same servers, costs little more than its first file.
+
+Lines are accepted and interpreted like CServerListManager::Load and
+CServerListEntry::parse do: lines without exactly seven fields, with an
+invalid host address or with an already seen host are skipped.
+
+Usage:
+./tools/jamulus_directory_file.py show serverlist.txt
+./tools/jamulus_directory_file.py diff old.txt new.txt --fields max_clients,country
+./tools/jamulus_directory_file.py compact serverlist.txt -o compacted.txt
+./tools/jamulus_directory_file.py churn snapshots/*.txt --json -
+
+"""
+
+import argparse
+import array
+import base64
+import binascii
+import collections
+import ipaddress
+import itertools
+import json
+import logging
+import re
+import sys
+
+logger = logging.getLogger('')
+
+NUM_FIELDS = 7
+FIELD_SEPARATOR = ';'
+DEFAULT_PORT_NUMBER = 22124  # see src/global.h
+DEFAULT_MAX_CLIENTS = 10  # see CServerListEntry::parse
+MAX_LEN_SERVER_NAME = 20
+MAX_LEN_SERVER_CITY = 20
+# lines which are parsed before they are appended to the columns
+READ_BATCH_LINES = 4096
+
+# column name -> array type code
+COLUMNS = {
+    'host': 'I',
+    'local_address': 'I',
+    'name': 'I',
+    'city': 'I',
+    'country': 'H',
+    'max_clients': 'i',
+    'permanent': 'B',
+}
+STRING_COLUMNS = ('host', 'local_address', 'name', 'city')
+DIFF_FIELDS = ('max_clients', 'country')
+
+Entry = collections.namedtuple('Entry', COLUMNS)
+Diff = collections.namedtuple('Diff', ['joined', 'left', 'changed'])
+
+BASE64_INVALID_RE = re.compile(r'[^A-Za-z0-9+/]')
+
+
+def parse_host_address(text):
+    """
+    Parses an address like NetworkUtil::ParseNetworkAddressBare for IP
+    literals (the only kind toCSV writes).
+
+    @param text: str, IPv4, IPv4:port, IPv6 or [IPv6]:port
+    @return: (ipaddress object, port) or None if invalid
+    """
+    text = text.strip()
+    m = re.match(r'\A\[([^\]]+)\](?::(\d+))?\Z', text)
+    if m:
+        host, port = m.group(1), m.group(2)
+    elif text.count(':') == 1:
+        host, port = text.split(':')
+    else:
+        host, port = text, None
+    try:
+        address = ipaddress.ip_address(host)
+        port = int(port) if port is not None else DEFAULT_PORT_NUMBER
+    except ValueError:
+        return None
+    if not 0 <= port <= 0xffff or (not int(address) and not port):
+        return None
+    return address, port
+
+
+def format_host_address(address, port):
+    """
+    @return: str, like CHostAddress::toString
+    """
+    if address.version == 6:
+        return f'[{address}]:{port}'
+    return f'{address}:{port}'
+
+
+def decode_base64(text):
+    """
+    Decodes leniently like QByteArray::fromBase64: characters outside of
+    the alphabet are ignored and padding is optional.
+
+    @return: bytes
+    """
+    text = BASE64_INVALID_RE.sub('', text.split('=', 1)[0])
+    if len(text) % 4 == 1:
+        text = text[:-1]
+    return binascii.a2b_base64(text + '=' * (-len(text) % 4))
+
+
+class StringPool:
+    """
+    Interns strings and maps them to dense integer ids. Decoded base64
+    values and parsed addresses are memoized per original text.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+        self.decoded = {}
+        self.addresses = {}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __getitem__(self, string_id):
+        return self.strings[string_id]
+
+    def add(self, text):
+        """
+        @return: int, id of the text
+        """
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def add_address(self, text):
+        """
+        @param text: str, host address as written by CHostAddress::toString
+        @return: (id of the normalized address, port) or None if invalid
+        """
+        try:
+            return self.addresses[text]
+        except KeyError:
+            pass
+        address = parse_host_address(text)
+        if address is not None:
+            address = (self.add(format_host_address(*address)), address[1])
+        self.addresses[text] = address
+        return address
+
+    def add_base64(self, tokens, max_len):
+        """
+        Decodes many base64 fields at once, each distinct one only once.
+
+        @param tokens: list of str, base64 encoded UTF-8 text
+        @param max_len: int, length the decoded texts are truncated to
+        @return: list of int, ids of the decoded texts
+        """
+        decoded = self.decoded
+        for token in set(tokens):
+            if (token, max_len) not in decoded:
+                text = decode_base64(token.strip()).decode('utf-8', 'replace')[:max_len]
+                decoded[token, max_len] = self.add(text)
+        return [decoded[token, max_len] for token in tokens]
+
+
+class Snapshot:
+    """
+    Column store of the entries of one server list file.
+
+    All string columns hold ids into the StringPool, so snapshots which are
+    compared with each other have to share the same pool.
+    """
+
+    def __init__(self, pool=None):
+        self.pool = pool if pool is not None else StringPool()
+        self.columns = {name: array.array(code) for name, code in COLUMNS.items()}
+        self.bad_lines = 0
+        self.duplicates = 0
+
+    def __len__(self):
+        return len(self.columns['host'])
+
+    @classmethod
+    def load(cls, path, pool=None):
+        """
+        Reads a server list file.
+
+        @param path: str, file name or '-' for stdin
+        @param pool: StringPool to share with other snapshots
+        @return: Snapshot
+        """
+        snapshot = cls(pool)
+        if path == '-':
+            snapshot.read(sys.stdin)
+        else:
+            with open(path, encoding='utf-8', errors='replace', newline=None) as f:
+                snapshot.read(f)
+        if snapshot.bad_lines or snapshot.duplicates:
+            logger.info('%s: skipped %d bad and %d duplicate lines', path, snapshot.bad_lines,
+                        snapshot.duplicates)
+        return snapshot
+
+    def read(self, lines):
+        """
+        Appends the entries of an iterable of lines. The lines are parsed
+        in batches, so only the columns grow with the size of the file.
+        """
+        rows = self.parse(lines)
+        while True:
+            batch = list(itertools.islice(rows, READ_BATCH_LINES))
+            if not batch:
+                break
+            self._append(batch)
+
+    def parse(self, lines):
+        """
+        Parses lines without storing them. Hosts which are already in the
+        snapshot or were yielded before count as duplicates.
+
+        @param lines: iterable of str
+        @return: generator of (host id, local address id, list of fields)
+        """
+        pool = self.pool
+        seen = set(self.columns['host'])
+        for line in lines:
+            fields = line.rstrip('\r\n').split(FIELD_SEPARATOR)
+            if len(fields) != NUM_FIELDS:
+                self.bad_lines += 1
+                continue
+            host = pool.add_address(fields[0])
+            if host is None:
+                self.bad_lines += 1
+                continue
+            host_id, port = host
+            if host_id in seen:
+                self.duplicates += 1
+                continue
+            seen.add(host_id)
+            local = pool.add_address(fields[1])
+            if local is None or not local[1]:
+                address = parse_host_address(fields[1])
+                local = pool.add_address(format_host_address(
+                    address[0] if address else ipaddress.IPv4Address(0), port))
+            yield host_id, local[0], fields
+
+    def _append(self, rows):
+        pool = self.pool
+        columns = self.columns
+        columns['host'].extend(row[0] for row in rows)
+        columns['local_address'].extend(row[1] for row in rows)
+        columns['name'].extend(pool.add_base64([row[2][2] for row in rows], MAX_LEN_SERVER_NAME))
+        columns['city'].extend(pool.add_base64([row[2][3] for row in rows], MAX_LEN_SERVER_CITY))
+        columns['country'].extend(_parse_country(row[2][4]) for row in rows)
+        columns['max_clients'].extend(_parse_int(row[2][5], DEFAULT_MAX_CLIENTS) for row in rows)
+        columns['permanent'].extend(_parse_int(row[2][6], 0) != 0 for row in rows)
+
+    def entry(self, row):
+        """
+        @return: Entry with the decoded values of a row
+        """
+        values = {name: column[row] for name, column in self.columns.items()}
+        for name in STRING_COLUMNS:
+            values[name] = self.pool[values[name]]
+        values['permanent'] = bool(values['permanent'])
+        return Entry(**values)
+
+    def entries(self):
+        """
+        @return: generator of Entry
+        """
+        return (self.entry(row) for row in range(len(self)))
+
+    def host_rows(self):
+        """
+        @return: dict mapping host ids to rows
+        """
+        return {host_id: row for row, host_id in enumerate(self.columns['host'])}
+
+    def to_csv_lines(self):
+        """
+        Formats all entries like CServerListEntry::toCSV.
+
+        @return: generator of str (without line endings)
+        """
+        for entry in self.entries():
+            yield FIELD_SEPARATOR.join([
+                entry.host,
+                entry.local_address,
+                base64.b64encode(entry.name.encode('utf-8')).decode('ascii'),
+                base64.b64encode(entry.city.encode('utf-8')).decode('ascii'),
+                str(entry.country),
+                str(entry.max_clients),
+                str(int(entry.permanent)),
+            ])
+
+
+def _parse_int(text, default):
+    try:
+        return int(text.strip())
+    except ValueError:
+        return default
+
+
+def _parse_country(text):
+    country = _parse_int(text, 0)
+    # out of range values become QLocale::AnyCountry
+    return country if 0 <= country <= 0xffff else 0
+
+
+def diff(old, new, fields=DIFF_FIELDS):
+    """
+    Compares two snapshots by host address in linear time.
+
+    @param old: Snapshot
+    @param new: Snapshot sharing the StringPool of old
+    @param fields: columns which are compared for hosts in both snapshots
+    @return: Diff of lists: joined (rows of new), left (rows of old) and
+             changed ((old row, new row, [names of changed fields]))
+    """
+    if old.pool is not new.pool:
+        raise ValueError('snapshots must share a StringPool')
+    old_rows = old.host_rows()
+    new_hosts = new.columns['host']
+    joined = []
+    changed = []
+    for new_row, host_id in enumerate(new_hosts):
+        old_row = old_rows.pop(host_id, None)
+        if old_row is None:
+            joined.append(new_row)
+            continue
+        differences = [name for name in fields
+                       if old.columns[name][old_row] != new.columns[name][new_row]]
+        if differences:
+            changed.append((old_row, new_row, differences))
+    return Diff(joined, sorted(old_rows.values()), changed)
+
+
+def diff_to_dict(old, new, result):
+    """
+    @return: dict with the entries of a Diff, suitable for JSON
+    """
+    return {
+        'joined': [new.entry(row)._asdict() for row in result.joined],
+        'left': [old.entry(row)._asdict() for row in result.left],
+        'changed': [{'host': new.entry(new_row).host,
+                     **{name: [old.entry(old_row)._asdict()[name],
+                               new.entry(new_row)._asdict()[name]] for name in names}}
+                    for old_row, new_row, names in result.changed],
+    }
+
+
+def churn(paths, fields=DIFF_FIELDS):
+    """
+    Compares each snapshot with its predecessor.
+
+    @param paths: list of file names, in chronological order
+    @return: list of dicts with the counts per snapshot
+    """
+    pool = StringPool()
+    previous = None
+    rows = []
+    for path in paths:
+        snapshot = Snapshot.load(path, pool)
+        row = {'file': path, 'servers': len(snapshot)}
+        if previous is not None:
+            result = diff(previous, snapshot, fields)
+            row.update(joined=len(result.joined), left=len(result.left),
+                       changed=len(result.changed))
+        rows.append(row)
+        previous = snapshot
+    logger.info('%d snapshots, %d distinct strings', len(rows), len(pool))
+    return rows
+
+
+def print_entries(snapshot):
+    print(f'{"host":<24} {"local address":<24} {"country":>7} {"max":>4} {"perm":>4}  '
+          'name / city')
+    for entry in snapshot.entries():
+        print(f'{entry.host:<24} {entry.local_address:<24} {entry.country:>7} '
+              f'{entry.max_clients:>4} {int(entry.permanent):>4}  {entry.name} / {entry.city}')
+
+
+def print_diff(old, new, result):
+    for row in result.joined:
+        entry = new.entry(row)
+        print(f'+ {entry.host} {entry.name}')
+    for row in result.left:
+        entry = old.entry(row)
+        print(f'- {entry.host} {entry.name}')
+    for old_row, new_row, names in result.changed:
+        old_entry, new_entry = old.entry(old_row), new.entry(new_row)
+        changes = ', '.join(f'{name} {getattr(old_entry, name)} -> {getattr(new_entry, name)}'
+                            for name in names)
+        print(f'~ {new_entry.host} {new_entry.name}: {changes}')
+
+
+def parse_fields(text):
+    fields = tuple(name.strip() for name in text.split(',') if name.strip())
+    unknown = set(fields) - set(COLUMNS) | set(fields) & {'host'}
+    if unknown:
+        raise argparse.ArgumentTypeError(f'unknown fields: {", ".join(sorted(unknown))}')
+    return fields
+
+
+def write_output(lines, path):
+    """
+    @param lines: iterable of str without line endings
+    @param path: str, file name or None for stdout
+    """
+    if path is None:
+        for line in lines:
+            print(line)
+        return
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for line in lines:
+            f.write(line + '\n')
+
+
+def main():
+    p = argparse.ArgumentParser(description='Reads, compacts and compares Jamulus directory '
+                                            'server list files (--directoryfile).')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    sub = p.add_subparsers(dest='command', required=True)
+
+    show = sub.add_parser('show', help='print the entries of a file')
+    show.add_argument('file', help='server list file ("-" for stdin)')
+    show.add_argument('--json', action='store_true', help='print JSON')
+
+    compare = sub.add_parser('diff', help='compare two snapshots')
+    compare.add_argument('old', help='older server list file')
+    compare.add_argument('new', help='newer server list file')
+    compare.add_argument('--fields', type=parse_fields, default=DIFF_FIELDS,
+                         help='comma separated fields to compare '
+                              f'(default: {",".join(DIFF_FIELDS)}; '
+                              f'available: {",".join(c for c in COLUMNS if c != "host")})')
+    compare.add_argument('--json', action='store_true', help='print JSON')
+
+    compact = sub.add_parser('compact',
+                             help='write a file without bad and duplicate lines, re-encoded '
+                                  'like the directory would save it')
+    compact.add_argument('file', help='server list file ("-" for stdin)')
+    compact.add_argument('-o', '--output', help='output file (default: stdout)')
+
+    history = sub.add_parser('churn', help='count joined, left and changed servers '
+                                           'between consecutive snapshots')
+    history.add_argument('files', nargs='+', help='server list files in chronological order')
+    history.add_argument('--fields', type=parse_fields, default=DIFF_FIELDS,
+                         help='comma separated fields to compare')
+    history.add_argument('--json', metavar='FILE', help='write JSON ("-" for stdout)')
+
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+
+    if args.command == 'show':
+        snapshot = Snapshot.load(args.file)
+        if args.json:
+            print(json.dumps([entry._asdict() for entry in snapshot.entries()], indent=2))
+        else:
+            print_entries(snapshot)
+    elif args.command == 'diff':
+        pool = StringPool()
+        old, new = Snapshot.load(args.old, pool), Snapshot.load(args.new, pool)
+        result = diff(old, new, args.fields)
+        if args.json:
+            print(json.dumps(diff_to_dict(old, new, result), indent=2))
+        else:
+            print_diff(old, new, result)
+    elif args.command == 'compact':
+        snapshot = Snapshot.load(args.file)
+        write_output(snapshot.to_csv_lines(), args.output)
+        logger.info('%d entries written', len(snapshot))
+    elif args.command == 'churn':
+        rows = churn(args.files, args.fields)
+        if args.json:
+            write_output([json.dumps(rows, indent=2)], None if args.json == '-' else args.json)
+        else:
+            for row in rows:
+                print(f"{row['file']}: {row['servers']} servers, +{row.get('joined', 0)} "
+                      f"-{row.get('left', 0)} ~{row.get('changed', 0)}")
+
+
+if __name__ == '__main__':
+    main()
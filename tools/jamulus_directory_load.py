@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Scale simulator for a Jamulus directory (a server started with
+--directoryserver).
+
+It impersonates many servers, each with its own local UDP socket. They
+register with PROTMESSID_CLM_REGISTER_SERVER_EX, refresh their
+registration and send NAT keep-alives on the schedule of
+CServerListManager, and eventually leave again: either cleanly with
+PROTMESSID_CLM_UNREGISTER_SERVER or by vanishing silently, in which case the
+directory only drops them after SERVLIST_TIME_OUT_MINUTES.
+
+At the same time, a number of list clients request the server list
+(PROTMESSID_CLM_REQ_SERVER_LIST) as fast as possible or at a given rate.
+The directory answers each request with a reduced and a full server list,
+both of which are sent as one unsplit UDP datagram, so the tool reports their
+sizes and the number of IP fragments they need at the given MTU.
+
+Progress lines show how registration latency, list size and list request
+throughput develop while the list grows. Note that the directory only
+accepts MAX_NUM_SERVERS_IN_SERVER_LIST servers; the others are answered
+with SRR_SERVER_LIST_FULL and are counted as "full".
+
+Usage:
+./tools/jamulus_directory_load.py --directory 127.0.0.1:22224 --servers 2000 --ramp-rate 100
+./tools/jamulus_directory_load.py --servers 500 --lifetime 120 --vanish-fraction 0.2 \
+    --listers 8 --duration 300 --json results.json
+
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import resource
+import time
+
+import jamulus_protocol as jp
+from jamulus_common import Histogram, parse_address, write_json
+
+logger = logging.getLogger('')
+
+# see src/global.h
+MAX_NUM_SERVERS_IN_SERVER_LIST = 150
+SERVLIST_REGIST_INTERV_MINUTES = 15
+SERVLIST_UPDATE_PING_SERVERS_MS = 59000
+REGISTER_SERVER_TIME_OUT_MS = 500
+REGISTER_SERVER_RETRY_LIMIT = 5
+MAX_LEN_SERVER_NAME = 20
+
+# see ESvrRegResult in src/util.h
+REGISTRATION_RESULTS = {
+    0: 'registered',
+    1: 'full',
+    2: 'version_too_old',
+    3: 'requirements',
+}
+
+OS_LINUX = 2  # see COSUtil::EOpSystemType
+
+IPV4_HEADER_BYTES = 20
+UDP_HEADER_BYTES = 8
+
+
+def ip_fragments(payload_size, mtu):
+    """
+    @param payload_size: int, size of a UDP payload in bytes
+    @param mtu: int, maximum IPv4 packet size in bytes
+    @return: int, number of IPv4 fragments needed to send the payload
+    """
+    fragment_payload = (mtu - IPV4_HEADER_BYTES) // 8 * 8
+    return math.ceil((payload_size + UDP_HEADER_BYTES) / fragment_payload)
+
+
+class Scenario:  # pylint: disable=too-many-instance-attributes
+    """
+    Behaviour of the synthetic servers and list clients. Times are in
+    seconds.
+    """
+
+    def __init__(self, refresh_interval=SERVLIST_REGIST_INTERV_MINUTES * 60,
+                 keepalive_interval=SERVLIST_UPDATE_PING_SERVERS_MS / 1000,
+                 lifetime=0.0, vanish_fraction=0.0):
+        self.refresh_interval = refresh_interval
+        self.keepalive_interval = keepalive_interval
+        self.lifetime = lifetime
+        self.vanish_fraction = vanish_fraction
+        self.version = '3.11.0'
+        self.listers = 4
+        self.list_rate = 0.0
+        self.list_timeout = 2.0
+
+    def jittered(self, interval):
+        """
+        @return: float, the interval randomized by +-10 % so that the
+                 servers do not stay in lock step
+        """
+        return interval * random.uniform(0.9, 1.1)
+
+    def draw_lifetime(self):
+        """
+        @return: float, seconds until a new server leaves or None if it stays
+        """
+        return random.expovariate(1 / self.lifetime) if self.lifetime > 0 else None
+
+
+class Stats:  # pylint: disable=too-many-instance-attributes
+    """
+    Counters and histograms of one reporting interval (or of the whole run
+    after merging all intervals).
+    """
+
+    def __init__(self):
+        self.registration = Histogram()
+        self.results = {name: 0 for name in REGISTRATION_RESULTS.values()}
+        self.registration_retries = 0
+        self.registration_timeouts = 0
+        self.unregistered = 0
+        self.vanished = 0
+        self.keepalives_received = 0
+        self.hole_punch_requests = 0
+        self.list_requests = 0
+        self.list_responses = 0
+        self.list_timeouts = 0
+        self.list_latency = Histogram()
+        self.list_entries = 0
+        self.list_bytes = 0
+        self.reduced_list_bytes = 0
+
+    def merge(self, other):
+        """
+        Adds the counters and histograms of another interval. The list size
+        fields keep the largest list seen.
+        """
+        for name in ('registration_retries', 'registration_timeouts', 'unregistered',
+                     'vanished', 'keepalives_received', 'hole_punch_requests', 'list_requests',
+                     'list_responses', 'list_timeouts'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name in ('list_entries', 'list_bytes', 'reduced_list_bytes'):
+            setattr(self, name, max(getattr(self, name), getattr(other, name)))
+        for name, count in other.results.items():
+            self.results[name] += count
+        self.registration.merge(other.registration)
+        self.list_latency.merge(other.list_latency)
+
+    def to_dict(self, mtu):
+        """
+        @param mtu: int, MTU used to calculate the number of IP fragments
+        @return: dict, suitable for JSON
+        """
+        return {
+            'registration_ms': self.registration.to_dict(),
+            'registration_results': dict(self.results),
+            'registration_retries': self.registration_retries,
+            'registration_timeouts': self.registration_timeouts,
+            'unregistered': self.unregistered,
+            'vanished': self.vanished,
+            'keepalives_received': self.keepalives_received,
+            'hole_punch_requests': self.hole_punch_requests,
+            'list_requests': self.list_requests,
+            'list_responses': self.list_responses,
+            'list_timeouts': self.list_timeouts,
+            'list_latency_ms': self.list_latency.to_dict(),
+            'list_entries': self.list_entries,
+            'list_bytes': self.list_bytes,
+            'list_fragments': ip_fragments(self.list_bytes, mtu) if self.list_bytes else 0,
+            'reduced_list_bytes': self.reduced_list_bytes,
+            'reduced_list_fragments':
+                ip_fragments(self.reduced_list_bytes, mtu) if self.reduced_list_bytes else 0,
+        }
+
+
+class SyntheticServer(asyncio.DatagramProtocol):  # pylint: disable=too-many-instance-attributes
+    """
+    One synthetic server, acting like the registering side of
+    CServerListManager as far as the directory can tell.
+    """
+
+    def __init__(self, index, test):
+        self.index = index
+        self.test = test
+        self.transport = None
+        self.state = 'new'
+        self.retries = 0
+        self.request_time = None
+        # one pending timer per purpose, like the QTimers of CServerListManager
+        self.timers = {}
+        self.fields = {
+            'port': 0,
+            'country': random.randint(1, 250),
+            'max_clients': random.choice((4, 8, 10, 16, 30)),
+            'permanent': False,
+            'name': f'sim-{index:06d}'[:MAX_LEN_SERVER_NAME],
+            'internal_address': '',
+            'city': 'Simulated',
+            'os': OS_LINUX,
+            'version': test.scenario.version,
+        }
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.fields['port'] = transport.get_extra_info('sockname')[1]
+
+    def datagram_received(self, data, addr):
+        frame = jp.decode_frame(data)
+        if frame is None:
+            return
+        stats = self.test.stats
+        if frame.id == jp.PROTMESSID_CLM_REGISTER_SERVER_RESP:
+            self.registration_response(frame.data)
+        elif frame.id == jp.PROTMESSID_CLM_EMPTY_MESSAGE:
+            stats.keepalives_received += 1
+        elif frame.id == jp.PROTMESSID_CLM_SEND_EMPTY_MESSAGE:
+            # a real server would now send an empty message to the client
+            # which requested the list in order to open its NAT/firewall
+            stats.hole_punch_requests += 1
+
+    def error_received(self, exc):
+        logger.debug('server %d: %s', self.index, exc)
+
+    def send(self, msg_id, fields=None):
+        self.transport.sendto(jp.encode_message(msg_id, fields))
+
+    def call_later(self, name, delay, callback):
+        """
+        (Re)starts the timer `name`, replacing its pending callback.
+        """
+        timer = self.timers.get(name)
+        if timer is not None:
+            timer.cancel()
+        self.timers[name] = asyncio.get_running_loop().call_later(delay, callback)
+
+    def start(self):
+        """
+        Registers and schedules keep-alives, refreshes and the departure.
+        """
+        scenario = self.test.scenario
+        self.register()
+        self.call_later('keepalive', scenario.jittered(scenario.keepalive_interval),
+                        self.keepalive)
+        lifetime = scenario.draw_lifetime()
+        if lifetime is not None:
+            self.call_later('leave', lifetime, self.leave)
+
+    def register(self, retry=False):
+        """
+        Sends the registration like CServerListManager::SetRegistered and
+        starts the response timeout.
+        """
+        if not retry:
+            self.retries = 0
+            self.request_time = time.monotonic()
+            self.call_later('refresh',
+                            self.test.scenario.jittered(self.test.scenario.refresh_interval),
+                            self.register)
+        if self.state != 'registered':
+            self.state = 'registering'
+        self.send(jp.PROTMESSID_CLM_REGISTER_SERVER_EX, self.fields)
+        self.call_later('response', REGISTER_SERVER_TIME_OUT_MS / 1000,
+                        self.registration_timeout)
+
+    def registration_timeout(self):
+        """
+        Retries like CServerListManager::OnTimerCLRegisterServerResp.
+        """
+        if self.request_time is None:
+            return
+        self.retries += 1
+        if self.retries >= REGISTER_SERVER_RETRY_LIMIT:
+            self.test.stats.registration_timeouts += 1
+            self.request_time = None
+            self.state = 'timeout'
+        else:
+            self.test.stats.registration_retries += 1
+            self.register(retry=True)
+
+    def registration_response(self, data):
+        try:
+            status = jp.decode_body(jp.PROTMESSID_CLM_REGISTER_SERVER_RESP, data)['status']
+        except jp.ProtocolError:
+            return
+        if self.request_time is None:
+            return  # late duplicate response
+        stats = self.test.stats
+        stats.registration.add((time.monotonic() - self.request_time) * 1000)
+        self.request_time = None
+        self.state = REGISTRATION_RESULTS.get(status, f'status_{status}')
+        if self.state in stats.results:
+            stats.results[self.state] += 1
+
+    def keepalive(self):
+        """
+        Keeps the NAT port open like CServerListManager::OnTimerPingServers.
+        """
+        self.send(jp.PROTMESSID_CLM_EMPTY_MESSAGE)
+        self.call_later('keepalive',
+                        self.test.scenario.jittered(self.test.scenario.keepalive_interval),
+                        self.keepalive)
+
+    def leave(self, vanish=None):
+        """
+        Unregisters (or silently disappears) and closes the socket.
+        """
+        if self.state == 'closed':
+            return
+        if vanish is None:
+            vanish = random.random() < self.test.scenario.vanish_fraction
+        if vanish:
+            self.test.stats.vanished += 1
+        else:
+            self.send(jp.PROTMESSID_CLM_UNREGISTER_SERVER)
+            self.test.stats.unregistered += 1
+        self.close()
+        self.test.server_left(self)
+
+    def close(self):
+        for timer in self.timers.values():
+            timer.cancel()
+        self.timers = {}
+        self.state = 'closed'
+        self.transport.close()
+
+
+class ListClient(asyncio.DatagramProtocol):
+    """
+    Requests the server list like a client's connect dialog and waits for the
+    full list which the directory sends after the reduced one.
+    """
+
+    def __init__(self, test):
+        self.test = test
+        self.transport = None
+        self.response = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        frame = jp.decode_frame(data)
+        if frame is None:
+            return
+        stats = self.test.stats
+        if frame.id == jp.PROTMESSID_CLM_RED_SERVER_LIST:
+            stats.reduced_list_bytes = max(stats.reduced_list_bytes, len(data))
+        elif frame.id == jp.PROTMESSID_CLM_SERVER_LIST:
+            try:
+                servers = jp.decode_body(frame.id, frame.data)['servers']
+            except jp.ProtocolError:
+                logger.warning('undecodable server list of %d bytes', len(data))
+                return
+            stats.list_entries = max(stats.list_entries, len(servers))
+            stats.list_bytes = max(stats.list_bytes, len(data))
+            if self.response is not None and not self.response.done():
+                self.response.set_result(None)
+
+    def error_received(self, exc):
+        logger.debug('list client: %s', exc)
+
+    async def run(self, rate, timeout):
+        """
+        Requests lists until cancelled.
+
+        @param rate: float, requests per second or 0 to send the next request
+                     as soon as the previous one was answered
+        @param timeout: float, seconds to wait for an answer
+        """
+        loop = asyncio.get_running_loop()
+        next_request = loop.time()
+        while True:
+            self.response = loop.create_future()
+            stats = self.test.stats
+            stats.list_requests += 1
+            sent = time.monotonic()
+            self.transport.sendto(jp.encode_message(jp.PROTMESSID_CLM_REQ_SERVER_LIST))
+            try:
+                await asyncio.wait_for(self.response, timeout)
+                # stats may have been rotated by a report meanwhile:
+                self.test.stats.list_responses += 1
+                self.test.stats.list_latency.add((time.monotonic() - sent) * 1000)
+            except asyncio.TimeoutError:
+                self.test.stats.list_timeouts += 1
+            if rate > 0:
+                next_request = max(next_request + 1 / rate, loop.time())
+                await asyncio.sleep(next_request - loop.time())
+
+
+class DirectoryLoadTest:  # pylint: disable=too-many-instance-attributes
+    """
+    Adds servers at a given rate, replaces departed ones and keeps the list
+    clients busy until the end of the run.
+    """
+
+    def __init__(self, directory, scenario, bind=None, mtu=1500):
+        self.directory = directory
+        self.scenario = scenario
+        self.bind = bind
+        self.mtu = mtu
+        self.servers = set()
+        self.num_created = 0
+        self.stats = Stats()
+        self.total = Stats()
+        self.timeline = []
+        self.start = None
+
+    async def open(self, factory):
+        loop = asyncio.get_running_loop()
+        local_addr = (self.bind, 0) if self.bind else None
+        _, protocol = await loop.create_datagram_endpoint(factory, remote_addr=self.directory,
+                                                          local_addr=local_addr)
+        return protocol
+
+    async def add_server(self):
+        server = await self.open(lambda: SyntheticServer(self.num_created, self))
+        self.num_created += 1
+        self.servers.add(server)
+        server.start()
+
+    def server_left(self, server):
+        self.servers.discard(server)
+
+    async def start_listers(self):
+        """
+        @return: list of (ListClient, asyncio.Task)
+        """
+        listers = []
+        for _ in range(self.scenario.listers):
+            client = await self.open(lambda: ListClient(self))
+            listers.append((client, asyncio.ensure_future(
+                client.run(self.scenario.list_rate, self.scenario.list_timeout))))
+        return listers
+
+    async def run(self, num_servers, ramp_rate, duration, report_interval):
+        """
+        @param num_servers: int, number of servers to keep registered
+        @param ramp_rate: float, new servers per second (also for replacements)
+        @param duration: float, seconds to run after the initial ramp up
+        @param report_interval: float, seconds between progress lines
+        """
+        loop = asyncio.get_running_loop()
+        self.start = loop.time()
+        listers = await self.start_listers()
+        next_server = self.start
+        next_report = self.start + report_interval
+        end = None
+        try:
+            while end is None or loop.time() < end:
+                now = loop.time()
+                while len(self.servers) < num_servers and next_server <= now:
+                    await self.add_server()
+                    next_server += 1 / ramp_rate
+                if len(self.servers) >= num_servers:
+                    next_server = max(next_server, now)
+                    if end is None:
+                        end = now + duration
+                if now >= next_report:
+                    self.report(now - self.start)
+                    next_report += report_interval
+                wake = min(next_report, end or math.inf)
+                if len(self.servers) < num_servers:
+                    wake = min(wake, next_server)
+                await asyncio.sleep(max(0.0, min(wake - loop.time(), 0.1)))
+            self.report(loop.time() - self.start)
+        finally:
+            for client, task in listers:
+                task.cancel()
+                client.transport.close()
+            self.close()
+
+    def report(self, elapsed):
+        """
+        Logs a one line summary of the last interval and starts a new one.
+        """
+        stats, self.stats = self.stats, Stats()
+        self.total.merge(stats)
+        states = [server.state for server in self.servers]
+        row = {
+            'elapsed': round(elapsed, 3),
+            'servers': len(states),
+            'registered': states.count('registered'),
+            'full': states.count('full'),
+            'pending': states.count('registering') + states.count('new'),
+            **stats.to_dict(self.mtu),
+        }
+        self.timeline.append(row)
+        interval = elapsed - (self.timeline[-2]['elapsed'] if len(self.timeline) > 1 else 0)
+        logger.info('%6.1fs servers: %d registered, %d full, %d pending; '
+                    'registration p50/p99 %s/%s ms; list: %d entries, %d bytes (%d fragments), '
+                    '%.1f req/s, p50/p99 %s/%s ms, %d timeouts',
+                    elapsed, row['registered'], row['full'], row['pending'],
+                    row['registration_ms'].get('p50'), row['registration_ms'].get('p99'),
+                    row['list_entries'], row['list_bytes'], row['list_fragments'],
+                    stats.list_responses / interval if interval > 0 else 0.0,
+                    row['list_latency_ms'].get('p50'), row['list_latency_ms'].get('p99'),
+                    row['list_timeouts'])
+
+    def close(self):
+        """
+        Unregisters all remaining servers.
+        """
+        for server in list(self.servers):
+            server.leave(vanish=False)
+
+    def results(self):
+        """
+        @return: dict, suitable for JSON
+        """
+        return {
+            'directory': f'{self.directory[0]}:{self.directory[1]}',
+            'servers_created': self.num_created,
+            'mtu': self.mtu,
+            'total': self.total.to_dict(self.mtu),
+            'timeline': self.timeline,
+        }
+
+
+def raise_file_limit(needed):
+    """
+    Raises the soft limit of open files up to the hard limit if the
+    requested number of sockets would not fit.
+
+    @return: int, the resulting limit
+    """
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        soft = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    return soft
+
+
+def main():
+    p = argparse.ArgumentParser(description='Registers synthetic servers with a Jamulus '
+                                            'directory and requests its server list.')
+    p.add_argument('--directory', default=f'127.0.0.1:{jp.DEFAULT_PORT_NUMBER}',
+                   type=parse_address, help='directory address as HOST[:PORT]')
+    p.add_argument('--servers', type=int, default=200,
+                   help='number of synthetic servers to keep alive '
+                        f'(the directory lists at most {MAX_NUM_SERVERS_IN_SERVER_LIST})')
+    p.add_argument('--ramp-rate', type=float, default=20.0,
+                   help='number of servers which register per second')
+    p.add_argument('--duration', type=float, default=60.0,
+                   help='seconds to keep running after all servers were added')
+    p.add_argument('--lifetime', type=float, default=0.0,
+                   help='mean lifetime of a server in seconds (exponentially distributed); '
+                        'departed servers are replaced by new ones; 0 keeps all servers')
+    p.add_argument('--vanish-fraction', type=float, default=0.0,
+                   help='fraction of departing servers which do not unregister')
+    p.add_argument('--refresh-interval', type=float, default=SERVLIST_REGIST_INTERV_MINUTES * 60,
+                   help='seconds between registration refreshes')
+    p.add_argument('--keepalive-interval', type=float,
+                   default=SERVLIST_UPDATE_PING_SERVERS_MS / 1000,
+                   help='seconds between NAT keep-alive messages to the directory')
+    p.add_argument('--listers', type=int, default=4,
+                   help='number of concurrent clients requesting the server list')
+    p.add_argument('--list-rate', type=float, default=0.0,
+                   help='list requests per second and list client '
+                        '(0: request again as soon as a list arrived)')
+    p.add_argument('--list-timeout', type=float, default=2.0,
+                   help='seconds to wait for a server list')
+    p.add_argument('--version', default='3.11.0',
+                   help='version reported by the synthetic servers')
+    p.add_argument('--bind', help='local address for all sockets')
+    p.add_argument('--mtu', type=int, default=1500,
+                   help='MTU used to calculate the number of IP fragments of a list')
+    p.add_argument('--report-interval', type=float, default=5.0,
+                   help='seconds between progress lines')
+    p.add_argument('--json', metavar='FILE',
+                   help='write the results and the timeline as JSON ("-" for stdout)')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(levelname)s %(message)s')
+
+    if args.servers < 1 or args.ramp_rate <= 0:
+        p.error('--servers and --ramp-rate must be positive')
+    if not 0 <= args.vanish_fraction <= 1:
+        p.error('--vanish-fraction must be between 0 and 1')
+    needed = args.servers + args.listers + 64
+    if raise_file_limit(needed) < needed:
+        p.error(f'the open file limit is too low for {args.servers} sockets, see ulimit -n')
+
+    scenario = Scenario(args.refresh_interval, args.keepalive_interval, args.lifetime,
+                        args.vanish_fraction)
+    scenario.version = args.version
+    scenario.listers = args.listers
+    scenario.list_rate = args.list_rate
+    scenario.list_timeout = args.list_timeout
+    test = DirectoryLoadTest(args.directory, scenario, args.bind, args.mtu)
+
+    try:
+        asyncio.run(test.run(args.servers, args.ramp_rate, args.duration, args.report_interval))
+    except KeyboardInterrupt:
+        logger.info('interrupted')
+    results = test.results()
+    logger.info('%d servers created, total: %s', results['servers_created'],
+                json.dumps(results['total']))
+    write_json(results, args.json)
+
+
+if __name__ == '__main__':
+    main()
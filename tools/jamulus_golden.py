@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Recomputes the golden values of the tools which model server code in
+Python from the unmodified C++ sources in src/.
+
+The needed classes are extracted from the Jamulus sources at build time
+(without Qt) and compiled with a small harness next to this script:
+
+- jitter-buffer: CNetBufWithStats of src/buffer.cpp, driven by
+  jamulus_golden_jitter_buffer.cpp with the events of the golden traces of
+  jamulus_jitter_buffer.py, to check its GOLDEN_SCENARIOS.
+- mix: the gain loop of CServer::DecodeReceiveData and the mixing part of
+  CServer::MixEncodeTransmitData of src/server.cpp, driven by
+  jamulus_golden_mix.cpp with the synthetic inputs of the GOLDEN_SCENARIOS
+  of jamulus_mix.py, to check its GOLDEN_DIGESTS.
+- opus: the Opus custom encoder of libs/opus, set up like the encoders of
+  CClient in src/client.cpp by jamulus_golden_opus.cpp, to check the
+  OPUS_FRAMES of jamulus_opus_frames.py which the synthetic clients of
+  jamulus_load_test.py send, and their OPUS_NUM_BYTES against src/client.h.
+
+By default, the C++ results are compared with the golden values of the
+tool. --print prints them in the form of the tool's tables instead, e.g.
+after a change of the C++ code.
+
+A C++17 compiler is needed (c++ or $CXX), for opus also a C compiler (cc
+or $CC).
+
+Usage:
+./tools/jamulus_golden.py jitter-buffer
+./tools/jamulus_golden.py jitter-buffer --print
+./tools/jamulus_golden.py mix
+./tools/jamulus_golden.py opus --print
+
+"""
+
+import argparse
+import hashlib
+import itertools
+import logging
+import math
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+
+import jamulus_jitter_buffer as jb
+import jamulus_load_test as jlt
+import jamulus_mix as jm
+import jamulus_opus_frames as jo
+import jamulus_protocol as jp
+from jamulus_common import exit_on_error
+
+logger = logging.getLogger('')
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SRC_DIR = os.path.join(os.path.dirname(TOOLS_DIR), 'src')
+
+# the block size does not matter for the buffer logic
+JITTER_BUFFER_BLOCK_SIZE = 10
+
+
+# C++ extraction --------------------------------------------------------------
+def _block_end(source, start):
+    """
+    @return: int, index after the brace which closes the first block at or
+             after start (and after a following semicolon)
+    """
+    depth = 0
+    for match in re.finditer(r'[{}]', source[start:]):
+        depth += 1 if match.group() == '{' else -1
+        if depth == 0:
+            end = start + match.end()
+            return end + 1 if source[end:end + 1] == ';' else end
+    raise RuntimeError('unbalanced braces')
+
+
+def extract(source, pattern):
+    """
+    @param pattern: str, regular expression matching the beginning of a
+                    class or function definition
+    @return: str, the whole definition
+    """
+    match = re.search(pattern, source, re.MULTILINE)
+    if match is None:
+        raise RuntimeError(f'{pattern!r} not found in the Jamulus sources')
+    return source[match.start():_block_end(source, match.start())]
+
+
+def extract_class(source, name, skip=()):
+    """
+    @param name: str, name of a class or class template
+    @param skip: names of members to leave out (e.g. ones which need Qt)
+    @return: str, the class and the out-of-class definitions of its members
+    """
+    definition = extract(source, rf'^(template<class TData>\n)?class {name}\b')
+    parts = ['\n'.join(line for line in definition.split('\n')
+                       if not any(member in line for member in skip))]
+    for match in re.finditer(rf'^template<class TData>\n[^\n(]*\b{name}<TData>::(\w+)', source,
+                             re.MULTILINE):
+        if match.group(1) not in skip:
+            parts.append(source[match.start():_block_end(source, match.start())])
+    return '\n\n'.join(parts)
+
+
+def extract_defines(source, names):
+    """
+    @return: str, the #define lines of the given macros
+    """
+    lines = []
+    for name in names:
+        match = re.search(rf'^#define {name}\b.*$', source, re.MULTILINE)
+        if match is None:
+            raise RuntimeError(f'#define {name} not found in the Jamulus sources')
+        lines.append(match.group())
+    return '\n'.join(lines)
+
+
+def read_source(src_dir, name):
+    """
+    @return: str, content of a file in src/
+    """
+    with open(os.path.join(src_dir, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def compile_harness(cxx, harness, sources, directory, flags=()):
+    """
+    @param harness: str, file name of the harness next to this script
+    @param sources: list of further .cpp or object files and libraries
+    @param directory: str, directory with the extracted headers, also
+                      receives the executable
+    @param flags: further compiler options
+    @return: str, path of the executable
+    """
+    executable = os.path.join(directory, 'harness')
+    command = [cxx, '-std=c++17', '-O2', '-I', directory, *flags,
+               os.path.join(TOOLS_DIR, harness), *sources, '-o', executable]
+    logger.debug('%s', ' '.join(command))
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    if result.returncode:
+        raise RuntimeError(f'building {harness} failed:\n{result.stderr}')
+    return executable
+
+
+def run_harness(executable, lines):
+    """
+    @param lines: list of str, input of the harness
+    @return: list of str, output lines
+    """
+    result = subprocess.run([executable], input='\n'.join(lines) + '\n', capture_output=True,
+                            text=True, check=False)
+    if result.returncode:
+        raise RuntimeError(f'the harness failed with exit status {result.returncode}')
+    return result.stdout.splitlines()
+
+
+def write_headers(src_dir, directory, util_parts, defines):
+    """
+    Writes a Qt-free util.h and global.h with the given parts of the
+    originals to directory.
+
+    @param util_parts: list of str, definitions extracted from src/util.h
+    @param defines: list of str, names of macros of src/global.h
+    """
+    with open(os.path.join(directory, 'global.h'), 'w', encoding='utf-8') as f:
+        f.write('// extracted from src/global.h by tools/jamulus_golden.py\n#pragma once\n')
+        f.write(extract_defines(read_source(src_dir, 'global.h'), defines) + '\n')
+    with open(os.path.join(directory, 'util.h'), 'w', encoding='utf-8') as f:
+        f.write('// extracted from src/util.h by tools/jamulus_golden.py\n'
+                '#pragma once\n#include "global.h"\n#include <algorithm>\n'
+                '#include <cmath>\n#include <cstdint>\n#include <vector>\n\n')
+        f.write('\n\n'.join(util_parts) + '\n')
+
+
+# Jitter buffer ----------------------------------------------------------------
+def build_jitter_buffer(src_dir, cxx, directory):
+    """
+    Writes util.h and global.h with the parts which src/buffer.cpp needs,
+    copies src/buffer.{h,cpp} next to them and builds the harness.
+
+    @return: str, path of the executable
+    """
+    util = read_source(src_dir, 'util.h')
+    write_headers(src_dir, directory,
+                  [extract_class(util, 'CVector', skip=['StringFiFoWithCompare']),
+                   extract_class(util, 'CMovingAv'), extract(util, r'^class MathUtils\b'),
+                   extract(util, r'^class CErrorRate\b')],
+                  ['AUD_MIX_FADER_MAX', 'AUD_MIX_FADER_RANGE_DB'])
+    for name in ('buffer.h', 'buffer.cpp'):
+        shutil.copy(os.path.join(src_dir, name), directory)
+    return compile_harness(cxx, 'jamulus_golden_jitter_buffer.cpp',
+                           [os.path.join(directory, 'buffer.cpp')], directory)
+
+
+def jitter_buffer_events(scenario):
+    """
+    Puts and Gets of a golden scenario in the order of jb.TickGrid: one Get
+    per period, starting offset after the first arrival and ending with the
+    first Get after the last arrival, each preceded by the packets which
+    arrived up to it.
+
+    @return: list of str, input of the harness
+    """
+    s = scenario
+    trace = jb.golden_trace(s)
+    times, seqs = trace.times.tolist(), trace.seqs.tolist()
+    double_frame = s['frame_size'] == jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES
+    # CChannel resizes the buffer to the auto setting only for clients
+    # which send sequence numbers
+    lines = [f"I {JITTER_BUFFER_BLOCK_SIZE} {s['initial_size']} {int(s['sequence_numbers'])} "
+             f"{int(double_frame)} {s['blocks_per_packet']} {int(s['sequence_numbers'])}"]
+    start = times[0] + s['offset']
+    gets = max(0, -((start - times[-1]) // s['period'])) + 1
+    packets = iter(zip(times, seqs))
+    pending = next(packets, None)
+    for tick in range(gets):
+        while pending is not None and pending[0] <= start + tick * s['period']:
+            lines.append(f'P {pending[1] & 0xFF}')
+            pending = next(packets, None)
+        lines.append('G')
+    return lines
+
+
+def jitter_buffer_results(executable, scenario):
+    """
+    @return: dict in the form of GOLDEN_SCENARIOS[i]['expected']
+    """
+    output = [line.split() for line in run_harness(executable, jitter_buffer_events(scenario))]
+    gets = [fields for fields in output if fields[0] == 'G']
+    return {
+        'auto': [(int(setting), len(list(run)))
+                 for setting, run in itertools.groupby(fields[2] for fields in gets)],
+        'main_errors': sum(fields[1] == '0' for fields in gets),
+        'main_put_errors': sum(fields == ['P', '0'] for fields in output),
+        'rates': [float(rate) for rate in gets[-1][3:]],
+    }
+
+
+def check_jitter_buffer(args):
+    """
+    @return: bool, True if the C++ results equal the golden values
+    """
+    passed = True
+    with tempfile.TemporaryDirectory() as directory:
+        executable = build_jitter_buffer(args.src, args.cxx, directory)
+        for scenario in jb.GOLDEN_SCENARIOS:
+            actual = jitter_buffer_results(executable, scenario)
+            if args.print:
+                print(f"{scenario['name']}: {actual!r}")
+            elif actual != scenario['expected']:
+                failed = [key for key, value in actual.items()
+                          if scenario['expected'][key] != value]
+                logger.error('%s: mismatch in %s', scenario['name'], ', '.join(failed))
+                passed = False
+            else:
+                logger.info('%s: OK', scenario['name'])
+    return passed
+
+
+# Mix -------------------------------------------------------------------------
+def build_mix(src_dir, cxx, directory):
+    """
+    Writes util.h and global.h with the parts which the mixing code needs,
+    extracts the gain loop of CServer::DecodeReceiveData and the mixing part
+    of CServer::MixEncodeTransmitData (up to the Opus encoding) and builds
+    the harness.
+
+    @return: str, path of the executable
+    """
+    util = read_source(src_dir, 'util.h')
+    write_headers(src_dir, directory,
+                  [extract_class(util, 'CVector', skip=['StringFiFoWithCompare']),
+                   extract(util, r'^class MathUtils\b'),
+                   extract(util, r'^inline short Float2Short\b')],
+                  ['_MAXSHORT', '_MINSHORT', 'MAX_DELAY_PANNING_SAMPLES', 'AUD_MIX_FADER_MAX',
+                   'AUD_MIX_FADER_RANGE_DB'])
+    server = read_source(src_dir, 'server.cpp')
+    with open(os.path.join(directory, 'server_gains.inc'), 'w', encoding='utf-8') as f:
+        f.write(extract(server, r'^ *// get gains of all connected channels$') + '\n')
+    function = extract(server, r'^void CServer::MixEncodeTransmitData\b')
+    end = re.search(r'^ *int +iClientFrameSizeSamples\b', function, re.MULTILINE)
+    if end is None:
+        raise RuntimeError('the end of the mixing code was not found in src/server.cpp')
+    with open(os.path.join(directory, 'server_mix.inc'), 'w', encoding='utf-8') as f:
+        f.write(function[:end.start()].rstrip() + '\n}\n')
+    return compile_harness(cxx, 'jamulus_golden_mix.cpp', [], directory)
+
+
+def mix_input(scenario):
+    """
+    @return: list of str, input of the harness for a golden scenario
+    """
+    s = scenario
+    wire, frames = jm.synthetic_wire_inputs(s)
+    fade_in_max = s.get('fade_in', 0)
+    # a muted channel is one whose gain was set to 0
+    gains = [0 if muted else gain
+             for gain, muted in zip(wire.gains.ravel().tolist(), wire.muted.ravel().tolist())]
+    fade_in = wire.fade_in.tolist() if fade_in_max else []
+    return [f"{s['clients']} {s['frame_size']} {int(bool(s.get('delay_pan')))} "
+            f"{s['frames']} {fade_in_max}"] + [
+                ' '.join(map(str, values))
+                for values in (wire.channels.tolist(), fade_in, gains, wire.pans.ravel().tolist(),
+                               frames.ravel().tolist())]
+
+
+def mix_digest(executable, scenario):
+    """
+    @return: str, SHA-256 of the samples sent to each channel, see jm.digest()
+    """
+    output = run_harness(executable, mix_input(scenario))
+    if output[-1:] != ['END']:
+        raise RuntimeError('incomplete output of the harness')
+    samples = [int(value) for value in output[:-1]]
+    return hashlib.sha256(struct.pack(f'<{len(samples)}h', *samples)).hexdigest()
+
+
+def check_mix(args):
+    """
+    @return: bool, True if the C++ results equal the golden digests
+    """
+    passed = True
+    with tempfile.TemporaryDirectory() as directory:
+        executable = build_mix(args.src, args.cxx, directory)
+        for scenario in jm.GOLDEN_SCENARIOS:
+            actual = mix_digest(executable, scenario)
+            if args.print:
+                print(f"    '{scenario['name']}': '{actual}',")
+            elif actual != jm.GOLDEN_DIGESTS[scenario['name']]:
+                logger.error('%s: digest %s, expected %s', scenario['name'], actual,
+                             jm.GOLDEN_DIGESTS[scenario['name']])
+                passed = False
+            else:
+                logger.info('%s: OK', scenario['name'])
+    return passed
+
+
+# Opus -------------------------------------------------------------------------
+def build_opus(src_dir, cxx, cc, directory):
+    """
+    Compiles the CELT sources of libs/opus which Jamulus.pro lists in
+    SOURCES_OPUS, with CUSTOM_MODES, writes util.h and global.h with the
+    parts which the harness needs and builds it.
+
+    @param cc: str, C compiler
+    @return: str, path of the executable
+    """
+    root = os.path.dirname(os.path.abspath(src_dir))
+    with open(os.path.join(root, 'Jamulus.pro'), encoding='utf-8') as f:
+        match = re.search(r'^SOURCES_OPUS = .*?\n\n', f.read(), re.MULTILINE | re.DOTALL)
+    if match is None:
+        raise RuntimeError('SOURCES_OPUS not found in Jamulus.pro')
+    opus = os.path.join(root, 'libs', 'opus')
+    includes = ['-I', os.path.join(opus, 'include'), '-I', os.path.join(opus, 'celt'), '-I', opus]
+    objects = []
+    # like DEFINES_OPUS in Jamulus.pro, without the run-time CPU detection
+    # of the SIMD code
+    for source in re.findall(r'libs/opus/celt/\w+\.c', match.group()):
+        objects.append(os.path.join(directory, os.path.basename(source)[:-2] + '.o'))
+        command = [cc, '-c', '-O2', '-DOPUS_BUILD=1', '-DUSE_ALLOCA=1', '-DHAVE_LRINTF=1',
+                   '-DHAVE_LRINT=1', '-DCUSTOM_MODES', *includes, os.path.join(root, source),
+                   '-o', objects[-1]]
+        logger.debug('%s', ' '.join(command))
+        result = subprocess.run(command, capture_output=True, text=True, check=False)
+        if result.returncode:
+            raise RuntimeError(f'building {source} failed:\n{result.stderr}')
+
+    util = read_source(src_dir, 'util.h')
+    write_headers(src_dir, directory,
+                  [extract_class(util, 'CVector', skip=['StringFiFoWithCompare']),
+                   extract(util, r'^inline int CalcBitRateBitsPerSecFromCodedBytes\b')],
+                  ['SYSTEM_SAMPLE_RATE_HZ', 'SYSTEM_FRAME_SIZE_SAMPLES',
+                   'DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES'])
+    return compile_harness(cxx, 'jamulus_golden_opus.cpp', [*objects, '-lm'], directory,
+                           includes)
+
+
+def opus_input(frame_samples, num_channels, coded_bytes):
+    """
+    @return: list of str, input of the harness for one table entry: the
+             test signal of jamulus_opus_frames.py for the warm-up and the
+             table frames
+    """
+    count = jo.WARMUP_FRAMES + jo.NUM_FRAMES
+    step = 2 * math.pi * jo.SIGNAL_FREQUENCY_HZ / jp.SYSTEM_SAMPLE_RATE_HZ
+    samples = []
+    for i in range(count * frame_samples):
+        samples += [round(jo.SIGNAL_AMPLITUDE * math.sin(step * i))] * num_channels
+    return [f'{frame_samples} {num_channels} {coded_bytes} {count}', ' '.join(map(str, samples))]
+
+
+def check_opus_num_bytes(src_dir):
+    """
+    @return: bool, True if jlt.OPUS_NUM_BYTES equals the sizes of src/client.h
+    """
+    client = read_source(src_dir, 'client.h')
+    passed = True
+    for (frame_samples, num_channels), sizes in jlt.OPUS_NUM_BYTES.items():
+        for quality, coded_bytes in sizes.items():
+            name = (f"OPUS_NUM_BYTES_{'MONO' if num_channels == 1 else 'STEREO'}_"
+                    f"{quality.upper()}_QUALITY")
+            if frame_samples == jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES:
+                name += '_DBLE_FRAMESIZE'
+            expected = int(extract_defines(client, [name]).split()[-1])
+            if coded_bytes != expected:
+                logger.error('OPUS_NUM_BYTES: %d instead of %s (%d)', coded_bytes, name, expected)
+                passed = False
+    return passed
+
+
+def check_opus(args):
+    """
+    @return: bool, True if the encoded frames equal the OPUS_FRAMES table
+    """
+    passed = check_opus_num_bytes(args.src)
+    with tempfile.TemporaryDirectory() as directory:
+        executable = build_opus(args.src, args.cxx, args.cc, directory)
+        for (frame_samples, num_channels), sizes in jlt.OPUS_NUM_BYTES.items():
+            for coded_bytes in sizes.values():
+                key = (frame_samples, num_channels, coded_bytes)
+                output = run_harness(executable, opus_input(*key))
+                actual = ''.join(output[jo.WARMUP_FRAMES:])
+                if args.print:
+                    print(f'    {key}: bytes.fromhex(')
+                    lines = [actual[i:i + 86] for i in range(0, len(actual), 86)]
+                    print('\n'.join(f"        '{line}'" for line in lines) + '),')
+                elif bytes.fromhex(actual) != jo.OPUS_FRAMES.get(key):
+                    logger.error('%s: frames differ', key)
+                    passed = False
+                else:
+                    logger.info('%s: OK', key)
+    return passed
+
+
+CHECKS = {
+    'jitter-buffer': check_jitter_buffer,
+    'mix': check_mix,
+    'opus': check_opus,
+}
+
+
+def run(args):
+    """
+    Runs the selected check and exits with status 1 if it failed.
+    """
+    if not CHECKS[args.command](args):
+        sys.exit(1)
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description='Recomputes golden values from the unmodified C++ sources.')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    sub = p.add_subparsers(dest='command', required=True)
+    jitter = sub.add_parser('jitter-buffer', help='CNetBufWithStats of src/buffer.cpp')
+    mix = sub.add_parser('mix', help='the mixing code of src/server.cpp')
+    opus = sub.add_parser('opus', help='the Opus frames of the synthetic clients')
+    opus.add_argument('--cc', default=os.environ.get('CC', 'cc'),
+                      help='C compiler (default: $CC or cc)')
+    for parser in (jitter, mix, opus):
+        parser.add_argument('--src', default=DEFAULT_SRC_DIR,
+                            help='Jamulus source directory (default: %(default)s)')
+        parser.add_argument('--cxx', default=os.environ.get('CXX', 'c++'),
+                            help='C++ compiler (default: $CXX or c++)')
+        parser.add_argument('--print', action='store_true',
+                            help='print the C++ results instead of comparing them')
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+
+    # ValueError: output of a harness which cannot be parsed
+    exit_on_error(run, args, errors=(OSError, RuntimeError, ValueError))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+/******************************************************************************\
+ * Copyright (c) 2026
+ *
+ * Author(s):
+ *  The Jamulus Development Team
+ *
+ * As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+ * under AGPL 3.0 or any later version.
+ *
+ * Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+ * This code will be licensed under GPL 3.0 (or any later version) from
+ * 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+ * the combined work, including network use provisions.
+ *
+ ******************************************************************************
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Affero General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU Affero General Public License for more details.
+ *
+ * You should have received a copy of the GNU Affero General Public License
+ * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+ *
+ * ---------------------------------------------------------------------------
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+ *
+\******************************************************************************/
+
+/* Golden value harness for tools/jamulus_jitter_buffer.py: drives the
+ * unmodified CNetBufWithStats of src/buffer.cpp with events read from stdin
+ * and prints the result of each of them. It is built and run by
+ * tools/jamulus_golden.py jitter-buffer.
+ *
+ * Input: one line "I blockSize numBlocks useSeq doubleFrame blocksPerPacket
+ * autoResize", followed by the events
+ *   P seq  put a packet whose (first) sequence number is seq,
+ *   G      get one block.
+ * Output: "P ok" per put and "G ok autoSetting errorRates..." per get.
+ */
+
+#include "buffer.h"
+#include <cstdio>
+
+int main()
+{
+    int blockSize, numBlocks, useSeq, doubleFrame, blocksPerPacket, autoResize;
+
+    if ( scanf ( "I %d %d %d %d %d %d\n", &blockSize, &numBlocks, &useSeq, &doubleFrame, &blocksPerPacket, &autoResize ) != 6 )
+    {
+        return 1;
+    }
+
+    CNetBufWithStats buf;
+    buf.SetUseDoubleSystemFrameSize ( doubleFrame != 0 );
+    buf.Init ( blockSize, numBlocks, useSeq != 0 );
+
+    const int        inSize = blocksPerPacket * ( blockSize + ( useSeq ? 1 : 0 ) );
+    CVector<uint8_t> data ( inSize, 0 );
+    CVector<uint8_t> out ( blockSize, 0 );
+    CVector<double>  rates;
+    double           limit, maxUpLimit;
+    char             op;
+
+    while ( scanf ( " %c", &op ) == 1 )
+    {
+        if ( op == 'P' )
+        {
+            int seq;
+            if ( scanf ( "%d", &seq ) != 1 )
+            {
+                return 1;
+            }
+            // the sequence number follows each block, see CChannel::PrepAndSendPacket
+            for ( int b = 0; useSeq && b < blocksPerPacket; b++ )
+            {
+                data[b * ( blockSize + 1 ) + blockSize] = static_cast<uint8_t> ( seq + b );
+            }
+            printf ( "P %d\n", buf.Put ( data, inSize ) ? 1 : 0 );
+        }
+        else if ( op == 'G' )
+        {
+            const bool ok = buf.Get ( out, blockSize );
+            buf.GetErrorRates ( rates, limit, maxUpLimit );
+            printf ( "G %d %d", ok ? 1 : 0, buf.GetAutoSetting() );
+            for ( int i = 0; i < rates.Size(); i++ )
+            {
+                printf ( " %.17g", rates[i] );
+            }
+            printf ( "\n" );
+
+            // like CChannel::UpdateSocketBufferSize with the auto setting enabled
+            if ( autoResize && buf.GetAutoSetting() != numBlocks )
+            {
+                numBlocks = buf.GetAutoSetting();
+                buf.Init ( blockSize, numBlocks, useSeq != 0, true );
+            }
+        }
+    }
+    return 0;
+}
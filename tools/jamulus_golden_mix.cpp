@@ -0,0 +1,207 @@
+/******************************************************************************\
+ * Copyright (c) 2026
+ *
+ * Author(s):
+ *  The Jamulus Development Team
+ *
+ * As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+ * under AGPL 3.0 or any later version.
+ *
+ * Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+ * This code will be licensed under GPL 3.0 (or any later version) from
+ * 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+ * the combined work, including network use provisions.
+ *
+ ******************************************************************************
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Affero General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU Affero General Public License for more details.
+ *
+ * You should have received a copy of the GNU Affero General Public License
+ * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+ *
+ * ---------------------------------------------------------------------------
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+ *
+\******************************************************************************/
+
+/* Golden value harness for tools/jamulus_mix.py: runs the gain loop of
+ * CServer::DecodeReceiveData and the mixing part of
+ * CServer::MixEncodeTransmitData of src/server.cpp, which
+ * tools/jamulus_golden.py mix extracts unmodified into server_gains.inc and
+ * server_mix.inc, for the inputs read from stdin.
+ *
+ * Input, repeated for each scenario:
+ *   clients frameSize delayPan frames fadeInMax
+ *   the audio channels of each client
+ *   the fade-in counter of each client
+ *   the gain of each client in each mix as received in PROTMESSID_CHANNEL_GAIN
+ *   the pan of each client in each mix as received in PROTMESSID_CHANNEL_PAN
+ *   2 * frameSize samples per client and frame
+ * Output: the samples sent to each client per frame, then "END".
+ */
+
+#include "util.h"
+#include <cstdio>
+#include <cstdlib>
+
+// the parts of CChannel which the gain loop uses, see src/channel.cpp
+class CChannel
+{
+public:
+    void  SetGain ( const int iChanID, const float fNewGain ) { vecfGains[iChanID] = fNewGain; }
+    float GetGain ( const int iChanID ) { return vecfGains[iChanID]; }
+    void  SetPan ( const int iChanID, const float fNewPan ) { vecfPannings[iChanID] = std::min ( 1.0f, std::max ( fNewPan, 0.0f ) ); }
+    float GetPan ( const int iChanID ) { return vecfPannings[iChanID]; }
+    float GetFadeInGain() { return static_cast<float> ( iFadeInCnt ) / iFadeInCntMax; }
+
+    CVector<float> vecfGains;
+    CVector<float> vecfPannings;
+    int            iFadeInCnt;
+    int            iFadeInCntMax;
+};
+
+class CServer
+{
+public:
+    void DecodeGains ( const int iChanCnt, const int iNumClients );
+    void MixEncodeTransmitData ( const int iChanCnt, const int iNumClients );
+
+    CVector<CChannel>         vecChannels;
+    CVector<CVector<float>>   vecvecfIntermediateProcBuf;
+    CVector<CVector<float>>   vecvecfGains;
+    CVector<CVector<float>>   vecvecfPannings;
+    CVector<CVector<int16_t>> vecvecsSendData;
+    CVector<CVector<int16_t>> vecvecsData;
+    CVector<CVector<int16_t>> vecvecsData2;
+    CVector<int>              vecChanIDsCurConChan;
+    CVector<int>              vecNumAudioChannels;
+    bool                      bDelayPan;
+    int                       iServerFrameSizeSamples;
+};
+
+void CServer::DecodeGains ( const int iChanCnt, const int iNumClients )
+{
+    const int iCurChanID = vecChanIDsCurConChan[iChanCnt];
+
+#include "server_gains.inc"
+}
+
+#include "server_mix.inc"
+
+static int ReadInt()
+{
+    int iValue;
+
+    if ( scanf ( "%d", &iValue ) != 1 )
+    {
+        exit ( 1 );
+    }
+    return iValue;
+}
+
+int main()
+{
+    int iNumClients, iFrameSize, iDelayPan, iNumFrames, iFadeInMax;
+
+    while ( scanf ( "%d %d %d %d %d", &iNumClients, &iFrameSize, &iDelayPan, &iNumFrames, &iFadeInMax ) == 5 )
+    {
+        CServer Server;
+        Server.bDelayPan               = iDelayPan != 0;
+        Server.iServerFrameSizeSamples = iFrameSize;
+        Server.vecChannels.Init ( iNumClients );
+        Server.vecvecfIntermediateProcBuf.Init ( iNumClients );
+        Server.vecvecfGains.Init ( iNumClients );
+        Server.vecvecfPannings.Init ( iNumClients );
+        Server.vecvecsSendData.Init ( iNumClients );
+        Server.vecvecsData.Init ( iNumClients );
+        Server.vecvecsData2.Init ( iNumClients );
+        Server.vecChanIDsCurConChan.Init ( iNumClients );
+        Server.vecNumAudioChannels.Init ( iNumClients );
+
+        for ( int i = 0; i < iNumClients; i++ )
+        {
+            Server.vecChannels[i].vecfGains.Init ( iNumClients );
+            Server.vecChannels[i].vecfPannings.Init ( iNumClients );
+            Server.vecvecfIntermediateProcBuf[i].Init ( 2 * iFrameSize );
+            Server.vecvecfGains[i].Init ( iNumClients );
+            Server.vecvecfPannings[i].Init ( iNumClients );
+            Server.vecvecsSendData[i].Init ( 2 * iFrameSize );
+            Server.vecvecsData[i].Init ( 2 * iFrameSize );
+            Server.vecvecsData2[i].Init ( 2 * iFrameSize );
+            Server.vecChanIDsCurConChan[i] = i;
+        }
+        for ( int i = 0; i < iNumClients; i++ )
+        {
+            Server.vecNumAudioChannels[i] = ReadInt();
+        }
+        for ( int i = 0; i < iNumClients; i++ )
+        {
+            // without a fade-in, the counter has reached its maximum
+            Server.vecChannels[i].iFadeInCnt    = iFadeInMax ? ReadInt() : 1;
+            Server.vecChannels[i].iFadeInCntMax = iFadeInMax ? iFadeInMax : 1;
+        }
+        // like CProtocol::EvaluateChanGainMes and EvaluateChanPanMes
+        for ( int i = 0; i < iNumClients; i++ )
+        {
+            for ( int j = 0; j < iNumClients; j++ )
+            {
+                Server.vecChannels[i].SetGain ( j, static_cast<float> ( ReadInt() ) / ( 1 << 15 ) );
+            }
+        }
+        for ( int i = 0; i < iNumClients; i++ )
+        {
+            for ( int j = 0; j < iNumClients; j++ )
+            {
+                Server.vecChannels[i].SetPan ( j, static_cast<float> ( ReadInt() ) / ( 1 << 15 ) );
+            }
+        }
+
+        // like CServer::OnTimer
+        for ( int iFrame = 0; iFrame < iNumFrames; iFrame++ )
+        {
+            for ( int i = 0; i < iNumClients; i++ )
+            {
+                for ( int k = 0; k < 2 * iFrameSize; k++ )
+                {
+                    Server.vecvecsData[i][k] = static_cast<int16_t> ( ReadInt() );
+                }
+                Server.DecodeGains ( i, iNumClients );
+            }
+            for ( int i = 0; i < iNumClients; i++ )
+            {
+                Server.MixEncodeTransmitData ( i, iNumClients );
+                for ( int k = 0; k < iFrameSize * Server.vecNumAudioChannels[i]; k++ )
+                {
+                    printf ( "%d\n", Server.vecvecsSendData[i][k] );
+                }
+            }
+            if ( Server.bDelayPan )
+            {
+                Server.vecvecsData2 = Server.vecvecsData;
+            }
+        }
+        printf ( "END\n" );
+        fflush ( stdout );
+    }
+    return 0;
+}
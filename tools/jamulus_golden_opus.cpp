@@ -0,0 +1,130 @@
+/******************************************************************************\
+ * Copyright (c) 2026
+ *
+ * Author(s):
+ *  The Jamulus Development Team
+ *
+ * As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+ * under AGPL 3.0 or any later version.
+ *
+ * Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+ * This code will be licensed under GPL 3.0 (or any later version) from
+ * 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+ * the combined work, including network use provisions.
+ *
+ ******************************************************************************
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Affero General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU Affero General Public License for more details.
+ *
+ * You should have received a copy of the GNU Affero General Public License
+ * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+ *
+ * ---------------------------------------------------------------------------
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <https://www.gnu.org/licenses/>.
+ *
+\******************************************************************************/
+
+
+/* Golden value harness for tools/jamulus_opus_frames.py: encodes the
+ * samples read from stdin with the Opus custom encoder of libs/opus,
+ * configured like the encoders of CClient in src/client.cpp.
+ *
+ * Input, repeated for each table entry:
+ *   frameSize channels codedBytes frames
+ *   frames * frameSize * channels interleaved samples
+ * Output: one line per frame with the coded bytes as hex.
+ */
+
+#include "util.h"
+#include "opus_custom.h"
+#include <cstdio>
+#include <cstdlib>
+
+static int ReadInt()
+{
+    int iValue;
+
+    if ( scanf ( "%d", &iValue ) != 1 )
+    {
+        exit ( 1 );
+    }
+    return iValue;
+}
+
+int main()
+{
+    int iFrameSize, iNumChannels, iCodedBytes, iNumFrames;
+
+    while ( scanf ( "%d %d %d %d", &iFrameSize, &iNumChannels, &iCodedBytes, &iNumFrames ) == 4 )
+    {
+        int                iOpusError;
+        OpusCustomMode*    pMode    = opus_custom_mode_create ( SYSTEM_SAMPLE_RATE_HZ, iFrameSize, &iOpusError );
+        OpusCustomEncoder* pEncoder = opus_custom_encoder_create ( pMode, iNumChannels, &iOpusError );
+
+        if ( pEncoder == nullptr )
+        {
+            exit ( 1 );
+        }
+
+        // like the CClient constructor
+        opus_custom_encoder_ctl ( pEncoder, OPUS_SET_VBR ( 0 ) );
+        if ( iFrameSize == SYSTEM_FRAME_SIZE_SAMPLES )
+        {
+            opus_custom_encoder_ctl ( pEncoder, OPUS_SET_PACKET_LOSS_PERC ( 35 ) );
+        }
+        opus_custom_encoder_ctl ( pEncoder, OPUS_SET_APPLICATION ( OPUS_APPLICATION_RESTRICTED_LOWDELAY ) );
+        if ( iFrameSize == DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES )
+        {
+            opus_custom_encoder_ctl ( pEncoder, OPUS_SET_COMPLEXITY ( 1 ) );
+        }
+
+        // like CClient::Init
+        opus_custom_encoder_ctl ( pEncoder, OPUS_SET_BITRATE ( CalcBitRateBitsPerSecFromCodedBytes ( iCodedBytes, iFrameSize ) ) );
+
+        CVector<int16_t> vecsAudio ( iFrameSize * iNumChannels );
+        CVector<uint8_t> vecbyCoded ( iCodedBytes );
+
+        for ( int iFrame = 0; iFrame < iNumFrames; iFrame++ )
+        {
+            for ( int i = 0; i < iFrameSize * iNumChannels; i++ )
+            {
+                vecsAudio[i] = static_cast<int16_t> ( ReadInt() );
+            }
+
+            // like CClient::ProcessAudioDataIntern
+            if ( opus_custom_encode ( pEncoder, &vecsAudio[0], iFrameSize, &vecbyCoded[0], iCodedBytes ) != iCodedBytes )
+            {
+                exit ( 1 );
+            }
+            for ( int i = 0; i < iCodedBytes; i++ )
+            {
+                printf ( "%02x", vecbyCoded[i] );
+            }
+            printf ( "\n" );
+        }
+
+        opus_custom_encoder_destroy ( pEncoder );
+        opus_custom_mode_destroy ( pMode );
+    }
+    return 0;
+}
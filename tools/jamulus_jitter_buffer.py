@@ -0,0 +1,983 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Trace-driven simulator of the automatic jitter buffer size of Jamulus.
+
+CNetBufWithStats in src/buffer.cpp runs NUM_STAT_SIMULATION_BUFFERS
+simulation buffers with 2 to 11 blocks next to the real jitter buffer. Every
+Put and Get of each of them updates a CErrorRate statistic, and after every
+Get, UpdateAutoSetting derives the auto setting from these error rates with a
+non-linear IIR filter and a hysteresis. The server then resizes the real
+buffer to the auto setting (CChannel::UpdateSocketBufferSize).
+
+This tool reproduces that algorithm bit-for-bit for packet arrival traces,
+e.g. taken from pcap captures, so that the latency and dropout of the auto
+setting and of every fixed buffer size can be evaluated offline. Many traces
+are simulated at once with NumPy:
+
+1. The packets of all traces are placed on a common grid of get ticks (one
+   Get per block period, the Puts which arrived before it in arrival order).
+2. The buffers are stepped over this grid for all traces and buffer sizes
+   together. With sequence numbers, the valid flags of a buffer are kept as
+   a bit mask relative to the get position, so window shifts, Gets and
+   resizes are integer operations; without sequence numbers only the fill
+   level matters.
+3. The moving averages of the error statistics are computed for all ticks at
+   once from cumulative sums.
+4. Only the IIR filter is sequential. It runs once per tick for all traces
+   together and also drives the real buffer. A statistics reset in the
+   initialization phase recomputes the averages of the affected traces.
+
+Without sequence numbers (clients which do not send NF_WITH_COUNTER),
+CNetBuf::Init drains and refills the buffer through the statistics on every
+resize. This is not modelled, the real buffer keeps its initial size then.
+
+The selfcheck command compares the simulator with golden values which were
+computed by the unmodified src/buffer.cpp for deterministic traces (see
+tools/jamulus_golden.py).
+
+Usage:
+./tools/jamulus_jitter_buffer.py simulate capture.pcap --port 22124
+./tools/jamulus_jitter_buffer.py simulate arrivals.csv --frame-size 64 --json results.json
+./tools/jamulus_jitter_buffer.py sweep --traces 200 --jitter-ms 0.5,1,2,4 --loss 0,0.001
+./tools/jamulus_jitter_buffer.py selfcheck
+
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import functools
+import itertools
+import logging
+import sys
+import time
+
+import jamulus_protocol as jp
+from jamulus_common import optional_import, require_numpy, write_json
+
+np = optional_import('numpy')
+logger = logging.getLogger('')
+
+# see src/buffer.h
+NUM_STAT_SIMULATION_BUFFERS = 10
+SIM_BUFFER_SIZES = tuple(range(2, 2 + NUM_STAT_SIMULATION_BUFFERS))
+FILTER_DECISION_HYSTERESIS = 0.1
+INIT_AUTO_BUFFER_SIZE = 6  # see CNetBufWithStats::Init
+
+# see src/global.h
+DEF_NET_BUF_SIZE_NUM_BL = 10
+
+AutoParameters = collections.namedtuple('AutoParameters', [
+    'max_statistic_count', 'error_rate_bound', 'up_max_error_bound',
+    'weight_up_normal', 'weight_down_normal', 'weight_up_fast', 'weight_down_fast'])
+
+# CNetBufWithStats::Init, the double frame size is used with CT_OPUS
+AUTO_PARAMETERS = {
+    jp.SYSTEM_FRAME_SIZE_SAMPLES: AutoParameters(
+        22500, 0.0005 / 2, 0.01 / 2, 0.9999975, 0.99994999875, 0.9997499687422, 0.999499875),
+    jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES: AutoParameters(
+        11000, 0.0005, 0.01, 0.999995, 0.9999, 0.9995, 0.999),
+}
+
+Trace = collections.namedtuple('Trace', ['name', 'times', 'seqs'])
+
+# packet interval, mean extra delay and loss probability of synthetic traces
+Network = collections.namedtuple('Network', ['interval', 'jitter', 'loss'])
+
+Decisions = collections.namedtuple('Decisions', [
+    'ticks', 'decisions', 'up_decisions', 'above', 'rates'])
+
+SimulationResult = collections.namedtuple('SimulationResult', [
+    'names', 'ticks', 'auto', 'main_errors', 'main_put_errors',
+    'get_errors', 'put_errors', 'rates'])
+
+
+def make_trace(name, times, seqs=None):
+    """
+    @param name: str
+    @param times: arrival times, any unit (seconds for captures)
+    @param seqs: sequence numbers of the (first block of the) packets, by
+                 default the arrival order
+    @return: Trace sorted by arrival time
+    """
+    require_numpy('the simulation')
+    times = np.asarray(times)
+    seqs = np.arange(len(times)) if seqs is None else np.asarray(seqs)
+    order = np.argsort(times, kind='stable')
+    return Trace(name, times[order], (seqs[order] & 0xFF).astype(np.int64))
+
+
+class TickGrid:
+    """
+    Event order shared by a batch of traces.
+
+    Get tick k happens at the first arrival + offset + k * period. Each tick
+    has as many put slots as the most packets any trace received since the
+    previous tick, followed by the get slot. A packet which arrives exactly
+    at a tick is put before the Get. Each trace ends with the tick after its
+    last packet.
+    """
+
+    def __init__(self, traces, period, offset):
+        require_numpy('the simulation')
+        self.names = [trace.name for trace in traces]
+        put_ticks = []
+        for trace in traces:
+            start = trace.times[0] + offset
+            # ceil((time - start) / period), also for integer times
+            put_ticks.append(np.maximum(-((start - trace.times) // period), 0).astype(np.int64))
+        self.ticks = np.array([tick[-1] + 1 for tick in put_ticks], dtype=np.int64)
+        num_ticks = int(self.ticks.max())
+        per_tick = np.zeros(num_ticks, dtype=np.int64)
+        for tick in put_ticks:
+            np.maximum(per_tick, np.bincount(tick, minlength=num_ticks), out=per_tick)
+        self.get_slots = np.cumsum(per_tick + 1) - 1
+        num_slots = int(self.get_slots[-1]) + 1
+        self.is_get = np.zeros(num_slots, dtype=bool)
+        self.is_get[self.get_slots] = True
+        # slot major, the simulation steps over the slots
+        self.seqs = np.zeros((num_slots, len(traces)), dtype=np.int32)
+        self.active = np.zeros((num_slots, len(traces)), dtype=bool)
+        self.active[self.get_slots] = np.arange(num_ticks)[:, None] < self.ticks
+        first_put_slots = self.get_slots - per_tick
+        for row, (tick, trace) in enumerate(zip(put_ticks, traces)):
+            slots = first_put_slots[tick] + np.arange(len(tick)) - np.searchsorted(tick, tick)
+            self.seqs[slots, row] = trace.seqs
+            self.active[slots, row] = True
+
+    def __len__(self):
+        return len(self.names)
+
+    def put_slots(self, tick):
+        """
+        @param tick: int
+        @return: range of the put slots before the Get of the tick
+        """
+        first = self.get_slots[tick - 1] + 1 if tick else 0
+        return range(first, self.get_slots[tick])
+
+
+class SequenceNumberBuffers:
+    """
+    CNetBuf with sequence numbers for arrays of buffers.
+
+    Bit i of mask is the valid flag of the block at the get position + i and
+    seq is iSequenceNumberAtGetPos. Shape of the state is that of the sizes
+    array broadcast against the traces.
+    """
+
+    def __init__(self, shape, sizes, blocks_per_packet):
+        self.mask = np.zeros(shape, dtype=np.int32)
+        self.seq = np.zeros(shape, dtype=np.int32)
+        self.blocks = blocks_per_packet
+        self.sizes = self.full = None
+        self.resize(sizes)
+
+    def resize(self, sizes):
+        """
+        Init with bPreserve: the blocks from the get position on are kept.
+        """
+        self.sizes = np.asarray(sizes, dtype=np.int32)
+        self.full = (1 << self.sizes) - 1
+        self.mask &= self.full
+
+    def put(self, seqs, active):
+        """
+        @param seqs: sequence numbers of the first blocks of the packets
+        @param active: bool array, buffers which receive a packet
+        @return: Put result (always true with sequence numbers)
+        """
+        sizes = self.sizes
+        for block in range(self.blocks):
+            diff = ((seqs + block - self.seq + 128) & 0xFF) - 128
+            if not np.any(active & ((diff < 0) | (diff >= sizes))):
+                # all packets fit into the current window
+                self.mask = self.mask | (active << np.maximum(diff, 0))
+                continue
+            late = diff < 0
+            early = diff >= sizes
+            # late: move the window back to the packet, early: move it forward
+            # so that the packet is the last block, invalidating the blocks
+            # passed over
+            shift = np.where(late, -diff, np.where(early, diff - sizes + 1, 0))
+            count = np.minimum(shift, sizes)
+            invalid = np.where(late,
+                               (((1 << np.maximum(count - 1, 0)) - 1) << (sizes - count + 1)) | 1,
+                               (1 << count) - 1)
+            rotate = np.where(early, sizes - shift % sizes, shift) % sizes
+            mask = self.mask & ~invalid
+            mask = ((mask << rotate) | (mask >> (sizes - rotate))) & self.full
+            mask |= 1 << np.where(late, 0, np.where(early, sizes - 1, diff))
+            self.mask = np.where(active, mask, self.mask)
+            self.seq = np.where(active, (self.seq + np.where(late, diff, shift)) & 0xFF, self.seq)
+        return True
+
+    def get(self, active):
+        """
+        @param active: bool array, buffers which are read
+        @return: bool array, Get results
+        """
+        ok = (self.mask & 1) > 0
+        self.mask = np.where(active, self.mask >> 1, self.mask)
+        self.seq = np.where(active, (self.seq + 1) & 0xFF, self.seq)
+        return ok
+
+
+class FillLevelBuffers:
+    """
+    CNetBuf without sequence numbers for arrays of buffers: only the number
+    of stored blocks matters.
+    """
+
+    def __init__(self, shape, sizes, blocks_per_packet):
+        self.level = np.zeros(shape, dtype=np.int32)
+        self.blocks = blocks_per_packet
+        self.sizes = sizes
+
+    def resize(self, sizes):
+        """
+        Init with bPreserve: as many blocks as fit are kept.
+        """
+        self.sizes = sizes
+        self.level = np.minimum(self.level, sizes)
+
+    def put(self, seqs, active):  # pylint: disable=unused-argument
+        """
+        @param seqs: ignored
+        @param active: bool array, buffers which receive a packet
+        @return: bool array, Put results
+        """
+        ok = self.sizes - self.level >= self.blocks
+        self.level = self.level + np.where(active & ok, self.blocks, 0)
+        return ok
+
+    def get(self, active):
+        """
+        @param active: bool array, buffers which are read
+        @return: bool array, Get results
+        """
+        ok = self.level > 0
+        self.level = self.level - (active & ok)
+        return ok
+
+
+def round_half_away(values):
+    """
+    @param values: float array
+    @return: int array, rounded like C round()
+    """
+    floor = np.floor(values)
+    return (floor + (values - floor >= 0.5)).astype(np.int64)
+
+
+def _moving_averages(state, active, ends, size):
+    """
+    CErrorRate with bBlockOnDoubleErrors: an error directly after an error
+    is not added to the moving average.
+
+    @param state: bool array (rows, slots), the values of the updates
+    @param active: bool array (rows, slots), slots with an update
+    @param ends: int array, slots to evaluate
+    @param size: int, history length
+    @return: (averages, settled): averages as array (rows, ends) and whether
+             all rows have a complete history at the last end
+    """
+    slots = np.arange(state.shape[1])
+    # the previous state of an update is the one of the last active slot
+    previous_slots = np.maximum.accumulate(np.where(active, slots, -1), axis=1)
+    previous_slots = np.pad(previous_slots[:, :-1], ((0, 0), (1, 0)), constant_values=-1)
+    previous = np.take_along_axis(state, np.maximum(previous_slots, 0), axis=1)
+    accepted = active & ~(state & (previous | (previous_slots < 0)))
+    sums, norms = _window_sums(accepted, accepted & state, ends, size)
+    averages = np.divide(sums, norms, out=np.ones(norms.shape), where=norms > 0)
+    return averages, bool(np.all(norms[:, -1:] == size))
+
+
+def _take_last(averages, last):
+    """
+    @param averages: array (rows, ticks)
+    @param last: int array, column per row
+    @return: the averages at the given columns, NaN after the last column
+             and 1.0 (no data) before the first
+    """
+    values = np.full(len(last), np.nan)
+    values[last < 0] = 1.0
+    inside = (last >= 0) & (last < averages.shape[1])
+    values[inside] = averages[inside, last[inside]]
+    return values
+
+
+def _merge(target, rows, update):
+    """
+    Copies the Decisions of some rows for a range of ticks into the
+    Decisions of all rows.
+    """
+    ticks = slice(update.ticks.start, update.ticks.stop)
+    target.decisions[rows, ticks] = update.decisions
+    target.up_decisions[rows, ticks] = update.up_decisions
+    target.above[rows, ticks] = update.above
+    target.rates[rows] = np.where(np.isnan(update.rates), target.rates[rows], update.rates)
+
+
+def _window_sums(accepted, values, ends, size):
+    """
+    Sums of the last size accepted values up to the given slots, like
+    CMovingAv over the accepted updates.
+
+    @param accepted: bool array (rows, slots)
+    @param values: bool array (rows, slots), the values of the updates
+    @param ends: int array, slots to evaluate
+    @param size: int, length of the moving average
+    @return: (sums, norms) as arrays (rows, ends)
+    """
+    counts = np.cumsum(accepted, axis=1, dtype=np.int32)[:, ends]
+    norms = np.minimum(counts, size)
+    # the accepted values of all rows one after the other, so that the sum of
+    # the first k accepted values of a row is a difference of two entries
+    totals = np.concatenate([[0], np.cumsum(values[accepted], dtype=np.int64)])
+    bases = np.concatenate([[0], np.cumsum(accepted.sum(axis=1))[:-1]])[:, None]
+    return totals[bases + counts] - totals[bases + counts - norms], norms
+
+
+class AutoFilter:
+    """
+    The sequential part of CNetBufWithStats::UpdateAutoSetting for arrays of
+    traces: initialization phase, non-linear IIR filter and hysteresis.
+    """
+
+    def __init__(self, parameters, count):
+        self.parameters = parameters
+        self.setting = np.full(count, INIT_AUTO_BUFFER_SIZE, dtype=np.int64)
+        self.iir = self.setting.astype(np.float64)
+        self.init_counter = np.full(count, parameters.max_statistic_count // 4, dtype=np.int64)
+
+    def update(self, decision, up_decision, active):
+        """
+        @param decision: int array, index of the smallest simulation buffer
+                         below the error rate bound
+        @param up_decision: int array, index of the smallest simulation
+                            buffer below the upper error bound
+        @param active: bool array, traces which have a Get in this tick
+        @return: bool array, traces which reach the check point of the
+                 initialization phase
+        """
+        p = self.parameters
+        sizes = np.array(SIM_BUFFER_SIZES)
+        # no buffer below the upper bound starts a new initialization phase
+        init_counter = np.where(up_decision == NUM_STAT_SIMULATION_BUFFERS - 1,
+                                p.max_statistic_count // 4, self.init_counter)
+        fast = init_counter > 0
+        init_counter = init_counter - fast
+        fast |= self.setting < sizes[up_decision]
+        new = sizes[decision].astype(np.float64)
+        weight = np.where(new < self.iir,
+                          np.where(fast, p.weight_down_fast, p.weight_down_normal),
+                          np.where(fast, p.weight_up_fast, p.weight_up_normal))
+        iir = self.iir * weight + (1.0 - weight) * new
+        # the hysteresis is always relative to the initial setting since
+        # iCurDecidedResult is never updated
+        setting = round_half_away(np.where(iir > INIT_AUTO_BUFFER_SIZE,
+                                           iir - FILTER_DECISION_HYSTERESIS,
+                                           iir + FILTER_DECISION_HYSTERESIS))
+        self.iir = np.where(active, iir, self.iir)
+        self.setting = np.where(active, setting, self.setting)
+        self.init_counter = np.where(active, init_counter, self.init_counter)
+        return active & (self.init_counter == p.max_statistic_count // 8)
+
+
+class Simulation:
+    """
+    CNetBufWithStats of a Jamulus server (or client) for batches of traces.
+    """
+
+    def __init__(self, frame_size=jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES, sequence_numbers=True,
+                 blocks_per_packet=1, initial_size=DEF_NET_BUF_SIZE_NUM_BL):
+        """
+        @param frame_size: int, samples per block, the double frame size
+                           selects the parameters used with CT_OPUS
+        @param sequence_numbers: bool, packets carry sequence numbers
+        @param blocks_per_packet: int, blocks of frame_size per packet
+        @param initial_size: int, size of the real buffer before the first
+                             resize to the auto setting
+        """
+        require_numpy('the simulation')
+        self.parameters = AUTO_PARAMETERS[frame_size]
+        self.sequence_numbers = sequence_numbers
+        self.blocks_per_packet = blocks_per_packet
+        self.initial_size = initial_size
+
+    def _buffers(self, shape, sizes):
+        if self.sequence_numbers:
+            return SequenceNumberBuffers(shape, sizes, self.blocks_per_packet)
+        return FillLevelBuffers(shape, sizes, self.blocks_per_packet)
+
+    def updates(self, grid):
+        """
+        @param grid: TickGrid
+        @return: bool array (slots, traces, buffers), the values which the
+                 simulation buffers pass to CErrorRate::Update
+        """
+        sizes = np.array(SIM_BUFFER_SIZES, dtype=np.int32)
+        buffers = self._buffers((len(grid), len(sizes)), sizes)
+        errors = np.zeros((len(grid.is_get), len(grid), len(sizes)), dtype=bool)
+        for slot, is_get in enumerate(grid.is_get):
+            active = grid.active[slot, :, None]
+            if is_get:
+                ok = buffers.get(active)
+            else:
+                ok = buffers.put(grid.seqs[slot, :, None], active)
+            errors[slot] = active & ~ok
+        return errors
+
+    def decisions(self, grid, errors, rows, start=0):
+        """
+        Evaluates the error rate statistics at the Gets from the given slot
+        on.
+
+        Once max_statistic_count updates were accepted after a statistics
+        reset, the moving averages are the same as without the reset. So for
+        a reset only the ticks until then are evaluated, provided that all
+        rows get there within a few times max_statistic_count slots.
+
+        @param grid: TickGrid
+        @param errors: result of updates()
+        @param rows: int array, traces to evaluate
+        @param start: int, first slot after a statistics reset
+        @return: Decisions for the range of ticks given by its ticks field;
+                 rates are the error rates after the last Get of each row,
+                 NaN if that is not in the range
+        """
+        end = len(grid.is_get)
+        if start:
+            horizon = min(end, start + 4 * self.parameters.max_statistic_count)
+            result, settled = self._evaluate(grid, errors, rows, (start, horizon))
+            if settled:
+                return result
+        return self._evaluate(grid, errors, rows, (start, end))[0]
+
+    def _evaluate(self, grid, errors, rows, span):
+        window = slice(*span)
+        ticks = range(*np.searchsorted(grid.get_slots, span).tolist())
+        active = grid.active[window, rows].T
+        shape = (len(rows), len(ticks))
+        result = Decisions(ticks, np.full(shape, NUM_STAT_SIMULATION_BUFFERS - 1, dtype=np.int8),
+                           np.full(shape, NUM_STAT_SIMULATION_BUFFERS - 1, dtype=np.int8),
+                           np.zeros(shape, dtype=bool),
+                           np.empty((len(rows), NUM_STAT_SIMULATION_BUFFERS)))
+        last = grid.ticks[rows] - 1 - ticks.start
+        settled = True
+        for index in reversed(range(NUM_STAT_SIMULATION_BUFFERS)):
+            averages, full = _moving_averages(errors[window, rows, index].T, active,
+                                              grid.get_slots[ticks.start:ticks.stop] - span[0],
+                                              self.parameters.max_statistic_count)
+            settled &= full
+            result.rates[:, index] = _take_last(averages, last)
+            if index == NUM_STAT_SIMULATION_BUFFERS - 1:
+                result.above[:] = averages > self.parameters.error_rate_bound
+            else:
+                result.decisions[averages <= self.parameters.error_rate_bound] = index
+                result.up_decisions[averages <= self.parameters.up_max_error_bound] = index
+        return result, settled
+
+    def run(self, grid):
+        """
+        @param grid: TickGrid
+        @return: SimulationResult
+        """
+        errors = self.updates(grid)
+        current = self.decisions(grid, errors, np.arange(len(grid)))
+        auto = AutoFilter(self.parameters, len(grid))
+        main = self._buffers(len(grid), np.full(len(grid), self.initial_size, dtype=np.int32))
+        settings = np.zeros(current.decisions.shape, dtype=np.int8)
+        main_errors = np.zeros((2, len(grid)), dtype=np.int64)  # Get and Put errors
+        for tick, get_slot in enumerate(grid.get_slots):
+            for slot in grid.put_slots(tick):
+                main_errors[1] += grid.active[slot] & ~main.put(grid.seqs[slot],
+                                                                grid.active[slot])
+            active = grid.active[get_slot]
+            main_errors[0] += active & ~main.get(active)
+            check = auto.update(current.decisions[:, tick], current.up_decisions[:, tick], active)
+            reset = np.flatnonzero(check & current.above[:, tick])
+            if len(reset):
+                # the statistics restart after this Get
+                _merge(current, reset, self.decisions(grid, errors, reset, get_slot + 1))
+            settings[:, tick] = auto.setting
+            if self.sequence_numbers:
+                main.resize(np.where(active, auto.setting, main.sizes))
+        return SimulationResult(grid.names, grid.ticks, settings, main_errors[0], main_errors[1],
+                                errors[grid.is_get].sum(axis=0),
+                                errors[~grid.is_get].sum(axis=0), current.rates)
+
+
+# Traces ---------------------------------------------------------------------
+def load_text_trace(path):
+    """
+    Reads a trace with one packet per line: arrival time in seconds and
+    optionally the sequence number, separated by white space or a comma.
+    Text after "#" is ignored.
+
+    @param path: str
+    @return: Trace
+    """
+    times, seqs = [], []
+    with open(path) as f:
+        for line in f:
+            fields = line.split('#')[0].replace(',', ' ').split()
+            if fields:
+                times.append(float(fields[0]))
+                seqs.extend(int(field) for field in fields[1:2])
+    if seqs and len(seqs) != len(times):
+        raise ValueError(f'{path}: sequence numbers are missing on some lines')
+    return make_trace(path, times, seqs or None)
+
+
+def load_capture_traces(path, port=None, blocks_per_packet=1, min_packets=1000):
+    """
+    Extracts one trace per UDP flow of audio packets from a capture. The
+    sequence number of a packet is the last byte of its first block, i.e.
+    of the first 1 / blocks_per_packet of the payload.
+
+    @param path: str, pcap or pcapng file
+    @param port: int, only consider packets from/to this UDP port
+    @param blocks_per_packet: int
+    @param min_packets: int, skip flows with fewer packets
+    @return: list of Trace
+    """
+    packets = jp.read_udp_packets(path, port)
+    batch = jp.FrameBatch(packets.buffer, packets.offsets, packets.lengths)
+    audio = np.flatnonzero(~batch.is_protocol & (packets.lengths >= blocks_per_packet))
+    flows, flow_of_packet = np.unique(
+        np.hstack([packets.src_addresses[audio], packets.dst_addresses[audio],
+                   packets.src_ports[audio, None].view(np.uint8),
+                   packets.dst_ports[audio, None].view(np.uint8)]),
+        axis=0, return_inverse=True)
+    traces = []
+    for flow, key in enumerate(flows):
+        index = audio[flow_of_packet.ravel() == flow]
+        if len(index) < min_packets:
+            continue
+        name = (f'{jp.format_address(key[:16])}:{packets.src_ports[index[0]]} -> '
+                f'{jp.format_address(key[16:32])}:{packets.dst_ports[index[0]]}')
+        first_blocks = packets.offsets[index] + packets.lengths[index] // blocks_per_packet
+        traces.append(make_trace(name, packets.timestamps[index],
+                                 packets.buffer[first_blocks - 1].astype(np.int64)))
+    return traces
+
+
+def synthetic_traces(network, count, duration, seed=0):
+    """
+    Packets sent at a constant interval with an exponentially distributed
+    extra delay and random losses. Late packets may overtake each other.
+
+    @param network: Network, times in seconds
+    @param count: int, number of traces
+    @param duration: float, seconds per trace
+    @param seed: int
+    @return: list of Trace
+    """
+    require_numpy('the simulation')
+    rng = np.random.default_rng(seed)
+    packets = np.arange(int(duration / network.interval))
+    traces = []
+    for index in range(count):
+        delays = rng.exponential(network.jitter, len(packets)) if network.jitter > 0 else 0.0
+        keep = rng.random(len(packets)) >= network.loss
+        traces.append(make_trace(f'synthetic-{index}',
+                                 (packets * network.interval + delays)[keep], packets[keep]))
+    return traces
+
+
+# Results --------------------------------------------------------------------
+def summarize(result, frame_size):
+    """
+    @param result: SimulationResult
+    @param frame_size: int, samples per block
+    @return: list of dicts, one per trace; rates are per Get
+    """
+    block_ms = frame_size * 1000 / jp.SYSTEM_SAMPLE_RATE_HZ
+    rows = []
+    for index, name in enumerate(result.names):
+        gets = int(result.ticks[index])
+        settings = result.auto[index, :gets]
+        rows.append({
+            'name': name,
+            'gets': gets,
+            'auto_blocks_mean': float(settings.mean()),
+            'auto_blocks_final': int(settings[-1]),
+            'auto_buffer_ms': float(settings.mean() * block_ms),
+            'auto_dropout_rate': float(result.main_errors[index] / gets),
+            'auto_overflow_rate': float(result.main_put_errors[index] / gets),
+            'dropout_rates': {str(size): float(result.get_errors[index, i] / gets)
+                              for i, size in enumerate(SIM_BUFFER_SIZES)},
+            'overflow_rates': {str(size): float(result.put_errors[index, i] / gets)
+                               for i, size in enumerate(SIM_BUFFER_SIZES)},
+            'error_rates': [float(rate) for rate in result.rates[index]],
+        })
+    return rows
+
+
+def aggregate(rows):
+    """
+    @param rows: result of summarize()
+    @return: dict, means over all traces and the 95th percentile of the
+             auto dropout rate
+    """
+    dropouts = np.array([row['auto_dropout_rate'] for row in rows])
+    return {
+        'traces': len(rows),
+        'auto_buffer_ms': float(np.mean([row['auto_buffer_ms'] for row in rows])),
+        'auto_dropout_rate': float(dropouts.mean()),
+        'auto_dropout_rate_p95': float(np.percentile(dropouts, 95)),
+        'dropout_rates': {str(size): float(np.mean([row['dropout_rates'][str(size)]
+                                                    for row in rows]))
+                          for size in SIM_BUFFER_SIZES},
+    }
+
+
+def _run_batch(simulation, clock, traces):
+    started = time.monotonic()
+    grid = TickGrid(traces, *clock)
+    result = simulation.run(grid)
+    logger.debug('simulated %d traces with %d Gets in %.2f s', len(grid), int(grid.ticks.sum()),
+                 time.monotonic() - started)
+    return result
+
+
+def simulate(traces, simulation, clock, batch=128, jobs=1):
+    """
+    @param traces: list of Trace, times in the unit of the clock
+    @param simulation: Simulation
+    @param clock: (period, offset), time between two Gets and from the
+                  first packet to the first Get
+    @param batch: int, traces simulated together
+    @param jobs: int, number of worker processes
+    @return: list of SimulationResult, one per batch
+    """
+    batches = [traces[first:first + batch] for first in range(0, len(traces), batch)]
+    run = functools.partial(_run_batch, simulation, clock)
+    if jobs <= 1 or len(batches) <= 1:
+        return [run(traces) for traces in batches]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(run, batches))
+
+
+# Golden values --------------------------------------------------------------
+# The expected values were produced by the unmodified CNetBufWithStats of
+# src/buffer.cpp (built without Qt against the CVector, CMovingAv, CErrorRate
+# and MathUtils definitions of src/util.h) for the event order of the
+# golden traces, resizing the buffer to the auto setting after every Get
+# when sequence numbers are used. auto is run-length encoded as
+# (setting, Gets), rates are the error rates after the last Get.
+# ./tools/jamulus_golden.py jitter-buffer rebuilds this harness
+# (jamulus_golden_jitter_buffer.cpp) and checks or prints the values.
+GOLDEN_SCENARIOS = [
+    {'name': 'seq-opus-jitter', 'frame_size': 128, 'sequence_numbers': True,
+     'blocks_per_packet': 1, 'initial_size': 10, 'packets': 14000, 'interval': 1000,
+     'period': 1000, 'offset': 500, 'jitter': 2500, 'spike_every': 997, 'spike': 9000, 'loss': 2,
+     'seed': 1,
+     'expected': {'auto': [(6, 260), (7, 516), (8, 878), (7, 325), (6, 37), (7, 515), (8, 11468)],
+                  'main_errors': 90, 'main_put_errors': 0,
+                  'rates': [0.11009090909090909, 0.03872727272727273, 0.0022727272727272726,
+                            0.0027272727272727275, 0.0032727272727272726, 0.0032727272727272726,
+                            0.0025454545454545456, 0.0024545454545454545, 0.002181818181818182,
+                            0.002]}},
+    {'name': 'seq-opus64-outage', 'frame_size': 64, 'sequence_numbers': True,
+     'blocks_per_packet': 1, 'initial_size': 10, 'packets': 30000, 'interval': 1000,
+     'period': 1000, 'offset': 300, 'jitter': 1800, 'outage': (600, 40), 'loss': 1, 'seed': 2,
+     'expected': {'auto': [(6, 516), (7, 1031), (8, 1393), (9, 83), (8, 392), (7, 1408),
+                            (8, 25177)],
+                  'main_errors': 76, 'main_put_errors': 0,
+                  'rates': [0.08662222222222223, 0.0008444444444444444, 0.0008444444444444444,
+                            0.0008444444444444444, 0.0008444444444444444, 0.0008444444444444444,
+                            0.0008444444444444444, 0.0008444444444444444, 0.0008444444444444444,
+                            0.0008444444444444444]}},
+    {'name': 'seq-two-blocks-drift', 'frame_size': 64, 'sequence_numbers': True,
+     'blocks_per_packet': 2, 'initial_size': 4, 'packets': 12000, 'interval': 2000, 'period': 997,
+     'offset': 100, 'jitter': 3000, 'seed': 3,
+     'expected': {'auto': [(6, 521), (7, 1031), (8, 1393), (9, 2629), (10, 946), (9, 400),
+                            (10, 17153)],
+                  'main_errors': 75, 'main_put_errors': 0,
+                  'rates': [0.12, 0.08093333333333333, 0.020666666666666667, 0.002, 0.002, 0.002,
+                            0.002, 0.002, 0.002, 0.002]}},
+    {'name': 'seq-slow-clock', 'frame_size': 128, 'sequence_numbers': True,
+     'blocks_per_packet': 1, 'initial_size': 6, 'packets': 13000, 'interval': 1000,
+     'period': 1004, 'offset': 900, 'jitter': 6000, 'spike_every': 313, 'spike': 14000,
+     'loss': 20, 'seed': 4,
+     'expected': {'auto': [(6, 260), (7, 516), (8, 696), (9, 1078), (10, 2505), (11, 7893)],
+                  'main_errors': 486, 'main_put_errors': 0,
+                  'rates': [0.219, 0.19772727272727272, 0.15536363636363637, 0.097,
+                            0.03563636363636364, 0.015909090909090907, 0.017,
+                            0.017545454545454545, 0.01781818181818182, 0.017363636363636362]}},
+    {'name': 'no-seq-opus', 'frame_size': 128, 'sequence_numbers': False, 'blocks_per_packet': 1,
+     'initial_size': 4, 'packets': 12000, 'interval': 1000, 'period': 1001, 'offset': 500,
+     'jitter': 2000, 'seed': 5,
+     'expected': {'auto': [(6, 278), (7, 516), (8, 292), (7, 326), (6, 813), (5, 8394), (4, 312),
+                            (5, 160), (4, 897)],
+                  'main_errors': 1, 'main_put_errors': 11,
+                  'rates': [0.049545454545454545, 0.0005454545454545455, 0.0005454545454545455,
+                            0.0005454545454545455, 0.0005454545454545455, 0.0005454545454545455,
+                            0.0005454545454545455, 0.0005454545454545455, 0.00045454545454545455,
+                            0.0003636363636363636]}},
+    {'name': 'no-seq-two-blocks', 'frame_size': 64, 'sequence_numbers': False,
+     'blocks_per_packet': 2, 'initial_size': 6, 'packets': 14000, 'interval': 2000, 'period': 999,
+     'offset': 1500, 'jitter': 2600, 'loss': 3, 'seed': 6,
+     'expected': {'auto': [(6, 1003), (7, 1031), (8, 1085), (7, 605), (8, 1393), (9, 22910)],
+                  'main_errors': 116, 'main_put_errors': 0,
+                  'rates': [0.2484, 0.12937777777777779, 0.019333333333333334, 0.0024, 0.0024,
+                            0.0024, 0.0024, 0.0024, 0.0024, 0.0024]}},
+]
+
+
+def _splitmix64(values):
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def golden_trace(scenario):
+    """
+    Trace of a golden scenario. Only integer arithmetic is used so that the
+    event order does not depend on floating point rounding.
+
+    @param scenario: dict, see GOLDEN_SCENARIOS
+    @return: Trace
+    """
+    s = scenario
+    packets = np.arange(s['packets'], dtype=np.int64)
+    noise = _splitmix64((np.uint64(s['seed']) << np.uint64(32)) | packets.astype(np.uint64))
+    delays = (noise % np.uint64(s['jitter'] + 1)).astype(np.int64)
+    if 'spike_every' in s:
+        delays += np.where(packets % s['spike_every'] == s['spike_every'] - 1, s['spike'], 0)
+    keep = ((noise >> np.uint64(32)) % np.uint64(1000)).astype(np.int64) >= s.get('loss', 0)
+    first, length = s.get('outage', (0, 0))
+    keep &= (packets < first) | (packets >= first + length)
+    return make_trace(s['name'], (packets * s['interval'] + delays)[keep],
+                      packets[keep] * s['blocks_per_packet'])
+
+
+def _run_lengths(values):
+    runs = []
+    for value in values.tolist():
+        if runs and runs[-1][0] == value:
+            runs[-1] = (value, runs[-1][1] + 1)
+        else:
+            runs.append((value, 1))
+    return runs
+
+
+def selfcheck():
+    """
+    Simulates the golden scenarios and compares the results.
+
+    @return: bool, True if all results match exactly
+    """
+    passed = True
+    for scenario in GOLDEN_SCENARIOS:
+        simulation = Simulation(scenario['frame_size'], scenario['sequence_numbers'],
+                                scenario['blocks_per_packet'], scenario['initial_size'])
+        grid = TickGrid([golden_trace(scenario)], scenario['period'], scenario['offset'])
+        result = simulation.run(grid)
+        actual = {
+            'auto': _run_lengths(result.auto[0, :result.ticks[0]]),
+            'main_errors': int(result.main_errors[0]),
+            'main_put_errors': int(result.main_put_errors[0]),
+            'rates': result.rates[0].tolist(),
+        }
+        failed = [key for key, value in scenario['expected'].items() if actual[key] != value]
+        if failed:
+            logger.error('%s: mismatch in %s', scenario['name'], ', '.join(failed))
+            for key in failed:
+                logger.error('  expected %s: %s', key, scenario['expected'][key])
+                logger.error('  actual %s:   %s', key, actual[key])
+            passed = False
+        else:
+            logger.info('%s: %d Gets OK', scenario['name'], int(result.ticks[0]))
+    return passed
+
+
+# Command line ---------------------------------------------------------------
+def print_rows(rows, label):
+    """
+    Prints one line per trace (or sweep point) with the mean auto setting in
+    ms, the dropout rate with the auto setting and with each fixed size.
+    """
+    print(f'{label:<40} {"auto ms":>8} {"auto %":>7} ' +
+          ' '.join(f'{size:>6}' for size in SIM_BUFFER_SIZES))
+    for row in rows:
+        print(f'{row["name"][:40]:<40} {row["auto_buffer_ms"]:>8.2f} '
+              f'{row["auto_dropout_rate"] * 100:>7.3f} ' +
+              ' '.join(f'{row["dropout_rates"][str(size)] * 100:>6.2f}'
+                       for size in SIM_BUFFER_SIZES))
+
+
+def parse_floats(text):
+    """
+    @param text: str, comma separated numbers
+    @return: list of float
+    """
+    return [float(value) for value in text.split(',')]
+
+
+def _add_simulation_arguments(parser):
+    parser.add_argument('--frame-size', type=int, choices=sorted(AUTO_PARAMETERS),
+                        default=jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES,
+                        help='samples per block: 128 with Opus (default), 64 with small '
+                             'network buffers')
+    parser.add_argument('--blocks-per-packet', type=int, default=1,
+                        help='blocks per network packet (default: 1)')
+    parser.add_argument('--no-sequence-numbers', action='store_true',
+                        help='packets without sequence numbers, the real buffer then keeps '
+                             'its initial size')
+    parser.add_argument('--initial-size', type=int, default=DEF_NET_BUF_SIZE_NUM_BL,
+                        help='size of the real buffer in blocks before the first resize '
+                             f'(default: {DEF_NET_BUF_SIZE_NUM_BL})')
+    parser.add_argument('--drift-ppm', type=float, default=0.0,
+                        help='clock of the receiver relative to the sender in ppm, positive '
+                             'values make Gets more frequent')
+    parser.add_argument('--batch', type=int, default=128, help='traces simulated together')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--json', metavar='FILE', help='write results as JSON ("-" for stdout)')
+
+
+def _load_traces(args):
+    traces = []
+    for path in args.traces:
+        if path.endswith(('.pcap', '.pcapng', '.cap')):
+            found = load_capture_traces(path, args.port, args.blocks_per_packet,
+                                        args.min_packets)
+            logger.info('%s: %d flows with at least %d audio packets', path, len(found),
+                        args.min_packets)
+            traces.extend(found)
+        else:
+            traces.append(load_text_trace(path))
+    return traces
+
+
+def _simulate_rows(traces, simulation, clock, args):
+    rows = []
+    for result in simulate(traces, simulation, clock, args.batch, args.jobs):
+        rows.extend(summarize(result, args.frame_size))
+    return rows
+
+
+def run_sweep(args, simulation, clock):
+    """
+    Simulates synthetic traces for all combinations of jitter and loss.
+
+    @return: list of dicts, the results of aggregate() per combination
+    """
+    interval = args.frame_size * args.blocks_per_packet / jp.SYSTEM_SAMPLE_RATE_HZ
+    results = []
+    for jitter, loss in itertools.product(args.jitter_ms, args.loss):
+        traces = synthetic_traces(Network(interval, jitter / 1000, loss), args.traces,
+                                  args.duration, args.seed)
+        rows = _simulate_rows(traces, simulation, clock, args)
+        results.append({'name': f'jitter {jitter:g} ms, loss {loss:g}', 'jitter_ms': jitter,
+                        'loss': loss, **aggregate(rows)})
+    return results
+
+
+def main():
+    p = argparse.ArgumentParser(description='Simulates the automatic jitter buffer size of '
+                                            'Jamulus for packet arrival traces.')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    sub = p.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('simulate', help='simulate captured or recorded traces')
+    run.add_argument('traces', nargs='+',
+                     help='pcap/pcapng captures (one trace per audio flow) or text files '
+                          'with "seconds [sequence number]" per line')
+    run.add_argument('--port', type=int, help='only consider packets from/to this UDP port')
+    run.add_argument('--min-packets', type=int, default=1000,
+                     help='skip captured flows with fewer audio packets')
+    _add_simulation_arguments(run)
+
+    sweep = sub.add_parser('sweep', help='simulate synthetic traces for a grid of network '
+                                         'conditions')
+    sweep.add_argument('--traces', type=int, default=100, help='traces per grid point')
+    sweep.add_argument('--duration', type=float, default=10.0, help='seconds per trace')
+    sweep.add_argument('--jitter-ms', type=parse_floats, default=[0.5, 1.0, 2.0, 4.0],
+                       help='comma separated mean extra delays in ms')
+    sweep.add_argument('--loss', type=parse_floats, default=[0.0],
+                       help='comma separated packet loss probabilities')
+    sweep.add_argument('--seed', type=int, default=0)
+    _add_simulation_arguments(sweep)
+
+    sub.add_parser('selfcheck', help='compare with golden values of the C++ implementation')
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+    require_numpy('the simulation')
+
+    if args.command == 'selfcheck':
+        sys.exit(0 if selfcheck() else 1)
+
+    simulation = Simulation(args.frame_size, not args.no_sequence_numbers,
+                            args.blocks_per_packet, args.initial_size)
+    period = args.frame_size / jp.SYSTEM_SAMPLE_RATE_HZ / (1 + args.drift_ppm * 1e-6)
+    clock = (period, period / 2)
+    started = time.monotonic()
+    if args.command == 'simulate':
+        traces = _load_traces(args)
+        if not traces:
+            sys.exit('no traces found')
+        rows = _simulate_rows(traces, simulation, clock, args)
+        print_rows(rows, 'trace')
+        results = {'traces': rows, 'total': aggregate(rows)}
+        count = len(rows)
+    else:
+        results = run_sweep(args, simulation, clock)
+        print_rows(results, 'network')
+        count = len(results) * args.traces
+    logger.info('simulated %d traces in %.1f s', count, time.monotonic() - started)
+    write_json(results, args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Measures the audio round trip latency through a Jamulus server with a
+synthetic client.
+
+The probe connects like jamulus_load_test.py and sends raw audio, which
+CServer::MixEncodeTransmitData also returns raw, so the personal mix the
+server sends back is available sample by sample. Every --interval seconds,
+the probe injects a test signal (a short chirp or an impulse) and finds it
+again in the returned mix by normalized cross-correlation, computed with
+NumPy's FFT over the whole recording at once. The latency of each detected
+signal is the time between sending the packet containing its first sample
+and receiving the packet which returned that sample, plus the offset of
+the sample within the packet.
+
+Besides this, the probe records the round trip time of
+PROTMESSID_CLM_PING_MS messages and every PROTMESSID_JITT_BUF_SIZE which
+the server reports for its auto jitter buffer. The difference between the
+audio latency and the ping is the delay added by the server's jitter buffer
+and mixing. The jitter buffer of a real client and the delay of its audio
+interface add to the mouth-to-ear latency on top of this.
+
+With --jamulus, the probe starts a local server for each --config, so that
+server options like --fastupdate and --multithreading can be compared in
+one run. The results record the version of the probed server, from the
+--version output of --jamulus or else from the PROTMESSID_VERSION_AND_OS
+message the server sends on a new connection. `selfcheck` verifies the
+detection on synthetic recordings without a server.
+
+Usage:
+./tools/jamulus_latency_probe.py run --server 127.0.0.1:22124 --duration 30
+./tools/jamulus_latency_probe.py run --jamulus ./Jamulus --config default= \
+    --config fast=--fastupdate --config mt="--fastupdate --multithreading" --json latency.json
+./tools/jamulus_latency_probe.py selfcheck
+
+"""
+
+import argparse
+import asyncio
+import collections
+import functools
+import logging
+import shlex
+import sys
+import time
+
+import jamulus_protocol as jp
+from jamulus_common import exit_on_error, optional_import, parse_address, require_numpy, write_json
+from jamulus_load_test import (NUM_CHANNELS_MONO, NUM_CHANNELS_STEREO, AudioFormat, LoadClient,
+                               LoadTest)
+from jamulus_rpc_bench import LocalServer, binary_version, split_version
+
+np = optional_import('numpy')
+logger = logging.getLogger('')
+
+CHIRP_SAMPLES = 256
+CHIRP_FREQUENCIES_HZ = (1000.0, 8000.0)
+# samples of silence after an impulse which the correlation takes into account
+IMPULSE_SAMPLES = 32
+
+ProbeOptions = collections.namedtuple('ProbeOptions', [
+    'duration', 'interval', 'template', 'jitter_buffer', 'threshold'])
+
+
+def make_template(signal, level):
+    """
+    @param signal: str, chirp or impulse
+    @param level: float, peak level in dBFS
+    @return: float array with the samples of the test signal
+    """
+    amplitude = 32767 * 10 ** (level / 20)
+    if signal == 'impulse':
+        template = np.zeros(IMPULSE_SAMPLES)
+        template[0] = amplitude
+        return template
+    t = np.arange(CHIRP_SAMPLES) / jp.SYSTEM_SAMPLE_RATE_HZ
+    start, end = CHIRP_FREQUENCIES_HZ
+    duration = CHIRP_SAMPLES / jp.SYSTEM_SAMPLE_RATE_HZ
+    phase = 2 * np.pi * (start * t + (end - start) * t ** 2 / (2 * duration))
+    return amplitude * np.sin(phase) * np.hanning(CHIRP_SAMPLES)
+
+
+def normalized_correlation(stream, template):
+    """
+    @param stream: float array
+    @param template: float array, not longer than stream
+    @return: float array of len(stream) - len(template) + 1 values in -1..1,
+             the correlation of the template with the stream at each offset
+    """
+    size = 1 << (len(stream) + len(template) - 2).bit_length()
+    spectrum = np.fft.rfft(stream, size) * np.conj(np.fft.rfft(template, size))
+    correlation = np.fft.irfft(spectrum, size)[:len(stream) - len(template) + 1]
+    energy = np.concatenate([[0.0], np.cumsum(stream ** 2)])
+    windows = np.sqrt(np.maximum(energy[len(template):] - energy[:-len(template)], 0.0))
+    norms = windows * np.linalg.norm(template)
+    # windows with less energy than one LSB are considered silent
+    silent = windows < 1
+    return np.where(silent, 0.0, correlation / np.where(silent, 1.0, norms))
+
+
+def find_peaks(values, threshold, distance):
+    """
+    @param values: float array
+    @param threshold: float, minimum peak value
+    @param distance: int, values above the threshold which are closer than
+                     this belong to the same peak
+    @return: int array with the position of the maximum of each peak
+    """
+    candidates = np.flatnonzero(values >= threshold)
+    if not candidates.size:
+        return candidates
+    groups = np.cumsum(np.diff(candidates, prepend=-distance - 1) > distance)
+    order = np.lexsort((-values[candidates], groups))
+    first = np.concatenate([[True], np.diff(groups[order]) != 0])
+    return candidates[order[first]]
+
+
+def measure_latencies(arrivals, samples, injections, template, threshold):
+    """
+    @param arrivals: float array, arrival time of each received packet
+    @param samples: float array, the received mono samples, the same
+                    number for every packet
+    @param injections: float array, send times of the packets in which a
+                       test signal starts (at the first sample)
+    @param template: float array, the test signal
+    @param threshold: float, minimum normalized correlation of a detection
+    @return: float array, latency in seconds per detected test signal
+    """
+    if len(samples) < len(template) or len(injections) == 0:
+        return np.zeros(0)
+    frame_samples = len(samples) // len(arrivals)
+    peaks = find_peaks(normalized_correlation(samples, template), threshold, len(template))
+    times = arrivals[peaks // frame_samples] + (peaks % frame_samples) / jp.SYSTEM_SAMPLE_RATE_HZ
+    # each test signal belongs to the last injection before it was received
+    injection = np.searchsorted(injections, times, side='right') - 1
+    valid = injection >= 0
+    injection, times = injection[valid], times[valid]
+    _, first = np.unique(injection, return_index=True)
+    return times[first] - injections[injection[first]]
+
+
+def summarize(values):
+    """
+    Like Histogram.to_dict() but with exact percentiles, since the latency
+    differences of interest are smaller than the histogram resolution.
+
+    @param values: float array, in ms
+    @return: dict with summary statistics, suitable for JSON
+    """
+    if len(values) == 0:
+        return {'count': 0}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        'count': len(values),
+        'mean': round(float(values.mean()), 3),
+        'min': round(float(values.min()), 3),
+        'p50': round(float(p50), 3),
+        'p90': round(float(p90), 3),
+        'p99': round(float(p99), 3),
+        'max': round(float(values.max()), 3),
+    }
+
+
+class ProbeClient(LoadClient):  # pylint: disable=too-many-instance-attributes
+    """
+    Synthetic client which sends a test signal and keeps the returned audio.
+    """
+
+    def __init__(self, index, server, audio_format, options):
+        super().__init__(index, server, audio_format)
+        self.options = options
+        self.pattern = self._make_pattern(options)
+        self.position = 0
+        self.injections = []
+        self.received = []
+        self.jitter_buffer_sizes = []
+        self.server_version = None
+
+    def _make_pattern(self, options):
+        """
+        @return: list of bytes, the audio of each packet of one interval
+        """
+        frame_samples = self.format.frame_samples
+        packets = max(1, round(options.interval / self.format.period))
+        packets = max(packets, -(-len(options.template) // frame_samples))
+        mono = np.zeros(packets * frame_samples)
+        mono[:len(options.template)] = options.template
+        pcm = np.repeat(np.round(mono).astype('<i2'), self.format.num_channels)
+        size = self.format.coded_bytes
+        data = pcm.tobytes()
+        return [data[i:i + size] for i in range(0, len(data), size)]
+
+    def handle_message(self, msg_id, data):
+        if msg_id == jp.PROTMESSID_REQ_JITT_BUF_SIZE:
+            self.send_message(jp.PROTMESSID_JITT_BUF_SIZE,
+                              {'num_blocks': self.options.jitter_buffer})
+        elif msg_id == jp.PROTMESSID_JITT_BUF_SIZE:
+            num_blocks = jp.decode_body(msg_id, data)['num_blocks']
+            logger.debug('server jitter buffer: %d blocks', num_blocks)
+            self.jitter_buffer_sizes.append((time.monotonic(), num_blocks))
+        elif msg_id == jp.PROTMESSID_VERSION_AND_OS:
+            # see CServer::OnNewConnection
+            self.server_version = jp.decode_body(msg_id, data)['version']
+        else:
+            super().handle_message(msg_id, data)
+
+    def audio_received(self, data):
+        super().audio_received(data)
+        if len(data) == self.format.packet_size:
+            self.received.append((time.monotonic(), bytes(data[:-1])))
+
+    def send_audio(self):
+        self.audio_packet[:-1] = self.pattern[self.position]
+        if self.position == 0:
+            self.injections.append(time.monotonic())
+        self.position = (self.position + 1) % len(self.pattern)
+        super().send_audio()
+
+    def results(self):
+        """
+        @return: dict, suitable for JSON
+        """
+        if self.received:
+            arrivals = np.array([arrival for arrival, _ in self.received])
+            samples = np.frombuffer(b''.join(data for _, data in self.received), dtype='<i2')
+            samples = samples.reshape(-1, self.format.num_channels).mean(axis=1)
+        else:
+            arrivals, samples = np.zeros(0), np.zeros(0)
+        latencies = measure_latencies(arrivals, samples, np.array(self.injections),
+                                      self.options.template, self.options.threshold)
+        ping = self.stats.ping
+        start = self.injections[0] if self.injections else 0.0
+        results = {
+            'server_version': self.server_version,
+            'injected': len(self.injections),
+            'detected': len(latencies),
+            'latency_ms': summarize(1000 * latencies),
+            'ping_ms': ping.to_dict(),
+            'jitter_buffer_blocks': [{'time': round(t - start, 3), 'num_blocks': n}
+                                     for t, n in self.jitter_buffer_sizes],
+            'audio': {name: value for name, value in self.stats.to_dict().items()
+                      if name not in ('ping_ms', 'protocol_received')},
+            'latencies_ms': [round(1000 * value, 3) for value in latencies],
+        }
+        if len(latencies) and ping.count:
+            results['server_delay_ms'] = round(results['latency_ms']['p50'] -
+                                               ping.percentile(0.5), 3)
+        return results
+
+
+async def probe(server, audio_format, options, report_interval):
+    """
+    Runs one synthetic client against a server.
+
+    @param server: (host, port)
+    @return: dict with the results
+    """
+    test = LoadTest(server, audio_format, report_interval)
+    test.client_class = functools.partial(ProbeClient, options=options)
+    try:
+        await test.run(1, 1.0, options.duration)
+    finally:
+        test.close()
+    client = test.clients[0]
+    if client.state != 'connected':
+        logger.warning('the probe did not get connected (state: %s)', client.state)
+    return client.results()
+
+
+def run(args, audio_format, options):
+    """
+    Probes every configuration and writes the results.
+    """
+    commit, version = binary_version(args.jamulus) if args.jamulus else (None, None)
+    runs = []
+    for name, server_args in args.config:
+        server = None
+        address = args.server
+        try:
+            if args.jamulus:
+                server = LocalServer(args.jamulus, server_args)
+                server.start()
+                address = server.audio
+            results = asyncio.run(probe(address, audio_format, options, args.report_interval))
+        finally:
+            if server is not None:
+                server.stop()
+        logger.info('%s: %d of %d test signals detected, latency p50 %s ms, p99 %s ms, '
+                    'ping p50 %s ms', name, results['detected'], results['injected'],
+                    results['latency_ms'].get('p50'), results['latency_ms'].get('p99'),
+                    results['ping_ms'].get('p50'))
+        if version is None and results['server_version']:
+            commit, version = split_version(results['server_version'])
+        runs.append({'config': name, 'server_args': server_args, **results})
+    write_json({
+        'commit': commit,
+        'version': version,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'server': args.jamulus or f'{args.server[0]}:{args.server[1]}',
+        'parameters': {
+            'duration': args.duration,
+            'interval': args.interval,
+            'signal': args.signal,
+            'level_dbfs': args.level,
+            'jitter_buffer': args.jitter_buffer or 'auto',
+            'channels': audio_format.num_channels,
+            'frame_samples': audio_format.frame_samples,
+        },
+        'runs': runs,
+    }, args.json)
+
+
+SELFCHECK_SIGNALS = 40
+SELFCHECK_INTERVAL = 150  # packets
+
+
+def _synthetic_recording(template, network, shift, rng):
+    """
+    @param template: float array, the test signal
+    @param network: float, seconds added to the arrival of every packet
+    @param shift: int, samples by which the server mix delays the signal
+    @return: (arrivals, samples, injections) tuple as expected by measure_latencies()
+    """
+    frame_samples = jp.SYSTEM_FRAME_SIZE_SAMPLES
+    period = frame_samples / jp.SYSTEM_SAMPLE_RATE_HZ
+    sent = np.zeros(SELFCHECK_SIGNALS * SELFCHECK_INTERVAL * frame_samples)
+    for start in range(0, len(sent), SELFCHECK_INTERVAL * frame_samples):
+        sent[start:start + len(template)] = template
+    # other clients in the mix and noise
+    mix = np.concatenate([np.zeros(shift), sent])[:len(sent)]
+    mix += 300 * np.sin(np.arange(len(mix)) * 0.05) + rng.normal(0, 30, len(mix))
+    arrivals = np.arange(len(mix) // frame_samples) * period + network
+    # a lost packet
+    keep = np.ones(len(arrivals), dtype=bool)
+    keep[777] = False
+    injections = np.arange(0, SELFCHECK_SIGNALS * SELFCHECK_INTERVAL, SELFCHECK_INTERVAL) * period
+    return arrivals[keep], mix.reshape(-1, frame_samples)[keep].ravel(), injections
+
+
+def selfcheck():
+    """
+    Detects test signals in synthetic recordings with a known latency, some
+    noise, a second signal in the mix and a lost packet.
+
+    @return: bool, True if all latencies were found within half a sample
+    """
+    passed = True
+    rng = np.random.default_rng(0)
+    for signal in ('chirp', 'impulse'):
+        template = make_template(signal, -6.0)
+        for network, shift in ((0.0123, 209), (0.0011, 0), (0.0450, 1000)):
+            latencies = measure_latencies(*_synthetic_recording(template, network, shift, rng),
+                                          template, 0.6)
+            expected = network + shift / jp.SYSTEM_SAMPLE_RATE_HZ
+            error = np.abs(latencies - expected).max() if len(latencies) else np.inf
+            ok = len(latencies) == SELFCHECK_SIGNALS and error < 0.5 / jp.SYSTEM_SAMPLE_RATE_HZ
+            logger.info('%s, %.1f ms: %d of %d detected, max error %.3f ms: %s', signal,
+                        1000 * expected, len(latencies), SELFCHECK_SIGNALS, 1000 * error,
+                        'OK' if ok else 'FAILED')
+            passed &= ok
+    return passed
+
+
+# Command line ---------------------------------------------------------------
+def parse_config(text):
+    """
+    @param text: str, NAME=SERVER_ARGS
+    @return: (name, list of str) tuple
+    """
+    name, sep, server_args = text.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f'invalid configuration {text!r}, expected NAME=ARGS')
+    return name, shlex.split(server_args)
+
+
+def main():
+    p = argparse.ArgumentParser(description='Measures the audio latency through a Jamulus server.')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    sub = p.add_subparsers(dest='command', required=True)
+
+    r = sub.add_parser('run', help='probe a server')
+    target = r.add_mutually_exclusive_group()
+    target.add_argument('--server', type=parse_address, metavar='HOST[:PORT]',
+                        default=f'127.0.0.1:{jp.DEFAULT_PORT_NUMBER}', help='server to probe')
+    target.add_argument('--jamulus', metavar='BINARY',
+                        help='start this Jamulus executable as a local server for each --config')
+    r.add_argument('--config', type=parse_config, action='append', metavar='NAME=ARGS',
+                   help='server options to probe with --jamulus (repeatable)')
+    r.add_argument('--duration', type=float, default=20.0, help='seconds to probe')
+    r.add_argument('--interval', type=float, default=0.25,
+                   help='seconds between test signals, must exceed the latency')
+    r.add_argument('--signal', choices=['chirp', 'impulse'], default='chirp',
+                   help='test signal to inject')
+    r.add_argument('--level', type=float, default=-6.0, help='peak level of the test signal '
+                                                             'in dBFS')
+    r.add_argument('--threshold', type=float, default=0.6,
+                   help='minimum normalized correlation of a detected test signal')
+    r.add_argument('--jitter-buffer', type=int,
+                   help='fixed server jitter buffer size in blocks (default: auto)')
+    r.add_argument('--stereo', action='store_true', help='send stereo instead of mono audio')
+    r.add_argument('--no-small-buffers', action='store_true',
+                   help='send 128 instead of 64 samples per packet')
+    r.add_argument('--report-interval', type=float, default=5.0,
+                   help='seconds between progress lines')
+    r.add_argument('--json', metavar='FILE', help='write the results as JSON ("-" for stdout)')
+
+    sub.add_parser('selfcheck', help='verify the detection on synthetic recordings')
+
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+
+    require_numpy('the onset detection')
+    if args.command == 'selfcheck':
+        sys.exit(0 if selfcheck() else 1)
+
+    if args.config and not args.jamulus:
+        p.error('--config requires --jamulus')
+    args.config = args.config or [('default', [])]
+    if args.jitter_buffer is not None and not (jp.MIN_NET_BUF_SIZE_NUM_BL <= args.jitter_buffer
+                                               <= jp.MAX_NET_BUF_SIZE_NUM_BL):
+        p.error(f'--jitter-buffer must be between {jp.MIN_NET_BUF_SIZE_NUM_BL} and '
+                f'{jp.MAX_NET_BUF_SIZE_NUM_BL}')
+    if args.duration <= 0 or args.interval <= 0:
+        p.error('--duration and --interval must be positive')
+
+    audio_format = AudioFormat(NUM_CHANNELS_STEREO if args.stereo else NUM_CHANNELS_MONO,
+                               small_buffers=not args.no_small_buffers)
+    options = ProbeOptions(args.duration, args.interval, make_template(args.signal, args.level),
+                           args.jitter_buffer or jp.AUTO_NET_BUF_SIZE_FOR_PROTOCOL,
+                           args.threshold)
+    exit_on_error(run, args, audio_format, options)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Downsampler and time series store for the channel levels seen by a Jamulus
+client.
+
+A connected client receives the meter level of every channel of the server
+about four times per second (CHANNEL_LEVEL_UPDATE_INTERVAL) and forwards it
+as the jamulusclient/channelLevelListReceived notification: an integer from
+0 (below -50 dB) to 8 (full scale), or 9 if the largest negative sample value
+was reached, i.e. the signal clipped. The list is in the order of the last
+jamulusclient/clientListReceived notification.
+
+This tool subscribes to both notifications over one JSON-RPC connection
+(see jamulus_rpc.py), which is re-established after failures. It reduces the
+levels to minimum, maximum, mean and number of clipped levels per time
+window and keeps the windows in a fixed-size NumPy ring buffer per channel
+ID, so memory use is constant and nothing is written to disk.
+
+The recent history is served as newline-delimited JSON-RPC over TCP, like
+the Jamulus API itself, without authentication (so listen on localhost):
+
+- levels/getChannels: all channels seen with name, last level and a state
+  ("clipping" if a level clipped within --clip-window seconds, "silent" if
+  all levels were 0 for --silent-window seconds, else "ok")
+- levels/getHistory: the windows of one channel ({"channel": ID}), optionally
+  only of the last seconds ({"seconds": 60})
+
+Usage:
+./tools/jamulus_levels.py --rpc 127.0.0.1:22100 --secret-file secret.txt
+./tools/jamulus_levels.py --rpc 127.0.0.1:22100 --secret-file secret.txt --window 5 \
+    --history 720 --listen 127.0.0.1:22199
+echo '{"id":1,"jsonrpc":"2.0","method":"levels/getChannels","params":{}}' | \
+    nc -q 1 127.0.0.1 22199
+
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+
+import jamulus_protocol as jp
+from jamulus_common import optional_import, parse_address, require_numpy
+from jamulus_rpc import (ERR_INVALID_PARAMS, ERR_INVALID_REQUEST, ERR_METHOD_NOT_FOUND,
+                         ERR_PARSE_ERROR, JsonRpcError, RpcConnection, read_secret_file)
+
+np = optional_import('numpy')
+logger = logging.getLogger('')
+
+LEVELS_NOTIFICATION = 'jamulusclient/channelLevelListReceived'
+CLIENT_LIST_NOTIFICATION = 'jamulusclient/clientListReceived'
+
+# see CServer::CreateLevelsForAllConChannels and CLevelMeter::SetValue
+CLIP_LEVEL = 9
+
+# one window per channel and ring position
+WINDOW_DTYPE = [('start', 'f8'), ('min', 'u1'), ('max', 'u1'), ('mean', 'f4'),
+                ('clipped', 'u4'), ('count', 'u4')]
+
+# per channel: ring position, number of stored windows, last level and the
+# accumulators of the current window
+STATE_DTYPE = [('head', 'i4'), ('filled', 'i4'), ('level', 'u1'), ('seen', 'f8'),
+               ('min', 'u1'), ('max', 'u1'), ('sum', 'f8'), ('clipped', 'u4'), ('count', 'u4')]
+
+MAX_BACKOFF = 30.0
+
+# not used by CRpcServer, see the JSON-RPC 2.0 specification
+ERR_INTERNAL_ERROR = -32603
+
+
+class LevelStore:
+    """
+    Min/max/mean downsampling of channel levels into ring buffers.
+    """
+
+    def __init__(self, window, capacity, channels=jp.MAX_NUM_CHANNELS):
+        """
+        @param window: float, seconds per window
+        @param capacity: int, windows kept per channel
+        @param channels: int, number of channel IDs
+        """
+        self.window = window
+        self.ring = np.zeros((channels, capacity), dtype=WINDOW_DTYPE)
+        self.state = np.zeros(channels, dtype=STATE_DTYPE)
+        self.current_start = None
+        self._reset_current()
+
+    def _reset_current(self):
+        state = self.state
+        state['min'] = 255
+        state['max'] = 0
+        state['sum'] = 0
+        state['clipped'] = 0
+        state['count'] = 0
+
+    def add(self, channel_ids, levels, now):
+        """
+        @param channel_ids: int array, channel ID of each level
+        @param levels: int array, levels of one notification
+        @param now: float, receive time in seconds since the epoch
+        """
+        start = math.floor(now / self.window) * self.window
+        if start != self.current_start:
+            self.flush()
+            self.current_start = start
+        ids = np.asarray(channel_ids, dtype=np.intp)
+        levels = np.asarray(levels, dtype=np.uint8)
+        state = self.state
+        state['level'][ids] = levels
+        state['seen'][ids] = now
+        state['min'][ids] = np.minimum(state['min'][ids], levels)
+        state['max'][ids] = np.maximum(state['max'][ids], levels)
+        state['sum'][ids] += levels
+        state['clipped'][ids] += levels >= CLIP_LEVEL
+        state['count'][ids] += 1
+
+    def flush(self):
+        """
+        Appends the current window of all channels with levels to their rings.
+        """
+        state = self.state
+        active = np.flatnonzero(state['count'])
+        if self.current_start is None or active.size == 0:
+            return
+        current = state[active]
+        windows = self.ring[active, current['head']]
+        windows['start'] = self.current_start
+        for field in ('min', 'max', 'clipped', 'count'):
+            windows[field] = current[field]
+        windows['mean'] = current['sum'] / current['count']
+        self.ring[active, current['head']] = windows
+        capacity = self.ring.shape[1]
+        state['head'][active] = (current['head'] + 1) % capacity
+        state['filled'][active] = np.minimum(current['filled'] + 1, capacity)
+        self._reset_current()
+
+    def history(self, channel, since=None):
+        """
+        @param channel: int, channel ID
+        @param since: float, only windows which end after this time or None
+        @return: structured array with WINDOW_DTYPE in chronological order,
+                 including the current incomplete window
+        """
+        state = self.state[channel]
+        capacity = self.ring.shape[1]
+        order = (state['head'] - state['filled'] + np.arange(state['filled'])) % capacity
+        windows = self.ring[channel, order]
+        if state['count']:
+            current = np.zeros(1, dtype=WINDOW_DTYPE)
+            current[0] = (self.current_start, state['min'], state['max'],
+                          state['sum'] / state['count'], state['clipped'], state['count'])
+            windows = np.concatenate([windows, current])
+        if since is not None:
+            windows = windows[windows['start'] + self.window > since]
+        return windows
+
+    def status(self, channel, now, silent_window, clip_window):
+        """
+        @param channel: int, channel ID
+        @param now: float, current time in seconds since the epoch
+        @param silent_window: float, seconds without any level above 0 for "silent"
+        @param clip_window: float, seconds to look back for clipped levels
+        @return: str, "clipping", "silent" or "ok"
+        """
+        windows = self.history(channel)
+        ends = windows['start'] + self.window
+        if windows['clipped'][ends > now - clip_window].any():
+            return 'clipping'
+        # the history has to cover the whole silent window
+        covered = len(windows) and windows['start'][0] <= now - silent_window
+        if covered and not windows['max'][ends > now - silent_window].any():
+            return 'silent'
+        return 'ok'
+
+    def channels(self):
+        """
+        @return: int array, IDs of the channels with any level
+        """
+        return np.flatnonzero(self.state['seen'])
+
+
+class LevelSubscriber:
+    """
+    Feeds the notifications of one Jamulus client into a LevelStore.
+    """
+
+    def __init__(self, address, secret_file, store, timeout=10.0):
+        """
+        @param address: (host, port) tuple of the JSON-RPC server of the client
+        @param secret_file: str, see read_secret_file(), or None
+        @param store: LevelStore
+        @param timeout: float, seconds to wait for connection and each response
+        """
+        self.address = address
+        self.secret_file = secret_file
+        self.store = store
+        self.timeout = timeout
+        self.clients = []  # channel ID per position in the level list
+        self.names = {}
+        self.connected = False
+
+    def set_clients(self, clients):
+        """
+        @param clients: list of dicts as in jamulusclient/clientListReceived
+        """
+        self.clients = [client.get('id', -1) for client in clients]
+        for client in clients:
+            if 'id' in client:
+                self.names[client['id']] = client.get('name', '')
+
+    def add_levels(self, levels, now):
+        """
+        @param levels: list of int, as in jamulusclient/channelLevelListReceived
+        @param now: float, receive time in seconds since the epoch
+        """
+        count = min(len(levels), len(self.clients))
+        if count != len(levels):
+            # the lists are sent separately, so they can briefly disagree
+            logger.debug('%d levels for %d clients', len(levels), len(self.clients))
+        ids = np.asarray(self.clients[:count], dtype=np.intp)
+        valid = (ids >= 0) & (ids < len(self.store.state))
+        if valid.any():
+            self.store.add(ids[valid], np.asarray(levels[:count])[valid], now)
+
+    async def _receive(self, connection):
+        with connection.subscribe(LEVELS_NOTIFICATION, CLIENT_LIST_NOTIFICATION) as subscription:
+            try:
+                self.set_clients((await connection.call('jamulusclient/getClientList'))['clients'])
+            except JsonRpcError as e:
+                # 1: the client is not connected to a server (yet)
+                if e.code != 1:
+                    raise
+            async for method, params in subscription:
+                if method == CLIENT_LIST_NOTIFICATION:
+                    self.set_clients(params.get('clients', []))
+                else:
+                    self.add_levels(params.get('channelLevelList', []), time.time())
+            if subscription.dropped:
+                logger.warning('dropped %d notifications', subscription.dropped)
+
+    async def run(self):
+        """
+        Receives notifications forever, reconnecting with exponential backoff.
+        """
+        failures = 0
+        while True:
+            connection = None
+            try:
+                secret = read_secret_file(self.secret_file) if self.secret_file else None
+                connection = RpcConnection(*self.address, secret, self.timeout)
+                await connection.connect()
+                failures = 0
+                self.connected = True
+                logger.info('connected to %s:%s', *self.address)
+                await self._receive(connection)
+                logger.warning('connection to %s:%s closed', *self.address)
+            except (OSError, ConnectionError, JsonRpcError, asyncio.TimeoutError) as e:
+                failures += 1
+                logger.warning('connection to %s:%s failed: %s', *self.address, str(e) or repr(e))
+            finally:
+                self.connected = False
+                if connection is not None:
+                    await connection.close()
+            backoff = min(MAX_BACKOFF, 2 ** failures)
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+
+
+def window_to_json(window):
+    """
+    @param window: one element of a WINDOW_DTYPE array
+    @return: dict
+    """
+    return {'start': round(float(window['start']), 3), 'min': int(window['min']),
+            'max': int(window['max']), 'mean': round(float(window['mean']), 3),
+            'clipped': int(window['clipped']), 'count': int(window['count'])}
+
+
+class QueryServer:
+    """
+    Serves the level history as newline-delimited JSON-RPC.
+    """
+
+    def __init__(self, store, subscriber, options):
+        """
+        @param store: LevelStore
+        @param subscriber: LevelSubscriber, for names and connection state
+        @param options: argparse.Namespace with silent_window and clip_window
+        """
+        self.store = store
+        self.subscriber = subscriber
+        self.options = options
+        self.methods = {
+            'levels/getChannels': self.get_channels,
+            'levels/getHistory': self.get_history,
+        }
+
+    def get_channels(self, params):
+        """
+        @return: dict with all channels seen since the start
+        """
+        del params
+        now = time.time()
+        state = self.store.state
+        present = set(self.subscriber.clients)
+        channels = []
+        for channel in self.store.channels():
+            channel = int(channel)
+            channels.append({
+                'id': channel,
+                'name': self.subscriber.names.get(channel, ''),
+                'present': channel in present,
+                'level': int(state['level'][channel]),
+                'lastSeen': round(float(state['seen'][channel]), 3),
+                'state': self.store.status(channel, now, self.options.silent_window,
+                                           self.options.clip_window),
+            })
+        return {'connected': self.subscriber.connected, 'window': self.store.window,
+                'channels': channels}
+
+    def get_history(self, params):
+        """
+        @return: dict with the windows of one channel
+        """
+        channel = params.get('channel')
+        seconds = params.get('seconds')
+        if (isinstance(channel, bool) or not isinstance(channel, int)
+                or not 0 <= channel < len(self.store.state)):
+            raise JsonRpcError(ERR_INVALID_PARAMS, 'Invalid params: channel must be a channel ID')
+        if seconds is not None and (isinstance(seconds, bool)
+                                    or not isinstance(seconds, (int, float))):
+            raise JsonRpcError(ERR_INVALID_PARAMS, 'Invalid params: seconds must be a number')
+        since = time.time() - seconds if seconds is not None else None
+        windows = self.store.history(channel, since)
+        return {'channel': channel, 'window': self.store.window,
+                'windows': [window_to_json(window) for window in windows]}
+
+    def handle(self, request):
+        """
+        @param request: one decoded JSON-RPC request
+        @return: response dict or None for notifications
+        """
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return {'id': None, 'jsonrpc': '2.0',
+                    'error': {'code': ERR_INVALID_REQUEST, 'message': 'Invalid request'}}
+        response = {'id': request.get('id'), 'jsonrpc': '2.0'}
+        handler = self.methods.get(request['method'])
+        params = request.get('params', {})
+        try:
+            if handler is None:
+                raise JsonRpcError(ERR_METHOD_NOT_FOUND, 'Method not found')
+            if not isinstance(params, dict):
+                raise JsonRpcError(ERR_INVALID_PARAMS, 'Invalid params: expected an object')
+            response['result'] = handler(params)
+        except JsonRpcError as e:
+            response['error'] = {'code': e.code, 'message': e.message}
+        except Exception:  # pylint: disable=broad-exception-caught
+            # answer instead of dropping the connection of the client
+            logger.exception('%s failed', request['method'])
+            response['error'] = {'code': ERR_INTERNAL_ERROR, 'message': 'Internal error'}
+        return response if 'id' in request else None
+
+    def handle_line(self, line):
+        """
+        @param line: bytes, one request or batch
+        @return: response object, list of responses or None
+        """
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return {'id': None, 'jsonrpc': '2.0',
+                    'error': {'code': ERR_PARSE_ERROR, 'message': 'Parse error'}}
+        if not isinstance(message, list):
+            return self.handle(message)
+        responses = [response for response in map(self.handle, message) if response is not None]
+        return responses or None
+
+    async def serve_client(self, reader, writer):
+        """
+        Answers requests until the peer closes the connection.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = self.handle_line(line)
+                if response is not None:
+                    writer.write(json.dumps(response, separators=(',', ':')).encode() + b'\n')
+                    await writer.drain()
+        except (ConnectionError, OSError) as e:
+            logger.debug('query connection failed: %s', e)
+        finally:
+            writer.close()
+
+
+async def run(args):
+    """
+    Runs the subscriber and the query server until interrupted.
+    """
+    listen_host, listen_port = parse_address(args.listen)
+    store = LevelStore(args.window, args.history)
+    subscriber = LevelSubscriber(parse_address(args.rpc), args.secret_file, store, args.timeout)
+    query = QueryServer(store, subscriber, args)
+    server = await asyncio.start_server(query.serve_client, listen_host, listen_port)
+    logger.info('serving levels on %s:%d', listen_host, listen_port)
+    async with server:
+        await subscriber.run()
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description='Downsamples the channel levels of a Jamulus client into ring buffers '
+                    'and serves the history over JSON-RPC')
+    p.add_argument('--rpc', required=True,
+                   help='HOST:PORT of the JSON-RPC API of the client (see --jsonrpcport)')
+    p.add_argument('--secret-file', help='file with the JSON-RPC secret (see --jsonrpcsecretfile)')
+    p.add_argument('--window', type=float, default=1.0,
+                   help='seconds per downsampled window (default: %(default)s)')
+    p.add_argument('--history', type=int, default=3600,
+                   help='windows kept per channel (default: %(default)s)')
+    p.add_argument('--listen', default='127.0.0.1:22199',
+                   help='HOST:PORT to serve the query API on (default: %(default)s)')
+    p.add_argument('--silent-window', type=float, default=30.0,
+                   help='seconds at level 0 after which a channel is silent '
+                        '(default: %(default)s)')
+    p.add_argument('--clip-window', type=float, default=10.0,
+                   help='seconds a clipped level keeps a channel in the clipping state '
+                        '(default: %(default)s)')
+    p.add_argument('--timeout', type=float, default=10.0,
+                   help='seconds to wait for a connection or response (default: %(default)s)')
+    p.add_argument('--verbose', '-v', action='store_true', help='enable verbose output')
+    args = p.parse_args()
+    logging.basicConfig(format='%(levelname)s %(message)s',
+                        level=logging.DEBUG if args.verbose else logging.INFO)
+    if args.window <= 0 or args.history < 1:
+        p.error('--window and --history must be positive')
+
+    require_numpy('the level store')
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
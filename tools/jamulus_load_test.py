@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Headless load generator which connects many synthetic clients to a Jamulus
+server in order to find its capacity limits.
+
+Each synthetic client uses its own UDP socket and speaks the subset of the
+protocol which a server needs to accept it as a full member: it
+acknowledges all connection messages, answers the requests for network
+transport properties, jitter buffer size and channel infos and sends audio
+at the system frame cadence.
+
+By default, audio is sent uncompressed ("raw" audio). The server detects
+raw audio by its packet size and copies it instead of decoding it, and it
+sends the mix back raw instead of encoding it (see
+CServer::DecodeReceiveData and CServer::MixEncodeTransmitData), so such a
+run measures the mixing and the network path, but not the Opus work which
+dominates the CPU load of a server with real clients. With --quality low,
+normal or high, the clients send Opus frames of the size CClient uses for
+that audio quality, so the server decodes every client and encodes every
+mix like in production. The frames are pre-encoded (see
+jamulus_opus_frames.py), so no Opus library is needed.
+
+Per client, the tool records the packet loss (via the sequence counter of
+the audio packets received from the server), the inter-arrival jitter of
+these packets, the number of gaps between them longer than --gap-threshold
+(a late server timer) and the round trip time of PROTMESSID_CLM_PING_MS
+messages.
+
+Usage:
+./tools/jamulus_load_test.py --clients 50 --ramp-rate 5 --duration 60
+./tools/jamulus_load_test.py --server 127.0.0.1:22124 --clients 150 --quality normal \
+    --json results.json
+
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import socket
+import struct
+import time
+
+import jamulus_protocol as jp
+from jamulus_common import Histogram, parse_address, write_json
+from jamulus_opus_frames import OPUS_FRAMES
+
+logger = logging.getLogger('')
+
+PING_UPDATE_TIME_MS = 500  # see src/global.h
+
+# the default server timer runs at DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES (without
+# --fastupdate), so longer gaps between two audio packets mean that it was
+# late by at least one period
+DEFAULT_GAP_THRESHOLD_MS = (2 * 1000 * jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES /
+                            jp.SYSTEM_SAMPLE_RATE_HZ)
+
+NUM_CHANNELS_MONO = 1
+NUM_CHANNELS_STEREO = 2
+
+AUDIO_QUALITIES = ['raw', 'low', 'normal', 'high']
+
+# coded bytes per frame of the Opus audio qualities of CClient by frame size
+# and number of channels, see src/client.h
+OPUS_NUM_BYTES = {
+    (jp.SYSTEM_FRAME_SIZE_SAMPLES, NUM_CHANNELS_MONO): {'low': 12, 'normal': 22, 'high': 36},
+    (jp.SYSTEM_FRAME_SIZE_SAMPLES, NUM_CHANNELS_STEREO): {'low': 24, 'normal': 35, 'high': 73},
+    (jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES, NUM_CHANNELS_MONO): {'low': 25, 'normal': 45,
+                                                               'high': 82},
+    (jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES, NUM_CHANNELS_STEREO): {'low': 47, 'normal': 71,
+                                                                 'high': 165},
+}
+
+
+class ClientStats:  # pylint: disable=too-many-instance-attributes
+    """
+    Counters and histograms of one synthetic client.
+    """
+
+    def __init__(self):
+        self.audio_sent = 0
+        self.audio_received = 0
+        self.audio_lost = 0
+        self.audio_late = 0
+        self.audio_gaps = 0
+        self.protocol_received = 0
+        self.ping = Histogram()
+        self.interarrival = Histogram()
+        self.jitter = 0.0  # RFC 3550 style running estimate in ms
+
+    def merge(self, other):
+        """
+        Adds the counters and histograms of another client.
+        """
+        for name in ('audio_sent', 'audio_received', 'audio_lost', 'audio_late', 'audio_gaps',
+                     'protocol_received'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.ping.merge(other.ping)
+        self.interarrival.merge(other.interarrival)
+        # the aggregated jitter is the one of the worst client
+        self.jitter = max(self.jitter, other.jitter)
+
+    def loss_ratio(self):
+        """
+        @return: float, lost audio packets relative to the expected ones
+        """
+        expected = self.audio_received + self.audio_lost
+        return self.audio_lost / expected if expected else 0.0
+
+    def to_dict(self):
+        """
+        @return: dict, suitable for JSON
+        """
+        return {
+            'audio_sent': self.audio_sent,
+            'audio_received': self.audio_received,
+            'audio_lost': self.audio_lost,
+            'audio_late': self.audio_late,
+            'audio_gaps': self.audio_gaps,
+            'loss_ratio': round(self.loss_ratio(), 6),
+            'jitter_ms': round(self.jitter, 3),
+            'protocol_received': self.protocol_received,
+            'ping_ms': self.ping.to_dict(),
+            'interarrival_ms': self.interarrival.to_dict(),
+        }
+
+
+class AudioFormat:
+    """
+    Network transport properties of the synthetic clients.
+
+    Blocks of either 64 (OPUS64, small network buffers) or 128 (OPUS)
+    samples. Raw audio is detected by the server from the packet size (see
+    CServer::DecodeReceiveData): 16 bit samples. Any other size is decoded
+    as Opus, with the sizes of the audio qualities in OPUS_NUM_BYTES.
+    """
+
+    def __init__(self, num_channels=NUM_CHANNELS_MONO, small_buffers=True, quality='raw'):
+        """
+        @param quality: str, one of AUDIO_QUALITIES
+        """
+        self.num_channels = num_channels
+        self.frame_samples = (jp.SYSTEM_FRAME_SIZE_SAMPLES if small_buffers
+                              else jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES)
+        self.codec = jp.CT_OPUS64 if small_buffers else jp.CT_OPUS
+        self.quality = quality
+        if quality == 'raw':
+            self.coded_bytes = 2 * self.frame_samples * num_channels
+        else:
+            self.coded_bytes = OPUS_NUM_BYTES[self.frame_samples, num_channels][quality]
+        # plus one byte sequence counter
+        self.packet_size = self.coded_bytes + 1
+
+    @property
+    def period(self):
+        """
+        @return: float, seconds between two audio packets
+        """
+        return self.frame_samples / jp.SYSTEM_SAMPLE_RATE_HZ
+
+    def transport_props(self):
+        """
+        @return: dict for PROTMESSID_NETW_TRANSPORT_PROPS
+        """
+        return {
+            'base_netw_size': self.packet_size,
+            'block_size_fact': 1,
+            'num_chan': self.num_channels,
+            'sample_rate': jp.SYSTEM_SAMPLE_RATE_HZ,
+            'audio_coding_type': self.codec,
+            'flags': jp.NF_WITH_COUNTER,
+            'audio_coding_arg': 0,
+        }
+
+    def test_signal(self, index):
+        """
+        @return: bytearray, one audio packet with a quiet sine wave; the
+                 frequency differs per client
+        """
+        frequency = 110.0 * (1 + index % 24)
+        samples = []
+        for i in range(self.frame_samples):
+            value = int(1000 * math.sin(2 * math.pi * frequency * i / jp.SYSTEM_SAMPLE_RATE_HZ))
+            samples += [value] * self.num_channels
+        return bytearray(struct.pack(f'<{len(samples)}h', *samples) + b'\0')
+
+    def audio_packets(self, index):
+        """
+        @return: list of bytearray, the audio packets to send in a loop: the
+                 raw test signal or the pre-encoded Opus frames, starting at
+                 a different frame per client
+        """
+        if self.quality == 'raw':
+            return [self.test_signal(index)]
+        frames = OPUS_FRAMES[self.frame_samples, self.num_channels, self.coded_bytes]
+        size = self.coded_bytes
+        packets = [bytearray(frames[i:i + size] + b'\0') for i in range(0, len(frames), size)]
+        start = index % len(packets)
+        return packets[start:] + packets[:start]
+
+
+class LoadClient(asyncio.DatagramProtocol):  # pylint: disable=too-many-instance-attributes
+    """
+    One synthetic client, acting like CClient/CChannel as far as the server
+    can tell.
+    """
+
+    def __init__(self, index, server, audio_format):
+        self.index = index
+        self.server = server
+        self.format = audio_format
+        self.transport = None
+        self.chan_id = None
+        self.state = 'connecting'
+        self.stats = ClientStats()
+        self.audio_packets = audio_format.audio_packets(index)
+        self.audio_packet = self.audio_packets[0]
+        self.sequence = 0
+        self.pings = {}
+        self.expected_sequence = None
+        self.last_audio_arrival = None
+        self.gap_threshold = DEFAULT_GAP_THRESHOLD_MS
+        # connection protocol state, see CProtocol
+        self.send_queue = []
+        self.send_counter = 0
+        self.last_send = 0.0
+        self.last_received = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        frame = jp.decode_frame(data)
+        if frame is None:
+            self.audio_received(data)
+        elif jp.is_connection_less_message_id(frame.id):
+            self.connection_less_received(frame)
+        else:
+            self.protocol_received(frame)
+
+    def error_received(self, exc):
+        logger.debug('client %d: %s', self.index, exc)
+
+    def send_message(self, msg_id, fields=None):
+        """
+        Queues a connection message. Like CProtocol, only the oldest message
+        is in flight and it is resent until it is acknowledged.
+        """
+        self.send_queue.append((msg_id, jp.encode_body(msg_id, fields), self.send_counter))
+        self.send_counter = (self.send_counter + 1) % 256
+        if len(self.send_queue) == 1:
+            self.resend(force=True)
+
+    def resend(self, force=False):
+        """
+        Sends the oldest unacknowledged message if it timed out.
+        """
+        now = time.monotonic()
+        if self.send_queue and (force or now - self.last_send >= jp.SEND_MESS_TIMEOUT_MS / 1000):
+            msg_id, body, cnt = self.send_queue[0]
+            self.transport.sendto(jp.encode_frame(msg_id, body, cnt))
+            self.last_send = now
+
+    def protocol_received(self, frame):
+        """
+        Handles a connection message, see CProtocol::ParseMessageBody.
+        """
+        self.stats.protocol_received += 1
+        if frame.id == jp.PROTMESSID_ACKN:
+            if (self.send_queue and self.send_queue[0][2] == frame.cnt and
+                    self.send_queue[0][0] == int.from_bytes(frame.data, 'little')):
+                self.send_queue.pop(0)
+                self.resend(force=True)
+            self.last_received = (frame.id, frame.cnt)
+            return
+        self.transport.sendto(jp.encode_message(jp.PROTMESSID_ACKN, id=frame.id, cnt=frame.cnt))
+        if self.last_received == (frame.id, frame.cnt):
+            return
+        self.last_received = (frame.id, frame.cnt)
+        self.handle_message(frame.id, frame.data)
+
+    def handle_message(self, msg_id, data):
+        """
+        Answers the requests the server sends on a new connection.
+        """
+        if msg_id == jp.PROTMESSID_CLIENT_ID:
+            self.chan_id = data[0] if data else None
+        elif msg_id == jp.PROTMESSID_REQ_SPLIT_MESS_SUPPORT:
+            self.send_message(jp.PROTMESSID_SPLIT_MESS_SUPPORTED)
+        elif msg_id == jp.PROTMESSID_REQ_NETW_TRANSPORT_PROPS:
+            self.send_message(jp.PROTMESSID_NETW_TRANSPORT_PROPS, self.format.transport_props())
+        elif msg_id == jp.PROTMESSID_REQ_JITT_BUF_SIZE:
+            # like CClient, request the auto jitter buffer, see CChannel::OnJittBufSizeChange
+            # in src/channel.cpp; any other value turns it off and fixes the size
+            self.send_message(jp.PROTMESSID_JITT_BUF_SIZE,
+                              {'num_blocks': jp.AUTO_NET_BUF_SIZE_FOR_PROTOCOL})
+        elif msg_id == jp.PROTMESSID_REQ_CHANNEL_INFOS:
+            self.send_message(jp.PROTMESSID_CHANNEL_INFOS, {
+                'country': 0, 'instrument': 0, 'skill_level': 0,
+                'name': f'load-{self.index:03d}', 'city': ''})
+            self.state = 'connected'
+
+    def connection_less_received(self, frame):
+        """
+        Handles ping replies and a full server.
+        """
+        if frame.id in (jp.PROTMESSID_CLM_PING_MS, jp.PROTMESSID_CLM_PING_MS_WITHNUMCLIENTS):
+            # the protocol only has millisecond resolution, so we look up
+            # the exact send time
+            sent = self.pings.pop(int.from_bytes(frame.data[:4], 'little'), None)
+            if sent is not None:
+                self.stats.ping.add((time.monotonic() - sent) * 1000)
+        elif frame.id == jp.PROTMESSID_CLM_SERVER_FULL:
+            self.state = 'rejected'
+
+    def audio_received(self, data):
+        """
+        Evaluates the sequence counter and arrival time of an audio packet.
+        """
+        now = time.monotonic()
+        stats = self.stats
+        stats.audio_received += 1
+        if self.last_audio_arrival is not None:
+            interarrival = (now - self.last_audio_arrival) * 1000
+            stats.interarrival.add(interarrival)
+            if interarrival > self.gap_threshold:
+                stats.audio_gaps += 1
+            deviation = abs(interarrival - self.format.period * 1000)
+            stats.jitter += (deviation - stats.jitter) / 16
+        self.last_audio_arrival = now
+        sequence = data[-1]
+        if self.expected_sequence is not None:
+            gap = (sequence - self.expected_sequence) % 256
+            if gap < 128:
+                stats.audio_lost += gap
+            else:
+                stats.audio_late += 1
+                return
+        self.expected_sequence = (sequence + 1) % 256
+
+    def send_audio(self):
+        """
+        Sends the next audio packet.
+        """
+        self.audio_packet = self.audio_packets[self.stats.audio_sent % len(self.audio_packets)]
+        self.audio_packet[-1] = self.sequence
+        self.sequence = (self.sequence + 1) % 256
+        self.transport.sendto(self.audio_packet)
+        self.stats.audio_sent += 1
+
+    def send_ping(self):
+        """
+        Sends a PROTMESSID_CLM_PING_MS message like CClient every
+        PING_UPDATE_TIME_MS.
+        """
+        now = time.monotonic()
+        time_ms = int(now * 1000) % (1 << 32)
+        # forget pings which were never answered
+        self.pings = {k: v for k, v in self.pings.items() if now - v < 10}
+        self.pings[time_ms] = now
+        self.transport.sendto(jp.encode_message(jp.PROTMESSID_CLM_PING_MS, time_ms=time_ms))
+
+    def disconnect(self):
+        """
+        Tells the server that we are leaving, like CClient::Stop.
+        """
+        if self.transport is not None:
+            for _ in range(3):
+                self.transport.sendto(jp.encode_message(jp.PROTMESSID_CLM_DISCONNECTION))
+            self.transport.close()
+
+
+class LoadTest:
+    """
+    Creates the clients at a given rate and drives all of them from a single
+    timer so that the sending cadence does not depend on the number of
+    asyncio tasks.
+    """
+
+    # called with (index, server, audio_format) for every new client
+    client_class = LoadClient
+
+    def __init__(self, server, audio_format, report_interval):
+        self.server = server
+        self.format = audio_format
+        self.report_interval = report_interval
+        self.gap_threshold = DEFAULT_GAP_THRESHOLD_MS
+        self.clients = []
+
+    async def add_client(self):
+        """
+        Opens a socket for a new synthetic client.
+        """
+        loop = asyncio.get_running_loop()
+        client = self.client_class(len(self.clients), self.server, self.format)
+        client.gap_threshold = self.gap_threshold
+        await loop.create_datagram_endpoint(lambda: client, remote_addr=self.server)
+        sock = client.transport.get_extra_info('socket')
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self.clients.append(client)
+        return client
+
+    async def run(self, num_clients, ramp_rate, duration):
+        """
+        @param num_clients: int, number of clients to create
+        @param ramp_rate: float, new clients per second
+        @param duration: float, seconds to run after the last client was added
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        next_frame = start
+        next_client = start
+        next_ping = start
+        next_report = start + self.report_interval
+        end = None
+        while end is None or loop.time() < end:
+            now = loop.time()
+            if len(self.clients) < num_clients and now >= next_client:
+                await self.add_client()
+                next_client += 1 / ramp_rate
+                if len(self.clients) == num_clients:
+                    end = now + duration
+            # catch up on missed frames but never send bursts of more than 10
+            frames = 0
+            while next_frame <= now and frames < 10:
+                self.send_audio()
+                next_frame += self.format.period
+                frames += 1
+            if next_frame <= now:
+                next_frame = now + self.format.period
+            if now >= next_ping:
+                for client in self.clients:
+                    client.send_ping()
+                    client.resend()
+                next_ping += PING_UPDATE_TIME_MS / 1000
+            if now >= next_report:
+                self.report(now - start)
+                next_report += self.report_interval
+            await asyncio.sleep(max(0.0, next_frame - loop.time()))
+
+    def send_audio(self):
+        """
+        Sends one audio packet for every client which is not rejected.
+        """
+        for client in self.clients:
+            if client.state != 'rejected':
+                client.send_audio()
+
+    def report(self, elapsed):
+        """
+        Logs a one line progress summary.
+        """
+        total = self.total()
+        states = [client.state for client in self.clients]
+        logger.info('%6.1fs clients: %d connected, %d connecting, %d rejected; '
+                    'loss %.3f%%, jitter p99 %s ms, ping p50 %s ms',
+                    elapsed, states.count('connected'), states.count('connecting'),
+                    states.count('rejected'), 100 * total.loss_ratio(),
+                    total.interarrival.to_dict().get('p99'), total.ping.to_dict().get('p50'))
+
+    def total(self):
+        """
+        @return: ClientStats, aggregated over all clients
+        """
+        total = ClientStats()
+        for client in self.clients:
+            total.merge(client.stats)
+        return total
+
+    def close(self):
+        """
+        Disconnects all clients.
+        """
+        for client in self.clients:
+            client.disconnect()
+
+    def results(self):
+        """
+        @return: dict, suitable for JSON
+        """
+        return {
+            'server': f'{self.server[0]}:{self.server[1]}',
+            'audio': {
+                'channels': self.format.num_channels,
+                'frame_samples': self.format.frame_samples,
+                'quality': self.format.quality,
+                'packet_bytes': self.format.packet_size,
+            },
+            'total': self.total().to_dict(),
+            'clients': [{'index': client.index, 'chan_id': client.chan_id, 'state': client.state,
+                         **client.stats.to_dict()}
+                        for client in self.clients],
+        }
+
+
+def main():
+    p = argparse.ArgumentParser(description='Connects synthetic clients to a Jamulus server.')
+    p.add_argument('--server', default=f'127.0.0.1:{jp.DEFAULT_PORT_NUMBER}', type=parse_address,
+                   help='server address as HOST[:PORT]')
+    p.add_argument('--clients', type=int, default=10,
+                   help=f'number of synthetic clients (at most {jp.MAX_NUM_CHANNELS})')
+    p.add_argument('--ramp-rate', type=float, default=2.0,
+                   help='number of clients which connect per second')
+    p.add_argument('--duration', type=float, default=30.0,
+                   help='seconds to keep running after all clients were added')
+    p.add_argument('--stereo', action='store_true', help='send stereo instead of mono audio')
+    p.add_argument('--no-small-buffers', action='store_true',
+                   help='send 128 instead of 64 samples per packet')
+    p.add_argument('--quality', choices=AUDIO_QUALITIES, default='raw',
+                   help='send raw audio, which the server does not decode, or Opus frames of '
+                        'the size of an audio quality of the client (default: %(default)s)')
+    p.add_argument('--report-interval', type=float, default=5.0,
+                   help='seconds between progress lines')
+    p.add_argument('--gap-threshold', type=float, default=DEFAULT_GAP_THRESHOLD_MS,
+                   help='milliseconds between two audio packets from the server which count '
+                        'as a gap (default: two periods of the default server timer)')
+    p.add_argument('--json', metavar='FILE',
+                   help='write per-client results as JSON ("-" for stdout)')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(levelname)s %(message)s')
+
+    if not 1 <= args.clients <= jp.MAX_NUM_CHANNELS:
+        p.error(f'--clients must be between 1 and {jp.MAX_NUM_CHANNELS} (MAX_NUM_CHANNELS)')
+    if args.ramp_rate <= 0:
+        p.error('--ramp-rate must be positive')
+
+    audio_format = AudioFormat(NUM_CHANNELS_STEREO if args.stereo else NUM_CHANNELS_MONO,
+                               small_buffers=not args.no_small_buffers, quality=args.quality)
+    test = LoadTest(args.server, audio_format, args.report_interval)
+    test.gap_threshold = args.gap_threshold
+
+    async def run():
+        try:
+            await test.run(args.clients, args.ramp_rate, args.duration)
+        finally:
+            test.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        logger.info('interrupted')
+    results = test.results()
+    logger.info('total: %s', json.dumps(results['total']))
+    write_json(results, args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Reference model and benchmark of the server mix of Jamulus.
+
+In every timer tick, CServer::MixEncodeTransmitData builds a personal mix of
+all connected channels for each connected channel before it is Opus encoded,
+so the mixing cost grows with the square of the number of clients. The mix
+applies the gain which the receiving client set for each channel (0 if it
+muted the channel), the fade-in of new channels (see
+CServer::DecodeReceiveData), a stereo-to-mono downmix for mono clients and
+either the amplitude panning or, with --delaypan, a delay of up to
+MAX_DELAY_PANNING_SAMPLES samples for stereo clients. The sum is converted to
+int16 with clipping (Float2Short).
+
+This tool models the mixing math in two ways:
+
+1. ServerMix.reference adds the channels one after another in single
+   precision like the server does, vectorized over all personal mixes and
+   samples. Its output is identical to the server.
+2. ServerMix.batched computes all personal mixes of a frame with a single
+   matrix product (a single weighted sum over gathered windows with
+   --delaypan) in double precision. As the sum is rounded differently, a
+   sample differs from the server by at most one LSB.
+
+A frame holds the decoded audio of all channels like vecvecsData: one int16
+row per connected channel with 2 * frame size samples, mono channels use the
+first half of the row and stereo channels are interleaved. Gains and pans are
+given as [receiving channel, mixed channel] matrices.
+
+The benchmark command reports the cost of both models per frame versus the
+number of clients, relative to the frame period, and the fitted exponent of
+the growth. The selfcheck command compares the reference model with golden
+digests which were computed by the mixing code of src/server.cpp for
+deterministic frames (see tools/jamulus_golden.py), and the batched model
+with the reference model.
+
+Usage:
+./tools/jamulus_mix.py benchmark --clients 4,8,16,32,64,128
+./tools/jamulus_mix.py benchmark --frame-size 64 --delay-pan --stereo 0.5 --json mix.json
+./tools/jamulus_mix.py selfcheck
+
+"""
+
+import argparse
+import collections
+import hashlib
+import logging
+import math
+import sys
+import time
+
+import jamulus_protocol as jp
+from jamulus_common import optional_import, require_numpy, write_json
+
+np = optional_import('numpy')
+logger = logging.getLogger('')
+
+# see src/global.h
+MAX_DELAY_PANNING_SAMPLES = 64
+MAX_NUM_CHANNELS = 150
+
+# gains and pans are transmitted as 16 bit values, see CProtocol::EvaluateChanGainMes
+WIRE_SCALE = 1 << 15
+
+SHORT_MIN = -32768
+SHORT_MAX = 32767
+
+# audio channels (1 or 2) and mixer settings of the connected channels, see ServerMix
+MixSettings = collections.namedtuple('MixSettings', ['channels', 'gains', 'pans', 'delay_pan'])
+# the same as received from the clients: gains and pans as 16 bit values,
+# channels which are muted in a mix and the fade-in counters (or None)
+WireSettings = collections.namedtuple('WireSettings',
+                                      ['channels', 'gains', 'pans', 'muted', 'fade_in'])
+
+
+def from_wire(values):
+    """
+    @param values: int array, gains or pans as received by the server
+    @return: float32 array, the values as stored by CChannel
+    """
+    return np.asarray(values, dtype=np.float32) / np.float32(WIRE_SCALE)
+
+
+def effective_gains(gains, fade_in=None, muted=None):
+    """
+    Gains as used for mixing, see CServer::DecodeReceiveData.
+
+    @param gains: (n, n) float array, gain of each channel [column] in the mix of
+                  each channel [row]
+    @param fade_in: None or float array of n fade-in gains (0..1)
+    @param muted: None or (n, n) bool array, channels muted in a mix
+    @return: (n, n) float32 array
+    """
+    gains = np.array(gains, dtype=np.float32)
+    if fade_in is not None:
+        fade_in = np.asarray(fade_in, dtype=np.float32)
+        gains *= fade_in[np.newaxis, :]
+        # the fade-in of the receiving channel applies to all other channels
+        gains *= np.where(np.eye(len(gains), dtype=bool), np.float32(1),
+                          fade_in[:, np.newaxis])
+    if muted is not None:
+        gains[np.asarray(muted, dtype=bool)] = 0
+    return gains
+
+
+def pan_delays(pans):
+    """
+    @param pans: float32 array, 0 (left) .. 1 (right)
+    @return: (left, right) int arrays, delay in samples of each output channel
+             with --delaypan
+    """
+    delays = np.float32(2 * MAX_DELAY_PANNING_SAMPLES - 2) * (pans - np.float32(0.5))
+    delays = delays.astype(np.float64)
+    delays = np.copysign(np.floor(np.abs(delays) + 0.5), delays).astype(np.int64)  # lround
+    return np.maximum(delays, 0), np.maximum(-delays, 0)
+
+
+def float_to_short(values):
+    """
+    Float2Short of src/util.h: clipping and truncation towards zero.
+    """
+    return np.trunc(np.clip(values, SHORT_MIN, SHORT_MAX)).astype(np.int16)
+
+
+def _signals(frame, stereo, dtype):
+    """
+    @return: (left, right, sum) arrays with one row per channel, the sum of
+             both channels of stereo channels is not halved
+    """
+    size = frame.shape[1] // 2
+    data = frame.astype(dtype)
+    left = np.where(stereo[:, np.newaxis], data[:, 0::2], data[:, :size])
+    right = np.where(stereo[:, np.newaxis], data[:, 1::2], data[:, :size])
+    total = np.where(stereo[:, np.newaxis], left + right, left)
+    return left, right, total
+
+
+def _history(previous, current):
+    """
+    @return: array with the previous and the current samples of each channel
+             flattened, the source of the delayed samples
+    """
+    return np.concatenate([previous, current], axis=1).ravel()
+
+
+class ServerMix:
+    """
+    Personal mixes of all connected channels for fixed mixer settings.
+    """
+
+    def __init__(self, settings, frame_size):
+        """
+        @param settings: MixSettings, gains and pans as (n, n) arrays with the
+                         settings of each receiving channel in a row, see
+                         effective_gains()
+        @param frame_size: int, samples per channel in a frame
+                           (iServerFrameSizeSamples)
+        """
+        self.frame_size = frame_size
+        self.stereo = np.asarray(settings.channels) == 2
+        self.gains = np.asarray(settings.gains, dtype=np.float32)
+        self.targets = (np.flatnonzero(~self.stereo), np.flatnonzero(self.stereo))
+
+        # MathUtils::GetLeftPan/GetRightPan without cross fade, the pan is
+        # centered with --delaypan
+        pans = np.asarray(settings.pans, dtype=np.float32)[self.targets[1]]
+        centered = np.full_like(pans, 0.5) if settings.delay_pan else pans
+        gains = self.gains[self.targets[1]]
+        self.pan_gains = (np.minimum(np.float32(0.5), np.float32(1) - centered) *
+                          np.float32(2) * gains,
+                          np.minimum(np.float32(0.5), centered) * np.float32(2) * gains)
+
+        # indices of the delayed samples in the flattened history of both frames
+        self.windows = None
+        if settings.delay_pan:
+            starts = frame_size + 2 * frame_size * np.arange(len(self.stereo))
+            self.windows = tuple((starts - delays)[:, :, np.newaxis] + np.arange(frame_size)
+                                 for delays in pan_delays(pans))
+
+        # weights of the batched mix: rows are the mono mixes followed by the
+        # left and the right channel of the stereo mixes, columns are the
+        # downmixed, the left and the right signals of all channels
+        count, mono, stereo = len(self.stereo), len(self.targets[0]), len(self.targets[1])
+        self.weights = np.zeros((mono + 2 * stereo, 3 * count))
+        self.weights[:mono, :count] = self.gains[self.targets[0]]
+        self.weights[mono:mono + stereo, count:2 * count] = self.pan_gains[0]
+        self.weights[mono + stereo:, 2 * count:] = self.pan_gains[1]
+
+    def _assemble(self, mono, left, right):
+        out = np.zeros((len(self.stereo), 2 * self.frame_size), dtype=mono.dtype)
+        out[self.targets[0], :self.frame_size] = mono
+        out[self.targets[1], 0::2] = left
+        out[self.targets[1], 1::2] = right
+        return float_to_short(out)
+
+    def reference(self, frame, previous=None):
+        """
+        Mixes like the server: the channels are added one after another in
+        single precision.
+
+        @param frame: (n, 2 * frame size) int16 array, the decoded audio
+        @param previous: None or the frame of the previous tick (used with
+                         --delaypan, vecvecsData2)
+        @return: (n, 2 * frame size) int16 array, the mix of each channel
+                 (vecvecsSendData)
+        """
+        left, right, total = _signals(frame, self.stereo, np.float32)
+        mono_targets, stereo_targets = self.targets
+        mono = np.zeros((len(mono_targets), self.frame_size), dtype=np.float32)
+        mix = np.zeros((2, len(stereo_targets), self.frame_size), dtype=np.float32)
+        if self.windows is not None:
+            previous = np.zeros_like(frame) if previous is None else previous
+            before = _signals(previous, self.stereo, np.float32)
+            left, right = _history(before[0], left), _history(before[1], right)
+
+        for j, stereo in enumerate(self.stereo):
+            gain = self.gains[mono_targets, j, np.newaxis]
+            # stereo-to-mono attenuation after the gain
+            mono += (gain * total[j]) / 2 if stereo else total[j] * gain
+            if self.windows is None:
+                mix[0] += left[j] * self.pan_gains[0][:, j, np.newaxis]
+                mix[1] += right[j] * self.pan_gains[1][:, j, np.newaxis]
+            else:
+                mix[0] += left[self.windows[0][:, j]] * self.pan_gains[0][:, j, np.newaxis]
+                mix[1] += right[self.windows[1][:, j]] * self.pan_gains[1][:, j, np.newaxis]
+        return self._assemble(mono, mix[0], mix[1])
+
+    def batched(self, frame, previous=None):
+        """
+        Mixes all channels at once in double precision, see reference().
+        """
+        left, right, total = _signals(frame, self.stereo, np.float64)
+        downmix = np.where(self.stereo[:, np.newaxis], total / 2, total)
+        signals = np.concatenate([downmix, left, right])
+        mono = len(self.targets[0])
+        if self.windows is None:
+            mix = self.weights @ signals
+            stereo = len(self.targets[1])
+            return self._assemble(mix[:mono], mix[mono:mono + stereo], mix[mono + stereo:])
+
+        previous = np.zeros_like(frame) if previous is None else previous
+        before = _signals(previous, self.stereo, np.float64)
+        return self._assemble(
+            self.weights[:mono] @ signals,
+            np.einsum('ts,tsk->tk', self.pan_gains[0], _history(before[0], left)[self.windows[0]]),
+            np.einsum('ts,tsk->tk', self.pan_gains[1],
+                      _history(before[1], right)[self.windows[1]]))
+
+
+def mix_frames(mix, frames, batched=False):
+    """
+    Mixes consecutive frames, each frame is the previous frame of the next.
+
+    @param mix: ServerMix
+    @param frames: (ticks, n, 2 * frame size) int16 array
+    @param batched: bool, use ServerMix.batched instead of ServerMix.reference
+    @return: (ticks, n, 2 * frame size) int16 array
+    """
+    method = mix.batched if batched else mix.reference
+    previous = None
+    out = np.empty_like(frames)
+    for tick, frame in enumerate(frames):
+        out[tick] = method(frame, previous)
+        previous = frame
+    return out
+
+
+def digest(mixes, channels):
+    """
+    @param mixes: (ticks, n, 2 * frame size) int16 array, see mix_frames()
+    @param channels: int array, 1 or 2 per channel
+    @return: str, SHA-256 of the samples sent to each channel as little-endian
+             int16 in the order tick, channel, sample
+    """
+    size = mixes.shape[2] // 2
+    valid = np.arange(2 * size) < size * np.asarray(channels)[:, np.newaxis]
+    return hashlib.sha256(mixes[:, valid].astype('<i2').tobytes()).hexdigest()
+
+
+# Synthetic and golden inputs --------------------------------------------------
+def _splitmix64(values):
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _stream(scenario, index, shape):
+    counter = np.arange(math.prod(shape), dtype=np.uint64).reshape(shape)
+    key = (np.uint64(scenario['seed']) << np.uint64(40)) | (np.uint64(index) << np.uint64(32))
+    return _splitmix64(key | counter)
+
+
+def synthetic_wire_inputs(scenario):
+    """
+    Deterministic mixer settings as received by the server and frames. Only
+    integer arithmetic is used.
+
+    @param scenario: dict with clients, frame_size, frames, seed, stereo (share
+                     of stereo clients in 1/1000), mute (share of muted channels
+                     in 1/1000), level (peak amplitude) and optional delay_pan,
+                     fade_in (fade-in counters run from 0 to this value)
+    @return: (WireSettings, frames) with frames as in mix_frames()
+    """
+    s = scenario
+    n = s['clients']
+    channels = np.where(_stream(s, 0, (n,)) % np.uint64(1000) < np.uint64(s['stereo']), 2, 1)
+    gains = (_stream(s, 1, (n, n)) % np.uint64(3 * WIRE_SCALE // 2)).astype(np.int64)
+    noise = _stream(s, 2, (n, n))
+    pans = (noise % np.uint64(WIRE_SCALE + 1)).astype(np.int64)
+    pans[noise >> np.uint64(62) == 0] = WIRE_SCALE // 2  # a quarter is centered
+    muted = _stream(s, 3, (n, n)) % np.uint64(1000) < np.uint64(s['mute'])
+    fade_in = None
+    if s.get('fade_in'):
+        fade_in = (_stream(s, 4, (n,)) % np.uint64(s['fade_in'] + 1)).astype(np.int64)
+    samples = _stream(s, 5, (s['frames'], n, 2 * s['frame_size']))
+    frames = ((samples % np.uint64(2 * s['level'] + 1)).astype(np.int64) -
+              s['level']).astype(np.int16)
+    return WireSettings(channels, gains, pans, muted, fade_in), frames
+
+
+def synthetic_inputs(scenario):
+    """
+    Deterministic mixer settings and frames, the gains and pans are
+    quantized like on the network.
+
+    @param scenario: dict, see synthetic_wire_inputs()
+    @return: (MixSettings, frames) with frames as in mix_frames()
+    """
+    wire, frames = synthetic_wire_inputs(scenario)
+    fade_in = None
+    if wire.fade_in is not None:
+        fade_in = wire.fade_in.astype(np.float32) / np.float32(scenario['fade_in'])
+    gains = effective_gains(from_wire(wire.gains), fade_in, wire.muted)
+    settings = MixSettings(wire.channels, gains, from_wire(wire.pans),
+                           bool(scenario.get('delay_pan')))
+    return settings, frames
+
+
+GOLDEN_SCENARIOS = [
+    {'name': 'mono', 'clients': 4, 'frame_size': 128, 'frames': 3, 'seed': 1, 'stereo': 0,
+     'mute': 0, 'level': 8000},
+    {'name': 'mixed-small-buffers', 'clients': 12, 'frame_size': 64, 'frames': 4, 'seed': 2,
+     'stereo': 500, 'mute': 100, 'level': 6000, 'fade_in': 1125},
+    {'name': 'stereo-clipping', 'clients': 10, 'frame_size': 128, 'frames': 3, 'seed': 3,
+     'stereo': 1000, 'mute': 50, 'level': 32767},
+    {'name': 'delaypan', 'clients': 9, 'frame_size': 128, 'frames': 4, 'seed': 4,
+     'stereo': 500, 'mute': 100, 'level': 5000, 'fade_in': 1125, 'delay_pan': True},
+    {'name': 'delaypan-clipping', 'clients': 7, 'frame_size': 64, 'frames': 4, 'seed': 5,
+     'stereo': 800, 'mute': 200, 'level': 32767, 'delay_pan': True},
+    {'name': 'many-clients', 'clients': 40, 'frame_size': 64, 'frames': 2, 'seed': 6,
+     'stereo': 300, 'mute': 50, 'level': 1500, 'fade_in': 2250},
+]
+
+# SHA-256 of the mixes computed by the mixing code of src/server.cpp, see digest().
+# ./tools/jamulus_golden.py mix rebuilds the harness which computed them
+# (jamulus_golden_mix.cpp) and checks or prints the digests.
+GOLDEN_DIGESTS = {
+    'mono': '55eaffcad60d473aae2cf92f1dd7718253445e612e924495ae041502ab7c4c67',
+    'mixed-small-buffers': '98112d7539a2f1ba9924fee5e6efb9afa8d2e565fd10240cc157a20571c878a5',
+    'stereo-clipping': 'e806671ac12ee94906fe16997e55fdf7461b5818f0980ac39a746838cd551dcd',
+    'delaypan': '4d64149f8ddb3a904c6add530cdf1dedc12cab9a885cd7f489c000f4a20bdab6',
+    'delaypan-clipping': '3cb89b7b4f32db59eae3d99741a9ecbc237d3324038c9d92304a9244f681d14b',
+    'many-clients': 'a1f777fe9d825b8048335719d58802f62d9418f652d11990280a23f49c99c573',
+}
+
+
+def selfcheck():
+    """
+    Compares the reference model with the golden digests and the batched
+    model with the reference model.
+
+    @return: bool, True if all checks passed
+    """
+    passed = True
+    for scenario in GOLDEN_SCENARIOS:
+        settings, frames = synthetic_inputs(scenario)
+        mix = ServerMix(settings, scenario['frame_size'])
+        reference = mix_frames(mix, frames)
+        deviation = np.abs(mix_frames(mix, frames, batched=True).astype(np.int32) - reference)
+        actual = digest(reference, settings.channels)
+        if actual != GOLDEN_DIGESTS[scenario['name']]:
+            logger.error('%s: reference digest %s, expected %s', scenario['name'], actual,
+                         GOLDEN_DIGESTS[scenario['name']])
+            passed = False
+        elif deviation.max() > 1:
+            logger.error('%s: batched mix deviates by up to %d', scenario['name'],
+                         deviation.max())
+            passed = False
+        else:
+            logger.info('%s: OK, %d of %d batched samples differ by one LSB', scenario['name'],
+                        np.count_nonzero(deviation), deviation.size)
+    return passed
+
+
+# Benchmark --------------------------------------------------------------------
+def _time_per_frame(method, frames, min_time):
+    """
+    @return: float, mean wall clock time of a mix in us
+    """
+    count = 0
+    started = time.perf_counter()
+    while True:
+        for tick, frame in enumerate(frames):
+            method(frame, frames[tick - 1])
+        count += len(frames)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return elapsed / count * 1e6
+
+
+def benchmark(clients, scenario, min_time=0.2):
+    """
+    Measures the mixing cost per frame of both models.
+
+    @param clients: list of int, numbers of connected clients
+    @param scenario: dict, see synthetic_inputs (without clients)
+    @param min_time: float, minimum measurement time per model and client count in s
+    @return: list of dicts, one per client count
+    """
+    period = scenario['frame_size'] / jp.SYSTEM_SAMPLE_RATE_HZ * 1e6
+    rows = []
+    for count in clients:
+        settings, frames = synthetic_inputs({**scenario, 'clients': count})
+        mix = ServerMix(settings, scenario['frame_size'])
+        row = {'clients': count}
+        for name, method in (('batched', mix.batched), ('reference', mix.reference)):
+            cost = _time_per_frame(method, frames, min_time)
+            row[f'{name}_us'] = round(cost, 2)
+            row[f'{name}_load'] = round(cost / period, 4)
+            row[f'{name}_ns_per_pair'] = round(cost * 1000 / count ** 2, 2)
+        rows.append(row)
+        logger.debug('%d clients: %s', count, row)
+    return rows
+
+
+def growth_exponent(rows, key):
+    """
+    @return: float, slope of log(cost) over log(clients) for the larger half
+             of the client counts, 2 for a cost growing with clients squared
+    """
+    rows = rows[len(rows) // 2:] if len(rows) > 3 else rows
+    if len(rows) < 2:
+        return None
+    slope = np.polyfit(np.log([row['clients'] for row in rows]),
+                       np.log([row[key] for row in rows]), 1)[0]
+    return round(float(slope), 3)
+
+
+def print_rows(rows):
+    """
+    Prints the mixing cost per frame and the share of the frame period.
+    """
+    print(f'{"clients":>7} {"batched us":>11} {"load %":>7} {"ns/pair":>8} '
+          f'{"reference us":>13} {"load %":>7} {"ns/pair":>8}')
+    for row in rows:
+        print(f'{row["clients"]:>7} {row["batched_us"]:>11.1f} {row["batched_load"] * 100:>7.2f} '
+              f'{row["batched_ns_per_pair"]:>8.1f} {row["reference_us"]:>13.1f} '
+              f'{row["reference_load"] * 100:>7.2f} {row["reference_ns_per_pair"]:>8.1f}')
+
+
+def parse_ints(text):
+    """
+    @param text: str, comma separated numbers
+    @return: list of int
+    """
+    return [int(value) for value in text.split(',')]
+
+
+def main():
+    p = argparse.ArgumentParser(description='Reference model and benchmark of the personal '
+                                            'mixes of the Jamulus server.')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    sub = p.add_subparsers(dest='command', required=True)
+
+    bench = sub.add_parser('benchmark', help='measure the mixing cost versus the number of '
+                                             'clients')
+    bench.add_argument('--clients', type=parse_ints,
+                       default=[2, 4, 8, 16, 32, 64, 128, MAX_NUM_CHANNELS],
+                       help='comma separated numbers of connected clients')
+    bench.add_argument('--frame-size', type=int, default=jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES,
+                       choices=[jp.SYSTEM_FRAME_SIZE_SAMPLES, jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES],
+                       help='server frame size: 128 (default) or 64 with --fastupdate')
+    bench.add_argument('--delay-pan', action='store_true', help='model a server with --delaypan')
+    bench.add_argument('--stereo', type=float, default=0.5, help='share of stereo clients')
+    bench.add_argument('--mute', type=float, default=0.05, help='share of muted channels')
+    bench.add_argument('--frames', type=int, default=8, help='distinct frames per run')
+    bench.add_argument('--min-time', type=float, default=0.2,
+                       help='minimum measurement time per point in s')
+    bench.add_argument('--seed', type=int, default=0)
+    bench.add_argument('--json', metavar='FILE', help='write results as JSON ("-" for stdout)')
+
+    sub.add_parser('selfcheck', help='compare with golden digests of the C++ implementation')
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+    require_numpy('the mix model')
+
+    if args.command == 'selfcheck':
+        sys.exit(0 if selfcheck() else 1)
+
+    scenario = {'frame_size': args.frame_size, 'frames': args.frames, 'seed': args.seed,
+                'stereo': round(args.stereo * 1000), 'mute': round(args.mute * 1000),
+                'level': 8000, 'delay_pan': args.delay_pan}
+    rows = benchmark(args.clients, scenario, args.min_time)
+    print_rows(rows)
+    exponents = {key: growth_exponent(rows, f'{key}_us') for key in ('batched', 'reference')}
+    logger.info('cost grows with clients^%s (batched), clients^%s (reference)',
+                exponents['batched'], exponents['reference'])
+    write_json({'frame_size': args.frame_size, 'delay_pan': args.delay_pan,
+                'stereo': args.stereo, 'mute': args.mute,
+                'frame_period_us': args.frame_size / jp.SYSTEM_SAMPLE_RATE_HZ * 1e6,
+                'growth_exponents': exponents, 'results': rows}, args.json)
+
+
+if __name__ == '__main__':
+    main()
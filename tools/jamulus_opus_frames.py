@@ -0,0 +1,211 @@
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Pre-encoded Opus frames which the synthetic clients of jamulus_load_test.py
+send with --quality low, normal or high, so that the server decodes and
+encodes their audio like the one of real clients without an Opus library on
+the tool side.
+
+The frames encode a sine wave of SIGNAL_FREQUENCY_HZ with an amplitude of
+SIGNAL_AMPLITUDE, equal on all channels, with the Opus custom encoder of
+libs/opus set up like the encoders of CClient (see src/client.cpp):
+constant bit rate at the coded size of each audio quality of src/client.h.
+The sine's period divides both frame sizes, so the NUM_FRAMES frames of
+each entry can be sent in a loop. The first WARMUP_FRAMES frames of the
+encoder are dropped.
+
+Generated by `./tools/jamulus_golden.py opus --print` and checked by
+`./tools/jamulus_golden.py opus`.
+
+"""
+
+SIGNAL_FREQUENCY_HZ = 375
+SIGNAL_AMPLITUDE = 1000
+WARMUP_FRAMES = 16
+NUM_FRAMES = 8
+
+# (frame size in samples, number of channels, coded bytes per frame): the
+# NUM_FRAMES frames of that size, one after the other
+OPUS_FRAMES = {
+    (64, 1, 12): bytes.fromhex(
+        '000008a8f6d6afd73341379a0000290cbcb2654cfe799186000008a8f6d6afd73341379a00000a1949879e'
+        'ad987cc906000027f66b9651c4a849369a00000a1cf8ce66d7e3f1930a00002803885604b2323b37960000'
+        '0a1cd8aaf422156ec909'),
+    (64, 1, 22): bytes.fromhex(
+        '00000a1cc5125a80666c3aee648c3ad7e9bcc3fbc2c400000a194987a8385ec83eab4bacb6146c85fe7704'
+        'c4000028074c8c5a80666c3aee648c3ad7e9b2c3f8f4c400000a1cc510382648681f7f3513f514b644c3fb'
+        '8244000008a8f6d69d8ff16f633ccfeb0e97d375e7d185440000291ac82d950ec1a81f7ab3a7ea296c8586'
+        '7ff54400000a1cc5125a80666c3aee64ac3ad7e9b2c3fb824400002803d101a8385ec83eab4bb4b6146c99'
+        'fe71e544'),
+    (64, 1, 36): bytes.fromhex(
+        '00000a1cc5176e8fb9fb2896e73c7f477bb770dfa37084652a54fa6db700ef6d7d80cf0900000a1cc51673'
+        '5070be900ed6d4ec45013602ded802272bbcd8f991b500eff57600d11800000a1cc5176e8fb9fb2896e73c'
+        '7f477bb770dfa37084652a54fa6d37016fed7d84d10800000a1cc516735070be900ed6d4ec45013602ded8'
+        '02272bbcd8f991b500efed7d80cf0900000a1cc5176e8fb9fb2896e73c7f477bb770dfa37084652a54fa6d'
+        '3700eff57d80d11800000a1cc516735070be900ed6d4ec45013602ded802272bbcd8f991b500efed7e0511'
+        '0900000a1cc5176e8fb9fb2896e73c7f477bb770dfa37084652a54fa6d37016ff57d80cf0800000a1cc516'
+        '735070be900ed6d4ec45013602ded802272bbcd8f991b500efed7580d118'),
+    (64, 2, 24): bytes.fromhex(
+        '040000319da29728c28c022b37bdb620f63140b530f3cc3a04000003053dd05e18974b593c4c43b5e9109e'
+        'afcf0c300a0400002fed48d7dcfd146d192265e385317100b630f3f03504000003053d3beb01aa82a39cb1'
+        'dffb15278eaccf0c3c0a040000318eb7a1fe7963551a8de2bfcde26840b530f3fc3a04000003053d3beb01'
+        'aa82a39cb1dffb15278eaccf0c3c0a040000318eabe9d258ae2ad15d8031a8d37c40b630f3cc3504000003'
+        '053d3beb035740a6166620eaff741eafcf0c300a'),
+    (64, 2, 35): bytes.fromhex(
+        '04000002ea9f813183b9f56123fea5abdd6f083ddc3305e1641e7b70f3f0fffc3016450400000305321b3d'
+        '801c29171941d45419f383999fc4fe476c2d134f0c0ff3cfa0024a040000318eb70db49dcb86595a290bf7'
+        '820d57ef756505e17bbcfaf0f3c0cf3cfd55ba04000003053dd05e1899030f75247452d5e9dcc32fb25181'
+        '6c2d134f0c3cf3fff0024a040000318eb7a19e663e67d49e24d12a9cba65c0b686332bfbacfaf0f3c0c3fc'
+        'fd564a04000003053d3cd44f86a2553d9dc9014170f38e9ae251816c2d134f0c0fff3fa0024a040000318e'
+        'abe8eb311666febb1a8831381e114146c31995fdde7b70f3f0f3ccfc15ba04000003053d3cc6157ba766c0'
+        '599ee1210362baac9ca302d85a3acf0c00cf3fa14245'),
+    (64, 2, 73): bytes.fromhex(
+        '04000003053dd050cc3e6707383aa402b254eb8cdd55f5437f1fd2027bc38e7f2fff5557c987e00679874c'
+        '1f6874edf964f7a308f545a7f30f3db6db9000377ffbaeffbb003333888804000003053dd050cc3e66e792'
+        '31f280feef7cf5319ee48dfc36b72a72d2658a99c522955f861807865a5044789333559c69d81e4077fff8'
+        'f0c126db9000377ff76effbb003344889904000003053dd050cc3e6707383aa402b254eb8cdd55f5437f1f'
+        'd2027bc38e7f2fff5557c9806781e6074c1f6874edf964f7a308f545a7f30f3db6d29002777ff76effcc00'
+        '3344888804000003053dd050cc3e66e79231f280feef7cf5319ee48dfc36b72a72d2658a99c522955fe7e0'
+        '07ffda5044789333559c69d81e4077fff8f0c1b6db9000377ff76effbb003333888804000003053dd050cc'
+        '3e6707383aa402b254eb8cdd55f5437f1fd2027bc38e7f2fff5557c986798660074c1f6874edf964f7a308'
+        'f545a7f30f3d26d29000377ffbaeffbb003344888804000003053dd050cc3e66e79231f280feef7cf5319e'
+        'e48dfc36b72a72d2658a99c522955f860607e65a5044789333559c69d81e4077fff8f0c1b6db9000377ff7'
+        '6effbb003344889904000003053dd050cc3e6707383aa402b254eb8cdd55f5437f1fd2027bc38e7f2fff55'
+        '57c987f801ff874c1f6874edf964f7a308f545a7f30f3d26db9002777ff76effbb00333388880400000305'
+        '3dd050cc3e66e79231f280feef7cf5319ee48dfc36b72a72d2658a99c522955fe66187805a504478933355'
+        '9c69d81e4077fff8f0c1b6d29000377ff76effbb0033448888'),
+    (128, 1, 25): bytes.fromhex(
+        '000000a9f9060db08270e352fdc3b14eb761c048b1f11b854c000008a943d41181e0b24863af6587748214'
+        'c048b1b70f94d100000276831b3e71b6931465c6f14339a6b6c048b1d14ce4d1000008a943d40fe9d2ac42'
+        'ffa8d7d6d72625c048b1f70fb1a9000009d4dcebe31edb59a8c9b12ebc2097c5809163e216f492000008a9'
+        '43d40fe9d2ac42ffa8d7d6d72627c048b1f70fb4aa00000276824a318b029ae6f59977c8c719b1809163e2'
+        '19c591000009d9d137c1a06b179de101c595bb2896c048b1d70f74cd'),
+    (128, 1, 45): bytes.fromhex(
+        '000008a943d41020966aa358ac693da243a4755b9744fb220d6dd5b0cba448b85f7499ecc77ca9a27ff8ea'
+        '54830000028c0983278ca03f9cb1ae85a225481d277f18ebd8220d6dd5b0cba448b85f74996ac7ea99a27d'
+        'f70b3474000008a943d41020966aa358ac693da243a4755b9744fb220d6dd5b0cba448b85f7499ecc7fca9'
+        'a26ff8ea3484000008a943d41020966aa358ac693da243a4755b9744fb220d6dd5b0cba448b85f7499ecc7'
+        'fca9a27ff0ea5474000008a943d41020966aa358ac693da243a4755b9744fb220d6dd5b0cba448b85f7499'
+        'ecc7fa99a27df8eb33840000028c0983278ca03f9cb1ae85a225481d277f18ebd8220d6dd5b0cba448b85f'
+        '74996ac7eca9a27ff70a3473000008a943d41020966aa358ac693da243a4755b9744fb220d6dd5b0cba448'
+        'b85f7499ecc7fca9a26ff8ea5484000008a943d41020966aa358ac693da243a4755b9744fb220d6dd5b0cb'
+        'a448b85f7499ecc7fa99a27ff0eb3484'),
+    (128, 1, 82): bytes.fromhex(
+        '000008a943d41020966a88a6c149d59cf970a2588d0fe968973e6bc331f90d67b8055cb777498c12eecb6d'
+        '9940f1d6e252effe4e8029b023491deb8e94627e8d00c7be108a3e512bc9ce7b786f8ae7686022000008a9'
+        '43d41020966a88a6c149d59cf970a2588d0fe968973e6bc331f90d67b8055cb7774d8c12eecb6d9940f1d6'
+        'e252effe4e8029b023491deb8e94627e8d00c7be108e2e512bc9def7785f8ac768a022000008a943d41020'
+        '966a88a6c149d59cf970a2588d0fe968973e6bc331f90d67b8055cb777418c12eecb6d9940f1d6e252effe'
+        '4e8029b023491deb8e94627e8d00c7fe108e3e512bc9ce7b806f8ac768a022000008a943d41020966a88a6'
+        'c149d59cf970a2588d0fe968973e6bc331f90d67b8055cb777498c12eecb6d9940f1d6e252effe4e8029b0'
+        '23491deb8e94627e8d00c7b6108a3e512bc9de7b786f8ac7686022000008a943d41020966a88a6c149d59c'
+        'f970a2588d0fe968973e6bc331f90d67b8055cb777498c12eecb6d9940f1d6e252effe4e8029b023491deb'
+        '8e94627e8d00c7be508e3e512bc9de77806f8ac768a022000008a943d41020966a88a6c149d59cf970a258'
+        '8d0fe968973e6bc331f90d67b8055cb777418c12eecb6d9940f1d6e252effe4e8029b023491deb8e94627e'
+        '8d00c7be108e3e512bc9cefb786f8ac768a022000008a943d41020966a88a6c149d59cf970a2588d0fe968'
+        '973e6bc331f90d67b8055cb777498c12eecb6d9940f1d6e252effe4e8029b023491deb8e94627e8d00c7fe'
+        '108a2e512bc9de7b785f8ae7686022000008a943d41020966a88a6c149d59cf970a2588d0fe968973e6bc3'
+        '31f90d67b8055cb777498c12eecb6d9940f1d6e252effe4e8029b023491deb8e94627e8d00c7b6108e3e51'
+        '2bc9ce77806f8ac768a022'),
+    (128, 2, 47): bytes.fromhex(
+        '040000002ec56fdc11c228988a5edf3a47040714443556f6c1ba60035ad4e3f3ea6b487b9aa0d6b0f03ff0'
+        '3cc48b7004000002e8fb2310a19501a117999882f6b0332292294adb7f9a135a7de341c3ea6b487b9aa0fd'
+        '58f03ff3ff348905040000002ed8b939d7aa7c1c946d25f63431d5f4712150d4fb4999ba0c558500fa9ad2'
+        '1ee6a87eb0f03f303ff14b6804000002ea88038eb91791554612f3197dc52fd8f8176e09dde4fb1f846b24'
+        '7d4dc2557cd506b563c0ffc03034893504000002e8fb2310a19501a117999882f6b0332292294adb7f9a13'
+        '5a7de341c3ea6b487b9aa0fd58f03ff3ff348b40040000002ed8b939d7aa7c1c87eca70fa7b2d948ce51b7'
+        'c4bcfb4e3eb7799ccafa9ad21ee6a87eb0f03cf03ff1492804000002ea8ab2adc8e1f3e99cfbf219f3353d'
+        '2d2104a3f87ef4bab0e7f9b2dcfa9ad21ee6a87eb0f03f33fccd4b54040000002ed8b939d7aa7c1c7edb77'
+        '60bd44af79d4a7d444d2966fc7457ed30fa9b84aaf9aa0d6b0f03ff03fc48b75'),
+    (128, 2, 71): bytes.fromhex(
+        '04000003043d48c1b042efd0fdb6244aec9cec1b276af76dbd80ebc719090d119e8dd4ff880d691230cbc4'
+        '96dc4a5df4fd1dc1a70bc6bfec68742cf03ebe805c03fc03f48992400400000002fa4329a1fe07e4c9abb8'
+        '24c2bb19b780d8f197710e5dd88a8171beb176268708f35f226f3c125b712977d3f47707ce15a45fd8d4b4'
+        '2cf03fffc3acc3ffe80492b64504000003053dd0ba5c5517aeb8ced702b8b9750e4b9dc8f47698895b5188'
+        '4bb09caae21b16f611964bcc324b6e252efa7f8ee6a70ad22fec68742cf03fffd7ac33fffffd2091b50400'
+        '00002ed8b939d7aa7c1c7edb7760bf35a5f60bfc5ef0704351d8637c2449585361484748a29f0bcc324b6e'
+        '252efa7f8ee6a70ad22fec68742cf03fffd45c33ffff0492b64004000002ea8ab2adc06e8a0d404aaf1c5a'
+        '07b3ab405f400a9b49e03da9113c9c0ee878c12a3ba8fc9865e24b6e252efa7f8ee6a70ad22d4d5c642cf0'
+        '3ffe805c03fc3cf6c991b504000002ea9f8138c86cf13656a68b2bacb72e74eb245fa117c62b0ae020bd53'
+        'f35d2564d909ba9c97986496dc4a5df4fd1dc1a70ad22d4d5c642cf03ffe83ac03fffcf489b64004000000'
+        '2ed8b939d7aa7c1c7edb7760bf35a5f60bfc5ef0704351d8637c2449585361484748a29f0bcc324b6e252e'
+        'fa7f8ee6a70ad22fec68742cf03fffc0ac03ffff0492b5b504000002ea9f8138c86cf13656a68b2bacb72e'
+        '74eb245fa117c62b0ae020bd53f35d2564d909ba9c97986496dc4a5df4fd1dc1a70ad22d4d5c642cf03fff'
+        'c35c03fffcf4899245'),
+    (128, 2, 165): bytes.fromhex(
+        '04000002ea9f8138c86cf13656a68b2bacb68bb8131b735443949474f513621213f44a5a4ebdcd927e222d'
+        'e6838fe2558d232b4cff39ebabb9ae80000000000000000000000000000000000000000000000000000000'
+        '000000000000000000000003c3cc0fc36304bbb2db66eaae8f6e252e7ae00a014d81bd50177ae3a9c625ce'
+        '8d0000f03f6ff18422318c79c420b1679e2247a74e7cfc78df70c3fbe55538ea1420810804000002ea9f81'
+        '38c86cf13656a68b2bacb68bb8131b735443949474f513621213f44a5a4ebdcd927e222de6838fe2558d23'
+        '2b4cff39ebabb9ae8000000000000000000000000000000000000000000000000000000000000000000000'
+        '0000000c03c30c33cc6304bbb2db66eaae8f6e252e7ae00a014d81bd50177ae3a9c625ce8d0000f03f6ff1'
+        '8422318c79c420b1679e2247a74e7cfc78df70c3fbe55538ea3460810804000002ea9f8138c86cf13656a6'
+        '8b2bacb68bb8131b735443949474f513621213f44a5a4ebdcd927e222de6838fe2558d232b4cff39ebabb9'
+        'ae80000000000000000000000000000000000000000000000000000000000000000000000000000c0f000c'
+        '3fcf6304bbb2db66eaae8f6e252e7ae00a014d81bd50177ae3a9c625ce8d0000f03f6ff18422318c79c420'
+        'b1679e2247a74e5cbc78e380c3fbe55538ea3460810804000002ea9f8138c86cf13656a68b2bacb68bb813'
+        '1b735443949474f513621213f44a5a4ebdcd927e222de6838fe2558d232b4cff39ebabb9ae800000000000'
+        '00000000000000000000000000000000000000000000000000000000000000000c03c3cc0fcf6304bbb2db'
+        '66eaae8f6e252e7ae00a014d81bd50177ae3a9c625ce8d0000f03f6ff18422318c79c420b1679e2247a74e'
+        '7cfc78df70c3fbe55538ea1420810804000002ea9f8138c86cf13656a68b2bacb68bb8131b735443949474'
+        'f513621213f44a5a4ebdcd927e222de6838fe2558d232b4cff39ebabb9ae80000000000000000000000000'
+        '000000000000000000000000000000000000000000000000000c33330c3fcc6304bbb2db66eaae8f6e252e'
+        '7ae00a014d81bd50177ae3a9c625ce8d0000f03f6ff18422318c79c420b1679e22479f3e7cfc78e38082fb'
+        'e55538ea3460810804000002ea9f8138c86cf13656a68b2bacb68bb8131b735443949474f513621213f44a'
+        '5a4ebdcd927e222de6838fe2558d232b4cff39ebabb9ae8000000000000000000000000000000000000000'
+        '0000000000000000000000000000000000000c00c30c3fcf6304bbb2db66eaae8f6e252e7ae00a014d81bd'
+        '50177ae3a9c625ce8d0000f03f6ff18422318c79c420b1679e2247a74e7cfc78df70c3fbe55538ea346081'
+        '0804000002ea9f8138c86cf13656a68b2bacb68bb8131b735443949474f513621213f44a5a4ebdcd927e22'
+        '2de6838fe2558d232b4cff39ebabb9ae800000000000000000000000000000000000000000000000000000'
+        '00000000000000000000000c03c0cc03c36304bbb2db66eaae8f6e252e7ae00a014d81bd50177ae3a9c625'
+        'ce8d0000f03f6ff18422318c79c420b1679e2247a74e7cfc78df70c3fbe55538ea1420810804000002ea9f'
+        '8138c86cf13656a68b2bacb68bb8131b735443949474f513621213f44a5a4ebdcd927e222de6838fe2558d'
+        '232b4cff39ebabb9ae80000000000000000000000000000000000000000000000000000000000000000000'
+        '000000000c03030c3fcc6304bbb2db66eaae8f6e252e7ae00a014d81bd50177ae3a9c625ce8d0000f03f6f'
+        'f18422318c79c420b1679e2247a74e7cfc78e380c3fbe55538ea34608108'),
+}
@@ -0,0 +1,940 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Encoder and decoder for the Jamulus UDP protocol messages.
+
+The framing follows CProtocol::GenMessageFrame/ParseMessageFrame in
+src/protocol.cpp (see also docs/JAMULUS_PROTOCOL.md): a 7 byte header
+(2 bytes TAG, 2 bytes ID, 1 byte cnt, 2 bytes length), the message body and
+a CRC16 as computed by CCRC in src/util.h. All values are little-endian.
+
+Message bodies are described declaratively in MESSAGE_FIELDS so that every
+PROTMESSID_* and PROTMESSID_CLM_* message can be encoded with encode_body()
+and decoded with decode_body().
+
+For offline analysis of large captures, FrameBatch validates and splits
+many UDP payloads at once using NumPy (optional dependency, only needed for
+the batch path and the pcap reader).
+
+Usage:
+./tools/jamulus_protocol.py decode 0000e903000400d2040000c4f9
+./tools/jamulus_protocol.py stats capture.pcap --port 22124
+
+"""
+
+import argparse
+import collections
+import ipaddress
+import json
+import math
+import mmap
+import struct
+import sys
+
+# DEFAULT_PORT_NUMBER is used by the tools as jp.DEFAULT_PORT_NUMBER
+from jamulus_common import DEFAULT_PORT_NUMBER  # pylint: disable=unused-import
+from jamulus_common import optional_import, require_numpy
+
+np = optional_import('numpy')
+
+# see src/global.h
+SYSTEM_SAMPLE_RATE_HZ = 48000
+SYSTEM_FRAME_SIZE_SAMPLES = 64
+DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES = 2 * SYSTEM_FRAME_SIZE_SAMPLES
+MAX_NUM_CHANNELS = 150
+MAX_SIZE_BYTES_NETW_BUF = 20000
+MIN_NET_BUF_SIZE_NUM_BL = 1
+MAX_NET_BUF_SIZE_NUM_BL = 20
+AUTO_NET_BUF_SIZE_FOR_PROTOCOL = MAX_NET_BUF_SIZE_NUM_BL + 1
+
+# see src/protocol.h
+PROTMESSID_ILLEGAL = 0
+PROTMESSID_ACKN = 1
+PROTMESSID_JITT_BUF_SIZE = 10
+PROTMESSID_REQ_JITT_BUF_SIZE = 11
+PROTMESSID_NET_BLSI_FACTOR = 12
+PROTMESSID_CHANNEL_GAIN = 13
+PROTMESSID_CONN_CLIENTS_LIST_NAME = 14
+PROTMESSID_SERVER_FULL = 15
+PROTMESSID_REQ_CONN_CLIENTS_LIST = 16
+PROTMESSID_CHANNEL_NAME = 17
+PROTMESSID_CHAT_TEXT = 18
+PROTMESSID_PING_MS = 19
+PROTMESSID_NETW_TRANSPORT_PROPS = 20
+PROTMESSID_REQ_NETW_TRANSPORT_PROPS = 21
+PROTMESSID_DISCONNECTION = 22
+PROTMESSID_REQ_CHANNEL_INFOS = 23
+PROTMESSID_CONN_CLIENTS_LIST = 24
+PROTMESSID_CHANNEL_INFOS = 25
+PROTMESSID_OPUS_SUPPORTED = 26
+PROTMESSID_LICENCE_REQUIRED = 27
+PROTMESSID_REQ_CHANNEL_LEVEL_LIST = 28
+PROTMESSID_VERSION_AND_OS = 29
+PROTMESSID_CHANNEL_PAN = 30
+PROTMESSID_MUTE_STATE_CHANGED = 31
+PROTMESSID_CLIENT_ID = 32
+PROTMESSID_RECORDER_STATE = 33
+PROTMESSID_REQ_SPLIT_MESS_SUPPORT = 34
+PROTMESSID_SPLIT_MESS_SUPPORTED = 35
+PROTMESSID_RAWAUDIO_SUPPORTED = 36
+
+PROTMESSID_CLM_PING_MS = 1001
+PROTMESSID_CLM_PING_MS_WITHNUMCLIENTS = 1002
+PROTMESSID_CLM_SERVER_FULL = 1003
+PROTMESSID_CLM_REGISTER_SERVER = 1004
+PROTMESSID_CLM_UNREGISTER_SERVER = 1005
+PROTMESSID_CLM_SERVER_LIST = 1006
+PROTMESSID_CLM_REQ_SERVER_LIST = 1007
+PROTMESSID_CLM_SEND_EMPTY_MESSAGE = 1008
+PROTMESSID_CLM_EMPTY_MESSAGE = 1009
+PROTMESSID_CLM_DISCONNECTION = 1010
+PROTMESSID_CLM_VERSION_AND_OS = 1011
+PROTMESSID_CLM_REQ_VERSION_AND_OS = 1012
+PROTMESSID_CLM_CONN_CLIENTS_LIST = 1013
+PROTMESSID_CLM_REQ_CONN_CLIENTS_LIST = 1014
+PROTMESSID_CLM_CHANNEL_LEVEL_LIST = 1015
+PROTMESSID_CLM_REGISTER_SERVER_RESP = 1016
+PROTMESSID_CLM_REGISTER_SERVER_EX = 1017
+PROTMESSID_CLM_RED_SERVER_LIST = 1018
+PROTMESSID_CLM_SERVER_FEATURES = 1019
+PROTMESSID_CLM_REQ_SERVER_FEATURES = 1020
+PROTMESSID_CLM_WELCOME_MESSAGE = 1021
+PROTMESSID_CLM_REQ_WELCOME_MESSAGE = 1022
+
+PROTMESSID_SPECIAL_SPLIT_MESSAGE = 2001
+
+MESS_HEADER_LENGTH_BYTE = 7
+MESS_LEN_WITHOUT_DATA_BYTE = MESS_HEADER_LENGTH_BYTE + 2
+SEND_MESS_TIMEOUT_MS = 400
+MESS_SPLIT_PART_SIZE_BYTES = 550
+MAX_NUM_MESS_SPLIT_PARTS = MAX_SIZE_BYTES_NETW_BUF // MESS_SPLIT_PART_SIZE_BYTES
+
+# see EAudComprType and ENetwFlags in src/util.h
+CT_NONE = 0
+CT_CELT = 1
+CT_OPUS = 2
+CT_OPUS64 = 3
+NF_NONE = 0
+NF_WITH_COUNTER = 1
+
+MESSAGE_NAMES = {value: name[len('PROTMESSID_'):] for name, value in globals().copy().items()
+                 if name.startswith('PROTMESSID_')}
+
+
+class ProtocolError(ValueError):
+    """
+    Exception which is raised when a message body cannot be encoded or
+    decoded.
+    """
+
+
+def is_connection_less_message_id(msg_id):
+    """
+    See CProtocol::IsConnectionLessMessageID.
+    """
+    return 1000 <= msg_id < 2000
+
+
+def message_name(msg_id):
+    """
+    @return: str, e.g. CLM_PING_MS for 1001
+    """
+    return MESSAGE_NAMES.get(msg_id, f'UNKNOWN_{msg_id}')
+
+
+# CRC ------------------------------------------------------------------------
+def _crc_table():
+    # CCRC shifts the register left and feeds back the polynomial
+    # x^16 + x^12 + x^5 + 1, i.e. the CCITT polynomial 0x1021 processed MSB
+    # first. The table allows processing a whole byte at once.
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+
+CRC_TABLE = _crc_table()
+
+
+def crc16(data):
+    """
+    Computes the CRC of a message like CCRC (initial state all ones,
+    transmitted inverted).
+
+    @param data: bytes, header plus body
+    @return: int
+    """
+    crc = 0xFFFF
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ CRC_TABLE[(crc >> 8) ^ byte]
+    return ~crc & 0xFFFF
+
+
+# Framing --------------------------------------------------------------------
+Frame = collections.namedtuple('Frame', ['id', 'cnt', 'data'])
+
+
+def encode_frame(msg_id, data=b'', cnt=0):
+    """
+    See CProtocol::GenMessageFrame.
+
+    @param msg_id: int, PROTMESSID_*
+    @param data: bytes, encoded message body
+    @param cnt: int, message counter (0 for connection less messages)
+    @return: bytes
+    """
+    message = struct.pack('<HHBH', 0, msg_id, cnt & 0xFF, len(data)) + bytes(data)
+    return message + struct.pack('<H', crc16(message))
+
+
+def decode_frame(packet):
+    """
+    See CProtocol::ParseMessageFrame.
+
+    @param packet: bytes-like UDP payload
+    @return: Frame or None if this is not a valid protocol message (which
+             usually means that it is an audio packet)
+    """
+    if len(packet) < MESS_LEN_WITHOUT_DATA_BYTE:
+        return None
+    tag, msg_id, cnt, length = struct.unpack_from('<HHBH', packet)
+    if tag != 0 or length != len(packet) - MESS_LEN_WITHOUT_DATA_BYTE:
+        return None
+    end = MESS_HEADER_LENGTH_BYTE + length
+    if crc16(packet[:end]) != struct.unpack_from('<H', packet, end)[0]:
+        return None
+    return Frame(msg_id, cnt, bytes(packet[MESS_HEADER_LENGTH_BYTE:end]))
+
+
+# Message bodies -------------------------------------------------------------
+#
+# Each message body is a list of (name, type) fields. Scalar types are
+# struct format characters, the others are handled in _decode_field and
+# _encode_field. ('name', [fields]) repeats a record until the end of the
+# body.
+
+CHANNEL_CORE_INFO_FIELDS = [
+    ('country', 'H'),
+    ('instrument', 'I'),
+    ('skill_level', 'B'),
+]
+
+CONN_CLIENT_FIELDS = [
+    ('chan_id', 'B'),
+    ('country', 'H'),
+    ('instrument', 'I'),
+    ('skill_level', 'B'),
+    ('ip', 'I'),  # always zero, used to be the IP address
+    ('name', 'str'),
+    ('city', 'str'),
+]
+
+REGISTER_SERVER_FIELDS = [
+    ('port', 'H'),
+    ('country', 'H'),
+    ('max_clients', 'B'),
+    ('permanent', 'bool'),
+    ('name', 'str'),
+    ('internal_address', 'str'),
+    ('city', 'str'),
+]
+
+VERSION_AND_OS_FIELDS = [
+    ('os', 'B'),
+    ('version', 'str'),
+]
+
+MESSAGE_FIELDS = {
+    PROTMESSID_ACKN: [('id', 'H')],
+    PROTMESSID_JITT_BUF_SIZE: [('num_blocks', 'H')],
+    PROTMESSID_REQ_JITT_BUF_SIZE: [],
+    PROTMESSID_CHANNEL_GAIN: [('chan_id', 'B'), ('gain', 'fraction')],
+    PROTMESSID_REQ_CONN_CLIENTS_LIST: [],
+    PROTMESSID_CHAT_TEXT: [('text', 'str')],
+    PROTMESSID_NETW_TRANSPORT_PROPS: [
+        ('base_netw_size', 'I'),
+        ('block_size_fact', 'H'),
+        ('num_chan', 'B'),
+        ('sample_rate', 'I'),
+        ('audio_coding_type', 'H'),
+        ('flags', 'H'),
+        ('audio_coding_arg', 'i'),
+    ],
+    PROTMESSID_REQ_NETW_TRANSPORT_PROPS: [],
+    PROTMESSID_REQ_CHANNEL_INFOS: [],
+    PROTMESSID_CONN_CLIENTS_LIST: [('clients', CONN_CLIENT_FIELDS)],
+    PROTMESSID_CHANNEL_INFOS: CHANNEL_CORE_INFO_FIELDS + [('name', 'str'), ('city', 'str')],
+    PROTMESSID_OPUS_SUPPORTED: [],
+    PROTMESSID_LICENCE_REQUIRED: [('licence_type', 'B')],
+    PROTMESSID_REQ_CHANNEL_LEVEL_LIST: [('enabled', 'bool')],
+    PROTMESSID_VERSION_AND_OS: VERSION_AND_OS_FIELDS,
+    PROTMESSID_CHANNEL_PAN: [('chan_id', 'B'), ('pan', 'fraction')],
+    PROTMESSID_MUTE_STATE_CHANGED: [('chan_id', 'B'), ('muted', 'bool')],
+    PROTMESSID_CLIENT_ID: [('chan_id', 'B')],
+    PROTMESSID_RECORDER_STATE: [('state', 'B')],
+    PROTMESSID_REQ_SPLIT_MESS_SUPPORT: [],
+    PROTMESSID_SPLIT_MESS_SUPPORTED: [],
+    PROTMESSID_RAWAUDIO_SUPPORTED: [],
+    PROTMESSID_CLM_PING_MS: [('time_ms', 'I')],
+    PROTMESSID_CLM_PING_MS_WITHNUMCLIENTS: [('time_ms', 'I'), ('num_clients', 'B')],
+    PROTMESSID_CLM_SERVER_FULL: [],
+    PROTMESSID_CLM_REGISTER_SERVER: REGISTER_SERVER_FIELDS,
+    PROTMESSID_CLM_UNREGISTER_SERVER: [],
+    PROTMESSID_CLM_SERVER_LIST: [('servers', [('address', 'ipv4')] + REGISTER_SERVER_FIELDS)],
+    PROTMESSID_CLM_REQ_SERVER_LIST: [],
+    PROTMESSID_CLM_SEND_EMPTY_MESSAGE: [('address', 'ipv4'), ('port', 'H')],
+    PROTMESSID_CLM_EMPTY_MESSAGE: [],
+    PROTMESSID_CLM_DISCONNECTION: [],
+    PROTMESSID_CLM_VERSION_AND_OS: VERSION_AND_OS_FIELDS,
+    PROTMESSID_CLM_REQ_VERSION_AND_OS: [],
+    PROTMESSID_CLM_CONN_CLIENTS_LIST: [('clients', CONN_CLIENT_FIELDS)],
+    PROTMESSID_CLM_REQ_CONN_CLIENTS_LIST: [],
+    PROTMESSID_CLM_CHANNEL_LEVEL_LIST: [('levels', 'levels')],
+    PROTMESSID_CLM_REGISTER_SERVER_RESP: [('status', 'B')],
+    PROTMESSID_CLM_REGISTER_SERVER_EX: REGISTER_SERVER_FIELDS + VERSION_AND_OS_FIELDS,
+    PROTMESSID_CLM_RED_SERVER_LIST: [
+        ('servers', [('address', 'ipv4'), ('port', 'H'), ('name', 'str8')])],
+    PROTMESSID_CLM_SERVER_FEATURES: [('features', 'I')],
+    PROTMESSID_CLM_REQ_SERVER_FEATURES: [],
+    PROTMESSID_CLM_WELCOME_MESSAGE: [('text', 'str')],
+    PROTMESSID_CLM_REQ_WELCOME_MESSAGE: [],
+    PROTMESSID_SPECIAL_SPLIT_MESSAGE: [
+        ('id', 'H'), ('num_parts', 'B'), ('split_cnt', 'B'), ('data', 'bytes')],
+}
+
+
+def _decode_string(size):
+    def decode(data, pos):
+        if pos + size > len(data):
+            raise ProtocolError('truncated string length')
+        length = int.from_bytes(data[pos:pos + size], 'little')
+        pos += size
+        if pos + length > len(data):
+            raise ProtocolError('truncated string')
+        return bytes(data[pos:pos + length]).decode('utf-8', 'replace'), pos + length
+    return decode
+
+
+def _encode_string(size):
+    def encode(value):
+        encoded = str(value).encode('utf-8')
+        return len(encoded).to_bytes(size, 'little') + encoded
+    return encode
+
+
+def _decode_levels(data, pos):
+    levels = []
+    for byte in data[pos:]:
+        levels += [byte & 0x0F, byte >> 4]
+    # an odd number of clients is padded with 0xF (out of range)
+    if levels and levels[-1] == 0x0F:
+        levels.pop()
+    return levels, len(data)
+
+
+def _encode_levels(value):
+    levels = list(value)
+    if len(levels) % 2:
+        levels.append(0x0F)
+    return bytes((lo & 0x0F) | ((hi & 0x0F) << 4) for lo, hi in zip(levels[::2], levels[1::2]))
+
+
+def _decode_scalar(fmt, convert=None):
+    size = struct.calcsize('<' + fmt)
+
+    def decode(data, pos):
+        if pos + size > len(data):
+            raise ProtocolError('truncated message body')
+        value = struct.unpack_from('<' + fmt, data, pos)[0]
+        return (convert(value) if convert else value), pos + size
+    return decode
+
+
+# (decoder, encoder) for each non-struct field type
+FIELD_CODECS = {
+    'str': (_decode_string(2), _encode_string(2)),
+    'str8': (_decode_string(1), _encode_string(1)),
+    'bytes': (lambda data, pos: (bytes(data[pos:]), len(data)), bytes),
+    'levels': (_decode_levels, _encode_levels),
+    # gain and pan values are transmitted as fraction of 2^15
+    'fraction': (_decode_scalar('H', lambda value: value / (1 << 15)),
+                 lambda value: struct.pack('<H', int(value * (1 << 15)))),
+    'bool': (_decode_scalar('B', bool), lambda value: struct.pack('<B', int(bool(value)))),
+    'ipv4': (_decode_scalar('I', lambda value: str(ipaddress.IPv4Address(value))),
+             lambda value: struct.pack('<I', int(ipaddress.IPv4Address(value)))),
+}
+
+
+def _decode_field(type_, data, pos):
+    if isinstance(type_, list):
+        records = []
+        while pos < len(data):
+            record, pos = _decode_fields(type_, data, pos)
+            records.append(record)
+        return records, pos
+    if type_ in FIELD_CODECS:
+        return FIELD_CODECS[type_][0](data, pos)
+    return _decode_scalar(type_)(data, pos)
+
+
+def _decode_fields(fields, data, pos):
+    record = {}
+    for name, type_ in fields:
+        record[name], pos = _decode_field(type_, data, pos)
+    return record, pos
+
+
+def _encode_field(type_, value):
+    if isinstance(type_, list):
+        return b''.join(_encode_fields(type_, record) for record in value)
+    if type_ in FIELD_CODECS:
+        return FIELD_CODECS[type_][1](value)
+    return struct.pack('<' + type_, value)
+
+
+def _encode_fields(fields, record):
+    try:
+        return b''.join(_encode_field(type_, record[name]) for name, type_ in fields)
+    except KeyError as e:
+        raise ProtocolError(f'missing field {e}') from None
+    except (struct.error, ValueError) as e:
+        raise ProtocolError(str(e)) from None
+
+
+def decode_body(msg_id, data):
+    """
+    @param msg_id: int, PROTMESSID_*
+    @param data: bytes, message body as returned by decode_frame()
+    @return: dict of field values; unknown and obsolete messages yield {'data': bytes}
+    @raise ProtocolError: if the body does not match the message layout
+    """
+    fields = MESSAGE_FIELDS.get(msg_id)
+    if fields is None:
+        return {'data': bytes(data)}
+    record, pos = _decode_fields(fields, data, 0)
+    if pos != len(data):
+        raise ProtocolError(f'{len(data) - pos} trailing bytes in {message_name(msg_id)}')
+    return record
+
+
+def encode_body(msg_id, fields=None, **kwargs):
+    """
+    @param msg_id: int, PROTMESSID_*
+    @param fields: dict of field values as returned by decode_body(), may be
+                   combined with or replaced by keyword arguments
+    @return: bytes
+    @raise ProtocolError: if a field is missing or out of range
+    """
+    record = dict(fields or {}, **kwargs)
+    layout = MESSAGE_FIELDS.get(msg_id)
+    if layout is None:
+        return bytes(record.get('data', b''))
+    return _encode_fields(layout, record)
+
+
+def encode_message(msg_id, fields=None, cnt=0, **kwargs):
+    """
+    Encodes body and frame in one go.
+
+    @return: bytes, ready to be sent as UDP payload
+    """
+    return encode_frame(msg_id, encode_body(msg_id, fields, **kwargs), cnt)
+
+
+def decode_message(packet):
+    """
+    Decodes frame and body in one go.
+
+    @return: (Frame, dict) or None if the packet is not a protocol message
+    @raise ProtocolError: if the body does not match the message layout
+    """
+    frame = decode_frame(packet)
+    if frame is None:
+        return None
+    return frame, decode_body(frame.id, frame.data)
+
+
+# Split messages --------------------------------------------------------------
+def split_message(msg_id, data):
+    """
+    Splits a body into PROTMESSID_SPECIAL_SPLIT_MESSAGE containers like
+    CProtocol::CreateAndSendMessage does if split messages are supported.
+
+    @return: list of container bodies (a single element list with the
+             original body if no split is required)
+    """
+    if len(data) <= MESS_SPLIT_PART_SIZE_BYTES:
+        return [bytes(data)]
+    num_parts = math.ceil(len(data) / MESS_SPLIT_PART_SIZE_BYTES)
+    return [encode_body(PROTMESSID_SPECIAL_SPLIT_MESSAGE, id=msg_id, num_parts=num_parts,
+                        split_cnt=i,
+                        data=data[i * MESS_SPLIT_PART_SIZE_BYTES:
+                                  (i + 1) * MESS_SPLIT_PART_SIZE_BYTES])
+            for i in range(num_parts)]
+
+
+class SplitMessageAssembler:
+    """
+    Reassembles split messages of one connection like
+    CProtocol::ParseMessageBody.
+    """
+
+    def __init__(self):
+        self.parts = []
+
+    def add(self, msg_id, data):
+        """
+        @param msg_id: int, ID of a received frame
+        @param data: bytes, body of a received frame
+        @return: (msg_id, data) of a complete message or None while parts are missing
+        """
+        if msg_id != PROTMESSID_SPECIAL_SPLIT_MESSAGE:
+            self.parts = []
+            return msg_id, data
+        try:
+            container = decode_body(msg_id, data)
+        except ProtocolError:
+            return None
+        if (container['split_cnt'] != len(self.parts) or
+                container['split_cnt'] >= container['num_parts'] or
+                container['split_cnt'] >= MAX_NUM_MESS_SPLIT_PARTS):
+            self.parts = []
+            return None
+        self.parts.append(container['data'])
+        if len(self.parts) < container['num_parts']:
+            return None
+        message, self.parts = b''.join(self.parts), []
+        return container['id'], message
+
+
+# Batch processing -----------------------------------------------------------
+CRC_TABLE_ARRAY = np.array(CRC_TABLE, dtype=np.uint32) if np is not None else None
+
+
+class FrameBatch:
+    """
+    Validates and splits many UDP payloads at once.
+
+    The payloads are given as one uint8 buffer (e.g. a memory-mapped capture
+    file) plus arrays of offsets and lengths. All checks of
+    ParseMessageFrame, including the CRC, run vectorized over the packets:
+    the CRC loop iterates over byte positions, not over packets.
+
+    After construction, the following arrays are available, each with one
+    entry per payload:
+
+    - is_protocol: bool, True for valid protocol messages
+    - ids, cnts: message ID and counter (0 for non-protocol packets)
+    - body_offsets, body_lengths: location of the message body in the buffer
+    """
+
+    def __init__(self, buffer, offsets, lengths):
+        require_numpy('batch processing')
+        self.buffer = np.frombuffer(buffer, dtype=np.uint8)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        count = len(self.offsets)
+        self.is_protocol = np.zeros(count, dtype=bool)
+        self.ids = np.zeros(count, dtype=np.uint16)
+        self.cnts = np.zeros(count, dtype=np.uint8)
+        self.body_lengths = np.zeros(count, dtype=np.int64)
+        self._parse()
+
+    @property
+    def body_offsets(self):
+        """
+        @return: array of body start positions in the buffer
+        """
+        return self.offsets + MESS_HEADER_LENGTH_BYTE
+
+    def _u16(self, positions):
+        return (self.buffer[positions].astype(np.uint32) |
+                (self.buffer[positions + 1].astype(np.uint32) << 8))
+
+    def _parse(self):
+        candidates = np.flatnonzero(self.lengths >= MESS_LEN_WITHOUT_DATA_BYTE)
+        starts = self.offsets[candidates]
+        tags = self._u16(starts)
+        body_lengths = self._u16(starts + 5).astype(np.int64)
+        ok = (tags == 0) & (body_lengths == self.lengths[candidates] - MESS_LEN_WITHOUT_DATA_BYTE)
+        candidates, starts, body_lengths = candidates[ok], starts[ok], body_lengths[ok]
+
+        crc_ok = self._check_crcs(starts, body_lengths + MESS_HEADER_LENGTH_BYTE)
+        valid = candidates[crc_ok]
+        starts = starts[crc_ok]
+        self.is_protocol[valid] = True
+        self.ids[valid] = self._u16(starts + 2)
+        self.cnts[valid] = self.buffer[starts + 4]
+        self.body_lengths[valid] = body_lengths[crc_ok]
+
+    def _check_crcs(self, starts, crc_lengths):
+        # process the longest messages first so that the active packets at
+        # each byte position are always a prefix of the sorted arrays
+        order = np.argsort(-crc_lengths, kind='stable')
+        sorted_starts = starts[order]
+        sorted_lengths = crc_lengths[order]
+        crcs = np.full(len(order), 0xFFFF, dtype=np.uint32)
+        max_length = int(sorted_lengths[0]) if len(order) else 0
+        # number of packets which are longer than each byte position
+        active_counts = np.searchsorted(-sorted_lengths, -np.arange(max_length), side='left')
+        for pos in range(max_length):
+            active = active_counts[pos]
+            current = crcs[:active]
+            byte = self.buffer[sorted_starts[:active] + pos]
+            crcs[:active] = ((current << 8) & 0xFFFF) ^ CRC_TABLE_ARRAY[(current >> 8) ^ byte]
+        received = self._u16(sorted_starts + sorted_lengths)
+        result = np.empty(len(order), dtype=bool)
+        result[order] = (~crcs & 0xFFFF) == received
+        return result
+
+    def body(self, index):
+        """
+        @return: bytes, the body of the protocol message at index
+        """
+        start = self.offsets[index] + MESS_HEADER_LENGTH_BYTE
+        return self.buffer[start:start + self.body_lengths[index]].tobytes()
+
+    def message_counts(self):
+        """
+        @return: dict of message ID to number of protocol messages
+        """
+        ids, counts = np.unique(self.ids[self.is_protocol], return_counts=True)
+        return dict(zip(ids.tolist(), counts.tolist()))
+
+    def audio_size_counts(self):
+        """
+        @return: dict of payload size to number of non-protocol packets,
+                 which are most likely audio packets
+        """
+        sizes, counts = np.unique(self.lengths[~self.is_protocol], return_counts=True)
+        return dict(zip(sizes.tolist(), counts.tolist()))
+
+
+# Capture files --------------------------------------------------------------
+PCAP_MAGIC = {
+    b'\xd4\xc3\xb2\xa1': ('<', 1e-6),
+    b'\xa1\xb2\xc3\xd4': ('>', 1e-6),
+    b'\x4d\x3c\xb2\xa1': ('<', 1e-9),
+    b'\xa1\xb2\x3c\x4d': ('>', 1e-9),
+}
+PCAPNG_SECTION_HEADER = 0x0A0D0D0A
+
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL2 = 276
+
+UdpPackets = collections.namedtuple('UdpPackets', [
+    'buffer', 'offsets', 'lengths', 'timestamps',
+    'src_addresses', 'src_ports', 'dst_addresses', 'dst_ports'])
+
+
+def _pcap_records(data):
+    magic = bytes(data[:4])
+    endian, resolution = PCAP_MAGIC[magic]
+    linktype = struct.unpack_from(endian + 'I', data, 20)[0] & 0x0FFFFFFF
+    record = struct.Struct(endian + 'IIII')
+    offsets, lengths, timestamps = [], [], []
+    pos = 24
+    end = len(data) - record.size
+    # walking the record headers is inherently sequential, everything
+    # after this is done on whole arrays
+    while pos <= end:
+        seconds, fraction, caplen, _ = record.unpack_from(data, pos)
+        pos += record.size
+        offsets.append(pos)
+        lengths.append(caplen)
+        timestamps.append(seconds + fraction * resolution)
+        pos += caplen
+    if offsets and offsets[-1] + lengths[-1] > len(data):
+        del offsets[-1], lengths[-1], timestamps[-1]
+    return [linktype] * len(offsets), offsets, lengths, timestamps
+
+
+def _pcapng_records(data):
+    endian = '<' if struct.unpack_from('<I', data, 8)[0] == 0x1A2B3C4D else '>'
+    linktypes, interfaces = [], []
+    offsets, lengths, timestamps = [], [], []
+    pos = 0
+    while pos + 12 <= len(data):
+        block_type, block_length = struct.unpack_from(endian + 'II', data, pos)
+        if block_length < 12:
+            break
+        if block_type == 1:  # interface description block
+            interfaces.append(struct.unpack_from(endian + 'H', data, pos + 8)[0])
+        elif block_type == 6:  # enhanced packet block
+            interface, high, low, caplen = struct.unpack_from(endian + 'IIII', data, pos + 8)
+            # assume the default timestamp resolution of microseconds
+            timestamps.append(((high << 32) | low) * 1e-6)
+            linktypes.append(interfaces[interface])
+            offsets.append(pos + 28)
+            lengths.append(caplen)
+        elif block_type == 3:  # simple packet block
+            caplen = min(struct.unpack_from(endian + 'I', data, pos + 8)[0], block_length - 16)
+            timestamps.append(float('nan'))
+            linktypes.append(interfaces[0])
+            offsets.append(pos + 12)
+            lengths.append(caplen)
+        pos += block_length
+    return linktypes, offsets, lengths, timestamps
+
+
+def _ip_offsets(buffer, offsets, ends, linktypes):
+    """
+    @return: array of IP header offsets, -1 where the link layer is unsupported
+    """
+    ip = np.full(len(offsets), -1, dtype=np.int64)
+
+    ethernet = linktypes == LINKTYPE_ETHERNET
+    ethertype = _u16be(buffer, np.minimum(offsets + 12, len(buffer) - 2))
+    vlan = ethernet & ((ethertype == 0x8100) | (ethertype == 0x88A8))
+    ip[ethernet] = offsets[ethernet] + 14
+    ip[vlan] += 4
+    for linktype, header in ((LINKTYPE_RAW, 0), (LINKTYPE_IPV4, 0), (LINKTYPE_IPV6, 0),
+                             (LINKTYPE_NULL, 4), (LINKTYPE_LINUX_SLL, 16),
+                             (LINKTYPE_LINUX_SLL2, 20)):
+        selected = linktypes == linktype
+        ip[selected] = offsets[selected] + header
+    # require at least an IPv4 and a UDP header
+    ip[ip + 28 > ends] = -1
+    return ip
+
+
+def _u16be(buffer, positions):
+    return (buffer[positions].astype(np.int64) << 8) | buffer[positions + 1]
+
+
+def _udp_offsets(buffer, ip, ends):
+    """
+    @return: array of UDP header offsets, -1 for non-UDP packets and IP
+             fragments other than the first
+    """
+    usable = ip >= 0
+    version = np.zeros(len(ip), dtype=np.uint8)
+    version[usable] = buffer[ip[usable]] >> 4
+    is_v4 = usable & (version == 4)
+    is_v6 = usable & (version == 6) & (ip + 48 <= ends)
+
+    udp = np.full(len(ip), -1, dtype=np.int64)
+    v4_ip = ip[is_v4]
+    v4_ok = (buffer[v4_ip + 9] == 17) & ((_u16be(buffer, v4_ip + 6) & 0x1FFF) == 0)
+    v4_udp = v4_ip + (buffer[v4_ip] & 0x0F).astype(np.int64) * 4
+    udp[np.flatnonzero(is_v4)[v4_ok]] = v4_udp[v4_ok]
+    v6_ok = buffer[ip[is_v6] + 6] == 17
+    udp[np.flatnonzero(is_v6)[v6_ok]] = ip[is_v6][v6_ok] + 40
+    udp[(udp >= 0) & (udp + 8 > ends)] = -1
+    return udp
+
+
+def _ip_addresses(buffer, ip):
+    """
+    @return: source and destination addresses as 16 byte rows each
+    """
+    addresses = np.zeros((2, len(ip), 16), dtype=np.uint8)
+    v4 = (buffer[ip] >> 4) == 4
+    addresses[:, v4, 10:12] = 0xFF
+    for column, (v4_start, v6_start) in enumerate(((12, 8), (16, 24))):
+        for i in range(4):
+            addresses[column, v4, 12 + i] = buffer[ip[v4] + v4_start + i]
+        for i in range(16):
+            addresses[column, ~v4, i] = buffer[ip[~v4] + v6_start + i]
+    return addresses
+
+
+def read_udp_packets(path, port=None):
+    """
+    Reads all IPv4/IPv6 UDP packets from a pcap or pcapng file.
+
+    The file is memory-mapped and the returned buffer refers to it, so no
+    payload is copied. IP fragments other than the first are skipped.
+
+    @param path: str
+    @param port: int, only keep packets from or to this UDP port
+    @return: UdpPackets with NumPy arrays; addresses are given as 16 byte
+             rows (IPv4 addresses mapped into ::ffff:0:0/96)
+    """
+    require_numpy('batch processing')
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if struct.unpack_from('<I', data, 0)[0] == PCAPNG_SECTION_HEADER:
+        linktypes, offsets, lengths, timestamps = _pcapng_records(data)
+    else:
+        linktypes, offsets, lengths, timestamps = _pcap_records(data)
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    offsets = np.array(offsets, dtype=np.int64)
+    ends = offsets + np.array(lengths, dtype=np.int64)
+    ip = _ip_offsets(buffer, offsets, ends, np.array(linktypes, dtype=np.int64))
+    udp = _udp_offsets(buffer, ip, ends)
+
+    keep = udp >= 0
+    if port is not None:
+        keep[keep] = ((_u16be(buffer, udp[keep]) == port) |
+                      (_u16be(buffer, udp[keep] + 2) == port))
+    keep = np.flatnonzero(keep)
+    udp = udp[keep]
+    payload_lengths = np.minimum(_u16be(buffer, udp + 4) - 8, ends[keep] - udp - 8)
+    addresses = _ip_addresses(buffer, ip[keep])
+    return UdpPackets(buffer, udp + 8, np.maximum(payload_lengths, 0),
+                      np.array(timestamps, dtype=np.float64)[keep],
+                      addresses[0], _u16be(buffer, udp).astype(np.uint16),
+                      addresses[1], _u16be(buffer, udp + 2).astype(np.uint16))
+
+
+def format_address(row):
+    """
+    @param row: 16 byte address row as returned by read_udp_packets()
+    @return: str
+    """
+    address = ipaddress.IPv6Address(bytes(row))
+    return str(address.ipv4_mapped or address)
+
+
+def _ipv4_checksum(header):
+    total = sum(struct.unpack('!10H', header))
+    total = (total & 0xFFFF) + (total >> 16)
+    return ~((total & 0xFFFF) + (total >> 16)) & 0xFFFF
+
+
+def write_udp_pcap(path, packets):
+    """
+    Writes UDP packets as a pcap file with raw IP link type, so that it can
+    be read back with read_udp_packets(). The UDP checksums are left empty.
+
+    @param path: str
+    @param packets: iterable of (timestamp, src_address, src_port, dst_address,
+                    dst_port, payload) tuples with the addresses given as 16
+                    byte rows like the ones returned by read_udp_packets()
+    @return: int, number of packets written
+    """
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<IHHiIII', 0xA1B2C3D4, 2, 4, 0, 0, 65535, LINKTYPE_RAW))
+        for timestamp, src, src_port, dst, dst_port, payload in packets:
+            src, dst = (ipaddress.IPv6Address(bytes(row)) for row in (src, dst))
+            udp = struct.pack('!HHHH', src_port, dst_port, 8 + len(payload), 0)
+            if src.ipv4_mapped and dst.ipv4_mapped:
+                header = struct.pack('!BBHHHBBH4s4s', 0x45, 0, 28 + len(payload), 0, 0, 64, 17,
+                                     0, src.ipv4_mapped.packed, dst.ipv4_mapped.packed)
+                header = header[:10] + struct.pack('!H', _ipv4_checksum(header)) + header[12:]
+            else:
+                header = struct.pack('!IHBB16s16s', 6 << 28, 8 + len(payload), 17, 64,
+                                     src.packed, dst.packed)
+            seconds, micros = divmod(round(timestamp * 1e6), 1000000)
+            size = len(header) + len(udp) + len(payload)
+            f.write(struct.pack('<IIII', seconds, micros, size, size))
+            f.write(header + udp + payload)
+            count += 1
+    return count
+
+
+# Command line ---------------------------------------------------------------
+def print_stats(path, port, as_json):
+    """
+    Prints the number of protocol messages per type and of audio packets
+    per size found in a capture file.
+    """
+    packets = read_udp_packets(path, port)
+    batch = FrameBatch(packets.buffer, packets.offsets, packets.lengths)
+    messages = {message_name(k): v for k, v in sorted(batch.message_counts().items())}
+    audio = batch.audio_size_counts()
+    stats = {
+        'udp_packets': len(packets.offsets),
+        'protocol_messages': int(batch.is_protocol.sum()),
+        'other_packets': int((~batch.is_protocol).sum()),
+        'messages': messages,
+        'other_packet_sizes': audio,
+    }
+    if as_json:
+        print(json.dumps(stats, indent=2))
+        return
+    print(f"UDP packets:       {stats['udp_packets']}")
+    print(f"protocol messages: {stats['protocol_messages']}")
+    print(f"other (audio):     {stats['other_packets']}")
+    for name, count in messages.items():
+        print(f'  {name:<32} {count}')
+    print('other packet sizes (bytes: packets):')
+    for size, count in sorted(audio.items(), key=lambda item: -item[1])[:20]:
+        print(f'  {size:>5}: {count}')
+
+
+def main():
+    p = argparse.ArgumentParser(description='Decodes Jamulus protocol messages.')
+    sub = p.add_subparsers(dest='command', required=True)
+    decode = sub.add_parser('decode', help='decode a single UDP payload given as hex')
+    decode.add_argument('payload', help='hex encoded UDP payload')
+    stats = sub.add_parser('stats', help='classify all UDP packets of a pcap/pcapng file')
+    stats.add_argument('capture', help='pcap or pcapng file')
+    stats.add_argument('--port', type=int, help='only consider packets from/to this UDP port')
+    stats.add_argument('--json', action='store_true', help='print machine-readable output')
+    args = p.parse_args()
+
+    if args.command == 'decode':
+        try:
+            decoded = decode_message(bytes.fromhex(args.payload))
+        except ProtocolError as e:
+            sys.exit(f'invalid message body: {e}')
+        if decoded is None:
+            sys.exit('not a valid protocol message (audio packet?)')
+        frame, body = decoded
+        print(json.dumps({'id': frame.id, 'name': message_name(frame.id), 'cnt': frame.cnt,
+                          'body': body}, default=bytes.hex, indent=2, ensure_ascii=False))
+    else:
+        try:
+            print_stats(args.capture, args.port, args.json)
+        except (OSError, RuntimeError) as e:
+            sys.exit(str(e))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Offline analysis and mixdown of jam recorder sessions.
+
+The jam recorder (src/recorder) writes one 16 bit, 48 kHz WAV file per
+client connection into a session directory. The file name encodes the
+client, the position within the session and the number of channels:
+
+<name>-<address>-<start frame>-<channels>[_<n>].wav
+
+The start frame is given in server frames (128 samples, or 64 samples
+if the server runs with --fastupdate). It is read from the session's .lof
+file if present.
+
+This tool memory-maps the WAV files and works on zero-copy NumPy views. Per
+track it reports sample peak, RMS and integrated loudness (ITU-R BS.1770
+with gating, K-weighting applied in the frequency domain per 100 ms block).
+It can also render a stereo mixdown with every track placed at its start
+frame. Both run in a process pool.
+
+Usage:
+./tools/jamulus_recording.py /srv/recordings/Jam-20240301-201503123
+./tools/jamulus_recording.py SESSION_DIR --mixdown mix.wav --gain -6 --jobs 8
+./tools/jamulus_recording.py SESSION_DIR --json stats.json
+
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import logging
+import math
+import os
+import re
+import struct
+import sys
+
+import jamulus_protocol as jp
+from jamulus_common import optional_import, require_numpy, write_json
+
+np = optional_import('numpy')
+logger = logging.getLogger('')
+
+# the recorder writes at the system sample rate, see FmtSubChunk in
+# src/recorder/cwavestream.h
+SAMPLE_RATE = jp.SYSTEM_SAMPLE_RATE_HZ
+WAV_HEADER_BYTES = 44
+# CWaveStream writes this data chunk size until the file is finalised
+WAV_UNSPECIFIED_LENGTH = 0x7FFFF000
+
+# see CJamClient::CJamClient and CJamSession::TracksFromSessionDir
+TRACK_FILE_RE = re.compile(
+    r'^(?P<name>[^-]+)-(?P<address>[^-]+)-(?P<start_frame>\d+)-(?P<channels>[12])'
+    r'(?:_(?P<index>\d+))?\.wav$')
+LOF_LINE_RE = re.compile(r'^file "(?P<file>[^"]+)" offset (?P<offset>[0-9.]+)', re.MULTILINE)
+
+Track = collections.namedtuple('Track', [
+    'path', 'name', 'address', 'start_frame', 'channels', 'index'])
+WavInfo = collections.namedtuple('WavInfo', [
+    'channels', 'sample_rate', 'bits_per_sample', 'data_offset', 'num_frames'])
+
+# K-weighting filter of ITU-R BS.1770-4 for 48 kHz: high shelf and high pass
+K_WEIGHTING = [
+    ([1.53512485958697, -2.69169618940638, 1.19839281085285],
+     [1.0, -1.69065929318241, 0.73248077421585]),
+    ([1.0, -2.0, 1.0],
+     [1.0, -1.99004745483398, 0.99007225036621]),
+]
+LOUDNESS_SUB_BLOCK = SAMPLE_RATE // 10  # 100 ms, a gating block is four of them
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+ANALYSIS_CHUNK_SUB_BLOCKS = 600  # one minute
+MIX_SEGMENT_SECONDS = 30
+
+
+class RecordingError(RuntimeError):
+    """
+    Exception which is raised for unreadable recordings.
+    """
+
+
+def parse_track_filename(path):
+    """
+    @param path: str, path of a WAV file written by the jam recorder
+    @return: Track or None if the name does not follow the recorder's scheme
+    """
+    match = TRACK_FILE_RE.match(os.path.basename(path))
+    if match is None:
+        return None
+    return Track(path, match['name'], match['address'], int(match['start_frame']),
+                 int(match['channels']), int(match['index'] or 0))
+
+
+def session_tracks(session_dir):
+    """
+    @return: list of Track of a session directory, sorted by start frame
+    """
+    tracks = [parse_track_filename(os.path.join(session_dir, name))
+              for name in os.listdir(session_dir)]
+    return sorted((track for track in tracks if track is not None),
+                  key=lambda track: (track.start_frame, track.name, track.index))
+
+
+def read_wav_info(path):
+    """
+    Reads the header of a WAV file. Files which were not finalised (the
+    server was killed while recording) are handled by taking the data length
+    from the file size.
+
+    @return: WavInfo
+    @raise RecordingError: if this is not a 16 bit PCM WAV file
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.read(4096)
+    if header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+        raise RecordingError(f'{path}: not a RIFF WAVE file')
+    pos = 12
+    audio_format = channels = sample_rate = bits_per_sample = 0
+    while pos + 8 <= len(header):
+        chunk_id, chunk_size = struct.unpack_from('<4sI', header, pos)
+        if chunk_id == b'fmt ':
+            audio_format, channels, sample_rate, _, _, bits_per_sample = struct.unpack_from(
+                '<HHIIHH', header, pos + 8)
+        elif chunk_id == b'data':
+            if audio_format != 1 or bits_per_sample != 16 or channels == 0:
+                raise RecordingError(f'{path}: not a 16 bit PCM WAV file')
+            available = size - pos - 8
+            if chunk_size in (0, WAV_UNSPECIFIED_LENGTH) or chunk_size > available:
+                chunk_size = available
+            return WavInfo(channels, sample_rate, bits_per_sample, pos + 8,
+                           chunk_size // (channels * 2))
+        pos += 8 + chunk_size + (chunk_size & 1)
+    raise RecordingError(f'{path}: no data chunk found')
+
+
+def wav_samples(path, info=None):
+    """
+    @return: read-only int16 array of shape (frames, channels) which is a
+             view of the memory-mapped file
+    """
+    require_numpy('reading WAV samples')
+    info = info or read_wav_info(path)
+    if info.num_frames == 0:
+        return np.zeros((0, info.channels), dtype=np.int16)
+    return np.memmap(path, dtype='<i2', mode='r', offset=info.data_offset,
+                     shape=(info.num_frames, info.channels))
+
+
+def write_wav_header(f, channels, num_frames):
+    """
+    Writes a 44 byte header of a 16 bit, 48 kHz PCM WAV file.
+    """
+    data_bytes = num_frames * channels * 2
+    f.write(struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 36 + data_bytes, b'WAVE', b'fmt ', 16, 1,
+                        channels, SAMPLE_RATE, SAMPLE_RATE * channels * 2, channels * 2, 16,
+                        b'data', data_bytes))
+
+
+def detect_frame_size(session_dir, tracks, default=jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES):
+    """
+    Determines the server frame size from the offsets in the Audacity .lof
+    file which the recorder writes at the end of a session.
+
+    @return: int, samples per start frame
+    """
+    start_frames = {os.path.basename(track.path): track.start_frame for track in tracks}
+    for name in os.listdir(session_dir):
+        if not name.endswith('.lof'):
+            continue
+        with open(os.path.join(session_dir, name), encoding='utf-8') as f:
+            for match in LOF_LINE_RE.finditer(f.read()):
+                frame = start_frames.get(match['file'])
+                if frame:
+                    return round(float(match['offset']) * SAMPLE_RATE / frame)
+    return default
+
+
+# Loudness ---------------------------------------------------------------------
+def k_weighting_gains(num_samples):
+    """
+    @return: float64 array of Parseval weights for the rfft bins of a block,
+             so that sum(|rfft(x)|^2 * weights) is the mean square of the
+             K-weighted block
+    """
+    frequencies = np.fft.rfftfreq(num_samples, 1 / SAMPLE_RATE)
+    z = np.exp(-2j * np.pi * frequencies / SAMPLE_RATE)
+    response = np.ones(len(frequencies), dtype=np.complex128)
+    for b, a in K_WEIGHTING:
+        response *= (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+    # the rfft only contains one half of the spectrum
+    multiplicity = np.full(len(frequencies), 2.0)
+    multiplicity[0] = 1.0
+    if num_samples % 2 == 0:
+        multiplicity[-1] = 1.0
+    return np.abs(response) ** 2 * multiplicity / num_samples ** 2
+
+
+def sub_block_energies(samples, weights):
+    """
+    @param samples: int16 array (frames, channels); trailing samples which
+                    do not fill a sub-block are ignored
+    @return: float64 array (sub-blocks,), K-weighted mean square summed over
+             the channels
+    """
+    count = len(samples) // LOUDNESS_SUB_BLOCK
+    blocks = samples[:count * LOUDNESS_SUB_BLOCK].reshape(count, LOUDNESS_SUB_BLOCK, -1)
+    spectrum = np.fft.rfft(blocks.astype(np.float32) / 32768, axis=1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    return np.einsum('bfc,f->b', power, weights)
+
+
+def integrated_loudness(energies):
+    """
+    Gated loudness of BS.1770 from the energies of 100 ms sub-blocks
+    (gating blocks of 400 ms with 75 % overlap).
+
+    @return: float, LUFS (-inf for silence)
+    """
+    if len(energies) < 4:
+        return -math.inf
+    blocks = np.convolve(energies, np.full(4, 0.25), mode='valid')
+    with np.errstate(divide='ignore'):
+        loudness = -0.691 + 10 * np.log10(blocks)
+    gated = blocks[loudness > ABSOLUTE_GATE_LUFS]
+    if len(gated) == 0:
+        return -math.inf
+    threshold = -0.691 + 10 * math.log10(gated.mean()) + RELATIVE_GATE_LU
+    gated = blocks[(loudness > ABSOLUTE_GATE_LUFS) & (loudness > threshold)]
+    return -0.691 + 10 * math.log10(gated.mean())
+
+
+def to_db(value):
+    """
+    @return: float rounded to 0.01 dB, None for -inf (JSON has no infinity)
+    """
+    if value <= 0:
+        return None
+    return round(20 * math.log10(value), 2)
+
+
+def analyze_track(path):
+    """
+    Computes level statistics of one WAV file. Runs in a worker process.
+
+    @return: dict
+    """
+    info = read_wav_info(path)
+    samples = wav_samples(path, info)
+    weights = k_weighting_gains(LOUDNESS_SUB_BLOCK)
+    chunk = ANALYSIS_CHUNK_SUB_BLOCKS * LOUDNESS_SUB_BLOCK
+    peak = 0
+    clipped = 0
+    square_sum = 0.0
+    energies = []
+    for start in range(0, len(samples), chunk):
+        part = samples[start:start + chunk]
+        peak = max(peak, int(np.abs(part.astype(np.int32)).max()))
+        clipped += int(np.count_nonzero((part == 32767) | (part == -32768)))
+        square_sum += float(np.einsum('ij,ij->', part, part, dtype=np.float64))
+        energies.append(sub_block_energies(part, weights))
+    num_samples = samples.size
+    lufs = integrated_loudness(np.concatenate(energies)) if energies else -math.inf
+    return {
+        'file': os.path.basename(path),
+        'channels': info.channels,
+        'duration_s': round(info.num_frames / SAMPLE_RATE, 3),
+        'peak_dbfs': to_db(peak / 32768),
+        'rms_dbfs': to_db(math.sqrt(square_sum / num_samples) / 32768 if num_samples else 0),
+        'loudness_lufs': round(lufs, 2) if math.isfinite(lufs) else None,
+        'clipped_samples': clipped,
+    }
+
+
+# Mixdown ----------------------------------------------------------------------
+MixSegment = collections.namedtuple('MixSegment', ['output', 'start', 'length', 'tracks', 'gain'])
+
+
+def mix_segment(segment):
+    """
+    Mixes all tracks overlapping one time segment and writes the result
+    into its place in the (already sized) output file. Runs in a worker
+    process.
+
+    @param segment: MixSegment; tracks is a list of (path, start sample)
+    @return: (peak, clipped samples) of the segment
+    """
+    mix = np.zeros((segment.length, 2), dtype=np.float32)
+    end = segment.start + segment.length
+    for path, track_start in segment.tracks:
+        samples = wav_samples(path)
+        first = max(segment.start, track_start)
+        last = min(end, track_start + len(samples))
+        if first >= last:
+            continue
+        # mono tracks are placed in the centre with unity gain on both sides
+        mix[first - segment.start:last - segment.start] += \
+            samples[first - track_start:last - track_start]
+    mix *= segment.gain
+    peak = float(np.abs(mix).max()) if segment.length else 0.0
+    clipped = int(np.count_nonzero((mix > 32767) | (mix < -32768)))
+    data = np.clip(np.rint(mix), -32768, 32767).astype('<i2').tobytes()
+    fd = os.open(segment.output, os.O_WRONLY)
+    try:
+        os.pwrite(fd, data, WAV_HEADER_BYTES + segment.start * 4)
+    finally:
+        os.close(fd)
+    return peak, clipped
+
+
+def plan_segments(placed, total, output, gain):
+    """
+    @param placed: list of (path, start sample, number of frames)
+    @return: list of MixSegment covering the whole timeline
+    """
+    step = MIX_SEGMENT_SECONDS * SAMPLE_RATE
+    segments = []
+    for start in range(0, total, step):
+        length = min(step, total - start)
+        overlapping = [(path, track_start) for path, track_start, frames in placed
+                       if track_start < start + length and track_start + frames > start]
+        segments.append(MixSegment(output, start, length, overlapping, gain))
+    return segments
+
+
+def mixdown(tracks, frame_size, output, executor, gain_db=0.0):
+    """
+    Renders a stereo mixdown of all tracks. The timeline is split into
+    segments which are mixed in parallel and written directly to their
+    position in the output file.
+
+    @return: dict with the peak level and the number of clipped samples
+    """
+    placed = [(track.path, track.start_frame * frame_size, read_wav_info(track.path).num_frames)
+              for track in tracks]
+    total = max((start + frames for _, start, frames in placed), default=0)
+    with open(output, 'wb') as f:
+        write_wav_header(f, 2, total)
+        f.truncate(WAV_HEADER_BYTES + total * 4)
+
+    peak, clipped = 0.0, 0
+    segments = plan_segments(placed, total, output, 10 ** (gain_db / 20))
+    for segment_peak, segment_clipped in executor.map(mix_segment, segments):
+        peak = max(peak, segment_peak)
+        clipped += segment_clipped
+    return {'file': output, 'duration_s': round(total / SAMPLE_RATE, 3),
+            'peak_dbfs': to_db(peak / 32768), 'clipped_samples': clipped}
+
+
+def print_table(stats):
+    """
+    Prints per-track statistics as a table.
+    """
+    print(f"{'file':<48} {'start s':>8} {'length s':>9} {'peak dBFS':>10} {'RMS dBFS':>9} "
+          f"{'LUFS':>7} {'clipped':>8}")
+    for row in stats:
+        cells = [row.get(key) for key in ('peak_dbfs', 'rms_dbfs', 'loudness_lufs')]
+        cells = ['-inf' if cell is None else f'{cell:.1f}' for cell in cells]
+        print(f"{row['file']:<48} {row.get('start_s', 0):>8.1f} {row['duration_s']:>9.1f} "
+              f"{cells[0]:>10} {cells[1]:>9} {cells[2]:>7} {row['clipped_samples']:>8}")
+
+
+def main():
+    p = argparse.ArgumentParser(description='Analyzes and mixes down a jam recorder session.')
+    p.add_argument('session', help='session directory (Jam-YYYYMMDD-HHMMSSzzz)')
+    p.add_argument('--mixdown', metavar='WAV', help='write a stereo mixdown to this file')
+    p.add_argument('--gain', type=float, default=0.0, help='mixdown gain in dB')
+    p.add_argument('--frame-size', type=int, choices=[jp.SYSTEM_FRAME_SIZE_SAMPLES,
+                                                      jp.DOUBLE_SYSTEM_FRAME_SIZE_SAMPLES],
+                   help='server frame size in samples (default: from the .lof file, else 128)')
+    p.add_argument('--jobs', type=int, default=os.cpu_count(), help='number of worker processes')
+    p.add_argument('--no-stats', action='store_true', help='skip the per-track statistics')
+    p.add_argument('--json', metavar='FILE', help='write the results as JSON ("-" for stdout)')
+    args = p.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+
+    try:
+        require_numpy('the analysis')
+        tracks = session_tracks(args.session)
+    except (OSError, RuntimeError) as e:
+        sys.exit(str(e))
+    if not tracks:
+        sys.exit(f'no recorder WAV files found in {args.session}')
+    frame_size = args.frame_size or detect_frame_size(args.session, tracks)
+    logger.info('%d tracks, %d samples per frame', len(tracks), frame_size)
+
+    results = {'session': args.session, 'frame_size': frame_size}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        try:
+            if not args.no_stats:
+                results['tracks'] = list(executor.map(analyze_track,
+                                                      [track.path for track in tracks]))
+                for track, row in zip(tracks, results['tracks']):
+                    row['start_s'] = round(track.start_frame * frame_size / SAMPLE_RATE, 3)
+            if args.mixdown:
+                results['mixdown'] = mixdown(tracks, frame_size, args.mixdown, executor,
+                                             args.gain)
+                results['mixdown'].update(analyze_track(args.mixdown))
+        except RecordingError as e:
+            sys.exit(str(e))
+
+    if args.json:
+        write_json(results, args.json)
+    else:
+        print_table(results.get('tracks', []) +
+                    ([results['mixdown']] if 'mixdown' in results else []))
+
+
+if __name__ == '__main__':
+    main()
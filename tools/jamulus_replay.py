@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Replays the client side of a captured Jamulus session against a local
+server with the original timing.
+
+All UDP packets which were sent to the server port (--port) in the capture
+are replayed, protocol messages as well as audio packets. Every original
+sender address is mapped to its own local UDP socket, so the local server
+sees as many clients as the production server did. Each sender's packets
+go out in their original order. The replay is open-loop: the packets are
+sent as captured and are not adapted to the answers of the local server.
+
+Timing: packet i is sent at start + (t_i - t_0) / --speed, with t_i being
+its capture timestamp. --speed 2 replays twice as fast and --speed 0 sends
+as fast as possible. The tool waits for the answers of the server in the
+meantime and spins for the last --spin milliseconds before each packet.
+It reports how late the packets left (send lag).
+
+The answers of the local server are recorded and compared with the answers
+of the production server in the capture: message counts per protocol
+message type, audio packets and packets per sender. --output writes them
+as pcap with the original addresses, so that the replay can be analysed
+like the capture itself, e.g. with jamulus_protocol.py stats.
+
+The server only accepts the audio of a channel after the client sent its
+PROTMESSID_NETW_TRANSPORT_PROPS, which clients send once after connecting.
+For senders which connected before --start, the last
+PROTMESSID_NETW_TRANSPORT_PROPS and PROTMESSID_CHANNEL_INFOS before the
+time window are therefore replayed right after their first audio packet in
+the window. Senders which connected before the capture started have no
+such messages; the tool warns about them, as the local server drops their
+audio.
+
+Usage:
+./tools/jamulus_replay.py capture.pcap --target 127.0.0.1:22124
+./tools/jamulus_replay.py capture.pcapng --port 22124 --start 3600 --duration 60 --speed 4 \
+    --output replay.pcap --json replay.json
+
+"""
+
+import argparse
+import collections
+import ipaddress
+import json
+import logging
+import selectors
+import socket
+import sys
+import time
+
+import jamulus_protocol as jp
+from jamulus_common import Histogram, optional_import, parse_address, require_numpy, write_json
+
+np = optional_import('numpy')
+logger = logging.getLogger('')
+
+# answers which arrive later than this after the last replayed request are
+# not compared, in the capture as well as in the replay; with --start or
+# --duration, the counts at the edges of the time window still differ
+ANSWER_WINDOW = 0.01
+
+ReplayOptions = collections.namedtuple('ReplayOptions', ['speed', 'spin', 'linger'])
+
+# packet indices in the capture, sender index and time per packet
+Flow = collections.namedtuple('Flow', ['index', 'senders', 'times'])
+
+Response = collections.namedtuple('Response', ['time', 'sender', 'payload'])
+
+# messages which a client sends once after connecting and which the server
+# needs for the audio of the channel, see CChannel::PutAudioData
+SETUP_MESSAGE_IDS = [jp.PROTMESSID_NETW_TRANSPORT_PROPS, jp.PROTMESSID_CHANNEL_INFOS]
+
+
+class Capture:
+    """
+    The packets of a capture which were exchanged with one server, split
+    into the requests of each sender and the responses of the server.
+    """
+
+    def __init__(self, path, port, server=None):
+        """
+        @param path: str, pcap or pcapng file
+        @param port: int, UDP port of the server in the capture
+        @param server: str, address of the server in the capture; defaults
+                       to the address which received most packets on `port`
+        """
+        packets = jp.read_udp_packets(path, port)
+        self.packets = packets
+        self.port = port
+        to_port = np.flatnonzero(packets.dst_ports == port)
+        if to_port.size == 0:
+            raise ValueError(f'{path} contains no packets to port {port}')
+        self.server = self._server_address(to_port, server)
+        server_row = np.frombuffer(self.server, dtype=np.uint8)
+
+        to_server = to_port[(packets.dst_addresses[to_port] == server_row).all(axis=1)]
+        if to_server.size == 0:
+            raise ValueError(f'{path} contains no packets to {server}:{port}')
+        senders, request_senders = np.unique(self._endpoints(to_server, 'src'), axis=0,
+                                             return_inverse=True)
+        request_senders = request_senders.ravel()
+        self.senders = [self._endpoint_key(row) for row in senders]
+        self.requests = Flow(to_server, request_senders,
+                             self._monotonic_times(to_server, request_senders))
+        # capture timestamp which corresponds to time 0 of the flows
+        self.origin = float(packets.timestamps[to_server].min())
+
+        # only keep the responses to senders whose requests are replayed
+        from_server = np.flatnonzero((packets.src_ports == port) &
+                                     (packets.src_addresses == server_row).all(axis=1))
+        lookup = {address: i for i, address in enumerate(self.senders)}
+        response_senders = np.array([lookup.get(self._endpoint_key(row), -1)
+                                     for row in self._endpoints(from_server, 'dst')],
+                                    dtype=np.int64)
+        known = response_senders >= 0
+        self.responses = Flow(from_server[known], response_senders[known],
+                              packets.timestamps[from_server[known]] - self.origin)
+
+    def _server_address(self, to_port, server):
+        """
+        @return: bytes, 16 byte address of the server
+        """
+        if server is None:
+            rows, counts = np.unique(self.packets.dst_addresses[to_port], axis=0,
+                                     return_counts=True)
+            return bytes(rows[np.argmax(counts)])
+        address = ipaddress.ip_address(server)
+        if address.version == 4:
+            address = ipaddress.IPv6Address(f'::ffff:{address}')
+        return address.packed
+
+    @staticmethod
+    def _endpoint_key(row):
+        return bytes(row[:16]), int(row[16:].view(np.uint16)[0])
+
+    def _endpoints(self, index, side):
+        addresses = getattr(self.packets, f'{side}_addresses')[index]
+        ports = getattr(self.packets, f'{side}_ports')[index]
+        return np.hstack([addresses, ports[:, None].view(np.uint8)])
+
+    def _monotonic_times(self, index, senders):
+        """
+        Capture timestamps of different interfaces or CPUs may go backwards
+        slightly. Clamps them so that each sender's packets keep the order
+        of the capture file.
+        """
+        times = self.packets.timestamps[index] - self.packets.timestamps[index].min()
+        order = np.lexsort((index, senders))
+        # an offset per sender keeps the running maximum within each sender
+        offset = senders[order] * (times.max() + 1)
+        times[order] = np.maximum.accumulate(times[order] + offset) - offset
+        return times
+
+    def select(self, start, duration):
+        """
+        Restricts the replay to a time window of the capture. Afterwards,
+        all times are relative to `start`.
+
+        @param start: float, seconds after the first request
+        @param duration: float or None, seconds to replay
+        @return: int, number of setup messages replayed from before `start`
+        """
+        end = np.inf if duration is None else start + duration
+        requests, responses = self.requests, self.responses
+        keep = (requests.times >= start) & (requests.times < end)
+        if not keep.any():
+            raise ValueError('no packets to replay in the selected time window')
+        positions, times = self._setup_messages(requests.times < start, keep)
+        # the stable sort in Replayer.run() sends the setup messages after
+        # the audio packet with the same time
+        self.requests = Flow(np.concatenate([requests.index[keep], requests.index[positions]]),
+                             np.concatenate([requests.senders[keep],
+                                             requests.senders[positions]]),
+                             np.concatenate([requests.times[keep], times]) - start)
+        keep = responses.times >= start
+        self.responses = Flow(responses.index[keep], responses.senders[keep],
+                              responses.times[keep] - start)
+        self.origin += start
+        return len(positions)
+
+    def _setup_messages(self, before, keep):
+        """
+        Finds the last setup messages of the senders which connected before
+        the time window and sent audio in it. The server only accepts
+        protocol messages of connected channels, so they are sent at the
+        time of the first audio packet in the window. Warns about senders
+        whose transport properties are not in the capture at all.
+
+        @param before: bool array, requests before the time window
+        @param keep: bool array, requests in the time window
+        @return: (positions, times) arrays, positions of the messages in
+                 the requests and times at which to send them
+        """
+        requests = self.requests
+        frames = jp.FrameBatch(self.packets.buffer, self.packets.offsets[requests.index],
+                               self.packets.lengths[requests.index])
+        audio = np.flatnonzero(keep & ~frames.is_protocol)
+        senders, first = np.unique(requests.senders[audio], return_index=True)
+        first_audio = dict(zip(senders.tolist(), audio[first].tolist()))
+
+        last = {}
+        for position in np.flatnonzero(before & frames.is_protocol &
+                                       np.isin(frames.ids, SETUP_MESSAGE_IDS)).tolist():
+            last[int(requests.senders[position]), int(frames.ids[position])] = position
+        positions, times = [], []
+        # sorted by message ID, so the transport properties go first
+        for (sender, _), position in sorted(last.items()):
+            if sender in first_audio:
+                positions.append(position)
+                times.append(requests.times[first_audio[sender]])
+
+        senders = requests.senders[frames.is_protocol & (before | keep) &
+                                   (frames.ids == jp.PROTMESSID_NETW_TRANSPORT_PROPS)]
+        missing = set(first_audio) - set(senders.tolist())
+        if missing:
+            logger.warning('%d senders sent audio but no PROTMESSID_NETW_TRANSPORT_PROPS in the '
+                           'capture, e.g. because they connected before it started; the server '
+                           'drops their audio', len(missing))
+        return np.array(positions, dtype=np.int64), np.array(times)
+
+    def payload(self, index):
+        """
+        @return: bytes, UDP payload of packet `index`
+        """
+        start = self.packets.offsets[index]
+        return self.packets.buffer[start:start + self.packets.lengths[index]].tobytes()
+
+    def original_responses(self, until):
+        """
+        @param until: float, end of the time window to return
+        @return: list of Response, as sent by the server in the capture
+        """
+        return [Response(float(t), int(sender), self.payload(index))
+                for index, sender, t in zip(*self.responses) if t < until]
+
+
+class Replayer:
+    """
+    Sends the requests of a Capture to a server from one socket per sender
+    and collects the responses.
+    """
+
+    def __init__(self, capture, options):
+        """
+        @param capture: Capture
+        @param options: ReplayOptions
+        """
+        self.capture = capture
+        self.options = options
+        self.selector = selectors.DefaultSelector()
+        self.sockets = []
+        self.responses = []
+        self.lag = Histogram()
+        self.errors = collections.Counter()
+
+    def open(self, target):
+        """
+        Creates one connected, non-blocking socket per sender.
+
+        @param target: (host, port) of the local server
+        """
+        family, _, _, _, address = socket.getaddrinfo(*target, type=socket.SOCK_DGRAM)[0]
+        for index in range(len(self.capture.senders)):
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            sock.connect(address)
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ, index)
+            self.sockets.append(sock)
+
+    def close(self):
+        """
+        Closes all sockets.
+        """
+        for sock in self.sockets:
+            self.selector.unregister(sock)
+            sock.close()
+        self.sockets = []
+
+    def receive(self, timeout, start):
+        """
+        Waits up to `timeout` seconds and records all responses which arrived.
+        """
+        for key, _ in self.selector.select(timeout):
+            while True:
+                try:
+                    data = key.fileobj.recv(jp.MAX_SIZE_BYTES_NETW_BUF)
+                except BlockingIOError:
+                    break
+                except ConnectionRefusedError:
+                    self.errors['refused'] += 1
+                    break
+                self.responses.append(Response(time.perf_counter() - start, key.data, data))
+
+    def wait_until(self, deadline, start):
+        """
+        Receives responses until shortly before `deadline`, then spins.
+        """
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= self.options.spin:
+                break
+            self.receive(remaining - self.options.spin, start)
+        while time.perf_counter() < deadline:
+            pass
+
+    def run(self):
+        """
+        Replays all requests and waits --linger seconds for further responses.
+
+        @return: float, seconds the replay took
+        """
+        requests = self.capture.requests
+        order = np.argsort(requests.times, kind='stable')
+        speed = self.options.speed
+        start = time.perf_counter()
+        for count, i in enumerate(order):
+            if speed:
+                deadline = start + requests.times[i] / speed
+                self.wait_until(deadline, start)
+                self.lag.add(1000 * (time.perf_counter() - deadline))
+            else:
+                self.receive(0, start)
+            try:
+                payload = self.capture.payload(requests.index[i])
+                self.sockets[requests.senders[i]].send(payload)
+            except BlockingIOError:
+                self.errors['send_buffer_full'] += 1
+            except ConnectionRefusedError:
+                self.errors['refused'] += 1
+            if count and count % 100000 == 0:
+                logger.info('%d of %d packets sent', count, len(order))
+        elapsed = time.perf_counter() - start
+        self.wait_until(time.perf_counter() + self.options.linger, start)
+        # align the response times with the capture's time base
+        if speed:
+            self.responses = [r._replace(time=r.time * speed) for r in self.responses]
+        return elapsed
+
+
+def summarize(responses, senders):
+    """
+    @param responses: list of Response
+    @param senders: int, number of senders
+    @return: dict with message counts per type and packets per sender
+    """
+    payloads = b''.join(r.payload for r in responses)
+    lengths = np.array([len(r.payload) for r in responses], dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    batch = jp.FrameBatch(payloads or b'\0', offsets, lengths)
+    per_sender = np.bincount(np.array([r.sender for r in responses], dtype=np.int64),
+                             minlength=senders)
+    return {
+        'packets': len(responses),
+        'protocol_messages': int(batch.is_protocol.sum()),
+        'audio_packets': int((~batch.is_protocol).sum()),
+        'messages': {jp.message_name(k): v for k, v in sorted(batch.message_counts().items())},
+        'per_sender': per_sender.tolist(),
+    }
+
+
+def print_comparison(original, replay, file=sys.stdout):
+    """
+    Prints the message counts of the capture next to the ones of the replay.
+    """
+    print(f'{"":<34} {"capture":>10} {"replay":>10}', file=file)
+    for name in ('packets', 'protocol_messages', 'audio_packets'):
+        print(f'{name:<34} {original[name]:>10} {replay[name]:>10}', file=file)
+    for name in sorted(original['messages'].keys() | replay['messages'].keys()):
+        print(f'  {name:<32} {original["messages"].get(name, 0):>10} '
+              f'{replay["messages"].get(name, 0):>10}', file=file)
+    silent = [i for i, (a, b) in enumerate(zip(original['per_sender'], replay['per_sender']))
+              if a and not b]
+    if silent:
+        print(f'{len(silent)} senders received answers in the capture but not in the replay',
+              file=file)
+
+
+def write_responses(path, capture, responses):
+    """
+    Writes the responses as pcap, from the captured server address to the
+    captured sender addresses.
+    """
+    count = jp.write_udp_pcap(path, ((capture.origin + r.time, capture.server, capture.port,
+                                      *capture.senders[r.sender], r.payload)
+                                     for r in responses))
+    logger.info('wrote %d responses to %s', count, path)
+
+
+def main():
+    p = argparse.ArgumentParser(description='Replays captured Jamulus traffic to a server.')
+    p.add_argument('capture', help='pcap or pcapng file')
+    p.add_argument('--port', type=int, default=jp.DEFAULT_PORT_NUMBER,
+                   help='UDP port of the server in the capture')
+    p.add_argument('--server', help='address of the server in the capture '
+                                    '(default: the one which received most packets)')
+    p.add_argument('--target', type=parse_address, default=f'127.0.0.1:{jp.DEFAULT_PORT_NUMBER}',
+                   help='local server to replay to as HOST[:PORT]')
+    p.add_argument('--speed', type=float, default=1.0,
+                   help='replay speed relative to the capture, 0 for as fast as possible')
+    p.add_argument('--start', type=float, default=0.0,
+                   help='skip the first seconds of the capture')
+    p.add_argument('--duration', type=float, help='only replay this many seconds')
+    p.add_argument('--spin', type=float, default=1.0,
+                   help='milliseconds to busy-wait before each packet for accurate timing')
+    p.add_argument('--linger', type=float, default=2.0,
+                   help='seconds to keep receiving after the last packet was sent')
+    p.add_argument('--output', metavar='FILE', help='write the responses of the server as pcap')
+    p.add_argument('--json', metavar='FILE', help='write the results as JSON ("-" for stdout)')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+
+    require_numpy('indexing the capture')
+    if args.speed < 0:
+        p.error('--speed must not be negative')
+    try:
+        capture = Capture(args.capture, args.port, args.server)
+        injected = capture.select(args.start, args.duration)
+    except (OSError, ValueError) as e:
+        sys.exit(f'cannot read {args.capture}: {e}')
+    logger.info('replaying %d packets of %d senders (%.1f s of capture), %d setup messages '
+                'from before --start', len(capture.requests.index), len(capture.senders),
+                capture.requests.times.max(), injected)
+
+    replayer = Replayer(capture, ReplayOptions(args.speed, args.spin / 1000, args.linger))
+    try:
+        replayer.open(args.target)
+        elapsed = replayer.run()
+    except KeyboardInterrupt:
+        logger.info('interrupted')
+        elapsed = None
+    finally:
+        replayer.close()
+
+    until = capture.requests.times.max() + ANSWER_WINDOW
+    original = summarize(capture.original_responses(until), len(capture.senders))
+    # without --speed, the replay has its own time base
+    replay = summarize([r for r in replayer.responses if r.time < until or not args.speed],
+                       len(capture.senders))
+    print_comparison(original, replay, sys.stderr if args.json == '-' else sys.stdout)
+    if args.output:
+        write_responses(args.output, capture, replayer.responses)
+    write_json({
+        'capture': args.capture,
+        'server': f'{jp.format_address(capture.server)}:{capture.port}',
+        'target': f'{args.target[0]}:{args.target[1]}',
+        'speed': args.speed,
+        'senders': [f'{jp.format_address(address)}:{port}' for address, port in capture.senders],
+        'packets_sent': len(capture.requests.index),
+        'setup_messages_injected': injected,
+        'seconds': elapsed and round(elapsed, 3),
+        'send_lag_ms': replayer.lag.to_dict(),
+        'errors': dict(replayer.errors),
+        'original': original,
+        'replay': replay,
+    }, args.json)
+    if args.json != '-':
+        logger.info('send lag: %s', json.dumps(replayer.lag.to_dict()))
+
+
+if __name__ == '__main__':
+    main()
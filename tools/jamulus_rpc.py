@@ -0,0 +1,363 @@
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Asyncio runtime for talking to the Jamulus JSON-RPC server.
+
+A single RpcConnection keeps one persistent TCP connection open,
+authenticates it once using jamulus/apiAuth and then pipelines any number
+of concurrent requests over it, matching responses to callers by their
+`id`. Notifications pushed by Jamulus can be consumed via async iterators
+returned by RpcConnection.subscribe().
+
+The typed per-method wrappers live in jamulus_rpc_api.py, which is
+generated from the @rpc_method/@rpc_notification annotations by
+./tools/generate_json_rpc_docs.py.
+
+Usage:
+
+    secret = read_secret_file('/file/with/a/secret.txt')
+    async with JamulusRpcClient('127.0.0.1', 22100, secret) as rpc:
+        clients = await rpc.jamulusserver.get_clients()
+
+"""
+
+import asyncio
+import collections
+import itertools
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# see CRpcServer in src/rpcserver.h
+ERR_INVALID_REQUEST = -32600
+ERR_METHOD_NOT_FOUND = -32601
+ERR_INVALID_PARAMS = -32602
+ERR_PARSE_ERROR = -32700
+ERR_AUTHENTICATION_FAILED = 400
+ERR_UNAUTHENTICATED = 401
+
+# Responses can become large (e.g. jamulusserver/getClients with many
+# clients), so allow long lines on the stream reader:
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+class JsonRpcError(RuntimeError):
+    """
+    Exception which is raised when Jamulus answers a request with an error
+    object.
+    """
+
+    def __init__(self, code, message, data=None):
+        super().__init__(f'{message} (code {code})')
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+def read_secret_file(path):
+    """
+    Reads the secret as passed to Jamulus via --jsonrpcsecretfile.
+    """
+    with open(path, 'r') as f:
+        return f.readline().strip()
+
+
+class Subscription:
+    """
+    Async iterator over the params of received notifications.
+
+    The queue is bounded: if the consumer falls behind, the oldest
+    notifications are discarded and counted in `dropped`.
+    """
+
+    def __init__(self, connection, methods, maxsize):
+        self._connection = connection
+        self.methods = methods
+        self._queue = collections.deque(maxlen=maxsize or None)
+        self._event = asyncio.Event()
+        self._closed = False
+        self.dropped = 0
+
+    def _push(self, method, params):
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append((method, params))
+        self._event.set()
+
+    def close(self):
+        """
+        Stops the subscription. Pending iterations end after the queue is
+        drained.
+        """
+        if not self._closed:
+            self._closed = True
+            self._connection._unsubscribe(self)  # pylint: disable=protected-access
+            self._event.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._queue:
+            if self._closed:
+                raise StopAsyncIteration
+            self._event.clear()
+            await self._event.wait()
+        return self._queue.popleft()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RpcConnection:  # pylint: disable=too-many-instance-attributes
+    """
+    One persistent, authenticated and pipelined JSON-RPC connection.
+    """
+
+    def __init__(self, host, port, secret=None, timeout=10.0):
+        """
+        @param host: str, address of the Jamulus JSON-RPC server
+        @param port: int, as passed to --jsonrpcport
+        @param secret: str, see read_secret_file(); None skips authentication
+        @param timeout: float, seconds to wait for connection and each response
+        """
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._subscriptions = []
+
+    @property
+    def connected(self):
+        """
+        @return: bool, True while the connection is open
+        """
+        return self._reader_task is not None and not self._reader_task.done()
+
+    async def connect(self):
+        """
+        Opens the TCP connection and authenticates it if a secret is known.
+        """
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, limit=STREAM_LIMIT),
+            self.timeout)
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+        if self.secret is not None:
+            try:
+                await self.call('jamulus/apiAuth', {'secret': self.secret})
+            except (JsonRpcError, ConnectionError, asyncio.TimeoutError):
+                await self.close()
+                raise
+        logger.debug('connected to %s:%s', self.host, self.port)
+
+    async def close(self):
+        """
+        Closes the connection. Outstanding requests fail with ConnectionError.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+        self._writer = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _new_request(self, method, params):
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        request = {'id': request_id, 'jsonrpc': '2.0', 'method': method,
+                   'params': params if params is not None else {}}
+        return request, future
+
+    async def _send(self, payload):
+        if self._writer is None or not self.connected:
+            raise ConnectionError(f'not connected to {self.host}:{self.port}')
+        self._writer.write(json.dumps(payload, separators=(',', ':')).encode() + b'\n')
+        await self._writer.drain()
+
+    async def _wait(self, futures, return_exceptions=False):
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*futures, return_exceptions=return_exceptions), self.timeout)
+        finally:
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+
+    async def call(self, method, params=None):
+        """
+        Sends a request and waits for its result. Any number of calls can
+        be awaited concurrently; they share the connection.
+
+        @param method: str, e.g. jamulusserver/getClients
+        @param params: dict or None
+        @return: the `result` member of the response
+        @raise JsonRpcError: if Jamulus returned an error object
+        """
+        request, future = self._new_request(method, params)
+        try:
+            await self._send(request)
+            return (await self._wait([future]))[0]
+        finally:
+            self._pending.pop(request['id'], None)
+
+    async def call_batch(self, calls, return_exceptions=False):
+        """
+        Sends several requests as one JSON-RPC batch array.
+
+        @param calls: iterable of (method, params) tuples
+        @param return_exceptions: bool, return the JsonRpcError of failed
+                                  requests in place of their result
+        @return: list of results in the order of `calls`
+        @raise JsonRpcError: for the first request which failed, unless
+                             return_exceptions is set
+        """
+        requests, futures = [], []
+        for method, params in calls:
+            request, future = self._new_request(method, params)
+            requests.append(request)
+            futures.append(future)
+        if not requests:
+            return []
+        try:
+            await self._send(requests)
+            return await self._wait(futures, return_exceptions)
+        finally:
+            for request in requests:
+                self._pending.pop(request['id'], None)
+
+    def subscribe(self, *methods, maxsize=1000):
+        """
+        Returns an async iterator yielding (method, params) tuples for each
+        received notification. Without any `methods` all notifications are
+        delivered.
+
+        @param methods: str, notification names such as jamulusclient/chatTextReceived
+        @param maxsize: int, number of buffered notifications (0 for unbounded)
+        """
+        subscription = Subscription(self, frozenset(methods), maxsize)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def _dispatch(self, message):
+        if not isinstance(message, dict):
+            logger.warning('ignoring unexpected message %r', message)
+            return
+        if 'method' in message and 'id' not in message:
+            method = message['method']
+            params = message.get('params', {})
+            for subscription in self._subscriptions:
+                if not subscription.methods or method in subscription.methods:
+                    subscription._push(method, params)  # pylint: disable=protected-access
+            return
+        future = self._pending.pop(message.get('id'), None)
+        if future is None:
+            error = message.get('error')
+            if error:
+                logger.warning('received error without matching request: %s', error)
+            return
+        if future.done():
+            return
+        if 'error' in message:
+            error = message['error']
+            future.set_exception(JsonRpcError(error.get('code'), error.get('message'),
+                                              error.get('data')))
+        else:
+            future.set_result(message.get('result'))
+
+    async def _read_loop(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.warning('received invalid JSON: %r', line[:200])
+                    continue
+                for item in message if isinstance(message, list) else [message]:
+                    self._dispatch(item)
+        except (ConnectionError, OSError) as e:
+            logger.debug('connection to %s:%s failed: %s', self.host, self.port, e)
+        except ValueError as e:
+            # a line longer than STREAM_LIMIT, the stream cannot be resynchronized
+            logger.warning('closing connection to %s:%s: %s', self.host, self.port, e)
+            self._writer.close()
+        finally:
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError(f'connection to {self.host}:{self.port} closed'))
+            for subscription in list(self._subscriptions):
+                subscription.close()
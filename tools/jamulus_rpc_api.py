@@ -0,0 +1,682 @@
+##############################################################################
+# This file is automatically generated from the source code.
+# Do not edit this file manually.
+# See `tools/generate_json_rpc_docs.py` for details.
+##############################################################################
+
+"""
+Typed asyncio client for the Jamulus JSON-RPC API.
+
+See jamulus_rpc.py for the connection handling and docs/JSON-RPC.md for the
+reference documentation.
+"""
+
+# pylint: disable=too-many-public-methods
+
+from typing import Any, Dict, List, Optional, TypedDict, Union
+
+from jamulus_rpc import (JsonRpcError, RpcConnection,  # pylint: disable=unused-import
+                         Subscription, read_secret_file)
+
+Number = Union[int, float]
+
+JamulusGetModeResult = TypedDict(
+    'JamulusGetModeResult',
+    {
+        'mode': str,
+    },
+    total=False,
+)
+
+JamulusGetVersionResult = TypedDict(
+    'JamulusGetVersionResult',
+    {
+        'version': str,
+    },
+    total=False,
+)
+
+JamulusclientChannelLevelListReceivedParams = TypedDict(
+    'JamulusclientChannelLevelListReceivedParams',
+    {
+        'channelLevelList': List[Number],
+    },
+    total=False,
+)
+
+JamulusclientChatTextReceivedParams = TypedDict(
+    'JamulusclientChatTextReceivedParams',
+    {
+        'chatText': str,
+    },
+    total=False,
+)
+
+JamulusclientClientListReceivedParamsClientsItem = TypedDict(
+    'JamulusclientClientListReceivedParamsClientsItem',
+    {
+        'id': Number,
+        'name': str,
+        'skillLevel': str,
+        'countryId': Number,
+        'country': str,
+        'city': str,
+        'instrumentId': Number,
+        'instrument': str,
+    },
+    total=False,
+)
+
+JamulusclientClientListReceivedParams = TypedDict(
+    'JamulusclientClientListReceivedParams',
+    {
+        'clients': List[JamulusclientClientListReceivedParamsClientsItem],
+    },
+    total=False,
+)
+
+JamulusclientConnectedParams = TypedDict(
+    'JamulusclientConnectedParams',
+    {
+        'id': Number,
+    },
+    total=False,
+)
+
+JamulusclientGetChannelInfoResult = TypedDict(
+    'JamulusclientGetChannelInfoResult',
+    {
+        'id': Number,
+        'name': str,
+        'skillLevel': str,
+        'countryId': Number,
+        'country': str,
+        'city': str,
+        'instrumentId': Number,
+        'instrument': str,
+    },
+    total=False,
+)
+
+JamulusclientGetClientInfoResult = TypedDict(
+    'JamulusclientGetClientInfoResult',
+    {
+        'connected': bool,
+    },
+    total=False,
+)
+
+JamulusclientGetClientListResult = TypedDict(
+    'JamulusclientGetClientListResult',
+    {
+        'clients': List[Any],
+    },
+    total=False,
+)
+
+JamulusclientRecorderStateParams = TypedDict(
+    'JamulusclientRecorderStateParams',
+    {
+        'state': Number,
+    },
+    total=False,
+)
+
+JamulusclientServerInfoReceivedParams = TypedDict(
+    'JamulusclientServerInfoReceivedParams',
+    {
+        'address': str,
+        'pingtime': Number,
+        'numClients': Number,
+    },
+    total=False,
+)
+
+JamulusclientServerListReceivedParamsServersItem = TypedDict(
+    'JamulusclientServerListReceivedParamsServersItem',
+    {
+        'address': str,
+        'name': str,
+        'countryId': Number,
+        'country': str,
+        'city': str,
+    },
+    total=False,
+)
+
+JamulusclientServerListReceivedParams = TypedDict(
+    'JamulusclientServerListReceivedParams',
+    {
+        'servers': List[JamulusclientServerListReceivedParamsServersItem],
+    },
+    total=False,
+)
+
+JamulusserverChatMessageReceivedParams = TypedDict(
+    'JamulusserverChatMessageReceivedParams',
+    {
+        'id': Number,
+        'chatMessage': str,
+    },
+    total=False,
+)
+
+JamulusserverClientConnectedParams = TypedDict(
+    'JamulusserverClientConnectedParams',
+    {
+        'id': Number,
+        'address': str,
+        'totalChannels': Number,
+    },
+    total=False,
+)
+
+JamulusserverClientDisconnectedParams = TypedDict(
+    'JamulusserverClientDisconnectedParams',
+    {
+        'id': Number,
+    },
+    total=False,
+)
+
+JamulusserverGetClientsResultClientsItem = TypedDict(
+    'JamulusserverGetClientsResultClientsItem',
+    {
+        'id': Number,
+        'address': str,
+        'name': str,
+        'jitterBufferSize': Number,
+        'channels': Number,
+        'instrumentCode': Number,
+        'city': str,
+        'countryName': Number,
+        'skillLevelCode': Number,
+    },
+    total=False,
+)
+
+JamulusserverGetClientsResult = TypedDict(
+    'JamulusserverGetClientsResult',
+    {
+        'connections': Number,
+        'clients': List[JamulusserverGetClientsResultClientsItem],
+    },
+    total=False,
+)
+
+JamulusserverGetRecorderStatusResult = TypedDict(
+    'JamulusserverGetRecorderStatusResult',
+    {
+        'initialised': bool,
+        'errorMessage': str,
+        'enabled': bool,
+        'recordingDirectory': str,
+    },
+    total=False,
+)
+
+JamulusserverGetServerProfileResult = TypedDict(
+    'JamulusserverGetServerProfileResult',
+    {
+        'name': str,
+        'city': str,
+        'countryId': Number,
+        'welcomeMessage': str,
+        'directoryType': str,
+        'directoryAddress': str,
+        'directory': str,
+        'registrationStatus': str,
+    },
+    total=False,
+)
+
+class JamulusMethods:
+    """
+    Methods and notifications of the jamulus/ namespace.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    async def get_mode(self) -> JamulusGetModeResult:
+        """
+        jamulus/getMode: Returns the current mode, i.e. whether Jamulus is running as a
+        server or client.
+        """
+        return await self._connection.call('jamulus/getMode', {})
+
+    async def get_version(self) -> JamulusGetVersionResult:
+        """
+        jamulus/getVersion: Returns Jamulus version.
+        """
+        return await self._connection.call('jamulus/getVersion', {})
+
+class JamulusclientMethods:
+    """
+    Methods and notifications of the jamulusclient/ namespace.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def subscribe_channel_level_list_received(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusclient/channelLevelListReceived: Emitted when the channel level list is
+        received.
+
+        @return: Subscription yielding (method, params) tuples, params being
+        JamulusclientChannelLevelListReceivedParams
+        """
+        return self._connection.subscribe(
+            'jamulusclient/channelLevelListReceived', maxsize=maxsize)
+
+    def subscribe_chat_text_received(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusclient/chatTextReceived: Emitted when a chat text is received.
+
+        @return: Subscription yielding (method, params) tuples, params being
+        JamulusclientChatTextReceivedParams
+        """
+        return self._connection.subscribe(
+            'jamulusclient/chatTextReceived', maxsize=maxsize)
+
+    def subscribe_client_list_received(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusclient/clientListReceived: Emitted when the client list is received.
+
+        @return: Subscription yielding (method, params) tuples, params being
+        JamulusclientClientListReceivedParams
+        """
+        return self._connection.subscribe(
+            'jamulusclient/clientListReceived', maxsize=maxsize)
+
+    def subscribe_connected(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusclient/connected: Emitted when the client is connected to the server.
+
+        @return: Subscription yielding (method, params) tuples, params being
+        JamulusclientConnectedParams
+        """
+        return self._connection.subscribe(
+            'jamulusclient/connected', maxsize=maxsize)
+
+    def subscribe_disconnected(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusclient/disconnected: Emitted when the client is disconnected from the
+        server.
+
+        @return: Subscription yielding (method, params) tuples, params being Dict[str, Any]
+        """
+        return self._connection.subscribe(
+            'jamulusclient/disconnected', maxsize=maxsize)
+
+    async def get_channel_info(self) -> JamulusclientGetChannelInfoResult:
+        """
+        jamulusclient/getChannelInfo: Returns the client's profile information.
+        """
+        return await self._connection.call('jamulusclient/getChannelInfo', {})
+
+    async def get_client_info(self) -> JamulusclientGetClientInfoResult:
+        """
+        jamulusclient/getClientInfo: Returns the client information.
+        """
+        return await self._connection.call('jamulusclient/getClientInfo', {})
+
+    async def get_client_list(self) -> JamulusclientGetClientListResult:
+        """
+        jamulusclient/getClientList: Returns the client list.
+        """
+        return await self._connection.call('jamulusclient/getClientList', {})
+
+    async def get_current_directory(self) -> str:
+        """
+        jamulusclient/getCurrentDirectory: Returns the currently selected directory socket
+        address.
+
+        @return: The socket address of the current directory, usable as params.directory in
+        jamulusclient/pollServerList.
+        """
+        return await self._connection.call('jamulusclient/getCurrentDirectory', {})
+
+    async def get_midi_devices(self) -> List[Any]:
+        """
+        jamulusclient/getMidiDevices: Returns a list of available MIDI input devices.
+
+        @return: Array of MIDI device name strings.
+        """
+        return await self._connection.call('jamulusclient/getMidiDevices', {})
+
+    async def get_midi_settings(self) -> Dict[str, Any]:
+        """
+        jamulusclient/getMidiSettings: Returns all MIDI controller settings.
+
+        @return: MIDI settings object.
+        """
+        return await self._connection.call('jamulusclient/getMidiSettings', {})
+
+    async def poll_server_list(self, directory: str) -> str:
+        """
+        jamulusclient/pollServerList: Request list of servers in a directory.
+
+        @param directory: Socket address of directory to query. Example:
+        anygenre1.jamulus.io:22124
+
+        @return: "ok" or "error" if bad arguments.
+        """
+        params = {
+            'directory': directory,
+        }
+        return await self._connection.call('jamulusclient/pollServerList', params)
+
+    def subscribe_recorder_state(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusclient/recorderState: Emitted when the client is connected to a server whose
+        recorder state changes.
+
+        @return: Subscription yielding (method, params) tuples, params being
+        JamulusclientRecorderStateParams
+        """
+        return self._connection.subscribe(
+            'jamulusclient/recorderState', maxsize=maxsize)
+
+    async def send_chat_text(self, chat_text: str) -> str:
+        """
+        jamulusclient/sendChatText: Sends a chat text message.
+
+        @param chat_text: The chat text message.
+
+        @return: Always "ok".
+        """
+        params = {
+            'chatText': chat_text,
+        }
+        return await self._connection.call('jamulusclient/sendChatText', params)
+
+    def subscribe_server_info_received(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusclient/serverInfoReceived: Emitted when a server info is received.
+
+        @return: Subscription yielding (method, params) tuples, params being
+        JamulusclientServerInfoReceivedParams
+        """
+        return self._connection.subscribe(
+            'jamulusclient/serverInfoReceived', maxsize=maxsize)
+
+    def subscribe_server_list_received(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusclient/serverListReceived: Emitted when the server list is received.
+
+        @return: Subscription yielding (method, params) tuples, params being
+        JamulusclientServerListReceivedParams
+        """
+        return self._connection.subscribe(
+            'jamulusclient/serverListReceived', maxsize=maxsize)
+
+    async def set_fader_level(self, channel_index: Number, level: Number) -> str:
+        """
+        jamulusclient/setFaderLevel: Sets the fader level. Example: {"id":1,"jsonrpc":"2.0"
+        ,"method":"jamulusclient/setFaderLevel","params":{"channelIndex": 0,"level": 50}}.
+
+        @param channel_index: The channel index of the fader to be set.
+        @param level: The fader level in range 0..100.
+
+        @return: Always "ok".
+        """
+        params = {
+            'channelIndex': channel_index,
+            'level': level,
+        }
+        return await self._connection.call('jamulusclient/setFaderLevel', params)
+
+    async def set_instrument_code(self, instr_code: Number) -> str:
+        """
+        jamulusclient/setInstrumentCode: Sets your instrument code.
+
+        @param instr_code: The new instrument code.
+
+        @return: Always "ok".
+        """
+        params = {
+            'instrCode': instr_code,
+        }
+        return await self._connection.call('jamulusclient/setInstrumentCode', params)
+
+    async def set_midi_settings(self, params: Dict[str, Any]) -> str:
+        """
+        jamulusclient/setMidiSettings: Sets one or more MIDI controller settings.
+
+        @param params: Any subset of MIDI settings fields to set.
+
+        @return: Always "ok".
+        """
+        return await self._connection.call('jamulusclient/setMidiSettings', params)
+
+    async def set_muted(self, muted: bool) -> str:
+        """
+        jamulusclient/setMuted: Mutes or unmutes the client.
+
+        @param muted: muted (true or false).
+
+        @return: Always "ok".
+        """
+        params = {
+            'muted': muted,
+        }
+        return await self._connection.call('jamulusclient/setMuted', params)
+
+    async def set_name(self, name: str) -> str:
+        """
+        jamulusclient/setName: Sets your name.
+
+        @param name: The new name.
+
+        @return: Always "ok".
+        """
+        params = {
+            'name': name,
+        }
+        return await self._connection.call('jamulusclient/setName', params)
+
+    async def set_skill_level(self, skill_level: str) -> str:
+        """
+        jamulusclient/setSkillLevel: Sets your skill level.
+
+        @param skill_level: The new skill level (beginner, intermediate, expert, or null).
+
+        @return: Always "ok".
+        """
+        params = {
+            'skillLevel': skill_level,
+        }
+        return await self._connection.call('jamulusclient/setSkillLevel', params)
+
+class JamulusserverMethods:
+    """
+    Methods and notifications of the jamulusserver/ namespace.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    async def broadcast_chat_message(self, chat_message: str) -> str:
+        """
+        jamulusserver/broadcastChatMessage: Sends a message (as the server) to all
+        connected clients. This can be used to broadcast messages from external sources
+        (e.g. scripts or monitoring tools).
+
+        @param chat_message: The chat message text.
+
+        @return: Always "ok".
+        """
+        params = {
+            'chatMessage': chat_message,
+        }
+        return await self._connection.call('jamulusserver/broadcastChatMessage', params)
+
+    def subscribe_chat_message_received(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusserver/chatMessageReceived: Emitted when a chat message is received from
+        either a Jamulus or RPC client and to be broadcast to all connected clients.
+
+        @return: Subscription yielding (method, params) tuples, params being
+        JamulusserverChatMessageReceivedParams
+        """
+        return self._connection.subscribe(
+            'jamulusserver/chatMessageReceived', maxsize=maxsize)
+
+    def subscribe_client_connected(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusserver/clientConnected: Emitted when a client has connected to the server.
+
+        @return: Subscription yielding (method, params) tuples, params being
+        JamulusserverClientConnectedParams
+        """
+        return self._connection.subscribe(
+            'jamulusserver/clientConnected', maxsize=maxsize)
+
+    def subscribe_client_disconnected(self, maxsize: int = 1000) -> Subscription:
+        """
+        jamulusserver/clientDisconnected: Emitted when a client has disconnected from the
+        server.
+
+        @return: Subscription yielding (method, params) tuples, params being
+        JamulusserverClientDisconnectedParams
+        """
+        return self._connection.subscribe(
+            'jamulusserver/clientDisconnected', maxsize=maxsize)
+
+    async def get_clients(self) -> JamulusserverGetClientsResult:
+        """
+        jamulusserver/getClients: Returns the list of connected clients along with details
+        about them.
+        """
+        return await self._connection.call('jamulusserver/getClients', {})
+
+    async def get_recorder_status(self) -> JamulusserverGetRecorderStatusResult:
+        """
+        jamulusserver/getRecorderStatus: Returns the recorder state.
+        """
+        return await self._connection.call('jamulusserver/getRecorderStatus', {})
+
+    async def get_server_profile(self) -> JamulusserverGetServerProfileResult:
+        """
+        jamulusserver/getServerProfile: Returns the server registration profile and status.
+        """
+        return await self._connection.call('jamulusserver/getServerProfile', {})
+
+    async def private_chat_message(self, chat_message: str, id_: Number) -> str:
+        """
+        jamulusserver/privateChatMessage: Sends a chat message to a single connected
+        client.
+
+        @param chat_message: The chat message text.
+        @param id_: The client's channel id.
+
+        @return: "ok" or "error" if bad arguments.
+        """
+        params = {
+            'chatMessage': chat_message,
+            'id': id_,
+        }
+        return await self._connection.call('jamulusserver/privateChatMessage', params)
+
+    async def restart_recording(self) -> str:
+        """
+        jamulusserver/restartRecording: Restarts the recording into a new directory.
+
+        @return: Always "acknowledged". To check if the recording was restarted or if there
+        is any error, call `jamulusserver/getRecorderStatus` again.
+        """
+        return await self._connection.call('jamulusserver/restartRecording', {})
+
+    async def set_directory(
+            self,
+            directory_type: str,
+            directory_address: Optional[str] = None) -> str:
+        """
+        jamulusserver/setDirectory: Set the directory type and, for custom, the directory
+        address.
+
+        @param directory_type: The directory type as a string (see EDirectoryType and
+        DeserializeDirectoryType).
+        @param directory_address: (optional) The directory address, required if
+        `directoryType` is "custom".
+
+        @return: Always "ok".
+        """
+        params = {
+            'directoryType': directory_type,
+        }
+        if directory_address is not None:
+            params['directoryAddress'] = directory_address
+        return await self._connection.call('jamulusserver/setDirectory', params)
+
+    async def set_recording_directory(self, recording_directory: str) -> str:
+        """
+        jamulusserver/setRecordingDirectory: Sets the server recording directory.
+
+        @param recording_directory: The new recording directory.
+
+        @return: Always "acknowledged". To check if the directory was changed, call
+        `jamulusserver/getRecorderStatus` again.
+        """
+        params = {
+            'recordingDirectory': recording_directory,
+        }
+        return await self._connection.call('jamulusserver/setRecordingDirectory', params)
+
+    async def set_server_name(self, server_name: str) -> str:
+        """
+        jamulusserver/setServerName: Sets the server name.
+
+        @param server_name: The new server name.
+
+        @return: Always "ok".
+        """
+        params = {
+            'serverName': server_name,
+        }
+        return await self._connection.call('jamulusserver/setServerName', params)
+
+    async def set_welcome_message(self, welcome_message: str) -> str:
+        """
+        jamulusserver/setWelcomeMessage: Sets the server welcome message.
+
+        @param welcome_message: The new welcome message.
+
+        @return: Always "ok".
+        """
+        params = {
+            'welcomeMessage': welcome_message,
+        }
+        return await self._connection.call('jamulusserver/setWelcomeMessage', params)
+
+    async def start_recording(self) -> str:
+        """
+        jamulusserver/startRecording: Starts the server recording.
+
+        @return: Always "acknowledged". To check if the recording was enabled, call
+        `jamulusserver/getRecorderStatus` again.
+        """
+        return await self._connection.call('jamulusserver/startRecording', {})
+
+    async def stop_recording(self) -> str:
+        """
+        jamulusserver/stopRecording: Stops the server recording.
+
+        @return: Always "acknowledged". To check if the recording was disabled, call
+        `jamulusserver/getRecorderStatus` again.
+        """
+        return await self._connection.call('jamulusserver/stopRecording', {})
+
+class JamulusRpcClient(RpcConnection):
+    """
+    RpcConnection with typed wrappers for all documented methods and
+    notifications, grouped by namespace.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jamulus = JamulusMethods(self)
+        self.jamulusclient = JamulusclientMethods(self)
+        self.jamulusserver = JamulusserverMethods(self)
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Throughput and latency benchmark for the JSON-RPC server which Jamulus
+embeds when started with --jsonrpcport.
+
+The benchmark either starts its own headless server (--jamulus) or attaches
+to a running one (--rpc). It then runs every combination of --concurrency
+and --batch-size for --duration seconds. Each of the concurrent connections
+sends its next request (or batch array of --batch-size requests) as soon as
+the previous one was answered. The methods are drawn at random from a
+weighted mix. By default this is every read-only jamulus/ and jamulusserver/
+method of the catalogue which generate_json_rpc_docs.py extracts from the
+source code.
+
+To see whether RPC load disturbs the audio path, jamulus_load_test.py runs
+alongside every scenario with --audio-clients synthetic clients and records
+the inter-arrival time of the audio packets which the server sends back.
+One baseline run without RPC load precedes the scenarios. The probe runs
+in its own process so that the load generator does not delay it.
+
+The results are written as JSON, together with the version and commit of
+the benchmarked server (from the --version output of the --jamulus binary
+or from jamulus/getVersion with --rpc), so that runs on different commits
+can be compared with the `compare` command.
+
+Usage:
+./tools/jamulus_rpc_bench.py run --jamulus ./Jamulus --concurrency 1,8,32 --batch-size 1,20 \
+    --json bench-$(git rev-parse --short HEAD).json
+./tools/jamulus_rpc_bench.py run --rpc 127.0.0.1:8765:/path/to/secret.txt --server 127.0.0.1 \
+    --method jamulusserver/getClients=3 --method jamulus/getVersion
+./tools/jamulus_rpc_bench.py compare bench-old.json bench-new.json
+
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import re
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import jamulus_protocol as jp
+from jamulus_common import Histogram, exit_on_error, parse_address, write_json
+from jamulus_rpc import JsonRpcError, RpcConnection, read_secret_file
+from jamulus_rpc_poller import check_methods, method_catalogue, parse_server_spec
+
+logger = logging.getLogger('')
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+LOAD_TEST = os.path.join(TOOLS_DIR, 'jamulus_load_test.py')
+
+JSON_RPC_MINIMUM_SECRET_LENGTH = 16  # see src/global.h
+
+SERVER_STARTUP_TIMEOUT = 10.0
+
+# see GetVersionAndNameStr in src/util.cpp and VERSION in Jamulus.pro
+VERSION_RE = re.compile(r'Version (\S+)')
+
+
+def default_method_mix():
+    """
+    @return: dict of method name to weight with all read-only methods which
+             a server answers without parameters
+    """
+    names = [name for name in method_catalogue()
+             if name.split('/')[0] in ('jamulus', 'jamulusserver')
+             and name.split('/')[1].startswith('get')]
+    check_methods(names)
+    return {name: 1.0 for name in sorted(names)}
+
+
+def parse_method_weight(text):
+    """
+    @param text: str, METHOD or METHOD=WEIGHT
+    @return: (method, weight) tuple
+    """
+    method, _, weight = text.partition('=')
+    try:
+        weight = float(weight) if weight else 1.0
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid weight in {text!r}') from None
+    if weight <= 0:
+        raise argparse.ArgumentTypeError(f'weight of {method} must be positive')
+    return method, weight
+
+
+def parse_int_list(text):
+    """
+    @param text: str, comma separated positive integers
+    @return: list of int
+    """
+    try:
+        values = [int(value) for value in text.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid list {text!r}') from None
+    if any(value < 1 for value in values):
+        raise argparse.ArgumentTypeError(f'values in {text!r} must be positive')
+    return values
+
+
+def split_version(version):
+    """
+    @param version: str, Jamulus version, e.g. 3.11.0 or for intermediate
+                    builds VERSION-COMMIT[-dirty], optionally followed by
+                    :BUILD_TIME
+    @return: (commit, version) tuple; the commit is the one of intermediate
+             builds or the version itself
+    """
+    # without the build time, which contains spaces
+    version = version.partition(':')[0]
+    _, sep, description = version.partition('-')
+    if not sep or description == 'nogit':
+        return version, version
+    return description, version
+
+
+def binary_version(path):
+    """
+    @param path: str, Jamulus executable
+    @return: (commit, version) tuple, see split_version()
+    """
+    output = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=30,
+                            check=False).stdout
+    match = VERSION_RE.search(output)
+    if match is None:
+        raise RuntimeError(f'cannot determine the version of {path}')
+    return split_version(match.group(1))
+
+
+async def server_version(rpc, secret):
+    """
+    @param rpc: (host, port) of the JSON-RPC server
+    @return: (commit, version) tuple, see split_version()
+    """
+    async with RpcConnection(*rpc, secret=secret) as connection:
+        return split_version((await connection.call('jamulus/getVersion'))['version'])
+
+
+def free_port(kind):
+    """
+    @param kind: socket.SOCK_STREAM or socket.SOCK_DGRAM
+    @return: int, a currently unused local port
+    """
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """
+    A headless Jamulus server with the JSON-RPC API enabled on free ports
+    and a random secret.
+    """
+
+    def __init__(self, binary, extra_args):
+        """
+        @param binary: str, path of the Jamulus executable
+        @param extra_args: list of str, further command line options
+        """
+        self.binary = binary
+        self.extra_args = extra_args
+        self.process = None
+        self.secret_file = None
+        self.rpc = None
+        self.audio = None
+
+    def start(self):
+        """
+        Starts the server and returns once the JSON-RPC port accepts connections.
+
+        @return: str, the secret
+        """
+        secret = secrets.token_hex(JSON_RPC_MINIMUM_SECRET_LENGTH)
+        with tempfile.NamedTemporaryFile('w', prefix='jamulus-rpc-bench-', suffix='.txt',
+                                         delete=False) as f:
+            f.write(secret + '\n')
+            self.secret_file = f.name
+        self.rpc = ('127.0.0.1', free_port(socket.SOCK_STREAM))
+        self.audio = ('127.0.0.1', free_port(socket.SOCK_DGRAM))
+        cmd = [self.binary, '--nogui', '--server', '--port', str(self.audio[1]),
+               '--jsonrpcport', str(self.rpc[1]), '--jsonrpcsecretfile', self.secret_file,
+               *self.extra_args]
+        logger.info('starting %s', ' '.join(cmd))
+        self.process = subprocess.Popen(  # pylint: disable=consider-using-with
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT
+        while True:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'{self.binary} exited with {self.process.returncode}')
+            try:
+                socket.create_connection(self.rpc, timeout=1).close()
+                return secret
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f'{self.binary} did not open its JSON-RPC port') from None
+                time.sleep(0.1)
+
+    def stop(self):
+        """
+        Terminates the server and removes the secret file.
+        """
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self.secret_file is not None:
+            os.unlink(self.secret_file)
+            self.secret_file = None
+
+
+class Scenario:
+    """
+    One benchmark run with a fixed number of connections and batch size.
+    """
+
+    def __init__(self, concurrency, batch_size, methods, seed):
+        """
+        @param concurrency: int, number of connections with one outstanding request each
+        @param batch_size: int, requests per round trip (1 sends single objects)
+        @param methods: dict of method name to weight
+        @param seed: int, for the random method selection
+        """
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.methods = methods
+        self.random = random.Random(seed)
+        self.latency = Histogram()
+        self.counts = {'requests': 0, 'errors': 0, 'failed_connections': 0}
+        self.measuring = False
+
+    async def worker(self, connection, end):
+        """
+        Sends requests back to back on one connection until `end`.
+        """
+        loop = asyncio.get_running_loop()
+        names, weights = list(self.methods), list(self.methods.values())
+        while loop.time() < end:
+            calls = [(name, None) for name in self.random.choices(names, weights,
+                                                                   k=self.batch_size)]
+            start = time.perf_counter()
+            try:
+                if self.batch_size == 1:
+                    results = [await connection.call(*calls[0])]
+                else:
+                    results = await connection.call_batch(calls, return_exceptions=True)
+            except JsonRpcError as e:
+                results = [e]
+            except (ConnectionError, asyncio.TimeoutError) as e:
+                logger.warning('connection %s:%s failed: %s', connection.host, connection.port,
+                               e or type(e).__name__)
+                self.counts['failed_connections'] += 1
+                return
+            if self.measuring:
+                self.latency.add(1000 * (time.perf_counter() - start))
+                self.counts['requests'] += len(calls)
+                self.counts['errors'] += sum(isinstance(r, JsonRpcError) for r in results)
+
+    async def run(self, rpc, secret, warmup, duration):
+        """
+        @param rpc: (host, port) of the JSON-RPC server
+        @param secret: str, for jamulus/apiAuth
+        @param warmup: float, seconds to run before measuring
+        @param duration: float, seconds to measure
+        """
+        loop = asyncio.get_running_loop()
+        connections = [RpcConnection(*rpc, secret=secret) for _ in range(self.concurrency)]
+        await asyncio.gather(*(c.connect() for c in connections))
+        try:
+            end = loop.time() + warmup + duration
+            workers = asyncio.gather(*(self.worker(c, end) for c in connections))
+            await asyncio.sleep(warmup)
+            self.measuring = True
+            started = loop.time()
+            await workers
+            self.measuring = False
+            return loop.time() - started
+        finally:
+            await asyncio.gather(*(c.close() for c in connections))
+
+    def results(self, elapsed):
+        """
+        @param elapsed: float, measured seconds
+        @return: dict, suitable for JSON
+        """
+        return {
+            'concurrency': self.concurrency,
+            'batch_size': self.batch_size,
+            'seconds': round(elapsed, 3),
+            **self.counts,
+            'requests_per_second': round(self.counts['requests'] / elapsed, 1),
+            'latency_ms': self.latency.to_dict(),
+        }
+
+
+async def run_audio_probe(server, clients, duration):
+    """
+    Runs jamulus_load_test.py in a separate process.
+
+    @param server: (host, port) of the audio server
+    @param clients: int, number of synthetic clients
+    @param duration: float, seconds to run after all clients were added
+    @return: dict with the aggregated results of the clients
+    """
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, LOAD_TEST, '--server', f'{server[0]}:{server[1]}',
+        '--clients', str(clients), '--ramp-rate', '100', '--duration', str(duration),
+        '--report-interval', str(duration + 1), '--json', '-',
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    stdout, _ = await process.communicate()
+    if process.returncode:
+        raise RuntimeError(f'jamulus_load_test.py exited with {process.returncode}')
+    total = json.loads(stdout)['total']
+    if not total['audio_received']:
+        logger.warning('the audio probe received no audio from %s:%s', *server)
+    return {name: total[name] for name in ('audio_received', 'loss_ratio', 'jitter_ms',
+                                           'interarrival_ms')}
+
+
+async def run_scenarios(args, rpc, audio, secret):
+    """
+    @param rpc: (host, port) of the JSON-RPC server
+    @param audio: (host, port) of the audio server
+    @param secret: str, for jamulus/apiAuth
+    @return: dict with the baseline and the results of all scenarios
+    """
+    results = {'audio_baseline': None, 'scenarios': []}
+    if args.audio_clients:
+        logger.info('audio baseline without RPC load')
+        results['audio_baseline'] = await run_audio_probe(audio, args.audio_clients,
+                                                          args.duration)
+    for concurrency in args.concurrency:
+        for batch_size in args.batch_size:
+            scenario = Scenario(concurrency, batch_size, args.methods, args.seed)
+            probe = None
+            if args.audio_clients:
+                probe = asyncio.ensure_future(run_audio_probe(
+                    audio, args.audio_clients, args.warmup + args.duration))
+            elapsed = await scenario.run(rpc, secret, args.warmup, args.duration)
+            result = scenario.results(elapsed)
+            if probe is not None:
+                result['audio'] = await probe
+            logger.info('concurrency %d, batch size %d: %.1f requests/s, latency p50 %s ms, '
+                        'p99 %s ms, %d errors', concurrency, batch_size,
+                        result['requests_per_second'], result['latency_ms'].get('p50'),
+                        result['latency_ms'].get('p99'), result['errors'])
+            results['scenarios'].append(result)
+    return results
+
+
+def run(args):
+    """
+    Runs all scenarios and writes the results.
+    """
+    server = None
+    try:
+        if args.jamulus:
+            commit, version = binary_version(args.jamulus)
+            server = LocalServer(args.jamulus, args.jamulus_arg)
+            secret = server.start()
+            rpc, audio = server.rpc, server.audio
+        else:
+            host, port, secret_file = args.rpc
+            secret = read_secret_file(secret_file)
+            rpc, audio = (host, port), args.server
+            commit, version = asyncio.run(server_version(rpc, secret))
+        results = asyncio.run(run_scenarios(args, rpc, audio, secret))
+    finally:
+        if server is not None:
+            server.stop()
+    write_json({
+        'commit': commit,
+        'version': version,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'host': platform.node(),
+        'server': args.jamulus or f'{rpc[0]}:{rpc[1]}',
+        'parameters': {
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'audio_clients': args.audio_clients,
+            'methods': args.methods,
+            'seed': args.seed,
+        },
+        **results,
+    }, args.json)
+
+
+def summarize(results):
+    """
+    @param results: dict, as written by `run`
+    @return: dict of (concurrency, batch_size) to (requests/s, p50, p99, audio p99)
+    """
+    summary = {}
+    for scenario in results['scenarios']:
+        latency = scenario['latency_ms']
+        audio = scenario.get('audio', {}).get('interarrival_ms', {})
+        summary[scenario['concurrency'], scenario['batch_size']] = (
+            scenario['requests_per_second'], latency.get('p50'), latency.get('p99'),
+            audio.get('p99'))
+    return summary
+
+
+def compare(args):
+    """
+    Prints the relative change of every scenario which both runs have in common.
+    """
+    runs = []
+    for path in (args.old, args.new):
+        with open(path) as f:
+            runs.append(json.load(f))
+    old, new = (summarize(results) for results in runs)
+    print(f'old: {runs[0].get("commit")}  new: {runs[1].get("commit")}')
+    print(f'{"conc":>5} {"batch":>5} {"req/s":>18} {"p50 ms":>18} {"p99 ms":>18} '
+          f'{"audio p99 ms":>18}')
+    for key in sorted(old.keys() & new.keys()):
+        cells = []
+        for before, after in zip(old[key], new[key]):
+            if before is None or after is None:
+                cells.append(f'{"-":>18}')
+            else:
+                change = f'{100 * (after - before) / before:+.1f}%' if before else ''
+                cells.append(f'{after:>10.3f} {change:>7}')
+        print(f'{key[0]:>5} {key[1]:>5} ' + ' '.join(cells))
+    for key in sorted(old.keys() ^ new.keys()):
+        print(f'scenario concurrency {key[0]}, batch size {key[1]} is only in one run')
+
+
+def main():
+    p = argparse.ArgumentParser(description='Benchmarks the JSON-RPC server of Jamulus.')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+    sub = p.add_subparsers(dest='command', required=True)
+
+    r = sub.add_parser('run', help='run the benchmark')
+    target = r.add_mutually_exclusive_group(required=True)
+    target.add_argument('--jamulus', metavar='BINARY',
+                        help='start this Jamulus executable as a headless server')
+    target.add_argument('--rpc', type=parse_server_spec, metavar='HOST:PORT:SECRET_FILE',
+                        help='use an already running server')
+    r.add_argument('--jamulus-arg', action='append', default=[], metavar='ARG',
+                   help='additional command line option for --jamulus (repeatable)')
+    r.add_argument('--server', type=parse_address, metavar='HOST[:PORT]',
+                   default=f'127.0.0.1:{jp.DEFAULT_PORT_NUMBER}',
+                   help='audio address of the server given with --rpc')
+    r.add_argument('--concurrency', type=parse_int_list, default=[1, 8, 32],
+                   help='comma separated numbers of concurrent connections')
+    r.add_argument('--batch-size', type=parse_int_list, default=[1, 20],
+                   help='comma separated numbers of requests per round trip')
+    r.add_argument('--method', type=parse_method_weight, action='append', default=[],
+                   metavar='METHOD[=WEIGHT]',
+                   help='method to call and its relative weight (repeatable, '
+                        'default: all read-only server methods)')
+    r.add_argument('--duration', type=float, default=10.0, help='measured seconds per scenario')
+    r.add_argument('--warmup', type=float, default=2.0,
+                   help='seconds of load before measuring each scenario')
+    r.add_argument('--audio-clients', type=int, default=2,
+                   help='synthetic audio clients watching the packet timing (0 to disable)')
+    r.add_argument('--seed', type=int, default=0, help='seed of the random method selection')
+    r.add_argument('--json', metavar='FILE', default='-',
+                   help='write the results as JSON (default: stdout)')
+
+    c = sub.add_parser('compare', help='compare the results of two runs')
+    c.add_argument('old', help='JSON file of the reference run')
+    c.add_argument('new', help='JSON file of the run to compare')
+
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+
+    if args.command == 'compare':
+        compare(args)
+        return
+    if args.duration <= 0 or args.warmup < 0:
+        p.error('--duration must be positive and --warmup must not be negative')
+    if not 0 <= args.audio_clients <= jp.MAX_NUM_CHANNELS:
+        p.error(f'--audio-clients must be between 0 and {jp.MAX_NUM_CHANNELS}')
+    try:
+        if args.method:
+            check_methods([method for method, _ in args.method])
+            args.methods = dict(args.method)
+        else:
+            args.methods = default_method_mix()
+    except ValueError as e:
+        p.error(str(e))
+    exit_on_error(run, args, errors=(OSError, RuntimeError, JsonRpcError))
+
+
+if __name__ == '__main__':
+    main()
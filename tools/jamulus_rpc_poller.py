@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Polls the JSON-RPC API of many Jamulus servers concurrently and writes all
+results as a single stream of newline-delimited JSON (NDJSON).
+
+Every server gets one persistent, authenticated connection (see
+jamulus_rpc.py) which is re-established with exponential backoff if it
+drops. On every interval, the configured methods are requested from all
+servers at once, bounded by --max-in-flight outstanding requests overall.
+If the src/ directory of the Jamulus source tree is next to this script,
+the method names are checked against the catalogue which
+generate_json_rpc_docs.py extracts from the source code. --cache keeps the
+parsed annotations in a file, otherwise nothing is written.
+
+Each server is given as HOST:PORT:SECRET_FILE, matching the --jsonrpcport
+and --jsonrpcsecretfile options of the respective server.
+
+Usage:
+./tools/jamulus_rpc_poller.py --interval 1 \
+    --server 127.0.0.1:22100:/path/to/secret.txt \
+    --server 127.0.0.1:22101:/path/to/other-secret.txt
+
+./tools/jamulus_rpc_poller.py --servers-file servers.txt --output feed.ndjson
+
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+import generate_json_rpc_docs
+from jamulus_rpc import JsonRpcError, RpcConnection, read_secret_file
+
+logger = logging.getLogger('')
+
+DEFAULT_METHODS = [
+    'jamulusserver/getClients',
+    'jamulusserver/getServerProfile',
+    'jamulusserver/getRecorderStatus',
+]
+
+
+def method_catalogue(cache_file=None):
+    """
+    @param cache_file: str, file to cache the parsed annotations in, or None
+    @return: dict of method name to DocumentationItem for all documented
+             methods, None if the source code is not available
+    """
+    if not os.path.isdir(os.path.join(generate_json_rpc_docs.repo_root, 'src')):
+        return None
+    items = generate_json_rpc_docs.parse_source_files(use_cache=cache_file is not None,
+                                                      path=cache_file)
+    return {item.name: item for item in items if item.type == 'method'}
+
+
+def check_methods(methods, cache_file=None):
+    """
+    Makes sure that all methods exist and can be called without parameters.
+    Without the source code, a warning is logged and nothing is checked.
+
+    @param methods: list of str
+    @param cache_file: str, see method_catalogue()
+    @raise ValueError: for the first unsuitable method
+    """
+    catalogue = method_catalogue(cache_file)
+    if catalogue is None:
+        logger.warning('source code not found, cannot check the method names')
+        return
+    for method in methods:
+        item = catalogue.get(method)
+        if item is None:
+            raise ValueError(f'{method} is not a documented JSON-RPC method')
+        params = generate_json_rpc_docs.SchemaNode.from_tags(item.params)
+        if params is not None and any(not p.optional for p in params.properties.values()):
+            raise ValueError(f'{method} requires parameters and cannot be polled')
+
+
+def parse_server_spec(spec):
+    """
+    @param spec: str, HOST:PORT:SECRET_FILE
+    @return: (host, port, secret_file) tuple
+    """
+    try:
+        host, port, secret_file = spec.rsplit(':', 2)
+        return host.strip('[]'), int(port), secret_file
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f'invalid server {spec!r}, expected HOST:PORT:SECRET_FILE') from None
+
+
+def positive_int(text):
+    """
+    @param text: str, command line value
+    @return: int, at least 1
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid int value {text!r}') from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'{value} is not a positive number')
+    return value
+
+
+class PolledServer:
+    """
+    A pooled connection to one server which is reconnected with exponential
+    backoff after failures.
+    """
+
+    def __init__(self, host, port, secret_file, options):
+        self.host = host
+        self.port = port
+        self.secret_file = secret_file
+        self.options = options
+        self.connection = None
+        self.failures = 0
+        self.next_attempt = 0.0
+
+    @property
+    def name(self):
+        """
+        @return: str, HOST:PORT as used in the emitted records
+        """
+        return f'{self.host}:{self.port}'
+
+    async def get_connection(self, emit):
+        """
+        Returns an open connection or None if the server is still backing off.
+        """
+        if self.connection is not None and self.connection.connected:
+            return self.connection
+        if time.monotonic() < self.next_attempt:
+            return None
+        try:
+            # re-read the secret on every attempt so that it can be rotated
+            secret = read_secret_file(self.secret_file)
+            connection = RpcConnection(self.host, self.port, secret, self.options.timeout)
+            await connection.connect()
+        except (OSError, ConnectionError, JsonRpcError, asyncio.TimeoutError) as e:
+            self.failures += 1
+            backoff = min(self.options.max_backoff, self.options.interval * 2 ** self.failures)
+            self.next_attempt = time.monotonic() + backoff * random.uniform(0.5, 1.0)
+            emit({'server': self.name, 'event': 'connect_failed', 'error': str(e) or repr(e),
+                  'retry_in_s': round(self.next_attempt - time.monotonic(), 3)})
+            return None
+        self.connection = connection
+        self.failures = 0
+        emit({'server': self.name, 'event': 'connected'})
+        return connection
+
+    async def poll(self, methods, semaphore, emit):
+        """
+        Requests all methods concurrently and emits one record per method.
+        """
+        connection = await self.get_connection(emit)
+        if connection is None:
+            return
+
+        async def request(method):
+            async with semaphore:
+                started = time.monotonic()
+                record = {'ts': round(time.time(), 3), 'server': self.name, 'method': method}
+                try:
+                    record['result'] = await connection.call(method)
+                except JsonRpcError as e:
+                    record['error'] = {'code': e.code, 'message': e.message}
+                except (ConnectionError, asyncio.TimeoutError) as e:
+                    record['error'] = {'message': str(e) or repr(e)}
+                record['latency_ms'] = round((time.monotonic() - started) * 1000, 3)
+                emit(record)
+
+        await asyncio.gather(*[request(method) for method in methods])
+        if not connection.connected:
+            emit({'server': self.name, 'event': 'disconnected'})
+            await connection.close()
+
+    async def close(self):
+        """
+        Closes the connection if one is open.
+        """
+        if self.connection is not None:
+            await self.connection.close()
+
+
+async def poll_servers(servers, methods, options, output):
+    """
+    Runs the poll rounds until --count rounds have been done (or forever).
+    """
+    semaphore = asyncio.Semaphore(options.max_in_flight)
+
+    def emit(record):
+        output.write(json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n')
+
+    tasks = {}
+    next_round = time.monotonic()
+    rounds = 0
+    try:
+        while options.count == 0 or rounds < options.count:
+            for server in servers:
+                # a slow server must not hold back the others, so only skip
+                # servers whose previous round has not finished yet
+                task = tasks.get(server)
+                if task is not None and not task.done():
+                    emit({'server': server.name, 'event': 'round_skipped'})
+                    continue
+                tasks[server] = asyncio.ensure_future(server.poll(methods, semaphore, emit))
+            rounds += 1
+            next_round += options.interval
+            await asyncio.sleep(max(0.0, next_round - time.monotonic()))
+            output.flush()
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*[server.close() for server in servers])
+        output.flush()
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description='Polls many Jamulus JSON-RPC servers and writes the results as NDJSON.')
+    p.add_argument('--server', action='append', default=[], type=parse_server_spec,
+                   help='HOST:PORT:SECRET_FILE of a server to poll; may be given multiple times')
+    p.add_argument('--servers-file',
+                   help='file with one HOST:PORT:SECRET_FILE per line (# starts a comment)')
+    p.add_argument('--method', action='append', dest='methods',
+                   help='method to poll; may be given multiple times '
+                        f'(default: {", ".join(DEFAULT_METHODS)})')
+    p.add_argument('--interval', type=float, default=5.0,
+                   help='seconds between poll rounds (default: %(default)s)')
+    p.add_argument('--count', type=int, default=0,
+                   help='number of poll rounds, 0 to poll forever (default: %(default)s)')
+    p.add_argument('--max-in-flight', type=positive_int, default=64,
+                   help='maximum number of outstanding requests (default: %(default)s)')
+    p.add_argument('--timeout', type=float, default=5.0,
+                   help='seconds to wait for a connection or response (default: %(default)s)')
+    p.add_argument('--max-backoff', type=float, default=300.0,
+                   help='maximum seconds between reconnection attempts (default: %(default)s)')
+    p.add_argument('--output', help='file to append the NDJSON feed to (default: stdout)')
+    p.add_argument('--cache', metavar='FILE',
+                   help='file to cache the parsed RPC annotations in (default: no cache)')
+    p.add_argument('--verbose', '-v', action='store_true', help='enable verbose output')
+    args = p.parse_args()
+    logging.basicConfig(format='%(levelname)s %(message)s',
+                        level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    specs = list(args.server)
+    if args.servers_file:
+        with open(args.servers_file, 'r') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    specs.append(parse_server_spec(line))
+    if not specs:
+        p.error('no servers given, use --server or --servers-file')
+
+    methods = args.methods or DEFAULT_METHODS
+    try:
+        check_methods(methods, args.cache)
+    except ValueError as e:
+        p.error(str(e))
+
+    servers = [PolledServer(host, port, secret_file, args) for host, port, secret_file in specs]
+    output = open(args.output, 'a') if args.output else sys.stdout  # pylint: disable=consider-using-with
+    try:
+        asyncio.run(poll_servers(servers, methods, args, output))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Multiplexing proxy for the Jamulus JSON-RPC API.
+
+CRpcServer (src/rpcserver.cpp) serves every TCP connection separately: each
+consumer has to authenticate with jamulus/apiAuth, and every notification
+is serialised and sent once per consumer by the server's main event loop.
+
+This proxy holds one authenticated upstream connection per Jamulus
+instance (see jamulus_rpc.py), which is re-established with exponential
+backoff, and accepts any number of local consumers speaking the same
+newline-delimited JSON-RPC protocol:
+
+- Notifications are received once and fanned out to all authenticated
+  consumers. A consumer which does not read them fast enough loses
+  notifications instead of slowing down the others.
+- Requests of all consumers are collected for --batch-delay seconds and
+  sent upstream as one JSON-RPC batch array.
+- Identical calls of the read-only methods in COALESCED_METHODS share one
+  upstream request while it is outstanding, and its result is reused for
+  --cache-ttl seconds.
+- jamulus/apiAuth is answered by the proxy itself: consumers have to know
+  the secret from --consumer-secret-file. Without that option, consumers
+  are accepted without authentication, which is only allowed if all
+  instances listen on a loopback address.
+- jamulusproxy/getStats returns the proxy's counters.
+
+Each instance is given as LISTEN_HOST:LISTEN_PORT=HOST:PORT:SECRET_FILE.
+
+Usage:
+./tools/jamulus_rpc_proxy.py --instance 127.0.0.1:22200=127.0.0.1:22100:/path/to/secret.txt
+./tools/jamulus_rpc_proxy.py --cache-ttl 0.5 --consumer-secret-file local-secret.txt \
+    --instance 127.0.0.1:22200=10.0.0.5:22100:secret-a.txt \
+    --instance 127.0.0.1:22201=10.0.0.6:22100:secret-b.txt
+
+"""
+
+import argparse
+import asyncio
+import collections
+import hmac
+import ipaddress
+import json
+import logging
+import random
+import time
+
+from jamulus_common import parse_address
+from jamulus_rpc import (ERR_AUTHENTICATION_FAILED, ERR_INVALID_PARAMS, ERR_INVALID_REQUEST,
+                         ERR_PARSE_ERROR, ERR_UNAUTHENTICATED, STREAM_LIMIT, JsonRpcError,
+                         RpcConnection, read_secret_file)
+from jamulus_rpc_poller import parse_server_spec
+
+logger = logging.getLogger('')
+
+# read-only methods whose identical calls are answered by one upstream request
+COALESCED_METHODS = frozenset([
+    'jamulus/getVersion',
+    'jamulusserver/getClients',
+    'jamulusserver/getServerProfile',
+])
+AUTH_METHOD = 'jamulus/apiAuth'
+STATS_METHOD = 'jamulusproxy/getStats'
+# implementation-defined server error of JSON-RPC 2.0
+ERR_UPSTREAM_UNAVAILABLE = -32000
+
+ProxyOptions = collections.namedtuple('ProxyOptions', [
+    'cache_ttl', 'batch_delay', 'max_batch', 'consumer_secret', 'timeout', 'max_backoff',
+    'max_buffer'])
+
+
+def error_reply(code, message, request_id=None):
+    """
+    @return: dict, a JSON-RPC error response
+    """
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def encode(message):
+    """
+    @return: bytes, one line of the protocol
+    """
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+class Consumer:
+    """
+    One downstream connection.
+    """
+
+    def __init__(self, writer, authenticated):
+        self.writer = writer
+        self.authenticated = authenticated
+        self.tasks = set()
+
+    def send(self, message):
+        """
+        Sends a response unless the connection is closing.
+        """
+        if not self.writer.is_closing():
+            self.writer.write(encode(message))
+
+    def send_notification(self, line, max_buffer):
+        """
+        @param line: bytes, the encoded notification
+        @param max_buffer: int, bytes which may be waiting to be sent
+        @return: bool, False if the notification was dropped
+        """
+        if self.writer.is_closing() or not self.authenticated:
+            return True
+        if self.writer.transport.get_write_buffer_size() > max_buffer:
+            return False
+        self.writer.write(line)
+        return True
+
+
+class Proxy:
+    """
+    Shares one upstream connection among many consumers.
+    """
+
+    def __init__(self, upstream_address, secret_file, options):
+        """
+        @param upstream_address: (host, port) tuple of the Jamulus JSON-RPC server
+        @param secret_file: str, see read_secret_file()
+        @param options: ProxyOptions
+        """
+        self.upstream = Upstream(upstream_address, secret_file, self, options)
+        self.options = options
+        self.consumers = set()
+        # (method, params as JSON) -> (expiry time, result)
+        self.cache = {}
+        # (method, params as JSON) -> future of the outstanding upstream call
+        self.in_flight = {}
+        # (method, params, future) of the next upstream batch
+        self.queue = []
+        self.stats = collections.Counter()
+
+    # Consumers -----------------------------------------------------------------
+
+    async def serve_consumer(self, reader, writer):
+        """
+        Reads the requests of one consumer and answers each one as soon as
+        its result is known.
+        """
+        consumer = Consumer(writer, self.options.consumer_secret is None)
+        self.consumers.add(consumer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    # answer what was sent before the consumer shut down its side
+                    await asyncio.gather(*consumer.tasks, return_exceptions=True)
+                    break
+                if not line.strip():
+                    consumer.send(error_reply(ERR_PARSE_ERROR, 'Parse error: Blank line received'))
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    consumer.send(error_reply(ERR_PARSE_ERROR,
+                                              'Parse error: Invalid JSON received'))
+                    break
+                if isinstance(message, list) and message and all(
+                        isinstance(item, dict) for item in message):
+                    requests = message
+                elif isinstance(message, dict):
+                    requests = [message]
+                else:
+                    consumer.send(error_reply(ERR_INVALID_REQUEST, 'Invalid request'))
+                    break
+                task = asyncio.ensure_future(self._answer(consumer, requests,
+                                                          isinstance(message, list)))
+                consumer.tasks.add(task)
+                task.add_done_callback(consumer.tasks.discard)
+        except (ConnectionError, OSError) as e:
+            logger.debug('consumer connection failed: %s', e)
+        finally:
+            self.consumers.discard(consumer)
+            for task in list(consumer.tasks):
+                task.cancel()
+            writer.close()
+
+    async def _answer(self, consumer, requests, batch):
+        responses = await asyncio.gather(*[self.process(consumer, request)
+                                           for request in requests])
+        consumer.send(responses if batch else responses[0])
+
+    async def process(self, consumer, request):
+        """
+        @param consumer: Consumer which sent the request
+        @param request: dict, one JSON-RPC request
+        @return: dict, the response
+        """
+        response = {'jsonrpc': '2.0', 'id': request.get('id')}
+        method = request.get('method')
+        params = request.get('params')
+        self.stats['requests'] += 1
+        try:
+            if not isinstance(method, str):
+                raise JsonRpcError(ERR_INVALID_REQUEST,
+                                   'Invalid request: The `method` member is not a string')
+            if not isinstance(params, dict):
+                raise JsonRpcError(ERR_INVALID_PARAMS,
+                                   'Invalid params: The `params` member is not an object')
+            if method == AUTH_METHOD:
+                response['result'] = self._authenticate(consumer, params)
+            elif not consumer.authenticated:
+                raise JsonRpcError(ERR_UNAUTHENTICATED,
+                                   'Unauthenticated: Please authenticate using '
+                                   'jamulus/apiAuth first')
+            elif method == STATS_METHOD:
+                response['result'] = self.get_stats()
+            elif method in COALESCED_METHODS:
+                response['result'] = await self._call_coalesced(method, params)
+            else:
+                response['result'] = await self._call(method, params)
+        except JsonRpcError as e:
+            response['error'] = {'code': e.code, 'message': e.message}
+            if e.data is not None:
+                response['error']['data'] = e.data
+        return response
+
+    def _authenticate(self, consumer, params):
+        secret = params.get('secret')
+        if not isinstance(secret, str):
+            raise JsonRpcError(ERR_INVALID_PARAMS, 'Invalid params: secret is not a string')
+        if self.options.consumer_secret is not None and not hmac.compare_digest(
+                secret.encode(), self.options.consumer_secret.encode()):
+            raise JsonRpcError(ERR_AUTHENTICATION_FAILED, 'Authentication failed.')
+        consumer.authenticated = True
+        return 'ok'
+
+    def get_stats(self):
+        """
+        @return: dict of counters
+        """
+        return dict(self.stats, consumers=len(self.consumers),
+                    upstream_connected=self.upstream.connected)
+
+    def broadcast(self, method, params):
+        """
+        Sends a notification to all authenticated consumers.
+        """
+        line = encode({'jsonrpc': '2.0', 'method': method, 'params': params})
+        self.stats['notifications'] += 1
+        for consumer in self.consumers:
+            if not consumer.send_notification(line, self.options.max_buffer):
+                self.stats['dropped_notifications'] += 1
+
+    # Upstream ------------------------------------------------------------------
+
+    async def _call_coalesced(self, method, params):
+        key = (method, json.dumps(params, sort_keys=True))
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.stats['cache_hits'] += 1
+            return cached[1]
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._call(method, params))
+            self.in_flight[key] = future
+            future.add_done_callback(lambda done: self._cache_result(key, done))
+        else:
+            self.stats['coalesced'] += 1
+        return await asyncio.shield(future)
+
+    def _cache_result(self, key, future):
+        del self.in_flight[key]
+        if future.cancelled():
+            return
+        # this retrieves the exception even if all callers were cancelled,
+        # otherwise asyncio logs that it was never retrieved
+        if future.exception() is None and self.options.cache_ttl > 0:
+            self.cache[key] = (time.monotonic() + self.options.cache_ttl, future.result())
+
+    async def _call(self, method, params):
+        if not self.upstream.connected:
+            raise JsonRpcError(ERR_UPSTREAM_UNAVAILABLE, 'Upstream unavailable')
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self.queue:
+            loop.call_later(self.options.batch_delay, self._flush)
+        self.queue.append((method, params, future))
+        return await future
+
+    def _flush(self):
+        while self.queue:
+            batch = self.queue[:self.options.max_batch]
+            del self.queue[:self.options.max_batch]
+            asyncio.ensure_future(self._send_batch(batch))
+
+    async def _send_batch(self, batch):
+        self.stats['upstream_batches'] += 1
+        self.stats['upstream_requests'] += len(batch)
+        try:
+            results = await self.upstream.call_batch([(method, params)
+                                                      for method, params, _ in batch])
+        except (ConnectionError, asyncio.TimeoutError) as e:
+            results = [e] * len(batch)
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, JsonRpcError):
+                future.set_exception(result)
+            elif isinstance(result, Exception):
+                future.set_exception(JsonRpcError(ERR_UPSTREAM_UNAVAILABLE,
+                                                  f'Upstream unavailable: {result!r}'))
+            else:
+                future.set_result(result)
+
+
+class Upstream:
+    """
+    The connection to the Jamulus JSON-RPC server, reconnected with
+    exponential backoff. Notifications are passed to the Proxy.
+    """
+
+    def __init__(self, address, secret_file, proxy, options):
+        self.address = address
+        self.secret_file = secret_file
+        self.proxy = proxy
+        self.options = options
+        self.connection = None
+
+    @property
+    def connected(self):
+        """
+        @return: bool, True while the upstream connection is open
+        """
+        return self.connection is not None and self.connection.connected
+
+    async def call_batch(self, calls):
+        """
+        @return: list of results or exceptions, see RpcConnection.call_batch()
+        """
+        if not self.connected:
+            raise ConnectionError('upstream is not connected')
+        return await self.connection.call_batch(calls, return_exceptions=True)
+
+    async def _connect(self):
+        connection = RpcConnection(*self.address, read_secret_file(self.secret_file),
+                                   self.options.timeout)
+        await connection.connect()
+        return connection
+
+    async def run(self):
+        """
+        Keeps the connection open and forwards notifications forever.
+        """
+        failures = 0
+        while True:
+            try:
+                self.connection = await self._connect()
+            except (OSError, ConnectionError, JsonRpcError, asyncio.TimeoutError) as e:
+                failures += 1
+                delay = min(self.options.max_backoff, 2 ** failures) * random.uniform(0.5, 1.0)
+                logger.warning('cannot connect to %s:%s (%s), retrying in %.1f s',
+                               *self.address, str(e) or repr(e), delay)
+                await asyncio.sleep(delay)
+                continue
+            failures = 0
+            logger.info('connected to %s:%s', *self.address)
+            # unbounded, the proxy only passes the notifications on
+            with self.connection.subscribe(maxsize=0) as subscription:
+                async for method, params in subscription:
+                    self.proxy.broadcast(method, params)
+            await self.connection.close()
+            self.connection = None
+            logger.warning('connection to %s:%s closed', *self.address)
+            await asyncio.sleep(random.uniform(0.5, 1.0))
+
+
+def parse_instance(spec):
+    """
+    @param spec: str, LISTEN_HOST:LISTEN_PORT=HOST:PORT:SECRET_FILE
+    @return: ((listen host, listen port), (host, port, secret file)) tuple
+    """
+    listen, sep, upstream = spec.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(
+            f'invalid instance {spec!r}, expected LISTEN_HOST:LISTEN_PORT=HOST:PORT:SECRET_FILE')
+    try:
+        return parse_address(listen), parse_server_spec(upstream)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def is_loopback(host):
+    """
+    @param host: str, listen address
+    @return: bool, True if only local processes can connect to it
+    """
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+async def run_proxies(instances, options):
+    """
+    Serves all instances until interrupted.
+    """
+    servers = []
+    tasks = []
+    for (listen_host, listen_port), (host, port, secret_file) in instances:
+        proxy = Proxy((host, port), secret_file, options)
+        servers.append(await asyncio.start_server(proxy.serve_consumer, listen_host,
+                                                  listen_port, limit=STREAM_LIMIT))
+        tasks.append(asyncio.ensure_future(proxy.upstream.run()))
+        logger.info('proxying %s:%s on %s:%s', host, port, listen_host, listen_port)
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for server in servers:
+            server.close()
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description='Shares one JSON-RPC connection to Jamulus among many local consumers.')
+    p.add_argument('--instance', type=parse_instance, action='append', required=True,
+                   help='LISTEN_HOST:LISTEN_PORT=HOST:PORT:SECRET_FILE, may be given '
+                        'multiple times')
+    p.add_argument('--cache-ttl', type=float, default=1.0,
+                   help='seconds to reuse results of the coalesced read-only methods '
+                        '(default: %(default)s)')
+    p.add_argument('--batch-delay', type=float, default=0.002,
+                   help='seconds to collect requests for one upstream batch '
+                        '(default: %(default)s)')
+    p.add_argument('--max-batch', type=int, default=100,
+                   help='maximum number of requests per upstream batch (default: %(default)s)')
+    p.add_argument('--consumer-secret-file',
+                   help='secret which consumers have to pass to jamulus/apiAuth; required '
+                        'unless all instances listen on a loopback address')
+    p.add_argument('--timeout', type=float, default=10.0,
+                   help='seconds to wait for the upstream connection and each response '
+                        '(default: %(default)s)')
+    p.add_argument('--max-backoff', type=float, default=30.0,
+                   help='maximum seconds between reconnection attempts (default: %(default)s)')
+    p.add_argument('--max-buffer', type=int, default=1024 * 1024,
+                   help='bytes which may wait to be sent to a consumer before notifications '
+                        'to it are dropped (default: %(default)s)')
+    p.add_argument('--verbose', '-v', action='store_true', help='enable verbose output')
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+
+    exposed = [f'{host}:{port}' for (host, port), _ in args.instance if not is_loopback(host)]
+    if exposed and not args.consumer_secret_file:
+        p.error(f'--consumer-secret-file is required to listen on {", ".join(exposed)}, '
+                'which is not a loopback address')
+    consumer_secret = (read_secret_file(args.consumer_secret_file)
+                       if args.consumer_secret_file else None)
+    options = ProxyOptions(args.cache_ttl, args.batch_delay, max(1, args.max_batch),
+                           consumer_secret, args.timeout, args.max_backoff, args.max_buffer)
+    try:
+        asyncio.run(run_proxies(args.instance, options))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
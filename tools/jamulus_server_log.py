@@ -0,0 +1,952 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+
+"""
+Indexes and queries the log files written by CServerLogging (--log).
+
+The server appends one line per new connection and a marker whenever the
+last client has left:
+
+2024-03-01 20:15:03, 192.0.2.1, connected (3)
+2024-03-01 23:40:12,, server idling -------------------------------------
+
+This tool streams the log through a memory-mapped reader once and stores a
+compact index next to it (LOG.index/ by default):
+
+- buckets.bin: one fixed-size record per time bucket (one hour by
+  default) with the byte offset of its first line, the number of
+  connections and the peak number of connected clients
+- ips-*.bin: segments of (IP hash, line offset) pairs sorted by hash, so
+  the lines of an IP address are found by binary search
+- meta.json: how far the log has been indexed
+
+The analyze command reconstructs the sessions from the connection events
+(the log has no disconnection lines) and computes peak concurrency,
+session lengths and busiest hours with NumPy.
+
+Every query first ingests the lines appended since the last run, so the
+log is never read twice. Rotated or truncated logs are detected and
+reindexed.
+
+Usage:
+./tools/jamulus_server_log.py index /var/log/jamulus.log
+./tools/jamulus_server_log.py concurrency /var/log/jamulus.log --from 2024-03-01 --to 2024-04-01
+./tools/jamulus_server_log.py ip /var/log/jamulus.log 192.0.2.1
+./tools/jamulus_server_log.py lines /var/log/jamulus.log --from "2024-03-01 20:00"
+./tools/jamulus_server_log.py analyze /var/log/jamulus.log --from 2024-03-01 --json
+
+"""
+
+import argparse
+import bisect
+import calendar
+import collections
+import datetime
+import hashlib
+import heapq
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+
+from jamulus_common import exit_on_error, optional_import, require_numpy
+
+np = optional_import('numpy')
+logger = logging.getLogger('')
+
+INDEX_VERSION = 1
+DEFAULT_BUCKET_SECONDS = 3600
+# a new IP segment is written every SEGMENT_LINES lines to bound the memory
+# used for sorting; segments are merged when there are more than MAX_SEGMENTS
+SEGMENT_LINES = 1 << 20
+MAX_SEGMENTS = 8
+HEAD_BYTES = 4096
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# see CServerLogging::AddNewConnection and CServerLogging::AddServerStopped
+LINE_RE = re.compile(
+    rb'^(\d{4}-\d\d-\d\d) (\d\d):(\d\d):(\d\d),'
+    rb'(?: ([^,\r\n]+), connected \((\d+)\)|, server idling[^\r\n]*)\r?$',
+    re.MULTILINE)
+
+# bucket start, offset of the first line, connections, peak clients,
+# clients after the last event of the bucket
+BUCKET = struct.Struct('<qQIHH')
+
+
+class LogIndexError(RuntimeError):
+    """
+    Exception which is raised when the index cannot be used.
+    """
+
+
+class LogEvent:
+    """
+    One parsed log line. address is None for "server idling" markers.
+    """
+
+    __slots__ = ('time', 'offset', 'address', 'clients')
+
+    def __init__(self, time_, offset, address, clients):
+        self.time = time_
+        self.offset = offset
+        self.address = address
+        self.clients = clients
+
+
+class LogReader:
+    """
+    Streams the events of a log file from a byte offset onwards.
+
+    The log file is memory-mapped and scanned with a compiled regular
+    expression. Dates are converted once per day, not once per line.
+    Timestamps are seconds since the epoch of the server's local time, as it
+    was written into the log (no timezone is stored in the log).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._days = {}
+
+    def _day(self, date):
+        day = self._days.get(date)
+        if day is None:
+            day = calendar.timegm(datetime.date.fromisoformat(date.decode()).timetuple())
+            self._days[date] = day
+        return day
+
+    def events(self, data, start=0, end=None):
+        """
+        @param data: mmap or bytes of the log
+        @param start: int, byte offset of a line start
+        @param end: int, byte offset after the last complete line (defaults
+                    to the end of the last complete line)
+        @return: iterator of LogEvent; unparsable lines are skipped
+        """
+        if end is None:
+            end = complete_length(data)
+        for match in LINE_RE.finditer(data, start, end):
+            date, hours, minutes, seconds, address, clients = match.groups()
+            time_ = self._day(date) + int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+            if address is None:
+                yield LogEvent(time_, match.start(), None, 0)
+            else:
+                yield LogEvent(time_, match.start(), address.decode(), int(clients))
+
+    def open(self):
+        """
+        @return: mmap of the log file, or b'' for an empty file
+        """
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def complete_length(data):
+    """
+    @return: int, length of data up to and including the last newline, so
+             that a line which is still being written is not indexed
+    """
+    return data.rfind(b'\n') + 1
+
+
+def ip_hash(address):
+    """
+    @return: int, 64 bit hash of an IP address string
+    """
+    return int.from_bytes(hashlib.blake2b(address.encode(), digest_size=8).digest(), 'little')
+
+
+def parse_time(text):
+    """
+    @param text: str, "YYYY-MM-DD[ HH:MM[:SS]]"
+    @return: int, seconds since the epoch as used in the index
+    """
+    for fmt in (TIME_FORMAT, '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            return calendar.timegm(datetime.datetime.strptime(text, fmt).timetuple())
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f'invalid time: {text}')
+
+
+def format_time(time_):
+    """
+    @return: str, inverse of parse_time()
+    """
+    return datetime.datetime.fromtimestamp(time_, datetime.timezone.utc).strftime(TIME_FORMAT)
+
+
+class IpSegment:
+    """
+    A sorted, memory-mapped table of (IP hash, line offset) pairs.
+
+    File layout: u64 count, count u64 hashes (sorted), count u64 offsets.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        count = struct.unpack_from('<Q', self._map)[0]
+        view = memoryview(self._map)
+        self.hashes = view[8:8 + 8 * count].cast('Q')
+        self.offsets = view[8 + 8 * count:8 + 16 * count].cast('Q')
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def lookup(self, hash_):
+        """
+        @return: list of line offsets of lines with the given IP hash
+        """
+        first = bisect.bisect_left(self.hashes, hash_)
+        last = bisect.bisect_right(self.hashes, hash_, first)
+        return list(self.offsets[first:last])
+
+    def pairs(self):
+        """
+        @return: iterator of (hash, offset) in hash order
+        """
+        return zip(self.hashes, self.offsets)
+
+    def close(self):
+        """
+        Releases the memory map.
+        """
+        self.hashes.release()
+        self.offsets.release()
+        self._map.close()
+
+    @staticmethod
+    def write(path, pairs, count):
+        """
+        Writes a segment from (hash, offset) pairs which are sorted by hash.
+
+        @param count: int, number of pairs
+        """
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(struct.pack('<Q', count))
+            offsets_start = 8 + 8 * count
+            f.truncate(offsets_start + 8 * count)
+            hashes, offsets = bytearray(), bytearray()
+            position = 0
+            for hash_, offset in pairs:
+                hashes += struct.pack('<Q', hash_)
+                offsets += struct.pack('<Q', offset)
+                if len(hashes) >= 1 << 20:
+                    position = _flush_columns(f, hashes, offsets, position, offsets_start)
+            _flush_columns(f, hashes, offsets, position, offsets_start)
+        os.replace(tmp, path)
+
+
+def _flush_columns(f, hashes, offsets, position, offsets_start):
+    f.seek(8 + position)
+    f.write(hashes)
+    f.seek(offsets_start + position)
+    f.write(offsets)
+    position += len(hashes)
+    del hashes[:], offsets[:]
+    return position
+
+
+class LogIndex:
+    """
+    On-disk index of one log file.
+    """
+
+    def __init__(self, log_path, index_path=None):
+        self.log_path = log_path
+        self.path = index_path or log_path + '.index'
+        self.reader = LogReader(log_path)
+        self.meta = None
+        self.buckets = []
+
+    @property
+    def bucket_seconds(self):
+        """
+        @return: int, width of a time bucket
+        """
+        return self.meta['bucket_seconds']
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _new_meta(self, bucket_seconds):
+        return {'version': INDEX_VERSION, 'bucket_seconds': bucket_seconds,
+                'indexed_bytes': 0, 'head_hash': '', 'num_buckets': 0,
+                'segments': [], 'next_segment': 0}
+
+    def load(self, bucket_seconds=DEFAULT_BUCKET_SECONDS):
+        """
+        Reads the index from disk or starts a new one.
+        """
+        try:
+            with open(self._file('meta.json')) as f:
+                self.meta = json.load(f)
+        except FileNotFoundError:
+            self.meta = self._new_meta(bucket_seconds)
+        if self.meta.get('version') != INDEX_VERSION:
+            raise LogIndexError(f'{self.path} has an unsupported version, delete it to reindex')
+        self.buckets = []
+        if self.meta['num_buckets']:
+            with open(self._file('buckets.bin'), 'rb') as f:
+                # anything after num_buckets was written by an interrupted run
+                data = f.read(self.meta['num_buckets'] * BUCKET.size)
+            self.buckets = [list(record) for record in BUCKET.iter_unpack(data)]
+
+    def _save(self):
+        with open(self._file('buckets.bin'), 'wb') as f:
+            for record in self.buckets:
+                f.write(BUCKET.pack(*record))
+        self.meta['num_buckets'] = len(self.buckets)
+        tmp = self._file('meta.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp, self._file('meta.json'))
+
+    def _reset(self):
+        for name in self.meta['segments']:
+            try:
+                os.remove(self._file(name))
+            except FileNotFoundError:
+                pass
+        self.meta = self._new_meta(self.meta['bucket_seconds'])
+        self.buckets = []
+
+    def update(self):
+        """
+        Indexes the lines which were appended since the last update.
+
+        @return: int, number of newly indexed events
+        """
+        os.makedirs(self.path, exist_ok=True)
+        data = self.reader.open()
+        indexed = self.meta['indexed_bytes']
+        if indexed and (len(data) < indexed or
+                        self.meta['head_hash'] != hashlib.sha256(
+                            data[:min(HEAD_BYTES, indexed)]).hexdigest()):
+            logger.info('%s was truncated or rotated, reindexing', self.log_path)
+            self._reset()
+            indexed = 0
+        end = complete_length(data)
+        if end <= indexed:
+            return 0
+
+        count = 0
+        pairs = []
+        hashes = {}
+        for event in self.reader.events(data, indexed, end):
+            count += 1
+            self._add_to_bucket(event)
+            if event.address is not None:
+                hash_ = hashes.get(event.address)
+                if hash_ is None:
+                    hash_ = hashes[event.address] = ip_hash(event.address)
+                pairs.append((hash_, event.offset))
+                if len(pairs) >= SEGMENT_LINES:
+                    self._write_segment(pairs)
+        self._write_segment(pairs)
+        if len(self.meta['segments']) > MAX_SEGMENTS:
+            self._merge_segments()
+
+        self.meta['indexed_bytes'] = end
+        self.meta['head_hash'] = hashlib.sha256(data[:min(HEAD_BYTES, end)]).hexdigest()
+        self._save()
+        logger.debug('indexed %d new events of %s', count, self.log_path)
+        return count
+
+    def _add_to_bucket(self, event):
+        start = event.time - event.time % self.bucket_seconds
+        if not self.buckets or self.buckets[-1][0] != start:
+            self.buckets.append([start, event.offset, 0, 0, 0])
+        bucket = self.buckets[-1]
+        if event.address is not None:
+            bucket[2] += 1
+            bucket[3] = max(bucket[3], min(event.clients, 0xFFFF))
+        bucket[4] = min(event.clients, 0xFFFF)
+
+    def _write_segment(self, pairs):
+        if not pairs:
+            return
+        pairs.sort()
+        name = f"ips-{self.meta['next_segment']:06d}.bin"
+        self.meta['next_segment'] += 1
+        IpSegment.write(self._file(name), pairs, len(pairs))
+        self.meta['segments'].append(name)
+        pairs.clear()
+
+    def _merge_segments(self):
+        segments = [IpSegment(self._file(name)) for name in self.meta['segments']]
+        name = f"ips-{self.meta['next_segment']:06d}.bin"
+        self.meta['next_segment'] += 1
+        IpSegment.write(self._file(name), heapq.merge(*[s.pairs() for s in segments]),
+                        sum(len(s) for s in segments))
+        for segment in segments:
+            segment.close()
+            os.remove(segment.path)
+        self.meta['segments'] = [name]
+
+    def _overlaps(self, bucket_start, start, end):
+        return ((start is None or bucket_start + self.bucket_seconds > start) and
+                (end is None or bucket_start < end))
+
+    def bucket_slice(self, start=None, end=None):
+        """
+        @return: (first, last) bucket numbers overlapping [start, end); if
+                 the clock went back, the slice can contain other buckets
+                 in between
+        """
+        starts = [bucket[0] for bucket in self.buckets]
+        if all(a < b for a, b in zip(starts, starts[1:])):
+            first = 0 if start is None else max(0, bisect.bisect_right(starts, start) - 1)
+            last = len(starts) if end is None else bisect.bisect_left(starts, end)
+            return first, last
+        # the log has local times, which go back e.g. at the end of daylight
+        # saving time, so the bucket starts are not sorted
+        overlapping = [i for i, bucket_start in enumerate(starts)
+                       if self._overlaps(bucket_start, start, end)]
+        if not overlapping:
+            return 0, 0
+        return overlapping[0], overlapping[-1] + 1
+
+    def bucket_range(self, start=None, end=None):
+        """
+        @return: list of bucket records [start, offset, connections, peak,
+                 last] overlapping [start, end), in log order
+        """
+        first, last = self.bucket_slice(start, end)
+        return [bucket for bucket in self.buckets[first:last]
+                if self._overlaps(bucket[0], start, end)]
+
+    def lines(self, start=None, end=None):
+        """
+        @return: iterator of LogEvent with start <= time < end; only the
+                 part of the log covered by the matching buckets is read
+        """
+        first, last = self.bucket_slice(start, end)
+        if first >= last:
+            return
+        stop = self.buckets[last][1] if last < len(self.buckets) else self.meta['indexed_bytes']
+        data = self.reader.open()
+        for event in self.reader.events(data, self.buckets[first][1], stop):
+            if (start is None or event.time >= start) and (end is None or event.time < end):
+                yield event
+
+    def lookup_ip(self, address):
+        """
+        @return: list of LogEvent of all connections from the given address
+        """
+        hash_ = ip_hash(address)
+        offsets = []
+        for name in self.meta['segments']:
+            segment = IpSegment(self._file(name))
+            offsets += segment.lookup(hash_)
+            segment.close()
+        data = self.reader.open()
+        events = []
+        for offset in sorted(offsets):
+            event = next(self.reader.events(data, offset, data.find(b'\n', offset) + 1), None)
+            # guard against hash collisions
+            if event is not None and event.address == address:
+                events.append(event)
+        return events
+
+
+# Analytics --------------------------------------------------------------------
+#
+# The analytics work on whole arrays instead of LogEvent objects: the log is
+# parsed chunk by chunk with NumPy (no Python code per line) into an Events
+# table of a few bytes per line, from which the sessions are reconstructed.
+
+ANALYSIS_CHUNK_BYTES = 16 << 20
+MAX_ADDRESS_LENGTH = 45  # longest textual IPv6 address
+SESSION_LENGTH_EDGES = [0, 60, 300, 900, 1800, 3600, 7200, 14400, 28800]
+
+Events = collections.namedtuple('Events', ['times', 'addresses', 'clients'])
+Sessions = collections.namedtuple('Sessions', ['starts', 'ends', 'addresses', 'censored'])
+
+
+def _days_from_civil(year, month, day):
+    # vectorized version of the days_from_civil algorithm by Howard Hinnant
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def _digits(buffer, positions, count):
+    value = np.zeros(len(positions), dtype=np.int64)
+    for i in range(count):
+        value = value * 10 + (buffer[positions + i].astype(np.int64) - 48)
+    return value
+
+
+def _parse_times(buffer, starts):
+    """
+    @return: (seconds since the epoch, valid mask) of the line timestamps
+    """
+    valid = np.ones(len(starts), dtype=bool)
+    for position, char in ((4, b'-'), (7, b'-'), (10, b' '), (13, b':'), (16, b':'),
+                           (19, b',')):
+        valid &= buffer[starts + position] == ord(char)
+    days = _days_from_civil(_digits(buffer, starts, 4), _digits(buffer, starts + 5, 2),
+                            _digits(buffer, starts + 8, 2))
+    times = (days * 86400 + _digits(buffer, starts + 11, 2) * 3600 +
+             _digits(buffer, starts + 14, 2) * 60 + _digits(buffer, starts + 17, 2))
+    return times, valid
+
+
+def _parse_clients(buffer, digits_start, num_digits, connected):
+    clients = np.zeros(len(digits_start), dtype=np.int64)
+    for i in range(5):
+        has_digit = connected & (num_digits > i)
+        digit = buffer[np.where(has_digit, digits_start + i, 0)].astype(np.int64) - 48
+        clients = np.where(has_digit, clients * 10 + digit, clients)
+    return clients
+
+
+def _address_ids(buffer, starts, lengths, address_ids):
+    """
+    Gives each distinct address a small integer id. The addresses are
+    hashed column by column (64 bit FNV-1a) and only one representative of
+    each distinct hash is converted to a Python object. Addresses which
+    differ from the representative of their hash (collisions) are looked up
+    one by one.
+    """
+    hashes = np.full(len(starts), 0xCBF29CE484222325, dtype=np.uint64)
+    prime = np.uint64(0x100000001B3)
+    for column in range(int(lengths.max()) if len(lengths) else 0):
+        rows = np.flatnonzero(lengths > column)
+        hashes[rows] = (hashes[rows] ^ buffer[starts[rows] + column]) * prime
+    unique, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+    if len(unique) == 0:
+        return np.zeros(0, dtype=np.int32)
+    mapping = np.array([address_ids.setdefault(bytes(buffer[starts[i]:starts[i] + lengths[i]]),
+                                               len(address_ids))
+                        for i in first], dtype=np.int32)
+    inverse = inverse.ravel()
+    ids = mapping[inverse]
+    for i in np.flatnonzero(_hash_collisions(buffer, starts, lengths, first[inverse])):
+        ids[i] = address_ids.setdefault(bytes(buffer[starts[i]:starts[i] + lengths[i]]),
+                                        len(address_ids))
+    return ids
+
+
+def _hash_collisions(buffer, starts, lengths, representatives):
+    """
+    @param representatives: array of the row of the representative of each
+                            row's hash
+    @return: bool array, True for rows whose address differs from it
+    """
+    collisions = lengths != lengths[representatives]
+    for column in range(int(lengths.max())):
+        rows = np.flatnonzero((lengths > column) & ~collisions)
+        collisions[rows] |= (buffer[starts[rows] + column] !=
+                             buffer[starts[representatives[rows]] + column])
+    return collisions
+
+
+def _connection_fields(buffer, starts, ends):
+    """
+    Locates the fields of "<time>, <address>, connected (<clients>)" lines.
+
+    @return: (address lengths, start and number of the client count digits,
+              mask of lines with the expected structure)
+    """
+    commas = np.flatnonzero(buffer == ord(','))
+    address_ends = commas[np.minimum(np.searchsorted(commas, starts + 21), len(commas) - 1)]
+    lengths = address_ends - starts - 21
+    digits_start = address_ends + len(', connected (')
+    num_digits = ends - 1 - digits_start
+    connected = ((lengths > 0) & (lengths <= MAX_ADDRESS_LENGTH) &
+                 (num_digits > 0) & (num_digits <= 5) & (address_ends < ends) &
+                 (buffer[np.minimum(digits_start - 1, len(buffer) - 1)] == ord('(')) &
+                 (buffer[ends - 1] == ord(')')))
+    return lengths, digits_start, num_digits, connected
+
+
+def _parse_chunk(buffer, address_ids):
+    """
+    Parses complete lines of a chunk.
+
+    @param buffer: uint8 array ending with a newline
+    @param address_ids: dict of address bytes to id, extended with new addresses
+    @return: Events of the valid lines
+    """
+    newlines = np.flatnonzero(buffer == ord('\n'))
+    starts = np.concatenate(([0], newlines[:-1] + 1))
+    ends = newlines - (buffer[np.maximum(newlines - 1, 0)] == ord('\r'))
+    # the shortest valid line is an idle marker without dashes
+    long_enough = ends - starts >= 35
+    starts, ends = starts[long_enough], ends[long_enough]
+    times, valid = _parse_times(buffer, starts)
+    idle = buffer[starts + 20] == ord(',')
+
+    lengths, digits_start, num_digits, connected = _connection_fields(buffer, starts, ends)
+    connected &= ~idle
+    valid &= idle | connected
+    connected &= valid
+
+    addresses = np.full(len(starts), -1, dtype=np.int32)
+    addresses[connected] = _address_ids(buffer, starts[connected] + 21, lengths[connected],
+                                        address_ids)
+    clients = _parse_clients(buffer, digits_start, num_digits, connected)
+    return Events(times[valid], addresses[valid], clients[valid].astype(np.int32))
+
+
+def load_events(path, start=0, end=None):
+    """
+    Parses a log file (or the byte range [start, end) of it) into arrays.
+
+    Memory usage is bounded by the chunk size plus 16 bytes per event.
+
+    @return: (Events, list of address strings indexed by address id)
+    """
+    require_numpy('the analysis')
+    data = LogReader(path).open()
+    end = complete_length(data) if end is None else end
+    address_ids = {}
+    parts = []
+    while start < end:
+        stop = data.rfind(b'\n', start, min(start + ANALYSIS_CHUNK_BYTES, end)) + 1
+        if stop <= start:
+            # a single line longer than a chunk can not be valid
+            stop = data.find(b'\n', start, end) + 1 or end
+        else:
+            parts.append(_parse_chunk(np.frombuffer(data, dtype=np.uint8, count=stop - start,
+                                                    offset=start), address_ids))
+        start = stop
+    if not parts:
+        parts = [Events(np.zeros(0, np.int64), np.zeros(0, np.int32), np.zeros(0, np.int32))]
+    events = Events(*[np.concatenate(column) for column in zip(*parts)])
+    names = [address.decode() for address in address_ids]
+    return events, names
+
+
+def reconstruct_sessions(events):
+    """
+    Infers session intervals from connection events.
+
+    The log has no disconnection lines, but the client count of each
+    connection line tells how many clients have left since the previous
+    line, and a "server idling" line means that everybody has left. The
+    clients which leave are assumed to be the ones which connected first
+    (FIFO). With that assumption, the n-th session overall ends with the
+    n-th departure, so all end times follow from one cumulative sum and a
+    binary search instead of a per-line simulation.
+
+    A departure between two lines is dated in the middle between them, a
+    departure at a "server idling" line at that line. Sessions which are
+    still open at the end of the log are marked as censored and end at the
+    last line.
+
+    @param events: Events in log order, as the client counts refer to the
+                   previous line (the times may go back if the clock was set
+                   back)
+    @return: Sessions
+    """
+    require_numpy('the analysis')
+    times = events.times
+    count = len(times)
+    is_connect = events.addresses >= 0
+    # number of clients after each line, and before it
+    after = np.where(is_connect, events.clients, 0).astype(np.int64)
+    before = np.concatenate(([0], after[:-1]))
+    departures = np.where(is_connect, before + 1 - after, before).clip(min=0)
+    cumulative = np.cumsum(departures)
+
+    session_events = np.flatnonzero(is_connect)
+    # session i ends at the first line after which more than i clients have left
+    end_events = np.searchsorted(cumulative, np.arange(len(session_events)), side='right')
+    # inconsistent counts (e.g. a log starting with "connected (5)") could
+    # otherwise end a session before it started
+    end_events = np.maximum(end_events, session_events + 1)
+    censored = end_events >= count
+    end_events = np.minimum(end_events, count - 1)
+
+    previous = np.maximum(end_events - 1, 0)
+    is_idle = ~is_connect[end_events]
+    ends = np.where(is_idle, times[end_events], (times[previous] + times[end_events]) / 2)
+    ends = np.where(censored, times[-1] if count else 0, ends)
+    starts = times[session_events]
+    return Sessions(starts, np.maximum(ends, starts), events.addresses[session_events], censored)
+
+
+def concurrency_integral(sessions):
+    """
+    @return: (times, levels, integral) where levels[i] is the number of
+             clients after times[i] and integral[i] the number of
+             client-seconds up to times[i]
+    """
+    times = np.concatenate((sessions.starts, sessions.ends)).astype(np.float64)
+    deltas = np.concatenate((np.ones(len(sessions.starts)), -np.ones(len(sessions.ends))))
+    order = np.argsort(times, kind='stable')
+    times, levels = times[order], np.cumsum(deltas[order])
+    integral = np.concatenate(([0.0], np.cumsum(levels[:-1] * np.diff(times))))
+    return times, levels, integral
+
+
+def hourly_clients(times, integral):
+    """
+    Mean number of clients per hour. As the integral is linear between the
+    given times, interpolating it at the hour boundaries is exact.
+
+    @return: (hour start times, mean clients per hour)
+    """
+    edges = np.arange(int(times[0]) // 3600 * 3600, int(times[-1]) + 3600, 3600, dtype=np.int64)
+    return edges[:-1], np.diff(np.interp(edges, times, integral)) / 3600
+
+
+def analyze(events, names, top=10):
+    """
+    @return: dict with concurrency, session length and busiest hour statistics
+    """
+    sessions = reconstruct_sessions(events)
+    if len(sessions.starts) == 0:
+        return {'events': int(len(events.times)), 'sessions': 0}
+    lengths = sessions.ends - sessions.starts
+    times, levels, integral = concurrency_integral(sessions)
+    hours, hourly = hourly_clients(times, integral)
+    hour_of_day = (hours // 3600) % 24
+    by_hour_of_day = (np.bincount(hour_of_day, weights=hourly, minlength=24) /
+                      np.maximum(np.bincount(hour_of_day, minlength=24), 1))
+    per_address = np.bincount(sessions.addresses, weights=lengths, minlength=len(names))
+    peak = int(np.argmax(events.clients))
+    return {
+        'events': int(len(events.times)),
+        'sessions': int(len(lengths)),
+        'open_sessions': int(sessions.censored.sum()),
+        'distinct_addresses': int(np.count_nonzero(np.bincount(sessions.addresses))),
+        'peak_clients': {'clients': int(events.clients[peak]),
+                         'time': format_time(int(events.times[peak]))},
+        'peak_reconstructed_clients': int(levels.max()),
+        'mean_clients': round(float(integral[-1] / max(times[-1] - times[0], 1)), 3),
+        'session_length_s': {f'p{p}': round(float(v), 1) for p, v in
+                             zip((50, 90, 99), np.percentile(lengths, (50, 90, 99)))},
+        'session_length_histogram': {
+            f'{SESSION_LENGTH_EDGES[i] // 60}m+': int(n) for i, n in
+            enumerate(np.histogram(lengths, bins=SESSION_LENGTH_EDGES + [np.inf])[0])},
+        'mean_clients_by_hour_of_day': [round(float(v), 3) for v in by_hour_of_day],
+        'busiest_hours': [{'time': format_time(int(hours[i])),
+                           'mean_clients': round(float(hourly[i]), 3)}
+                          for i in np.argsort(-hourly, kind='stable')[:top]],
+        'top_addresses': [{'address': names[i], 'hours': round(float(per_address[i]) / 3600, 2)}
+                          for i in np.argsort(-per_address, kind='stable')[:top]],
+    }
+
+
+def print_analysis(index, args):
+    """
+    Prints the analysis of the log or of a time range of it. Only the part
+    of the log covered by the matching index buckets is parsed.
+    """
+    first, last = index.bucket_slice(args.start, args.end)
+    if first < last:
+        end = index.buckets[last][1] if last < len(index.buckets) else index.meta['indexed_bytes']
+        events, names = load_events(index.log_path, index.buckets[first][1], end)
+    else:
+        events, names = load_events(index.log_path, 0, 0)
+    selected = np.ones(len(events.times), dtype=bool)
+    if args.start is not None:
+        selected &= events.times >= args.start
+    if args.end is not None:
+        selected &= events.times < args.end
+    result = analyze(Events(*[column[selected] for column in events]), names, args.top)
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+        return
+    lists = ('mean_clients_by_hour_of_day', 'busiest_hours', 'top_addresses')
+    for key, value in result.items():
+        if key not in lists:
+            print(f'{key}: {value}')
+    print('mean clients by hour of day:')
+    for hour, clients in enumerate(result.get('mean_clients_by_hour_of_day', [])):
+        print(f'  {hour:02d}:00  {clients:8.3f}')
+    print('busiest hours:')
+    for row in result.get('busiest_hours', []):
+        print(f"  {row['time']}  {row['mean_clients']:8.3f}")
+    print('top addresses (hours connected):')
+    for row in result.get('top_addresses', []):
+        print(f"  {row['address']:<39}  {row['hours']:8.2f}")
+
+
+def open_index(args):
+    """
+    Loads and, unless disabled, updates the index of a log file.
+
+    @return: LogIndex
+    """
+    index = LogIndex(args.log, args.index)
+    index.load(args.bucket_seconds)
+    if not args.no_update:
+        index.update()
+    return index
+
+
+def print_concurrency(index, args):
+    """
+    Prints connections and peak clients per bucket (or per multiple of
+    buckets if --per is larger than the bucket width).
+    """
+    per = args.per or index.bucket_seconds
+    if per % index.bucket_seconds:
+        sys.exit(f'--per must be a multiple of the index bucket width ({index.bucket_seconds}s)')
+    rows = {}
+    for start, _, connections, peak, _ in index.bucket_range(args.start, args.end):
+        row = rows.setdefault(start - start % per, [0, 0])
+        row[0] += connections
+        row[1] = max(row[1], peak)
+    if args.json:
+        json.dump([{'time': format_time(k), 'connections': v[0], 'peak_clients': v[1]}
+                   for k, v in sorted(rows.items())], sys.stdout, indent=2)
+        print()
+        return
+    print(f"{'time':<19}  {'connections':>11}  {'peak clients':>12}")
+    for start, (connections, peak) in sorted(rows.items()):
+        print(f'{format_time(start):<19}  {connections:>11}  {peak:>12}')
+
+
+def print_events(events, as_json):
+    """
+    Prints log events either like the original log lines or as JSON lines.
+    """
+    for event in events:
+        if as_json:
+            print(json.dumps({'time': format_time(event.time), 'address': event.address,
+                              'clients': event.clients}))
+        elif event.address is None:
+            print(f'{format_time(event.time)},, server idling')
+        else:
+            print(f'{format_time(event.time)}, {event.address}, connected ({event.clients})')
+
+
+def add_common_arguments(p):
+    """
+    Adds the arguments shared by all subcommands.
+    """
+    p.add_argument('log', help='log file written by the server (--log)')
+    p.add_argument('--index', help='index directory (default: LOG.index)')
+    p.add_argument('--bucket-seconds', type=int, default=DEFAULT_BUCKET_SECONDS,
+                   help='time bucket width of a new index')
+    p.add_argument('--no-update', action='store_true',
+                   help='do not ingest lines appended since the last run')
+    p.add_argument('--json', action='store_true', help='print machine-readable output')
+    p.add_argument('-v', '--verbose', action='store_true', help='enable debug logging')
+
+
+def add_time_arguments(p):
+    """
+    Adds --from/--to.
+    """
+    p.add_argument('--from', dest='start', type=parse_time, help='start time (inclusive)')
+    p.add_argument('--to', dest='end', type=parse_time, help='end time (exclusive)')
+
+
+def build_parser():
+    """
+    @return: argparse.ArgumentParser for all subcommands
+    """
+    p = argparse.ArgumentParser(description='Indexes and queries Jamulus server log files.')
+    sub = p.add_subparsers(dest='command', required=True)
+    add_common_arguments(sub.add_parser('index', help='create or update the index'))
+    concurrency = sub.add_parser('concurrency', help='connections and peak clients over time')
+    add_common_arguments(concurrency)
+    add_time_arguments(concurrency)
+    concurrency.add_argument('--per', type=lambda text: {'hour': 3600, 'day': 86400}.get(
+        text) or int(text), help='aggregation interval: hour, day or seconds')
+    ip = sub.add_parser('ip', help='all connections from an IP address')
+    add_common_arguments(ip)
+    ip.add_argument('address', help='IP address as written in the log')
+    lines = sub.add_parser('lines', help='log lines of a time range')
+    add_common_arguments(lines)
+    add_time_arguments(lines)
+    analysis = sub.add_parser('analyze', help='reconstruct sessions and compute statistics')
+    add_common_arguments(analysis)
+    add_time_arguments(analysis)
+    analysis.add_argument('--top', type=int, default=10,
+                          help='number of busiest hours and top addresses to list')
+    return p
+
+
+def run(args):
+    """
+    Runs the selected subcommand.
+    """
+    index = open_index(args)
+    if args.command == 'index':
+        print(f"{index.meta['indexed_bytes']} bytes indexed in {len(index.buckets)} buckets "
+              f"and {len(index.meta['segments'])} IP segment(s)")
+    elif args.command == 'concurrency':
+        print_concurrency(index, args)
+    elif args.command == 'ip':
+        print_events(index.lookup_ip(args.address), args.json)
+    elif args.command == 'lines':
+        print_events(index.lines(args.start, args.end), args.json)
+    elif args.command == 'analyze':
+        print_analysis(index, args)
+
+
+def main():
+    args = build_parser().parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+    # LogIndexError and a missing NumPy are RuntimeErrors
+    exit_on_error(run, args)
+
+
+if __name__ == '__main__':
+    main()
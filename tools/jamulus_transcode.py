@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+##############################################################################
+# Copyright (c) 2026
+#
+# Author(s):
+#  The Jamulus Development Team
+#
+# As of Jamulus 3.12.1dev (commit eb172d47): All new source code contributions must be licensed
+# under AGPL 3.0 or any later version.
+#
+# Existing code: Code contributed before 3.12.1dev (commit eb172d47) was licensed under GPL 2.0+.
+# This code will be licensed under GPL 3.0 (or any later version) from
+# 3.12.1dev (commit eb172d47).  When distributed as part of Jamulus, the AGPL 3.0 terms govern
+# the combined work, including network use provisions.
+#
+##############################################################################
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+##############################################################################
+"""
+Live compression of jam recorder sessions.
+
+The jam recorder (src/recorder) writes one uncompressed 16 bit WAV file per
+client connection into a session directory below --recording and keeps
+appending to it until the client disconnects. Then CJamClient::Disconnect
+finalises the file by writing the real data length into the header. When
+the session ends, the recorder writes a Reaper .rpp and an Audacity .lof
+project which reference the WAV files.
+
+This tool watches the recording directory for new sessions and tails every
+growing WAV file: each poll only reads the bytes appended since the last
+one and streams them into an encoder process (flac or opusenc), so the
+compression runs while the session is still recording. Pumping the data is
+done by a pool of worker threads. Once a file is finalised (or has not
+grown for --stale seconds, e.g. because the server was killed), the encoder
+is closed and the compressed file is moved into place. The WAV file is
+then deleted if --delete-wav is given, so the disk only has to hold the
+WAV files of the clients which are currently connected. When all files of
+a session are done, the references in its .rpp and .lof project are
+rewritten to the compressed files.
+
+Existing sessions are processed as well, so this can also be used to
+archive old recordings (with --once it exits when nothing is left to do).
+If the tool is restarted, files which are not yet complete are encoded
+again from the start.
+
+Usage:
+./tools/jamulus_transcode.py /srv/recordings
+./tools/jamulus_transcode.py /srv/recordings --encoder opus --opus-bitrate 48 --delete-wav
+./tools/jamulus_transcode.py /srv/recordings --encoder flac --once --jobs 4
+
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import logging
+import os
+import re
+import shutil
+import struct
+import subprocess
+import time
+
+from jamulus_recording import (WAV_UNSPECIFIED_LENGTH, RecordingError, parse_track_filename,
+                               read_wav_info)
+
+logger = logging.getLogger('')
+
+# see CJamSession::CJamSession
+SESSION_DIR_PREFIX = 'Jam-'
+READ_CHUNK_BYTES = 1024 * 1024
+PARTIAL_SUFFIX = '.part'
+
+# encoder name -> (file extension, Reaper source type, command reading raw
+# 16 bit little endian PCM from stdin)
+ENCODERS = {
+    'flac': ('.flac', 'FLAC',
+             ['flac', '--silent', '--force-raw-format', '--endian=little', '--sign=signed',
+              '--bps=16', '--channels={channels}', '--sample-rate={sample_rate}',
+              '--compression-level-{flac_level}', '--output-name={output}', '-']),
+    'opus': ('.opus', 'OPUS',
+             ['opusenc', '--quiet', '--raw', '--raw-bits', '16', '--raw-endianness', '0',
+              '--raw-chan', '{channels}', '--raw-rate', '{sample_rate}',
+              '--bitrate', '{bitrate}', '-', '{output}']),
+}
+SOURCE_TYPES = {extension: source_type for extension, source_type, _ in ENCODERS.values()}
+
+LOF_FILE_RE = re.compile(r'^(file ")([^"]+)(")', re.MULTILINE)
+RPP_FILE_RE = re.compile(r'^(\s*FILE ")([^"]+)(".*)$')
+RPP_SOURCE_WAVE = '<SOURCE WAVE'
+
+EncoderOptions = collections.namedtuple('EncoderOptions', [
+    'encoder', 'flac_level', 'opus_bitrate', 'stale', 'delete_wav'])
+
+
+def encoder_command(options, channels, sample_rate, output):
+    """
+    @param options: EncoderOptions
+    @param channels: int, number of interleaved channels
+    @param sample_rate: int, samples per second
+    @param output: str, path of the compressed file
+    @return: list of str, the encoder command line
+    """
+    _, _, command = ENCODERS[options.encoder]
+    values = {'channels': channels, 'sample_rate': sample_rate, 'output': output,
+              'flac_level': options.flac_level, 'bitrate': options.opus_bitrate * channels}
+    return [arg.format(**values) for arg in command]
+
+
+def output_path(path, options):
+    """
+    @return: str, path of the compressed file for a recorder WAV file
+    """
+    extension, _, _ = ENCODERS[options.encoder]
+    return os.path.splitext(path)[0] + extension
+
+
+def is_finalised(path, info):
+    """
+    @param info: WavInfo of the file
+    @return: bool, True if CWaveStream::finalise has written the data length
+    """
+    with open(path, 'rb') as f:
+        f.seek(info.data_offset - 4)
+        header = f.read(4)
+    return len(header) == 4 and struct.unpack('<I', header)[0] != WAV_UNSPECIFIED_LENGTH
+
+
+class TrackEncoder:
+    """
+    Tails one growing recorder WAV file into an encoder process.
+    """
+
+    def __init__(self, path, options):
+        """
+        @param path: str, path of the WAV file
+        @param options: EncoderOptions
+        """
+        self.path = path
+        self.output = output_path(path, options)
+        self.options = options
+        self.info = None
+        self.offset = 0
+        self.process = None
+
+    def _start(self):
+        # raises RecordingError while the recorder has not written the header yet
+        self.info = read_wav_info(self.path)
+        self.offset = self.info.data_offset
+        command = encoder_command(self.options, self.info.channels, self.info.sample_rate,
+                                  self.output + PARTIAL_SUFFIX)
+        logger.debug('encoding %s: %s', self.path, ' '.join(command))
+        self.process = subprocess.Popen(  # pylint: disable=consider-using-with
+            command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)
+
+    def _pump(self, end):
+        """
+        Feeds the whole frames from the current offset up to end to the
+        encoder.
+        """
+        block_align = self.info.channels * 2
+        end = self.offset + (end - self.offset) // block_align * block_align
+        if end <= self.offset:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            while self.offset < end:
+                chunk = f.read(min(READ_CHUNK_BYTES, end - self.offset))
+                if not chunk:
+                    break
+                self.process.stdin.write(chunk)
+                self.offset += len(chunk)
+        self.process.stdin.flush()
+
+    def _finish(self, end):
+        self._pump(end)
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RecordingError(f'{self.path}: {self.options.encoder} failed with exit status '
+                                 f'{self.process.returncode}')
+        os.replace(self.output + PARTIAL_SUFFIX, self.output)
+        logger.info('%s: wrote %s', self.path, os.path.basename(self.output))
+        if self.options.delete_wav:
+            os.remove(self.path)
+
+    def step(self):
+        """
+        Encodes the data appended since the last step and finishes the
+        encoding once the file is finalised or stale.
+
+        @return: bool, True when the compressed file is complete
+        """
+        if self.process is None:
+            self._start()
+        if is_finalised(self.path, self.info):
+            info = read_wav_info(self.path)
+            self._finish(info.data_offset + info.num_frames * info.channels * 2)
+            return True
+        stat = os.stat(self.path)
+        if time.time() - stat.st_mtime > self.options.stale:
+            logger.warning('%s has not grown for %.0f s, finishing it', self.path,
+                           self.options.stale)
+            self._finish(stat.st_size)
+            return True
+        self._pump(stat.st_size)
+        return False
+
+    def abort(self):
+        """
+        Stops the encoder and removes the incomplete compressed file.
+        """
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+            except BrokenPipeError:
+                pass  # the encoder exited already
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+        try:
+            os.remove(self.output + PARTIAL_SUFFIX)
+        except FileNotFoundError:
+            pass
+
+
+# Project files ---------------------------------------------------------------
+
+def rewrite_lof(text, renames):
+    """
+    @param text: str, Audacity .lof project as written by CJamRecorder
+    @param renames: dict, WAV file name -> compressed file name
+    @return: str, the project referencing the compressed files
+    """
+    return LOF_FILE_RE.sub(
+        lambda match: match[1] + renames.get(match[2], match[2]) + match[3], text)
+
+
+def rewrite_rpp(text, renames):
+    """
+    @param text: str, Reaper .rpp project as written by CReaperProject
+    @param renames: dict, WAV file name -> compressed file name
+    @return: str, the project referencing the compressed files
+    """
+    lines = text.split('\n')
+    for i, line in enumerate(lines):
+        match = RPP_FILE_RE.match(line)
+        if match is None:
+            continue
+        path = match[2]
+        name = os.path.basename(path)
+        if name not in renames:
+            continue
+        new_name = renames[name]
+        lines[i] = match[1] + path[:len(path) - len(name)] + new_name + match[3]
+        if i and lines[i - 1].strip() == RPP_SOURCE_WAVE:
+            source_type = SOURCE_TYPES[os.path.splitext(new_name)[1]]
+            lines[i - 1] = lines[i - 1].replace('WAVE', source_type)
+    return '\n'.join(lines)
+
+
+def rewrite_projects(session_dir, renames, min_age):
+    """
+    Rewrites the .rpp and .lof projects of a session to reference the
+    compressed files.
+
+    @param session_dir: str, session directory
+    @param renames: dict, WAV file name -> compressed file name
+    @param min_age: float, seconds since the last modification of a project
+                    before it is considered complete
+    @return: bool, True if all projects were found and checked
+    """
+    names = [name for name in os.listdir(session_dir) if name.endswith(('.lof', '.rpp'))]
+    if not names:
+        return False
+    for name in names:
+        path = os.path.join(session_dir, name)
+        if time.time() - os.path.getmtime(path) < min_age:
+            return False
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        new_text = (rewrite_lof if name.endswith('.lof') else rewrite_rpp)(text, renames)
+        if new_text != text:
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(new_text)
+            os.replace(tmp_path, path)
+            logger.info('%s: updated the file references', path)
+    return True
+
+
+# Watcher ---------------------------------------------------------------------
+
+class Transcoder:
+    """
+    Watches a recording directory and runs one TrackEncoder per WAV file.
+    """
+
+    def __init__(self, recording_dir, options, executor):
+        """
+        @param recording_dir: str, as passed to --recording
+        @param options: EncoderOptions
+        @param executor: concurrent.futures.Executor which runs the encoder steps
+        """
+        self.recording_dir = recording_dir
+        self.options = options
+        self.executor = executor
+        self.tracks = {}
+        self.futures = {}
+        self.failed = set()
+        self.finished_sessions = set()
+
+    def _session_dirs(self):
+        return sorted(entry.path for entry in os.scandir(self.recording_dir)
+                      if entry.is_dir() and entry.name.startswith(SESSION_DIR_PREFIX)
+                      and entry.path not in self.finished_sessions)
+
+    def scan(self, min_age):
+        """
+        Starts tracking new WAV files and rewrites the projects of sessions
+        whose files are all done.
+
+        @param min_age: float, see rewrite_projects()
+        """
+        extension, _, _ = ENCODERS[self.options.encoder]
+        for session_dir in self._session_dirs():
+            names = os.listdir(session_dir)
+            for name in sorted(names):
+                path = os.path.join(session_dir, name)
+                if (path in self.tracks or path in self.failed
+                        or parse_track_filename(path) is None
+                        or os.path.exists(output_path(path, self.options))):
+                    continue
+                self.tracks[path] = TrackEncoder(path, self.options)
+            if any(os.path.dirname(path) == session_dir for path in self.tracks):
+                continue
+            # the compressed files are complete, the WAV files may be deleted
+            renames = {os.path.splitext(name)[0] + '.wav': name
+                       for name in names if name.endswith(extension)}
+            if rewrite_projects(session_dir, renames, min_age):
+                self.finished_sessions.add(session_dir)
+
+    def poll(self):
+        """
+        Submits one step of every idle encoder and collects the finished ones.
+        """
+        for path, future in list(self.futures.items()):
+            if not future.done():
+                continue
+            del self.futures[path]
+            track = self.tracks[path]
+            try:
+                done = future.result()
+            except (OSError, RecordingError) as e:
+                if track.process is None and isinstance(e, RecordingError):
+                    logger.debug('%s', e)
+                    continue  # the header is not written yet, try again
+                logger.error('%s: %s', path, e)
+                track.abort()
+                self.failed.add(path)
+                done = True
+            if done:
+                del self.tracks[path]
+        for path, track in self.tracks.items():
+            if path not in self.futures:
+                self.futures[path] = self.executor.submit(track.step)
+
+    def run(self, interval, once=False):
+        """
+        Polls forever or, with once, until no WAV file is left to encode.
+
+        @param interval: float, seconds between polls
+        """
+        try:
+            while True:
+                self.scan(interval)
+                self.poll()
+                if once and not self.tracks:
+                    # rewrite the projects of the tracks finished by this poll
+                    self.scan(0)
+                    if not self.tracks:
+                        return
+                time.sleep(interval)
+        finally:
+            concurrent.futures.wait(self.futures.values())
+            for track in self.tracks.values():
+                track.abort()
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description='Compresses the WAV files of the jam recorder while they are recorded.')
+    p.add_argument('recording', help='recording directory, as passed to --recording')
+    p.add_argument('--encoder', choices=sorted(ENCODERS), default='flac',
+                   help='encoder to use, needs flac or opusenc in PATH (default: %(default)s)')
+    p.add_argument('--flac-level', type=int, choices=range(9), default=5,
+                   help='FLAC compression level (default: %(default)s)')
+    p.add_argument('--opus-bitrate', type=int, default=64,
+                   help='Opus bitrate in kbit/s per channel (default: %(default)s)')
+    p.add_argument('--delete-wav', action='store_true',
+                   help='delete each WAV file once it has been compressed')
+    p.add_argument('--interval', type=float, default=2.0,
+                   help='seconds between polls of the recording directory (default: %(default)s)')
+    p.add_argument('--stale', type=float, default=600.0,
+                   help='seconds without growth after which an unfinalised WAV file is '
+                        'finished (default: %(default)s)')
+    p.add_argument('--jobs', type=int, default=os.cpu_count(),
+                   help='number of worker threads feeding the encoders')
+    p.add_argument('--once', action='store_true',
+                   help='exit when all existing WAV files have been compressed')
+    p.add_argument('--verbose', '-v', action='store_true', help='enable verbose output')
+    args = p.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(message)s')
+    if not os.path.isdir(args.recording):
+        p.error(f'{args.recording} is not a directory')
+    _, _, command = ENCODERS[args.encoder]
+    if shutil.which(command[0]) is None:
+        p.error(f'{command[0]} not found in PATH')
+
+    options = EncoderOptions(args.encoder, args.flac_level, args.opus_bitrate, args.stale,
+                             args.delete_wav)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        try:
+            Transcoder(args.recording, options, executor).run(args.interval, args.once)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()